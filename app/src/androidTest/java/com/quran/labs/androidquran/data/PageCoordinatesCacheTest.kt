@@ -0,0 +1,99 @@
+package com.quran.labs.androidquran.data
+
+import android.graphics.RectF
+import androidx.test.core.app.ApplicationProvider
+import androidx.test.ext.junit.runners.AndroidJUnit4
+import com.quran.page.common.data.AyahBounds
+import com.quran.page.common.data.AyahCoordinates
+import com.quran.page.common.data.AyahMarkerLocation
+import com.quran.page.common.data.PageCoordinates
+import com.quran.page.common.data.SuraHeaderLocation
+import org.junit.After
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertNotNull
+import org.junit.Assert.assertNull
+import org.junit.Before
+import org.junit.Test
+import org.junit.runner.RunWith
+import java.io.File
+
+/**
+ * Writes page coordinates to a cache and reads them back (this needs a real [RectF], so it
+ * can't run as a unit test).
+ */
+@RunWith(AndroidJUnit4::class)
+class PageCoordinatesCacheTest {
+  private lateinit var file: File
+
+  @Before
+  fun setup() {
+    val context = ApplicationProvider.getApplicationContext<android.content.Context>()
+    file = File(context.cacheDir, "ayahinfo_1024.db.coords")
+    file.delete()
+  }
+
+  @After
+  fun tearDown() {
+    file.delete()
+  }
+
+  @Test
+  fun testPagesAreReadBack() {
+    val pages = listOf(
+        pageCoordinates(1, RectF(10f, 20f, 1014f, 1600f)) to ayahCoordinates(1, 1, 7),
+        pageCoordinates(2, RectF(12f, 18f, 1010f, 1620f)) to ayahCoordinates(2, 1, 5)
+    )
+    val writer = PageCoordinatesCache.Writer(file, SOURCE_VERSION, pages.size)
+    pages.forEach { (pageCoordinates, ayahCoordinates) ->
+      writer.addPage(pageCoordinates, ayahCoordinates)
+    }
+    writer.finish()
+
+    val cache = PageCoordinatesCache.open(file, SOURCE_VERSION)
+    assertNotNull(cache)
+    assertEquals(pages.map { it.first }, cache!!.getPageCoordinates(true, 1, 2))
+
+    val withoutBounds = cache.getPageCoordinates(false, 2)!!.single()
+    assertEquals(RectF(), withoutBounds.pageBounds)
+    assertEquals(pages[1].first.suraHeaders, withoutBounds.suraHeaders)
+    assertEquals(pages[1].first.ayahMarkers, withoutBounds.ayahMarkers)
+
+    pages.forEach { (_, expected) ->
+      val actual = cache.getAyahCoordinates(expected.page)!!
+      assertEquals(expected.page, actual.page)
+      assertEquals(expected.ayahCoordinates.keys, actual.ayahCoordinates.keys)
+      expected.ayahCoordinates.forEach { (key, bounds) ->
+        val actualBounds = actual.ayahCoordinates.getValue(key)
+        assertEquals(bounds.map { it.line }, actualBounds.map { it.line })
+        assertEquals(bounds.map { it.position }, actualBounds.map { it.position })
+        assertEquals(bounds.map { it.bounds }, actualBounds.map { it.bounds })
+      }
+    }
+
+    assertNull(cache.getAyahCoordinates(3))
+  }
+
+  private fun pageCoordinates(page: Int, bounds: RectF): PageCoordinates {
+    return PageCoordinates(
+        page,
+        bounds,
+        listOf(SuraHeaderLocation(page, 0, 40, 1024, 90)),
+        listOf(AyahMarkerLocation(page, 1, 500 + page, 300), AyahMarkerLocation(page, 2, 80, 420))
+    )
+  }
+
+  private fun ayahCoordinates(page: Int, firstAyah: Int, lastAyah: Int): AyahCoordinates {
+    val ayahs = (firstAyah..lastAyah).associate { ayah ->
+      val top = ayah * 100f
+      "$page:$ayah" to listOf(
+          AyahBounds(ayah, 1, RectF(0f, top, 512.5f, top + 50f)),
+          AyahBounds(ayah + 1, 2, RectF(600f, top + 50f, 1000f, top + 100f))
+      )
+    }
+    return AyahCoordinates(page, ayahs)
+  }
+
+  companion object {
+    private const val SOURCE_VERSION = 3L
+  }
+}
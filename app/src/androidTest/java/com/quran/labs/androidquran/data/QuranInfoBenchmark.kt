@@ -0,0 +1,77 @@
+package com.quran.labs.androidquran.data
+
+import androidx.test.ext.junit.runners.AndroidJUnit4
+import com.quran.data.core.QuranInfo
+import com.quran.data.pageinfo.common.MadaniDataSource
+import org.junit.Assert.assertEquals
+import org.junit.Test
+import org.junit.runner.RunWith
+
+/**
+ * Looks up the ayah id and page of every ayah, using the [QuranInfo] lookup tables and using
+ * the linear scans they replaced.
+ */
+@RunWith(AndroidJUnit4::class)
+class QuranInfoBenchmark {
+  private val dataSource = MadaniDataSource()
+  private val quranInfo = QuranInfo(dataSource)
+  private val ayahCounts = dataSource.getNumberOfAyahsForSuraArray()
+  private val suraPageStart = dataSource.getPageForSuraArray()
+  private val pageSuraStart = dataSource.getSuraForPageArray()
+  private val pageAyahStart = dataSource.getAyahForPageArray()
+
+  @Test
+  fun benchmarkAyahLookups() {
+    val iterations = 50
+
+    var tableChecksum = 0L
+    var start = System.nanoTime()
+    repeat(iterations) {
+      forEachAyah { sura, ayah ->
+        tableChecksum += quranInfo.getAyahId(sura, ayah) + quranInfo.getPageFromSuraAyah(sura, ayah)
+      }
+    }
+    val tableTime = System.nanoTime() - start
+
+    var linearChecksum = 0L
+    start = System.nanoTime()
+    repeat(iterations) {
+      forEachAyah { sura, ayah ->
+        linearChecksum += linearAyahId(sura, ayah) + linearPage(sura, ayah)
+      }
+    }
+    val linearTime = System.nanoTime() - start
+
+    assertEquals(linearChecksum, tableChecksum)
+    println("looked up ${iterations}x6236 ayahs with tables in ${tableTime / 1_000_000} ms, " +
+        "with linear scans in ${linearTime / 1_000_000} ms")
+  }
+
+  private inline fun forEachAyah(block: (Int, Int) -> Unit) {
+    for (sura in 1..ayahCounts.size) {
+      for (ayah in 1..ayahCounts[sura - 1]) {
+        block(sura, ayah)
+      }
+    }
+  }
+
+  private fun linearAyahId(sura: Int, ayah: Int): Int {
+    var ayahId = 0
+    for (i in 0 until sura - 1) {
+      ayahId += ayahCounts[i]
+    }
+    return ayahId + ayah
+  }
+
+  private fun linearPage(sura: Int, ayah: Int): Int {
+    var index = suraPageStart[sura - 1] - 1
+    while (index < quranInfo.numberOfPages) {
+      val ss = pageSuraStart[index]
+      if (ss > sura || ss == sura && pageAyahStart[index] > ayah) {
+        break
+      }
+      index++
+    }
+    return index
+  }
+}
@@ -0,0 +1,121 @@
+package com.quran.labs.androidquran.database
+
+import android.content.ContentValues
+import android.database.Cursor
+import android.database.sqlite.SQLiteDatabase
+import androidx.test.core.app.ApplicationProvider
+import androidx.test.ext.junit.runners.AndroidJUnit4
+import com.quran.data.core.QuranInfo
+import com.quran.data.pageinfo.common.MadaniDataSource
+import org.junit.After
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertFalse
+import org.junit.Assert.assertTrue
+import org.junit.Before
+import org.junit.Test
+import org.junit.runner.RunWith
+import java.io.File
+
+/**
+ * Reads every page's verses from a tafseer sized database, by sura and ayah and by ayah id.
+ */
+@RunWith(AndroidJUnit4::class)
+class VerseRangeQueriesBenchmark {
+  private val quranInfo = QuranInfo(MadaniDataSource())
+  private lateinit var databaseFile: File
+  private lateinit var database: SQLiteDatabase
+
+  @Before
+  fun setup() {
+    val context = ApplicationProvider.getApplicationContext<android.content.Context>()
+    databaseFile = File(context.cacheDir, "verse_range_benchmark.db")
+    databaseFile.delete()
+    database = SQLiteDatabase.openOrCreateDatabase(databaseFile, null)
+    createTafseer("verses", shuffled = false)
+    createTafseer("shuffled_verses", shuffled = true)
+  }
+
+  @After
+  fun tearDown() {
+    database.close()
+    databaseFile.delete()
+  }
+
+  @Test
+  fun testShuffledRowIdsFallBackToSuraAyah() {
+    val queries = VerseRangeQueries(database)
+    assertTrue(queries.isInVerseOrder("verses", quranInfo))
+    assertFalse(queries.isInVerseOrder("shuffled_verses", quranInfo))
+
+    val range = quranInfo.getVerseRangeForPage(50)
+    assertEquals(
+        readAyahs(queries.getVersesBySuraAyah(range, "verses")),
+        readAyahs(queries.getVerses(range, "shuffled_verses", quranInfo))
+    )
+  }
+
+  @Test
+  fun benchmarkReadingEveryPage() {
+    val queries = VerseRangeQueries(database)
+    // checks the verse order of the table once, outside of the timings
+    assertTrue(queries.isInVerseOrder("verses", quranInfo))
+
+    val pages = 1..quranInfo.numberOfPages
+    val bySuraAyah = mutableListOf<String>()
+    var start = System.nanoTime()
+    pages.forEach { page ->
+      val range = quranInfo.getVerseRangeForPage(page)
+      bySuraAyah.addAll(readAyahs(queries.getVersesBySuraAyah(range, "verses")))
+    }
+    val suraAyahTime = System.nanoTime() - start
+
+    val byAyahId = mutableListOf<String>()
+    start = System.nanoTime()
+    pages.forEach { page ->
+      val range = quranInfo.getVerseRangeForPage(page)
+      byAyahId.addAll(readAyahs(queries.getVerses(range, "verses", quranInfo)))
+    }
+    val ayahIdTime = System.nanoTime() - start
+
+    assertEquals(bySuraAyah, byAyahId)
+    println("read ${pages.count()} pages by sura and ayah in ${suraAyahTime / 1_000_000} ms, " +
+        "by ayah id in ${ayahIdTime / 1_000_000} ms")
+  }
+
+  private fun readAyahs(cursor: Cursor): List<String> {
+    return cursor.use {
+      val result = mutableListOf<String>()
+      while (it.moveToNext()) {
+        result.add("${it.getInt(1)}:${it.getInt(2)}:${it.getString(3).length}")
+      }
+      result
+    }
+  }
+
+  private fun createTafseer(table: String, shuffled: Boolean) {
+    database.execSQL("CREATE TABLE $table(sura INTEGER, ayah INTEGER, text TEXT)")
+    database.execSQL("CREATE INDEX ${table}_index ON $table(sura, ayah)")
+
+    val verses = (1..114).flatMap { sura ->
+      (1..quranInfo.getNumberOfAyahs(sura)).map { ayah -> sura to ayah }
+    }
+    val rowIds = verses.indices.map { it + 1 }.let { if (shuffled) it.reversed() else it }
+
+    // tafseer entries are a few kilobytes each
+    val text = "tafseer ".repeat(256)
+    database.beginTransaction()
+    try {
+      verses.forEachIndexed { index, (sura, ayah) ->
+        val values = ContentValues()
+        values.put("rowid", rowIds[index])
+        values.put("sura", sura)
+        values.put("ayah", ayah)
+        values.put("text", text)
+        database.insert(table, null, values)
+      }
+      database.setTransactionSuccessful()
+    } finally {
+      database.endTransaction()
+    }
+  }
+}
@@ -11,6 +11,7 @@ import com.quran.labs.androidquran.core.worker.QuranWorkerFactory
 import com.quran.labs.androidquran.di.component.application.ApplicationComponent
 import com.quran.labs.androidquran.di.component.application.DaggerApplicationComponent
 import com.quran.labs.androidquran.di.module.application.ApplicationModule
+import com.quran.labs.androidquran.ui.helpers.QuranPageCache
 import com.quran.labs.androidquran.util.QuranSettings
 import com.quran.labs.androidquran.util.RecordingLogTree
 import com.quran.labs.androidquran.widget.BookmarksWidgetSubscriber
@@ -27,6 +28,9 @@ open class QuranApplication : MultiDexApplication() {
   @Inject
   lateinit var bookmarksWidgetSubscriber: BookmarksWidgetSubscriber
 
+  @Inject
+  lateinit var quranPageCache: QuranPageCache
+
   override fun onCreate() {
     super.onCreate()
     setupTimber()
@@ -41,6 +45,11 @@ open class QuranApplication : MultiDexApplication() {
     bookmarksWidgetSubscriber.subscribeBookmarksWidgetIfNecessary()
   }
 
+  override fun onTrimMemory(level: Int) {
+    super.onTrimMemory(level)
+    quranPageCache.trimMemory(level)
+  }
+
   open fun setupTimber() {
     Timber.plant(RecordingLogTree())
   }
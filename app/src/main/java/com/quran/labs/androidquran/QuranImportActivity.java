@@ -1,5 +1,6 @@
 package com.quran.labs.androidquran;
 
+import android.app.ProgressDialog;
 import android.os.Bundle;
 import androidx.annotation.NonNull;
 import androidx.annotation.Nullable;
@@ -8,7 +9,7 @@ import androidx.appcompat.app.AlertDialog;
 import androidx.appcompat.app.AppCompatActivity;
 import android.widget.Toast;
 
-import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkCounts;
 import com.quran.labs.androidquran.presenter.QuranImportPresenter;
 import com.quran.labs.androidquran.ui.util.ToastCompat;
 
@@ -17,6 +18,7 @@ import javax.inject.Inject;
 public class QuranImportActivity extends AppCompatActivity implements
     ActivityCompat.OnRequestPermissionsResultCallback {
   private AlertDialog mDialog;
+  private ProgressDialog mProgressDialog;
   @Inject QuranImportPresenter mPresenter;
 
   @Override
@@ -45,6 +47,9 @@ public class QuranImportActivity extends AppCompatActivity implements
     if (mDialog != null) {
       mDialog.dismiss();
     }
+    if (mProgressDialog != null) {
+      mProgressDialog.dismiss();
+    }
     super.onDestroy();
   }
 
@@ -52,19 +57,34 @@ public class QuranImportActivity extends AppCompatActivity implements
     return mDialog != null;
   }
 
-  public void showImportConfirmationDialog(final BookmarkData bookmarkData) {
+  public void showImportConfirmationDialog(final BookmarkCounts bookmarkCounts) {
     String message = getString(R.string.import_data_and_override,
-        bookmarkData.getBookmarks().size(),
-        bookmarkData.getTags().size());
+        bookmarkCounts.getBookmarkCount(),
+        bookmarkCounts.getTagCount());
     AlertDialog.Builder builder = new AlertDialog.Builder(this)
         .setMessage(message)
         .setPositiveButton(R.string.import_data,
-            (dialog, which) -> mPresenter.importData(bookmarkData))
+            (dialog, which) -> {
+              mDialog = null;
+              mPresenter.importData();
+            })
         .setNegativeButton(android.R.string.cancel, (dialog, which) -> finish())
         .setOnCancelListener(dialog -> finish());
     mDialog = builder.show();
   }
 
+  public void showImportProgress(int imported, int total) {
+    if (mProgressDialog == null) {
+      mProgressDialog = new ProgressDialog(this);
+      mProgressDialog.setProgressStyle(ProgressDialog.STYLE_HORIZONTAL);
+      mProgressDialog.setMessage(getString(R.string.importing_data));
+      mProgressDialog.setCancelable(false);
+      mProgressDialog.setMax(total);
+      mProgressDialog.show();
+    }
+    mProgressDialog.setProgress(imported);
+  }
+
   public void showImportComplete() {
     ToastCompat.makeText(QuranImportActivity.this,
         R.string.import_successful, Toast.LENGTH_LONG).show();
@@ -1,3 +1,14 @@
 package com.quran.labs.androidquran.common
 
-class QuranText(val sura: Int, val ayah: Int, val text: String, val extraData: String? = null)
+/**
+ * The text of an ayah. [ayahSpans] holds the start and end offsets of the quoted ayahs in
+ * [extraData] (or in [text] when there's no extra data) for translations that were processed
+ * when they were installed, in which case footers were already removed from that text.
+ */
+class QuranText @JvmOverloads constructor(
+  val sura: Int,
+  val ayah: Int,
+  val text: String,
+  val extraData: String? = null,
+  val ayahSpans: IntArray? = null
+)
@@ -1,20 +1,15 @@
 package com.quran.labs.androidquran.core.worker.di
 
+import com.quran.common.networking.ManifestFetcher
 import com.quran.labs.androidquran.feature.audio.api.AudioUpdateService
 import dagger.Module
 import dagger.Provides
-import retrofit2.Retrofit.Builder
-import retrofit2.converter.moshi.MoshiConverterFactory
 
 @Module
 object AudioUpdateModule {
 
   @Provides
-  fun provideAudioUpdateService(): AudioUpdateService {
-    val retrofit = Builder()
-        .baseUrl("https://android.quran.com/")
-        .addConverterFactory(MoshiConverterFactory.create())
-        .build()
-    return retrofit.create(AudioUpdateService::class.java)
+  fun provideAudioUpdateService(manifestFetcher: ManifestFetcher): AudioUpdateService {
+    return AudioUpdateService(manifestFetcher)
   }
 }
@@ -0,0 +1,66 @@
+package com.quran.labs.androidquran.dao.audio
+
+import java.util.Arrays
+
+/**
+ * Gapless timings for a single sura.
+ *
+ * [ayahs] is sorted in ascending order, and [times] holds the start time (in milliseconds) of
+ * the ayah at the same index. Ayah 0 is the start of the sura (ex the basmallah) and ayah
+ * [END_OF_SURA], when present, marks the end of the sura.
+ */
+class SuraTimings(val sura: Int, private val ayahs: IntArray, private val times: IntArray) {
+  // range of indices holding actual ayahs (excluding 0 and the end of sura marker)
+  private val firstAyahIndex: Int
+  private val lastAyahIndex: Int
+
+  init {
+    require(ayahs.size == times.size) { "ayahs and times must have the same size" }
+    var first = 0
+    while (first < ayahs.size && ayahs[first] < 1) {
+      first++
+    }
+    var last = ayahs.size - 1
+    while (last >= first && ayahs[last] >= END_OF_SURA) {
+      last--
+    }
+    firstAyahIndex = first
+    lastAyahIndex = last
+  }
+
+  /**
+   * Returns the start time of the given ayah, or 0 if there is no timing for it.
+   */
+  fun getTime(ayah: Int): Int {
+    val index = Arrays.binarySearch(ayahs, ayah)
+    return if (index >= 0) times[index] else 0
+  }
+
+  /**
+   * Returns the ayah being played at the given position, which is the last ayah that
+   * starts at or before the position. Positions before the first ayah map to the first ayah.
+   */
+  fun getAyahForPosition(position: Int): Int {
+    if (firstAyahIndex > lastAyahIndex) {
+      return 1
+    }
+
+    var low = firstAyahIndex
+    var high = lastAyahIndex
+    var result = firstAyahIndex
+    while (low <= high) {
+      val mid = (low + high) ushr 1
+      if (times[mid] <= position) {
+        result = mid
+        low = mid + 1
+      } else {
+        high = mid - 1
+      }
+    }
+    return ayahs[result]
+  }
+
+  companion object {
+    const val END_OF_SURA = 999
+  }
+}
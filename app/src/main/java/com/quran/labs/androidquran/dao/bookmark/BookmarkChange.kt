@@ -0,0 +1,17 @@
+package com.quran.labs.androidquran.dao.bookmark
+
+/**
+ * A change to a single bookmark, so observers only need to update what changed.
+ *
+ * [bookmark] is the bookmark after the change (or before it, for a removed bookmark). It is null
+ * for [Type.RESET], which means that all the bookmarks may have changed (ex after an import).
+ */
+data class BookmarkChange(val type: Type, val bookmark: Bookmark?) {
+
+  enum class Type { ADDED, REMOVED, RETAGGED, RESET }
+
+  companion object {
+    @JvmField
+    val RESET = BookmarkChange(Type.RESET, null)
+  }
+}
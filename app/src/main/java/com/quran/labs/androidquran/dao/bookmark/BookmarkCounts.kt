@@ -0,0 +1,10 @@
+package com.quran.labs.androidquran.dao.bookmark
+
+/**
+ * The number of tags and bookmarks in a backup, counted while reading it without keeping them.
+ */
+data class BookmarkCounts(val tagCount: Int, val bookmarkCount: Int) {
+
+  val total: Int
+    get() = tagCount + bookmarkCount
+}
@@ -5,12 +5,13 @@ import android.database.Cursor;
 import android.database.SQLException;
 import android.database.sqlite.SQLiteDatabase;
 import android.graphics.RectF;
+import android.util.SparseArray;
 import androidx.annotation.NonNull;
 
+import com.quran.data.core.QuranInfo;
 import com.quran.labs.androidquran.database.DatabaseUtils;
 import com.quran.labs.androidquran.util.QuranFileUtils;
-import com.quran.page.common.data.AyahBounds;
-import com.quran.page.common.data.AyahCoordinates;
+import com.quran.page.common.data.AyahBoundsTable;
 import com.quran.page.common.data.AyahMarkerLocation;
 import com.quran.page.common.data.PageCoordinates;
 import com.quran.page.common.data.SuraHeaderLocation;
@@ -95,73 +96,79 @@ public class AyahInfoDatabaseHandler {
     return database != null && database.isOpen();
   }
 
+  /**
+   * Returns the page coordinates for each of the given pages, in the same order, using a
+   * single query per table for all of the pages.
+   */
   @NonNull
-  public PageCoordinates getPageInfo(int page, boolean wantBounds) {
-    final RectF bounds = wantBounds ? getPageBounds(page) : EMPTY_BOUNDS;
-    if (haveVerseMarkerData()) {
-      return new PageCoordinates(page,
-          bounds,
-          getSuraHeadersForPage(page),
-          getVerseMarkersForPage(page));
-    } else {
-      return new PageCoordinates(page, bounds, new ArrayList<>(), new ArrayList<>());
+  public List<PageCoordinates> getPageInfo(boolean wantBounds, int... pages) {
+    final String pageSelection = getPageSelection(pages);
+    final SparseArray<RectF> bounds =
+        wantBounds ? getPageBounds(pageSelection) : new SparseArray<>();
+    final boolean haveVerseMarkerData = haveVerseMarkerData();
+    final SparseArray<List<SuraHeaderLocation>> headers = haveVerseMarkerData ?
+        getSuraHeadersForPages(pageSelection) : new SparseArray<>();
+    final SparseArray<List<AyahMarkerLocation>> markers = haveVerseMarkerData ?
+        getVerseMarkersForPages(pageSelection) : new SparseArray<>();
+
+    final List<PageCoordinates> result = new ArrayList<>(pages.length);
+    for (int page : pages) {
+      RectF pageBounds = EMPTY_BOUNDS;
+      if (wantBounds) {
+        pageBounds = bounds.get(page);
+        if (pageBounds == null) {
+          throw new IllegalArgumentException("getPageBounds() on a non-existent page: " + page);
+        }
+      }
+      result.add(new PageCoordinates(page, pageBounds,
+          getOrEmpty(headers, page), getOrEmpty(markers, page)));
     }
+    return result;
   }
 
   @NonNull
-  private RectF getPageBounds(int page) {
+  private SparseArray<RectF> getPageBounds(String pageSelection) {
+    final SparseArray<RectF> result = new SparseArray<>();
     Cursor c = null;
     try {
-      String[] colNames = new String[]{
+      String[] colNames = new String[]{ COL_PAGE,
           "MIN(" + MIN_X + ")", "MIN(" + MIN_Y + ")",
           "MAX(" + MAX_X + ")", "MAX(" + MAX_Y + ")" };
-      c = database.query(GLYPHS_TABLE, colNames, COL_PAGE + "=" + page, null, null, null, null);
-      if (c.moveToFirst()) {
-        return new RectF(c.getInt(0), c.getInt(1), c.getInt(2), c.getInt(3));
-      } else {
-        throw new IllegalArgumentException("getPageBounds() on a non-existent page: " + page);
+      c = database.query(GLYPHS_TABLE, colNames, pageSelection, null, COL_PAGE, null, null);
+      while (c.moveToNext()) {
+        result.put(c.getInt(0), new RectF(c.getInt(1), c.getInt(2), c.getInt(3), c.getInt(4)));
       }
+      return result;
     } finally {
       DatabaseUtils.closeCursor(c);
     }
   }
 
+  /**
+   * Returns the bounds of the verses on all of the given pages, using a single query.
+   */
   @NonNull
-  public AyahCoordinates getVersesBoundsForPage(int page) {
-    Map<String, List<AyahBounds>> ayahBounds = new HashMap<>();
+  public AyahBoundsTable getVersesBoundsForPages(QuranInfo quranInfo, int... pages) {
+    final AyahBoundsTable.Builder builder = new AyahBoundsTable.Builder();
     Cursor cursor = null;
     try {
-      cursor = getVersesBoundsCursorForPage(page);
+      cursor = database.query(GLYPHS_TABLE,
+          new String[]{ COL_PAGE, COL_LINE, COL_SURA, COL_AYAH,
+              COL_POSITION, MIN_X, MIN_Y, MAX_X, MAX_Y },
+          getPageSelection(pages),
+          null, null, null,
+          COL_SURA + "," + COL_AYAH + "," + COL_PAGE + "," + COL_POSITION);
       while (cursor.moveToNext()) {
-        int sura = cursor.getInt(2);
-        int ayah = cursor.getInt(3);
-        String key = sura + ":" + ayah;
-        List<AyahBounds> bounds = ayahBounds.get(key);
-        if (bounds == null) {
-          bounds = new ArrayList<>();
-        }
-
-        AyahBounds last = null;
-        if (bounds.size() > 0) {
-          last = bounds.get(bounds.size() - 1);
-        }
-
-        AyahBounds bound = new AyahBounds(cursor.getInt(1),
-            cursor.getInt(4), cursor.getInt(5),
-            cursor.getInt(6), cursor.getInt(7),
-            cursor.getInt(8));
-        if (last != null && last.getLine() == bound.getLine()) {
-          last.engulf(bound);
-        } else {
-          bounds.add(bound);
-        }
-        ayahBounds.put(key, bounds);
+        final int sura = cursor.getInt(2);
+        final int ayah = cursor.getInt(3);
+        builder.add(quranInfo.getAyahId(sura, ayah), sura, ayah,
+            cursor.getInt(0), cursor.getInt(1), cursor.getInt(4),
+            cursor.getInt(5), cursor.getInt(6), cursor.getInt(7), cursor.getInt(8));
       }
     } finally {
       DatabaseUtils.closeCursor(cursor);
     }
-
-    return new AyahCoordinates(page, ayahBounds);
+    return builder.build();
   }
 
   private boolean haveVerseMarkerData() {
@@ -175,20 +182,20 @@ public class AyahInfoDatabaseHandler {
     }
   }
 
-  private List<AyahMarkerLocation> getVerseMarkersForPage(int page) {
-    final List<AyahMarkerLocation> markers = new ArrayList<>();
+  private SparseArray<List<AyahMarkerLocation>> getVerseMarkersForPages(String pageSelection) {
+    final SparseArray<List<AyahMarkerLocation>> markers = new SparseArray<>();
     Cursor cursor = null;
     try {
       cursor = database.query("ayah_markers",
-          new String[] { "sura_number", "ayah_number", "x", "y" },
-          "page_number = ?", new String[] { String.valueOf(page) }, null,
+          new String[] { "sura_number", "ayah_number", "x", "y", COL_PAGE },
+          pageSelection, null, null,
           null, "sura_number, ayah_number ASC");
       while (cursor.moveToNext()) {
         final int sura = cursor.getInt(0);
         final int ayah = cursor.getInt(1);
         final int x = cursor.getInt(2);
         final int y = cursor.getInt(3);
-        markers.add(new AyahMarkerLocation(sura, ayah, x, y));
+        getOrCreate(markers, cursor.getInt(4)).add(new AyahMarkerLocation(sura, ayah, x, y));
       }
     } finally {
       DatabaseUtils.closeCursor(cursor);
@@ -196,13 +203,13 @@ public class AyahInfoDatabaseHandler {
     return markers;
   }
 
-  private List<SuraHeaderLocation> getSuraHeadersForPage(int page) {
-    final List<SuraHeaderLocation> headers = new ArrayList<>();
+  private SparseArray<List<SuraHeaderLocation>> getSuraHeadersForPages(String pageSelection) {
+    final SparseArray<List<SuraHeaderLocation>> headers = new SparseArray<>();
     Cursor cursor = null;
     try {
       cursor = database.query("sura_headers",
-          new String[] { "sura_number", "x", "y", "width", "height" },
-          "page_number = ?", new String[] { String.valueOf(page) }, null,
+          new String[] { "sura_number", "x", "y", "width", "height", COL_PAGE },
+          pageSelection, null, null,
           null, "sura_number ASC");
       while (cursor.moveToNext()) {
         final int sura = cursor.getInt(0);
@@ -210,7 +217,8 @@ public class AyahInfoDatabaseHandler {
         final int y = cursor.getInt(2);
         final int width = cursor.getInt(3);
         final int height = cursor.getInt(4);
-        headers.add(new SuraHeaderLocation(sura, x, y, width, height));
+        getOrCreate(headers, cursor.getInt(5))
+            .add(new SuraHeaderLocation(sura, x, y, width, height));
       }
     } finally {
       DatabaseUtils.closeCursor(cursor);
@@ -218,12 +226,28 @@ public class AyahInfoDatabaseHandler {
     return headers;
   }
 
-  private Cursor getVersesBoundsCursorForPage(int page) {
-    return database.query(GLYPHS_TABLE,
-        new String[]{ COL_PAGE, COL_LINE, COL_SURA, COL_AYAH,
-            COL_POSITION, MIN_X, MIN_Y, MAX_X, MAX_Y },
-        COL_PAGE + "=" + page,
-        null, null, null,
-        COL_SURA + "," + COL_AYAH + "," + COL_POSITION);
+  private static String getPageSelection(int... pages) {
+    final StringBuilder builder = new StringBuilder(COL_PAGE).append(" IN (");
+    for (int i = 0; i < pages.length; i++) {
+      if (i > 0) {
+        builder.append(",");
+      }
+      builder.append(pages[i]);
+    }
+    return builder.append(")").toString();
+  }
+
+  private static <T> List<T> getOrCreate(SparseArray<List<T>> lists, int page) {
+    List<T> list = lists.get(page);
+    if (list == null) {
+      list = new ArrayList<>();
+      lists.put(page, list);
+    }
+    return list;
+  }
+
+  private static <T> List<T> getOrEmpty(SparseArray<List<T>> lists, int page) {
+    final List<T> list = lists.get(page);
+    return list == null ? new ArrayList<>() : list;
   }
 }
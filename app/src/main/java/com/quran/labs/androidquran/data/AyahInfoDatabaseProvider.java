@@ -5,6 +5,8 @@ import android.content.Context;
 import com.quran.labs.androidquran.di.ActivityScope;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 
+import java.io.File;
+
 import javax.inject.Inject;
 
 import androidx.annotation.Nullable;
@@ -33,6 +35,17 @@ public class AyahInfoDatabaseProvider {
     return databaseHandler;
   }
 
+  /**
+   * Returns the ayahinfo database file for the current width, or null if there
+   * is no ayahinfo directory.
+   */
+  @Nullable
+  public File getAyahInfoDatabaseFile() {
+    final String base = quranFileUtils.getQuranAyahDatabaseDirectory(context);
+    return base == null ? null :
+        new File(base, quranFileUtils.getAyaPositionFileName(widthParameter));
+  }
+
   public int getPageWidth() {
     return Integer.parseInt(widthParameter.substring(1));
   }
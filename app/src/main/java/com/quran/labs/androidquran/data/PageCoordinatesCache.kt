@@ -0,0 +1,238 @@
+package com.quran.labs.androidquran.data
+
+import android.graphics.RectF
+import com.quran.page.common.data.AyahBounds
+import com.quran.page.common.data.AyahCoordinates
+import com.quran.page.common.data.AyahMarkerLocation
+import com.quran.page.common.data.PageCoordinates
+import com.quran.page.common.data.SuraHeaderLocation
+import java.io.DataOutputStream
+import java.io.File
+import java.io.FileOutputStream
+import java.io.FilterOutputStream
+import java.io.IOException
+import java.io.OutputStream
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+import java.nio.channels.FileChannel
+
+/**
+ * A memory mapped file with the [PageCoordinates] and normalized [AyahCoordinates] of every
+ * page for a given page width.
+ *
+ * The geometry in the ayahinfo database never changes for a given width, so this is written
+ * once from the database and then read directly from the mapped file. The file starts with a
+ * header (including the version of the database it was built from), followed by the data of
+ * each page, and ends with a table of where each page's data starts.
+ */
+class PageCoordinatesCache private constructor(private val buffer: ByteBuffer) {
+  private val numberOfPages = buffer.getInt(PAGE_COUNT_OFFSET)
+  private val offsetsStart = buffer.limit() - (numberOfPages + 1) * 4
+
+  /**
+   * Returns the coordinates of each of [pages], or null if any of them aren't in the cache.
+   */
+  fun getPageCoordinates(wantBounds: Boolean, vararg pages: Int): List<PageCoordinates>? {
+    return pages.map { page -> readPage(page, wantBounds)?.first ?: return null }
+  }
+
+  fun getAyahCoordinates(page: Int): AyahCoordinates? = readPage(page, false)?.second
+
+  private fun readPage(page: Int, wantBounds: Boolean): Pair<PageCoordinates, AyahCoordinates>? {
+    if (page < 1 || page > numberOfPages) {
+      return null
+    }
+
+    val reader = Reader(buffer, buffer.getInt(offsetsStart + (page - 1) * 4))
+    val bounds = reader.readRect()
+    val headers = (0 until reader.readInt()).map {
+      SuraHeaderLocation(
+          reader.readInt(), reader.readInt(), reader.readInt(), reader.readInt(), reader.readInt()
+      )
+    }
+    val markers = (0 until reader.readInt()).map {
+      AyahMarkerLocation(reader.readInt(), reader.readInt(), reader.readInt(), reader.readInt())
+    }
+
+    val ayahs = mutableMapOf<String, List<AyahBounds>>()
+    repeat(reader.readInt()) {
+      val key = "${reader.readInt()}:${reader.readInt()}"
+      ayahs[key] = (0 until reader.readInt()).map {
+        AyahBounds(reader.readInt(), reader.readInt(), reader.readRect())
+      }
+    }
+
+    val pageCoordinates =
+        PageCoordinates(page, if (wantBounds) bounds else RectF(), headers, markers)
+    return pageCoordinates to AyahCoordinates(page, ayahs)
+  }
+
+  private class Reader(private val buffer: ByteBuffer, private var position: Int) {
+
+    fun readInt(): Int {
+      val value = buffer.getInt(position)
+      position += 4
+      return value
+    }
+
+    fun readRect(): RectF {
+      val rect = RectF(
+          buffer.getFloat(position), buffer.getFloat(position + 4),
+          buffer.getFloat(position + 8), buffer.getFloat(position + 12)
+      )
+      position += 16
+      return rect
+    }
+  }
+
+  /**
+   * Writes a cache file. Pages must be added in order, starting from page 1.
+   */
+  class Writer(
+    private val file: File,
+    private val sourceVersion: Long,
+    private val numberOfPages: Int
+  ) {
+    private val temporaryFile = File(file.path + ".tmp")
+    private val output = CountingOutputStream(FileOutputStream(temporaryFile).buffered())
+    private val data = DataOutputStream(output)
+    private val offsets = IntArray(numberOfPages + 1)
+    private var pages = 0
+
+    init {
+      data.writeInt(MAGIC)
+      data.writeInt(VERSION)
+      data.writeLong(sourceVersion)
+      data.writeInt(numberOfPages)
+    }
+
+    @Throws(IOException::class)
+    fun addPage(pageCoordinates: PageCoordinates, ayahCoordinates: AyahCoordinates) {
+      require(pageCoordinates.page == pages + 1) { "page ${pageCoordinates.page} out of order" }
+      offsets[pages++] = output.count
+
+      writeRect(pageCoordinates.pageBounds)
+      data.writeInt(pageCoordinates.suraHeaders.size)
+      pageCoordinates.suraHeaders.forEach {
+        data.writeInt(it.sura)
+        data.writeInt(it.x)
+        data.writeInt(it.y)
+        data.writeInt(it.width)
+        data.writeInt(it.height)
+      }
+
+      data.writeInt(pageCoordinates.ayahMarkers.size)
+      pageCoordinates.ayahMarkers.forEach {
+        data.writeInt(it.sura)
+        data.writeInt(it.ayah)
+        data.writeInt(it.x)
+        data.writeInt(it.y)
+      }
+
+      val ayahs = ayahCoordinates.ayahCoordinates
+      data.writeInt(ayahs.size)
+      ayahs.forEach { (key, bounds) ->
+        val separator = key.indexOf(':')
+        data.writeInt(key.substring(0, separator).toInt())
+        data.writeInt(key.substring(separator + 1).toInt())
+        data.writeInt(bounds.size)
+        bounds.forEach {
+          data.writeInt(it.line)
+          data.writeInt(it.position)
+          writeRect(it.bounds)
+        }
+      }
+    }
+
+    /**
+     * Finishes writing the file, replacing any existing cache.
+     */
+    @Throws(IOException::class)
+    fun finish() {
+      try {
+        data.use {
+          check(pages == numberOfPages) { "only $pages of $numberOfPages pages were added" }
+          offsets[numberOfPages] = output.count
+          offsets.forEach { data.writeInt(it) }
+        }
+
+        if (!temporaryFile.renameTo(file)) {
+          throw IOException("unable to write coordinates cache to ${file.path}")
+        }
+      } catch (exception: Exception) {
+        temporaryFile.delete()
+        throw exception
+      }
+    }
+
+    /**
+     * Stops writing without replacing any existing cache.
+     */
+    fun abort() {
+      try {
+        data.close()
+      } catch (ioException: IOException) {
+        // ignored
+      }
+      temporaryFile.delete()
+    }
+
+    private fun writeRect(rect: RectF) {
+      data.writeFloat(rect.left)
+      data.writeFloat(rect.top)
+      data.writeFloat(rect.right)
+      data.writeFloat(rect.bottom)
+    }
+  }
+
+  private class CountingOutputStream(output: OutputStream) : FilterOutputStream(output) {
+    var count = 0
+      private set
+
+    override fun write(b: Int) {
+      out.write(b)
+      count++
+    }
+
+    override fun write(b: ByteArray, off: Int, len: Int) {
+      out.write(b, off, len)
+      count += len
+    }
+  }
+
+  companion object {
+    private const val MAGIC = 0x51434f43 // QCOC
+    private const val VERSION = 1
+    private const val SOURCE_VERSION_OFFSET = 8
+    private const val PAGE_COUNT_OFFSET = 16
+    private const val HEADER_SIZE = 20
+
+    /**
+     * Maps the cache in [file], returning null if it is missing, invalid, or was built from a
+     * different version of the database.
+     */
+    @JvmStatic
+    fun open(file: File, sourceVersion: Long): PageCoordinatesCache? {
+      if (!file.exists()) {
+        return null
+      }
+
+      return try {
+        RandomAccessFile(file, "r").use { randomAccessFile ->
+          val channel = randomAccessFile.channel
+          val buffer = channel.map(FileChannel.MapMode.READ_ONLY, 0, channel.size())
+          if (buffer.limit() < HEADER_SIZE ||
+              buffer.getInt(0) != MAGIC ||
+              buffer.getInt(4) != VERSION ||
+              buffer.getLong(SOURCE_VERSION_OFFSET) != sourceVersion) {
+            null
+          } else {
+            PageCoordinatesCache(buffer)
+          }
+        }
+      } catch (ioException: IOException) {
+        null
+      }
+    }
+  }
+}
@@ -0,0 +1,73 @@
+package com.quran.labs.androidquran.data
+
+import com.quran.labs.androidquran.data.SearchSession.SearchRow
+import timber.log.Timber
+import java.util.concurrent.ExecutorService
+import java.util.concurrent.Future
+
+/**
+ * Searches several databases at once and merges their results.
+ *
+ * Every database is queried in parallel on the given executor (each database has its own
+ * connection), and results are merged in the order of [search]'s databases as soon as each
+ * one finishes. A verse found in more than one database is only kept from the first of them.
+ * Once [maxResults] rows have been merged, the searches that are still running are cancelled
+ * and the results are returned without waiting for them.
+ */
+class ParallelSearchExecutor(
+  private val source: SearchSession.Source,
+  private val executor: ExecutorService
+) {
+
+  class MergedResults(
+    val rows: List<SearchRow>,
+    /** time spent searching each database that finished, in milliseconds */
+    val timings: Map<String, Long>
+  )
+
+  private class TimedRows(val rows: List<SearchRow>, val elapsed: Long)
+
+  fun search(query: String, databases: List<String>, maxResults: Int): MergedResults {
+    val futures: List<Future<TimedRows?>> = databases.map { database ->
+      executor.submit<TimedRows?> {
+        val start = System.nanoTime()
+        source.search(database, query, true)?.let { rows ->
+          TimedRows(rows, (System.nanoTime() - start) / NANOS_PER_MILLI)
+        }
+      }
+    }
+
+    val merged = LinkedHashMap<Int, SearchRow>()
+    val timings = LinkedHashMap<String, Long>()
+    try {
+      for ((database, future) in databases.zip(futures)) {
+        if (merged.size >= maxResults) {
+          break
+        }
+
+        val results = awaitSearch(future) ?: continue
+        timings[database] = results.elapsed
+        Timber.d("searched %s in %d ms, %d rows", database, results.elapsed, results.rows.size)
+
+        for (row in results.rows) {
+          if (merged.size >= maxResults) {
+            break
+          }
+
+          val key = row.sura * MAX_AYAHS_PER_SURA + row.ayah
+          if (key !in merged) {
+            merged[key] = row
+          }
+        }
+      }
+    } finally {
+      futures.forEach { it.cancel(true) }
+    }
+    return MergedResults(merged.values.toList(), timings)
+  }
+
+  companion object {
+    private const val NANOS_PER_MILLI = 1_000_000L
+    private const val MAX_AYAHS_PER_SURA = 1000
+  }
+}
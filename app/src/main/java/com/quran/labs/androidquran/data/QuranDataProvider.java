@@ -11,6 +11,7 @@ import android.database.MatrixCursor;
 import android.net.Uri;
 import android.provider.BaseColumns;
 
+import com.quran.common.search.ResultFilter;
 import com.quran.labs.androidquran.BuildConfig;
 import com.quran.labs.androidquran.QuranApplication;
 import com.quran.labs.androidquran.R;
@@ -21,7 +22,12 @@ import com.quran.labs.androidquran.database.TranslationsDBAdapter;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.util.QuranUtils;
 
+import java.util.ArrayList;
 import java.util.List;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.LinkedBlockingQueue;
+import java.util.concurrent.ThreadPoolExecutor;
+import java.util.concurrent.TimeUnit;
 
 import javax.inject.Inject;
 
@@ -42,10 +48,42 @@ public class QuranDataProvider extends ContentProvider {
   private static final int SEARCH_SUGGEST = 1;
   private static final UriMatcher uriMatcher = buildUriMatcher();
 
+  private static final int MAX_SUGGESTIONS = 5;
+  private static final int MAX_SEARCH_RESULTS = 1000;
+  private static final int MAX_CONCURRENT_SEARCHES = 3;
+  private static final long SEARCH_THREAD_KEEP_ALIVE_SECONDS = 30;
+  private static final String[] SEARCH_COLUMNS =
+      new String[] { BaseColumns._ID, "sura", "ayah", "text" };
+
   private boolean didInject;
   @Inject QuranDisplayData quranDisplayData;
   @Inject TranslationsDBAdapter translationsDBAdapter;
   @Inject QuranFileUtils quranFileUtils;
+  private ExecutorService searchExecutor;
+  private SearchSession searchSession;
+  private long searchSessionWriteTime;
+  private ParallelSearchExecutor parallelSearchExecutor;
+
+  private final SearchSession.Source searchSource = new SearchSession.Source() {
+    @Override
+    public List<SearchSession.SearchRow> search(@NonNull String database,
+                                                @NonNull String query,
+                                                boolean withSnippets) {
+      return searchRows(query, database, withSnippets);
+    }
+
+    @Override
+    public int getMaxResults(@NonNull String database) {
+      return getDatabaseHandler(database)
+          .getMaxSearchResults(false, QURAN_ARABIC_DATABASE.equals(database));
+    }
+
+    @Override
+    public ResultFilter getResultFilter(@NonNull String database, @NonNull String query) {
+      return getDatabaseHandler(database)
+          .getSearchResultFilter(query, QURAN_ARABIC_DATABASE.equals(database));
+    }
+  };
 
   private static UriMatcher buildUriMatcher() {
     UriMatcher matcher = new UriMatcher(UriMatcher.NO_MATCH);
@@ -132,18 +170,11 @@ public class QuranDataProvider extends ContentProvider {
     MatrixCursor mc = new MatrixCursor(cols);
 
     Context context = getContext();
-    boolean gotResults = false;
-    boolean likelyHaveMoreResults = false;
+    List<String> databases = new ArrayList<>();
     for (int i = start; i < total; i++) {
-      if (gotResults) {
-        continue;
-      }
-
-      String database;
       if (i < 0) {
-        database = QURAN_ARABIC_DATABASE;
-        if (!quranFileUtils.hasArabicSearchDatabase(context)) {
-          continue;
+        if (quranFileUtils.hasArabicSearchDatabase(context)) {
+          databases.add(QURAN_ARABIC_DATABASE);
         }
       } else {
         LocalTranslation translation = translations.get(i);
@@ -154,41 +185,28 @@ public class QuranDataProvider extends ContentProvider {
           // results and is confusing.
           continue;
         }
-        database = translation.getFilename();
+        databases.add(translation.getFilename());
       }
+    }
 
-      Cursor suggestions = null;
-      try {
-        suggestions = search(query, database, false);
-        if (context != null && suggestions != null && suggestions.moveToFirst()) {
-          if (suggestions.getCount() > 5) {
-            likelyHaveMoreResults = true;
-          }
-
-          int results = 0;
-          do {
-            if (results == 5) {
-              break;
-            }
-            int sura = suggestions.getInt(1);
-            int ayah = suggestions.getInt(2);
-            String text = suggestions.getString(3);
-            String foundText = context.getString(
-                R.string.found_in_sura, quranDisplayData.getSuraName(context, sura, false), ayah);
-
-            gotResults = true;
-            MatrixCursor.RowBuilder row = mc.newRow();
-            int id = suggestions.getInt(0);
-
-            row.add(id);
-            row.add(text);
-            row.add(foundText);
-            row.add(id);
-            results++;
-          } while (suggestions.moveToNext());
-        }
-      } finally {
-        DatabaseUtils.closeCursor(suggestions);
+    final SearchSession.SearchResults suggestions = getSearchSession().search(query, databases);
+    boolean likelyHaveMoreResults = false;
+    if (context != null && suggestions != null) {
+      final List<SearchSession.SearchRow> rows = suggestions.getRows();
+      likelyHaveMoreResults = rows.size() > MAX_SUGGESTIONS;
+      for (int i = 0, size = Math.min(rows.size(), MAX_SUGGESTIONS); i < size; i++) {
+        final SearchSession.SearchRow suggestion = rows.get(i);
+        String foundText = context.getString(R.string.found_in_sura,
+            quranDisplayData.getSuraName(context, suggestion.getSura(), false),
+            suggestion.getAyah());
+
+        MatrixCursor.RowBuilder row = mc.newRow();
+        int id = suggestion.getId();
+
+        row.add(id);
+        row.add(suggestion.getText());
+        row.add(foundText);
+        row.add(id);
       }
     }
 
@@ -215,10 +233,10 @@ public class QuranDataProvider extends ContentProvider {
     int start = haveArabic ? -1 : 0;
     int total = translations.size();
 
+    List<String> databases = new ArrayList<>();
     for (int i = start; i < total; i++) {
-      String databaseName;
       if (i < 0) {
-        databaseName = QURAN_ARABIC_DATABASE;
+        databases.add(QURAN_ARABIC_DATABASE);
       } else {
         LocalTranslation translation = translations.get(i);
         // skip non-arabic databases if the query is in arabic
@@ -227,20 +245,82 @@ public class QuranDataProvider extends ContentProvider {
           // in the future, can think of better ways to enable tafseer search.
           continue;
         }
-        databaseName = translation.getFilename();
+        databases.add(translation.getFilename());
+      }
+    }
+
+    final ParallelSearchExecutor.MergedResults results =
+        getParallelSearchExecutor().search(query, databases, MAX_SEARCH_RESULTS);
+    final List<SearchSession.SearchRow> rows = results.getRows();
+    if (rows.isEmpty()) {
+      return null;
+    }
+
+    final MatrixCursor cursor = new MatrixCursor(SEARCH_COLUMNS, rows.size());
+    for (int i = 0, size = rows.size(); i < size; i++) {
+      final SearchSession.SearchRow row = rows.get(i);
+      cursor.addRow(new Object[] { row.getId(), row.getSura(), row.getAyah(), row.getText() });
+    }
+    return cursor;
+  }
+
+  private synchronized ExecutorService getSearchExecutor() {
+    if (searchExecutor == null) {
+      ThreadPoolExecutor executor = new ThreadPoolExecutor(
+          MAX_CONCURRENT_SEARCHES, MAX_CONCURRENT_SEARCHES,
+          SEARCH_THREAD_KEEP_ALIVE_SECONDS, TimeUnit.SECONDS, new LinkedBlockingQueue<>());
+      executor.allowCoreThreadTimeOut(true);
+      searchExecutor = executor;
+    }
+    return searchExecutor;
+  }
+
+  private synchronized ParallelSearchExecutor getParallelSearchExecutor() {
+    if (parallelSearchExecutor == null) {
+      parallelSearchExecutor = new ParallelSearchExecutor(searchSource, getSearchExecutor());
+    }
+    return parallelSearchExecutor;
+  }
+
+  private synchronized SearchSession getSearchSession() {
+    final long lastWriteTime = translationsDBAdapter.getLastWriteTime();
+    if (searchSession == null) {
+      searchSession = new SearchSession(searchSource, getSearchExecutor());
+    } else if (searchSessionWriteTime != lastWriteTime) {
+      // translations were added, removed or updated, so earlier results may be out of date
+      searchSession.clear();
+    }
+    searchSessionWriteTime = lastWriteTime;
+    return searchSession;
+  }
+
+  private List<SearchSession.SearchRow> searchRows(String query,
+                                                  String databaseName,
+                                                  boolean wantSnippets) {
+    Cursor cursor = null;
+    try {
+      cursor = search(query, databaseName, wantSnippets);
+      if (cursor == null) {
+        return null;
       }
 
-      Cursor cursor = search(query, databaseName, true);
-      if (cursor != null && cursor.getCount() > 0) {
-        return cursor;
+      final List<SearchSession.SearchRow> rows = new ArrayList<>();
+      while (!Thread.currentThread().isInterrupted() && cursor.moveToNext()) {
+        rows.add(new SearchSession.SearchRow(
+            cursor.getInt(0), cursor.getInt(1), cursor.getInt(2), cursor.getString(3)));
       }
+      return rows;
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
     }
-    return null;
+  }
+
+  private DatabaseHandler getDatabaseHandler(String databaseName) {
+    return DatabaseHandler.getDatabaseHandler(getContext(), databaseName, quranFileUtils);
   }
 
   private Cursor search(String query, String databaseName, boolean wantSnippets) {
-    final DatabaseHandler handler =
-        DatabaseHandler.getDatabaseHandler(getContext(), databaseName, quranFileUtils);
+    final DatabaseHandler handler = getDatabaseHandler(databaseName);
     return handler.search(query, wantSnippets, QURAN_ARABIC_DATABASE.equals(databaseName));
   }
 
@@ -0,0 +1,164 @@
+package com.quran.labs.androidquran.data
+
+import com.quran.common.search.ResultFilter
+import timber.log.Timber
+import java.util.concurrent.CancellationException
+import java.util.concurrent.ExecutionException
+import java.util.concurrent.ExecutorService
+import java.util.concurrent.Future
+
+/**
+ * Runs search suggestion queries as the user types.
+ *
+ * Databases are searched on the given (bounded) executor, and the results of the first
+ * database (in the given order) with any results are returned. When a query extends the previous one,
+ * databases that had no results are skipped, and complete results are narrowed in memory
+ * rather than queried again, as long as the [Source] has a [ResultFilter] for the query.
+ * Starting a new search cancels the search that is in flight.
+ */
+class SearchSession(private val source: Source, private val executor: ExecutorService) {
+
+  interface Source {
+    /**
+     * Search [database] for [query], returning null if the database can't be searched.
+     * Implementations should stop early when the calling thread is interrupted.
+     */
+    fun search(database: String, query: String, withSnippets: Boolean): List<SearchRow>?
+
+    fun getMaxResults(database: String): Int
+
+    fun getResultFilter(database: String, query: String): ResultFilter?
+  }
+
+  data class SearchRow(val id: Int, val sura: Int, val ayah: Int, val text: String)
+
+  class SearchResults(
+    val database: String,
+    val query: String,
+    val rows: List<SearchRow>,
+    val isComplete: Boolean
+  )
+
+  private class PendingSearch(
+    val database: String,
+    val results: SearchResults?,
+    val future: Future<SearchResults?>?
+  )
+
+  // all guarded by this
+  private val previousResults = mutableMapOf<String, SearchResults>()
+  private var inFlight = emptyList<Future<SearchResults?>>()
+  private var generation = 0L
+
+  /**
+   * Returns the results of the first database in [databases] with results for [query], or
+   * null if there are none or if this search was superseded by a newer one.
+   */
+  fun search(query: String, databases: List<String>): SearchResults? {
+    val currentGeneration: Long
+    val previous: Map<String, SearchResults>
+    synchronized(this) {
+      inFlight.forEach { it.cancel(true) }
+      inFlight = emptyList()
+      currentGeneration = ++generation
+      previous = previousResults.toMap()
+    }
+
+    val pending = databases.map { database ->
+      val narrowed = narrow(previous[database], query)
+      if (narrowed != null) {
+        PendingSearch(database, narrowed, null)
+      } else {
+        val future = executor.submit<SearchResults?> { runSearch(database, query) }
+        PendingSearch(database, null, future)
+      }
+    }
+
+    val futures = pending.mapNotNull { it.future }
+    synchronized(this) {
+      if (generation == currentGeneration) {
+        inFlight = futures
+      } else {
+        futures.forEach { it.cancel(true) }
+        return null
+      }
+    }
+
+    try {
+      for (item in pending) {
+        val results = item.results ?: awaitSearch(item.future) ?: continue
+        synchronized(this) {
+          if (generation != currentGeneration) {
+            return null
+          }
+          previousResults[item.database] = results
+        }
+
+        if (results.rows.isNotEmpty()) {
+          return results
+        }
+      }
+      return null
+    } finally {
+      futures.forEach { it.cancel(true) }
+    }
+  }
+
+  /**
+   * Forgets the results of earlier queries (ex when a database was added, removed or updated),
+   * so the next search queries every database again. Cancels the search that is in flight.
+   */
+  fun clear() {
+    synchronized(this) {
+      inFlight.forEach { it.cancel(true) }
+      inFlight = emptyList()
+      generation++
+      previousResults.clear()
+    }
+  }
+
+  private fun runSearch(database: String, query: String): SearchResults? {
+    val rows = source.search(database, query, false) ?: return null
+    return SearchResults(database, query, rows, rows.size < source.getMaxResults(database))
+  }
+
+  /**
+   * Returns the results for [query] based on the results of a previous query, or null if the
+   * database has to be queried.
+   */
+  private fun narrow(previous: SearchResults?, query: String): SearchResults? {
+    if (previous == null || previous.query.isEmpty() || !query.startsWith(previous.query)) {
+      return null
+    } else if (previous.query == query) {
+      return SearchResults(previous.database, query, previous.rows, previous.isComplete)
+    }
+
+    // without a filter (ex full text MATCH queries), a longer query can match more rows
+    val filter = source.getResultFilter(previous.database, query) ?: return null
+    if (previous.rows.isEmpty()) {
+      return SearchResults(previous.database, query, previous.rows, true)
+    } else if (!previous.isComplete) {
+      return null
+    }
+
+    val rows = previous.rows.filter { filter.matches(it.text) }
+    return SearchResults(previous.database, query, rows, true)
+  }
+}
+
+/**
+ * Waits for a search submitted to an executor, returning null if it failed or was cancelled.
+ */
+internal fun <T> awaitSearch(future: Future<T?>?): T? {
+  return try {
+    future?.get()
+  } catch (cancellationException: CancellationException) {
+    null
+  } catch (executionException: ExecutionException) {
+    Timber.e(executionException.cause, "error while searching")
+    null
+  } catch (interruptedException: InterruptedException) {
+    Thread.currentThread().interrupt()
+    null
+  }
+}
@@ -0,0 +1,48 @@
+package com.quran.labs.androidquran.database
+
+import com.quran.labs.androidquran.dao.audio.SuraTimings
+import java.util.LinkedHashMap
+
+/**
+ * Caches the [SuraTimings] of a single gapless qari database.
+ *
+ * Timings are loaded once per sura and kept in a small LRU cache, so that moving between suras
+ * (or seeking back into a recently played one) doesn't query the database again.
+ */
+class AyahTimingIndex @JvmOverloads constructor(
+  val databasePath: String,
+  private val maxSuras: Int = DEFAULT_MAX_SURAS,
+  private val loader: (Int) -> SuraTimings? = { sura ->
+    SuraTimingDatabaseHandler.getDatabaseHandler(databasePath).getSuraTimings(sura)
+  }
+) {
+  private val cache = object : LinkedHashMap<Int, SuraTimings>(maxSuras, 0.75f, true) {
+    override fun removeEldestEntry(eldest: MutableMap.MutableEntry<Int, SuraTimings>?): Boolean {
+      return size > maxSuras
+    }
+  }
+
+  /**
+   * Returns the timings for the sura if they are already cached, without querying the database.
+   */
+  @Synchronized
+  fun getCachedTimings(sura: Int): SuraTimings? = cache[sura]
+
+  /**
+   * Returns the timings for the sura, loading them from the database if necessary.
+   * This should not be called on the main thread.
+   */
+  fun getTimings(sura: Int): SuraTimings? {
+    getCachedTimings(sura)?.let { return it }
+
+    val timings = loader(sura)
+    if (timings != null) {
+      synchronized(this) { cache[sura] = timings }
+    }
+    return timings
+  }
+
+  companion object {
+    private const val DEFAULT_MAX_SURAS = 8
+  }
+}
@@ -8,7 +8,6 @@ import androidx.annotation.NonNull;
 import androidx.core.util.Pair;
 
 import com.quran.labs.androidquran.dao.bookmark.Bookmark;
-import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
 import com.quran.labs.androidquran.dao.RecentPage;
 import com.quran.labs.androidquran.dao.Tag;
 import com.quran.labs.androidquran.data.Constants;
@@ -17,6 +16,7 @@ import com.quran.labs.androidquran.database.BookmarksDBHelper.BookmarksTable;
 import com.quran.labs.androidquran.database.BookmarksDBHelper.LastPagesTable;
 import com.quran.labs.androidquran.database.BookmarksDBHelper.TagsTable;
 
+import java.io.IOException;
 import java.util.ArrayList;
 import java.util.List;
 import java.util.Set;
@@ -61,7 +61,6 @@ public class BookmarksDBAdapter {
         orderBy = BookmarksTable.TABLE_NAME + "." + BookmarksTable.ADDED_DATE + " DESC";
     }
 
-    List<Bookmark> bookmarks = new ArrayList<>();
     StringBuilder queryBuilder = new StringBuilder(BookmarksDBHelper.QUERY_BOOKMARKS);
     if (pageFilter != null) {
       queryBuilder.append(" WHERE ")
@@ -71,10 +70,31 @@ public class BookmarksDBAdapter {
           .append(BookmarksTable.AYAH).append(" IS NOT NULL");
     }
     queryBuilder.append(" ORDER BY ").append(orderBy);
+    return queryBookmarks(queryBuilder.toString(), null);
+  }
+
+  /**
+   * Returns up to {@code limit} bookmarks with ids greater than {@code afterId}, ordered by id,
+   * so that all the bookmarks can be read a batch at a time.
+   */
+  @NonNull
+  public List<Bookmark> getBookmarksAfter(long afterId, int limit) {
+    String bookmarkId = BookmarksTable.TABLE_NAME + "." + BookmarksTable.ID;
+    String query = BookmarksDBHelper.QUERY_BOOKMARKS +
+        " WHERE " + bookmarkId + " IN (SELECT " + BookmarksTable.ID +
+        " FROM " + BookmarksTable.TABLE_NAME + " WHERE " + BookmarksTable.ID + " > ?" +
+        " ORDER BY " + BookmarksTable.ID + " LIMIT ?)" +
+        " ORDER BY " + bookmarkId + " ASC";
+    return queryBookmarks(query,
+        new String[] { String.valueOf(afterId), String.valueOf(limit) });
+  }
 
+  @NonNull
+  private List<Bookmark> queryBookmarks(String query, String[] args) {
+    List<Bookmark> bookmarks = new ArrayList<>();
     Cursor cursor = null;
     try {
-      cursor = db.rawQuery(queryBuilder.toString(), null);
+      cursor = db.rawQuery(query, args);
       if (cursor != null) {
         long lastId = -1;
         Bookmark lastBookmark = null;
@@ -296,6 +316,28 @@ public class BookmarksDBAdapter {
     return tags;
   }
 
+  /**
+   * Returns up to {@code limit} tags with ids greater than {@code afterId}, ordered by id.
+   */
+  @NonNull
+  public List<Tag> getTagsAfter(long afterId, int limit) {
+    List<Tag> tags = new ArrayList<>();
+    Cursor cursor = null;
+    try {
+      cursor = db.query(TagsTable.TABLE_NAME, null,
+          TagsTable.ID + " > ?", new String[] { String.valueOf(afterId) },
+          null, null, TagsTable.ID + " ASC", String.valueOf(limit));
+      if (cursor != null) {
+        while (cursor.moveToNext()) {
+          tags.add(new Tag(cursor.getLong(0), cursor.getString(1)));
+        }
+      }
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
+    }
+    return tags;
+  }
+
   public long addTag(String name) {
     final long existingTag = haveMatchingTag(name);
     if (existingTag == -1) {
@@ -377,33 +419,60 @@ public class BookmarksDBAdapter {
     }
   }
 
-  public boolean importBookmarks(BookmarkData data) {
-    boolean result = true;
+  /**
+   * Imports tags and bookmarks (ex a batch at a time, using {@link #importTags(List)} and
+   * {@link #importBookmarks(List)}).
+   */
+  public interface BookmarkImporter {
+    void importBookmarks() throws IOException;
+  }
+
+  /**
+   * Replaces all the bookmarks and tags with the ones imported by {@code importer}. This is done
+   * in a single transaction, so the existing bookmarks are kept if the import fails.
+   */
+  public void replaceAllBookmarks(BookmarkImporter importer) throws IOException {
     db.beginTransaction();
     try {
       db.delete(BookmarksTable.TABLE_NAME, null, null);
       db.delete(BookmarkTagTable.TABLE_NAME, null, null);
       db.delete(TagsTable.TABLE_NAME, null, null);
+      importer.importBookmarks();
+      db.setTransactionSuccessful();
+    } finally {
+      db.endTransaction();
+    }
+  }
 
+  /**
+   * Imports a batch of tags, keeping their ids.
+   */
+  public void importTags(List<Tag> tags) {
+    db.beginTransaction();
+    try {
       ContentValues values = new ContentValues();
-
-      List<Tag> tags = data.getTags();
-      int tagSize = tags.size();
-      Timber.d("importing %d tags...", tagSize);
-
-      for (int i = 0; i < tagSize; i++) {
+      for (int i = 0, tagSize = tags.size(); i < tagSize; i++) {
         Tag tag = tags.get(i);
         values.clear();
         values.put(TagsTable.NAME, tag.getName());
         values.put(TagsTable.ID, tag.getId());
         db.insert(TagsTable.TABLE_NAME, null, values);
       }
+      db.setTransactionSuccessful();
+    } finally {
+      db.endTransaction();
+    }
+    Timber.d("imported %d tags", tags.size());
+  }
 
-      List<Bookmark> bookmarks = data.getBookmarks();
-      int bookmarkSize = bookmarks.size();
-      Timber.d("importing %d bookmarks...", bookmarkSize);
-
-      for (int i = 0; i < bookmarkSize; i++) {
+  /**
+   * Imports a batch of bookmarks along with their tags, keeping their ids.
+   */
+  public void importBookmarks(List<Bookmark> bookmarks) {
+    db.beginTransaction();
+    try {
+      ContentValues values = new ContentValues();
+      for (int i = 0, bookmarkSize = bookmarks.size(); i < bookmarkSize; i++) {
         Bookmark bookmark = bookmarks.get(i);
 
         values.clear();
@@ -422,15 +491,10 @@ public class BookmarksDBAdapter {
           db.insert(BookmarkTagTable.TABLE_NAME, null, values);
         }
       }
-
-      Timber.d("import successful!");
       db.setTransactionSuccessful();
-    } catch (Exception e) {
-      Timber.e(e, "Failed to import data");
-      result = false;
     } finally {
       db.endTransaction();
     }
-    return result;
+    Timber.d("imported %d bookmarks", bookmarks.size());
   }
 }
@@ -6,12 +6,17 @@ import android.database.DefaultDatabaseErrorHandler;
 import android.database.SQLException;
 import android.database.sqlite.SQLiteDatabase;
 import android.database.sqlite.SQLiteDatabaseCorruptException;
+import android.database.sqlite.SQLiteStatement;
 import android.provider.BaseColumns;
+import android.text.TextUtils;
 import android.util.SparseArray;
 
 import com.quran.common.search.ArabicSearcher;
 import com.quran.common.search.DefaultSearcher;
+import com.quran.common.search.ResultFilter;
 import com.quran.common.search.Searcher;
+import com.quran.common.search.arabic.ArabicSearchIndex;
+import com.quran.data.core.QuranInfo;
 import com.quran.labs.androidquran.R;
 import com.quran.labs.androidquran.common.QuranText;
 import com.quran.labs.androidquran.data.QuranFileConstants;
@@ -20,8 +25,10 @@ import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.util.TranslationUtil;
 
 import java.io.File;
+import java.io.IOException;
 import java.lang.annotation.Retention;
 import java.lang.annotation.RetentionPolicy;
+import java.nio.ByteBuffer;
 import java.util.ArrayList;
 import java.util.HashMap;
 import java.util.HashSet;
@@ -31,6 +38,8 @@ import java.util.Set;
 
 import androidx.annotation.IntDef;
 import androidx.annotation.NonNull;
+import androidx.annotation.Nullable;
+import androidx.annotation.WorkerThread;
 import androidx.core.content.ContextCompat;
 import timber.log.Timber;
 
@@ -47,6 +56,14 @@ public class DatabaseHandler {
   private static final String COL_PROPERTY = "property";
   private static final String COL_VALUE = "value";
 
+  private static final String SEARCH_INDEX_EXTENSION = ".idx";
+
+  // translation text with footers removed and quoted ayahs found, written when a translation is
+  // installed. verses without any footers or quoted ayahs are left out of this table.
+  private static final String PROCESSED_TEXT_TABLE = "processed_text";
+  private static final String COL_AYAH_SPANS = "ayah_spans";
+  private static final int[] NO_AYAH_SPANS = new int[0];
+
   private static final String MATCH_END = "</font>";
   private static final String ELLIPSES = "<b>...</b>";
 
@@ -54,9 +71,15 @@ public class DatabaseHandler {
 
   private int schemaVersion = 1;
   private SQLiteDatabase database = null;
+  private File databaseFile = null;
+  private ArabicSearchIndex arabicSearchIndex = null;
+  private long failedSearchIndexVersion = -1;
+  private Boolean hasProcessedText = null;
+  private VerseRangeQueries verseRangeQueries = null;
 
   private final Searcher defaultSearcher;
   private final Searcher arabicSearcher;
+  private final Searcher indexedArabicSearcher;
 
   @Retention(RetentionPolicy.SOURCE)
   @IntDef( { TextType.ARABIC, TextType.TRANSLATION } )
@@ -97,6 +120,8 @@ public class DatabaseHandler {
             "\">";
     defaultSearcher = new DefaultSearcher(matchString, MATCH_END, ELLIPSES);
     arabicSearcher = new ArabicSearcher(defaultSearcher, matchString, MATCH_END);
+    indexedArabicSearcher = new ArabicSearcher(defaultSearcher, matchString, MATCH_END,
+        this::getArabicSearchIndex);
 
     // if there's no Quran base directory, there are no databases
     String base = quranFileUtils.getQuranDatabaseDirectory(context);
@@ -104,6 +129,7 @@ public class DatabaseHandler {
 
     String path = base + File.separator + databaseName;
     Timber.d("opening database file: %s", path);
+    databaseFile = new File(path);
 
     try {
       database = SQLiteDatabase.openDatabase(path, null,
@@ -117,6 +143,7 @@ public class DatabaseHandler {
       throw se;
     }
 
+    verseRangeQueries = new VerseRangeQueries(database);
     schemaVersion = getSchemaVersion();
   }
 
@@ -173,19 +200,40 @@ public class DatabaseHandler {
    */
   public Cursor getVerses(int minSura, int minAyah, int maxSura,
                           int maxAyah, String table) {
+    return getVerses(minSura, minAyah, maxSura, maxAyah, table, null);
+  }
+
+  /**
+   * Returns a cursor of the verses in the range from table. When quranInfo is passed in, the
+   * range is read as a single range of ayah ids for tables whose rowids are ayah ids.
+   */
+  public Cursor getVerses(int minSura, int minAyah, int maxSura,
+                          int maxAyah, String table, @Nullable QuranInfo quranInfo) {
     // pass -1 for verses since this is used internally only and the field isn't needed.
-    return getVersesInternal(new VerseRange(minSura, minAyah, maxSura, maxAyah, -1), table);
+    return getVersesInternal(
+        new VerseRange(minSura, minAyah, maxSura, maxAyah, -1), table, quranInfo);
   }
 
   public List<QuranText> getVerses(VerseRange verses, @TextType int textType) {
+    return getVerses(verses, textType, null);
+  }
+
+  /**
+   * Returns the verses in the range. When quranInfo is passed in, the range is read as a
+   * single range of ayah ids for tables whose rowids are ayah ids.
+   */
+  public List<QuranText> getVerses(VerseRange verses, @TextType int textType,
+                                   @Nullable QuranInfo quranInfo) {
     Cursor cursor = null;
     List<QuranText> results = new ArrayList<>();
+    final List<Integer> rowIds = new ArrayList<>();
     final Set<Integer> toLookup = new HashSet<>();
 
     String table = textType == TextType.ARABIC ? ARABIC_TEXT_TABLE : VERSE_TABLE;
     try {
-      cursor = getVersesInternal(verses, table);
+      cursor = getVersesInternal(verses, table, quranInfo);
       while (cursor != null && cursor.moveToNext()) {
+        rowIds.add(cursor.getInt(0));
         int sura = cursor.getInt(1);
         int ayah = cursor.getInt(2);
         String text = cursor.getString(3);
@@ -213,11 +261,154 @@ public class DatabaseHandler {
         }
         toExpandBuilder.append(id);
       }
-      return expandHyperlinks(table, results, toExpandBuilder.toString());
+      results = expandHyperlinks(table, results, toExpandBuilder.toString());
+    }
+
+    if (textType == TextType.TRANSLATION && hasProcessedText()) {
+      rowIds.addAll(toLookup);
+      return applyProcessedText(results, rowIds);
     }
     return results;
   }
 
+  private synchronized boolean hasProcessedText() {
+    if (hasProcessedText == null) {
+      Cursor cursor = null;
+      try {
+        cursor = database.rawQuery("SELECT name FROM sqlite_master WHERE type = 'table'" +
+            " AND name = '" + PROCESSED_TEXT_TABLE + "'", null);
+        hasProcessedText = cursor != null && cursor.moveToFirst();
+      } catch (SQLException se) {
+        hasProcessedText = false;
+      } finally {
+        DatabaseUtils.closeCursor(cursor);
+      }
+    }
+    return hasProcessedText;
+  }
+
+  /**
+   * Replaces the text of each verse (or of the verse it links to) with the processed text,
+   * so that footers and quoted ayahs don't have to be parsed again for display.
+   */
+  private List<QuranText> applyProcessedText(List<QuranText> data, List<Integer> rowIds) {
+    final SparseArray<QuranText> processed = new SparseArray<>();
+    Cursor cursor = null;
+    try {
+      cursor = database.query(PROCESSED_TEXT_TABLE,
+          new String[]{ "rowid", COL_TEXT, COL_AYAH_SPANS },
+          "rowid in (" + TextUtils.join(",", rowIds) + ")", null, null, null, null);
+      while (cursor != null && cursor.moveToNext()) {
+        processed.put(cursor.getInt(0),
+            new QuranText(0, 0, cursor.getString(1), null, decodeAyahSpans(cursor.getBlob(2))));
+      }
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
+    }
+
+    final List<QuranText> result = new ArrayList<>();
+    for (int i = 0, size = data.size(); i < size; i++) {
+      final QuranText ayah = data.get(i);
+      final Integer linkId = TranslationUtil.getHyperlinkAyahId(ayah);
+      if (linkId != null) {
+        final QuranText link = processed.get(linkId);
+        final String extraData = link == null ? ayah.getExtraData() : link.getText();
+        final int[] spans = link == null ? NO_AYAH_SPANS : link.getAyahSpans();
+        result.add(extraData == null ? ayah :
+            new QuranText(ayah.getSura(), ayah.getAyah(), ayah.getText(), extraData, spans));
+      } else {
+        final QuranText text = processed.get(rowIds.get(i));
+        result.add(text == null ?
+            new QuranText(ayah.getSura(), ayah.getAyah(), ayah.getText(), null, NO_AYAH_SPANS) :
+            new QuranText(ayah.getSura(), ayah.getAyah(), text.getText(), null, text.getAyahSpans()));
+      }
+    }
+    return result;
+  }
+
+  /**
+   * Removes the footers and finds the quoted ayahs of every verse of this translation once, so
+   * that displaying the translation doesn't need to. Called when a translation is installed.
+   *
+   * @return true if the processed text was written
+   */
+  @WorkerThread
+  public boolean processTranslationText() {
+    if (!validDatabase()) {
+      return false;
+    }
+
+    final long start = System.currentTimeMillis();
+    final List<Integer> rowIds = new ArrayList<>();
+    final List<String> texts = new ArrayList<>();
+    Cursor cursor = null;
+    try {
+      cursor = database.query(VERSE_TABLE, new String[]{ "rowid", COL_TEXT },
+          null, null, null, null, "rowid");
+      while (cursor != null && cursor.moveToNext()) {
+        rowIds.add(cursor.getInt(0));
+        texts.add(cursor.getString(1));
+      }
+    } catch (SQLException se) {
+      Timber.e(se, "unable to read translation text");
+      return false;
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
+    }
+
+    final List<TranslationUtil.ProcessedText> processed =
+        TranslationUtil.processTranslationTexts(texts);
+
+    database.beginTransaction();
+    try {
+      database.execSQL("DROP TABLE IF EXISTS " + PROCESSED_TEXT_TABLE);
+      database.execSQL("CREATE TABLE " + PROCESSED_TEXT_TABLE + "(" +
+          "rowid INTEGER PRIMARY KEY, " + COL_TEXT + " TEXT NOT NULL, " +
+          COL_AYAH_SPANS + " BLOB NOT NULL)");
+      final SQLiteStatement insert = database.compileStatement("INSERT INTO " +
+          PROCESSED_TEXT_TABLE + " VALUES (?, ?, ?)");
+      for (int i = 0, size = processed.size(); i < size; i++) {
+        final TranslationUtil.ProcessedText text = processed.get(i);
+        if (text.getAyahSpans().length == 0 && text.getText().equals(texts.get(i))) {
+          continue;
+        }
+
+        insert.bindLong(1, rowIds.get(i));
+        insert.bindString(2, text.getText());
+        insert.bindBlob(3, encodeAyahSpans(text.getAyahSpans()));
+        insert.executeInsert();
+      }
+      insert.close();
+      database.setTransactionSuccessful();
+    } catch (SQLException se) {
+      Timber.e(se, "unable to write processed translation text");
+      return false;
+    } finally {
+      database.endTransaction();
+    }
+
+    synchronized (this) {
+      hasProcessedText = true;
+    }
+    Timber.d("processed %d verses in %d ms", texts.size(), System.currentTimeMillis() - start);
+    return true;
+  }
+
+  private static byte[] encodeAyahSpans(int[] spans) {
+    final ByteBuffer buffer = ByteBuffer.allocate(spans.length * 4);
+    buffer.asIntBuffer().put(spans);
+    return buffer.array();
+  }
+
+  private static int[] decodeAyahSpans(byte[] blob) {
+    if (blob == null || blob.length == 0) {
+      return NO_AYAH_SPANS;
+    }
+    final int[] spans = new int[blob.length / 4];
+    ByteBuffer.wrap(blob).asIntBuffer().get(spans);
+    return spans;
+  }
+
   private List<QuranText> expandHyperlinks(String table, List<QuranText> data, String rowIds) {
     SparseArray<String> expansions = new SparseArray<>();
 
@@ -248,49 +439,12 @@ public class DatabaseHandler {
     return result;
   }
 
-  private Cursor getVersesInternal(VerseRange verses, String table) {
+  private Cursor getVersesInternal(VerseRange verses, String table,
+                                   @Nullable QuranInfo quranInfo) {
     if (!validDatabase()) {
         return null;
     }
-
-    StringBuilder whereQuery = new StringBuilder();
-    whereQuery.append("(");
-
-    if (verses.startSura == verses.endingSura) {
-      whereQuery.append(COL_SURA)
-          .append("=").append(verses.startSura)
-          .append(" and ").append(COL_AYAH)
-          .append(">=").append(verses.startAyah)
-          .append(" and ").append(COL_AYAH)
-          .append("<=").append(verses.endingAyah);
-    } else {
-      // (sura = minSura and ayah >= minAyah)
-      whereQuery.append("(").append(COL_SURA).append("=")
-          .append(verses.startSura).append(" and ")
-          .append(COL_AYAH).append(">=").append(verses.startAyah).append(")");
-
-      whereQuery.append(" or ");
-
-      // (sura = maxSura and ayah <= maxAyah)
-      whereQuery.append("(").append(COL_SURA).append("=")
-          .append(verses.endingSura).append(" and ")
-          .append(COL_AYAH).append("<=").append(verses.endingAyah).append(")");
-
-      whereQuery.append(" or ");
-
-      // (sura > minSura and sura < maxSura)
-      whereQuery.append("(").append(COL_SURA).append(">")
-          .append(verses.startSura).append(" and ")
-          .append(COL_SURA).append("<")
-          .append(verses.endingSura).append(")");
-    }
-
-    whereQuery.append(")");
-
-    return database.query(table,
-        new String[] { "rowid as _id", COL_SURA, COL_AYAH, COL_TEXT },
-        whereQuery.toString(), null, null, null,
-        COL_SURA + "," + COL_AYAH);
+    return verseRangeQueries.getVerses(verses, table, quranInfo);
   }
 
   /**
@@ -319,6 +473,93 @@ public class DatabaseHandler {
     return database.rawQuery(sql, null);
   }
 
+  /**
+   * Returns the search index for the verses table, building it if it is missing or
+   * older than the database. The index is only used for the Arabic database.
+   */
+  private synchronized ArabicSearchIndex getArabicSearchIndex() {
+    if (!validDatabase()) {
+      return null;
+    }
+
+    final long sourceVersion = databaseFile.lastModified();
+    if (arabicSearchIndex != null && arabicSearchIndex.getSourceVersion() == sourceVersion) {
+      return arabicSearchIndex;
+    } else if (failedSearchIndexVersion == sourceVersion) {
+      // building the index failed, so don't try again for every search
+      return null;
+    }
+
+    final File indexFile = new File(databaseFile.getPath() + SEARCH_INDEX_EXTENSION);
+    ArabicSearchIndex index = ArabicSearchIndex.open(indexFile);
+    if (index == null || index.getSourceVersion() != sourceVersion) {
+      index = buildArabicSearchIndex(indexFile, sourceVersion);
+    }
+    if (index == null) {
+      failedSearchIndexVersion = sourceVersion;
+    }
+    arabicSearchIndex = index;
+    return index;
+  }
+
+  private ArabicSearchIndex buildArabicSearchIndex(File indexFile, long sourceVersion) {
+    final long start = System.currentTimeMillis();
+    final ArabicSearchIndex.Builder builder = new ArabicSearchIndex.Builder();
+    Cursor cursor = null;
+    try {
+      cursor = database.query(VERSE_TABLE, new String[]{ "rowid", COL_TEXT },
+          null, null, null, null, "rowid");
+      while (cursor != null && cursor.moveToNext()) {
+        builder.add(cursor.getInt(0), cursor.getString(1));
+      }
+    } catch (SQLException e) {
+      Timber.e(e, "unable to build search index");
+      return null;
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
+    }
+    Timber.d("built search index in %d ms", System.currentTimeMillis() - start);
+
+    try {
+      builder.write(indexFile, sourceVersion);
+      final ArabicSearchIndex index = ArabicSearchIndex.open(indexFile);
+      if (index != null) {
+        return index;
+      }
+    } catch (IOException e) {
+      Timber.e(e, "unable to write search index");
+    }
+    // keep the index in memory instead, so it isn't built again for every search
+    return builder.build(sourceVersion);
+  }
+
+  /**
+   * Returns a filter that finds the rows matching query amongst the rows that a prefix of
+   * query returned from {@link #search(String, boolean, boolean)}, or null if the database
+   * needs to be queried again.
+   */
+  public ResultFilter getSearchResultFilter(String query, boolean isArabicDatabase) {
+    return getSearcher(VERSE_TABLE, isArabicDatabase)
+        .getResultFilter(query, useFullTextIndex(isArabicDatabase));
+  }
+
+  public int getMaxSearchResults(boolean withSnippets, boolean isArabicDatabase) {
+    return getSearcher(VERSE_TABLE, isArabicDatabase).getMaxResults(withSnippets);
+  }
+
+  private Searcher getSearcher(String table, boolean isArabicDatabase) {
+    if (isArabicDatabase) {
+      // the search index only covers the verses table
+      return VERSE_TABLE.equals(table) ? indexedArabicSearcher : arabicSearcher;
+    } else {
+      return defaultSearcher;
+    }
+  }
+
+  private boolean useFullTextIndex(boolean isArabicDatabase) {
+    return schemaVersion > 1 && !isArabicDatabase;
+  }
+
   public Cursor search(String query, boolean withSnippets, boolean isArabicDatabase) {
     return search(query, VERSE_TABLE, withSnippets, isArabicDatabase);
   }
@@ -346,15 +587,8 @@ public class DatabaseHandler {
       searchText = searchText.replaceAll("\"", "");
     }
 
-    final Searcher searcher;
-    if (isArabicDatabase) {
-      searcher = arabicSearcher;
-    } else {
-      searcher = defaultSearcher;
-    }
-
-
-    final boolean useFullTextIndex = (schemaVersion > 1 && !isArabicDatabase);
+    final Searcher searcher = getSearcher(table, isArabicDatabase);
+    final boolean useFullTextIndex = useFullTextIndex(isArabicDatabase);
     String qtext = searcher.getQuery(withSnippets, useFullTextIndex, table,
         "rowid as " + BaseColumns._ID + ", " + COL_SURA + ", " + COL_AYAH, COL_TEXT) +
         " " + searcher.getLimit(withSnippets);
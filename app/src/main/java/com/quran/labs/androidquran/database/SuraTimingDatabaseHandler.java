@@ -6,6 +6,8 @@ import android.database.SQLException;
 import android.database.sqlite.SQLiteDatabase;
 import android.database.sqlite.SQLiteDatabaseCorruptException;
 
+import com.quran.labs.androidquran.dao.audio.SuraTimings;
+
 import java.io.File;
 import java.util.HashMap;
 import java.util.Map;
@@ -83,6 +85,31 @@ public class SuraTimingDatabaseHandler {
     }
   }
 
+  public SuraTimings getSuraTimings(int sura) {
+    Cursor cursor = null;
+    try {
+      cursor = getAyahTimings(sura);
+      if (cursor != null && cursor.moveToFirst()) {
+        final int count = cursor.getCount();
+        final int[] ayahs = new int[count];
+        final int[] times = new int[count];
+        int index = 0;
+        do {
+          ayahs[index] = cursor.getInt(1);
+          times[index] = cursor.getInt(2);
+          index++;
+        } while (cursor.moveToNext() && index < count);
+        return new SuraTimings(sura, ayahs, times);
+      }
+    } catch (SQLException se) {
+      // don't crash the app if the database is corrupt
+      Timber.e(se);
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
+    }
+    return null;
+  }
+
   public int getVersion() {
     if (!validDatabase()) { return -1; }
 
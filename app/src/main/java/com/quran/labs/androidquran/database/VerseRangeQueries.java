@@ -0,0 +1,143 @@
+package com.quran.labs.androidquran.database;
+
+import android.database.Cursor;
+import android.database.SQLException;
+import android.database.sqlite.SQLiteDatabase;
+
+import com.quran.data.core.QuranInfo;
+import com.quran.data.model.VerseRange;
+
+import java.util.HashMap;
+import java.util.Map;
+
+import androidx.annotation.NonNull;
+import androidx.annotation.Nullable;
+import timber.log.Timber;
+
+/**
+ * Queries for the verses in a range of ayahs from a table of sura, ayah and text.
+ *
+ * When the rowids of a table are the ayah ids of its verses (which is checked once per table),
+ * a range of ayahs is read as one range scan over the rowids. The sql for each table is built
+ * once and only the bounds are bound per query, so the compiled statement is reused from the
+ * database's statement cache. Otherwise, verses are queried by sura and ayah.
+ */
+class VerseRangeQueries {
+  static final String COL_SURA = "sura";
+  static final String COL_AYAH = "ayah";
+  static final String COL_TEXT = "text";
+
+  private final SQLiteDatabase database;
+  private final Map<String, String> rowIdQueries = new HashMap<>();
+  private final Map<String, Boolean> tablesInVerseOrder = new HashMap<>();
+
+  VerseRangeQueries(@NonNull SQLiteDatabase database) {
+    this.database = database;
+  }
+
+  /**
+   * Returns a cursor of rowid, sura, ayah and text for the verses in the range, sorted by
+   * sura and ayah. The rowid range is only used if quranInfo is passed in.
+   */
+  Cursor getVerses(VerseRange verses, String table, @Nullable QuranInfo quranInfo) {
+    if (quranInfo != null && isInVerseOrder(table, quranInfo)) {
+      return getVersesByRowId(table,
+          quranInfo.getAyahId(verses.startSura, verses.startAyah),
+          quranInfo.getAyahId(verses.endingSura, verses.endingAyah));
+    }
+    return getVersesBySuraAyah(verses, table);
+  }
+
+  Cursor getVersesByRowId(String table, int startAyahId, int endAyahId) {
+    return database.rawQuery(getRowIdQuery(table),
+        new String[] { String.valueOf(startAyahId), String.valueOf(endAyahId) });
+  }
+
+  Cursor getVersesBySuraAyah(VerseRange verses, String table) {
+    StringBuilder whereQuery = new StringBuilder();
+    whereQuery.append("(");
+
+    if (verses.startSura == verses.endingSura) {
+      whereQuery.append(COL_SURA)
+          .append("=").append(verses.startSura)
+          .append(" and ").append(COL_AYAH)
+          .append(">=").append(verses.startAyah)
+          .append(" and ").append(COL_AYAH)
+          .append("<=").append(verses.endingAyah);
+    } else {
+      // (sura = minSura and ayah >= minAyah)
+      whereQuery.append("(").append(COL_SURA).append("=")
+          .append(verses.startSura).append(" and ")
+          .append(COL_AYAH).append(">=").append(verses.startAyah).append(")");
+
+      whereQuery.append(" or ");
+
+      // (sura = maxSura and ayah <= maxAyah)
+      whereQuery.append("(").append(COL_SURA).append("=")
+          .append(verses.endingSura).append(" and ")
+          .append(COL_AYAH).append("<=").append(verses.endingAyah).append(")");
+
+      whereQuery.append(" or ");
+
+      // (sura > minSura and sura < maxSura)
+      whereQuery.append("(").append(COL_SURA).append(">")
+          .append(verses.startSura).append(" and ")
+          .append(COL_SURA).append("<")
+          .append(verses.endingSura).append(")");
+    }
+
+    whereQuery.append(")");
+
+    return database.query(table,
+        new String[] { "rowid as _id", COL_SURA, COL_AYAH, COL_TEXT },
+        whereQuery.toString(), null, null, null,
+        COL_SURA + "," + COL_AYAH);
+  }
+
+  private synchronized String getRowIdQuery(String table) {
+    String query = rowIdQueries.get(table);
+    if (query == null) {
+      query = "SELECT rowid as _id, " + COL_SURA + ", " + COL_AYAH + ", " + COL_TEXT +
+          " FROM " + table +
+          " WHERE rowid BETWEEN CAST(? AS INTEGER) AND CAST(? AS INTEGER)" +
+          " ORDER BY rowid";
+      rowIdQueries.put(table, query);
+    }
+    return query;
+  }
+
+  /**
+   * Whether the rowid of every verse in the table is its ayah id.
+   */
+  synchronized boolean isInVerseOrder(String table, QuranInfo quranInfo) {
+    Boolean inVerseOrder = tablesInVerseOrder.get(table);
+    if (inVerseOrder == null) {
+      inVerseOrder = checkVerseOrder(table, quranInfo);
+      tablesInVerseOrder.put(table, inVerseOrder);
+    }
+    return inVerseOrder;
+  }
+
+  private boolean checkVerseOrder(String table, QuranInfo quranInfo) {
+    Cursor cursor = null;
+    try {
+      cursor = database.query(table, new String[] { "rowid", COL_SURA, COL_AYAH },
+          null, null, null, null, "rowid");
+      while (cursor != null && cursor.moveToNext()) {
+        final int sura = cursor.getInt(1);
+        final int ayah = cursor.getInt(2);
+        if (ayah < 1 || ayah > quranInfo.getNumberOfAyahs(sura) ||
+            cursor.getInt(0) != quranInfo.getAyahId(sura, ayah)) {
+          Timber.d("rowids of %s are not ayah ids, querying by sura and ayah", table);
+          return false;
+        }
+      }
+      return cursor != null;
+    } catch (SQLException se) {
+      Timber.e(se, "unable to check verse order of %s", table);
+      return false;
+    } finally {
+      DatabaseUtils.closeCursor(cursor);
+    }
+  }
+}
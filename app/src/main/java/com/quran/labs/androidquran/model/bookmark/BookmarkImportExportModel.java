@@ -6,14 +6,18 @@ import androidx.annotation.NonNull;
 import androidx.core.content.FileProvider;
 
 import com.quran.labs.androidquran.R;
-import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
-import com.quran.labs.androidquran.database.BookmarksDBAdapter;
+import com.quran.labs.androidquran.dao.Tag;
+import com.quran.labs.androidquran.dao.bookmark.Bookmark;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkCounts;
 
 import java.io.File;
 import java.io.IOException;
+import java.util.List;
 
 import javax.inject.Inject;
 
+import io.reactivex.Maybe;
+import io.reactivex.Observable;
 import io.reactivex.Single;
 import io.reactivex.schedulers.Schedulers;
 import okio.BufferedSink;
@@ -24,6 +28,9 @@ import okio.Okio;
 public class BookmarkImportExportModel {
   private static final String FILE_NAME = "quran_android.backup";
 
+  // the number of tags or bookmarks read, written or imported at a time
+  static final int BATCH_SIZE = 500;
+
   private final Context appContext;
   private final BookmarkJsonModel jsonModel;
   private final BookmarkModel bookmarkModel;
@@ -36,25 +43,72 @@ public class BookmarkImportExportModel {
     this.bookmarkModel = bookmarkModel;
   }
 
-  public Single<BookmarkData> readBookmarks(@NonNull final BufferedSource source) {
-    return Single.defer(() -> Single.just(jsonModel.fromJson(source)))
+  /**
+   * Reads a backup to count its tags and bookmarks (and to make sure that it is valid) without
+   * keeping them in memory. The source is closed once it is read.
+   */
+  public Single<BookmarkCounts> readBookmarks(@NonNull final BufferedSource source) {
+    return Single.fromCallable(() -> countBookmarks(source))
         .subscribeOn(Schedulers.io());
   }
 
+  /**
+   * Replaces all the tags and bookmarks with the ones in the backup read from {@code source},
+   * which is read again from the start (and closed once it is read). If it can't be read again,
+   * the import fails with an {@link IOException}.
+   * @return an observable of the number of tags and bookmarks imported so far
+   */
+  public Observable<Integer> importBookmarksObservable(Maybe<BufferedSource> source) {
+    return source
+        .switchIfEmpty(Single.error(() -> new IOException("Unable to read the backup again")))
+        .flatMapObservable(bufferedSource -> bookmarkModel.importBookmarksObservable(
+            listener -> readBookmarks(bufferedSource, listener)))
+        .subscribeOn(Schedulers.io())
+        .cache();
+  }
+
   public Single<Uri> exportBookmarksObservable() {
-    return bookmarkModel.getBookmarkDataObservable(BookmarksDBAdapter.SORT_DATE_ADDED)
-        .flatMap(bookmarkData -> Single.just(exportBookmarks(bookmarkData)))
+    return Single.fromCallable(this::exportBookmarks)
         .subscribeOn(Schedulers.io());
   }
 
   @NonNull
-  private Uri exportBookmarks(BookmarkData data) throws IOException {
+  private BookmarkCounts countBookmarks(BufferedSource source) throws IOException {
+    final int[] counts = new int[2];
+    readBookmarks(source, new BookmarkJsonModel.BookmarkBatchListener() {
+      @Override
+      public void onTags(@NonNull List<Tag> tags) {
+        counts[0] += tags.size();
+      }
+
+      @Override
+      public void onBookmarks(@NonNull List<Bookmark> bookmarks) {
+        counts[1] += bookmarks.size();
+      }
+    });
+    return new BookmarkCounts(counts[0], counts[1]);
+  }
+
+  private void readBookmarks(BufferedSource source,
+                             BookmarkJsonModel.BookmarkBatchListener listener) throws IOException {
+    try {
+      jsonModel.readJson(source, BATCH_SIZE, listener);
+    } finally {
+      source.close();
+    }
+  }
+
+  @NonNull
+  private Uri exportBookmarks() throws IOException {
     File externalFilesDir = new File(appContext.getExternalFilesDir(null), "backups");
     if (externalFilesDir.exists() || externalFilesDir.mkdir()) {
       File file = new File(externalFilesDir, FILE_NAME);
       BufferedSink sink = Okio.buffer(Okio.sink(file));
-      jsonModel.toJson(sink, data);
-      sink.close();
+      try {
+        jsonModel.toJson(sink, bookmarkModel.getBookmarkBatchSource(BATCH_SIZE));
+      } finally {
+        sink.close();
+      }
 
       return FileProvider.getUriForFile(
           appContext, appContext.getString(R.string.file_authority), file);
@@ -0,0 +1,167 @@
+package com.quran.labs.androidquran.model.bookmark
+
+import com.quran.labs.androidquran.dao.bookmark.Bookmark
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange.Type
+import com.quran.labs.androidquran.database.BookmarksDBAdapter
+import java.util.BitSet
+
+/**
+ * An in memory copy of the bookmarks, so checking whether a page or an ayah is bookmarked
+ * doesn't need a database query.
+ *
+ * Pages are tracked in bitsets (pages with a page bookmark, and pages with at least one ayah
+ * bookmark), and ayah bookmarks are kept by ayah. [BookmarkModel] keeps the index up to date as
+ * it changes the database, and each update returns the [BookmarkChange]s it made.
+ */
+class BookmarkIndex {
+  private val bookmarks = HashMap<Long, Bookmark>()
+  private val pageBookmarks = HashMap<Int, Bookmark>()
+  private val ayahBookmarks = HashMap<Int, Bookmark>()
+  private val bookmarkedPages = BitSet()
+  private val pagesWithAyahBookmarks = BitSet()
+
+  /**
+   * Replaces the contents of the index with [all] (ex the bookmarks in the database).
+   */
+  @Synchronized
+  fun reset(all: List<Bookmark>) {
+    bookmarks.clear()
+    pageBookmarks.clear()
+    ayahBookmarks.clear()
+    bookmarkedPages.clear()
+    pagesWithAyahBookmarks.clear()
+    all.forEach { put(it) }
+  }
+
+  @Synchronized
+  fun getBookmark(bookmarkId: Long): Bookmark? = bookmarks[bookmarkId]
+
+  /**
+   * Returns the id of the bookmark for the given ayah (or the page, if sura and ayah are null),
+   * or -1 if there is no such bookmark.
+   */
+  @Synchronized
+  fun getBookmarkId(sura: Int?, ayah: Int?, page: Int): Long {
+    val bookmark = if (sura == null || ayah == null) {
+      if (bookmarkedPages[page]) pageBookmarks[page] else null
+    } else if (pagesWithAyahBookmarks[page]) {
+      ayahBookmarks[ayahKey(sura, ayah)]?.takeIf { it.page == page }
+    } else {
+      null
+    }
+    return bookmark?.id ?: -1
+  }
+
+  @Synchronized
+  fun isPageBookmarked(page: Int): Boolean = bookmarkedPages[page]
+
+  /**
+   * Returns the ayah bookmarks on [page], sorted by their location.
+   */
+  @Synchronized
+  fun getBookmarkedAyahsOnPage(page: Int): List<Bookmark> {
+    return if (pagesWithAyahBookmarks[page]) {
+      ayahBookmarks.values
+          .filter { it.page == page }
+          .sortedWith(LOCATION_COMPARATOR)
+    } else {
+      emptyList()
+    }
+  }
+
+  /**
+   * Returns all the bookmarks, in the same order as [BookmarksDBAdapter.getBookmarks].
+   */
+  @Synchronized
+  fun getBookmarks(sortOrder: Int): List<Bookmark> {
+    val comparator = if (sortOrder == BookmarksDBAdapter.SORT_LOCATION) {
+      LOCATION_COMPARATOR
+    } else {
+      DATE_ADDED_COMPARATOR
+    }
+    return bookmarks.values.sortedWith(comparator)
+  }
+
+  @Synchronized
+  fun add(bookmark: Bookmark): BookmarkChange {
+    bookmarks[bookmark.id]?.let { remove(it) }
+    put(bookmark)
+    return BookmarkChange(Type.ADDED, bookmark)
+  }
+
+  @Synchronized
+  fun remove(bookmarkId: Long): BookmarkChange? {
+    val bookmark = bookmarks[bookmarkId] ?: return null
+    remove(bookmark)
+    return BookmarkChange(Type.REMOVED, bookmark)
+  }
+
+  /**
+   * Replaces the tags of a bookmark, returning null if the bookmark isn't indexed or if its
+   * tags are unchanged.
+   */
+  @Synchronized
+  fun setTags(bookmarkId: Long, tagIds: Collection<Long>): BookmarkChange? {
+    val bookmark = bookmarks[bookmarkId] ?: return null
+    val tags = tagIds.distinct().sorted()
+    if (bookmark.tags.sorted() == tags) {
+      return null
+    }
+
+    val retagged = bookmark.withTags(tags)
+    put(retagged)
+    return BookmarkChange(Type.RETAGGED, retagged)
+  }
+
+  /**
+   * Removes a deleted tag from all the bookmarks tagged with it.
+   */
+  @Synchronized
+  fun removeTag(tagId: Long): List<BookmarkChange> {
+    return bookmarks.values
+        .filter { tagId in it.tags }
+        .mapNotNull { bookmark -> setTags(bookmark.id, bookmark.tags - tagId) }
+  }
+
+  private fun put(bookmark: Bookmark) {
+    bookmarks[bookmark.id] = bookmark
+    val sura = bookmark.sura
+    val ayah = bookmark.ayah
+    if (sura == null || ayah == null) {
+      pageBookmarks[bookmark.page] = bookmark
+      bookmarkedPages.set(bookmark.page)
+    } else {
+      ayahBookmarks[ayahKey(sura, ayah)] = bookmark
+      pagesWithAyahBookmarks.set(bookmark.page)
+    }
+  }
+
+  private fun remove(bookmark: Bookmark) {
+    bookmarks.remove(bookmark.id)
+    val sura = bookmark.sura
+    val ayah = bookmark.ayah
+    if (sura == null || ayah == null) {
+      if (pageBookmarks[bookmark.page]?.id == bookmark.id) {
+        pageBookmarks.remove(bookmark.page)
+        bookmarkedPages.clear(bookmark.page)
+      }
+    } else {
+      val key = ayahKey(sura, ayah)
+      if (ayahBookmarks[key]?.id == bookmark.id) {
+        ayahBookmarks.remove(key)
+      }
+
+      if (ayahBookmarks.values.none { it.page == bookmark.page }) {
+        pagesWithAyahBookmarks.clear(bookmark.page)
+      }
+    }
+  }
+
+  companion object {
+    private val LOCATION_COMPARATOR = compareBy<Bookmark>({ it.page }, { it.sura }, { it.ayah })
+    private val DATE_ADDED_COMPARATOR = compareByDescending<Bookmark> { it.timestamp }
+
+    private fun ayahKey(sura: Int, ayah: Int) = (sura shl 16) or ayah
+  }
+}
@@ -2,11 +2,18 @@ package com.quran.labs.androidquran.model.bookmark;
 
 import androidx.annotation.NonNull;
 
+import com.quran.labs.androidquran.dao.RecentPage;
+import com.quran.labs.androidquran.dao.Tag;
+import com.quran.labs.androidquran.dao.bookmark.Bookmark;
 import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
 import com.squareup.moshi.JsonAdapter;
+import com.squareup.moshi.JsonReader;
+import com.squareup.moshi.JsonWriter;
 import com.squareup.moshi.Moshi;
 
 import java.io.IOException;
+import java.util.ArrayList;
+import java.util.List;
 
 import javax.inject.Inject;
 
@@ -14,12 +21,46 @@ import okio.BufferedSink;
 import okio.BufferedSource;
 
 class BookmarkJsonModel {
+  private static final String TAGS = "tags";
+  private static final String BOOKMARKS = "bookmarks";
+  private static final String RECENT_PAGES = "recentPages";
+
   private final JsonAdapter<BookmarkData> jsonAdapter;
+  private final JsonAdapter<Tag> tagAdapter;
+  private final JsonAdapter<Bookmark> bookmarkAdapter;
+  private final JsonAdapter<RecentPage> recentPageAdapter;
+
+  /**
+   * Receives the tags and bookmarks read by
+   * {@link #readJson(BufferedSource, int, BookmarkBatchListener)}, a batch at a time.
+   */
+  interface BookmarkBatchListener {
+    void onTags(@NonNull List<Tag> tags);
+    void onBookmarks(@NonNull List<Bookmark> bookmarks);
+  }
+
+  /**
+   * Supplies the data written by {@link #toJson(BufferedSink, BookmarkBatchSource)}. Tags and
+   * bookmarks are requested in batches ordered by id, each one starting after the last id of
+   * the previous batch, until an empty batch is returned.
+   */
+  interface BookmarkBatchSource {
+    @NonNull List<Tag> getTags(long afterId);
+    @NonNull List<Bookmark> getBookmarks(long afterId);
+    @NonNull List<RecentPage> getRecentPages();
+  }
+
+  private interface BatchHandler<T> {
+    void onBatch(List<T> batch);
+  }
 
   @Inject
   BookmarkJsonModel() {
     Moshi moshi = new Moshi.Builder().build();
     jsonAdapter = moshi.adapter(BookmarkData.class);
+    tagAdapter = moshi.adapter(Tag.class);
+    bookmarkAdapter = moshi.adapter(Bookmark.class);
+    recentPageAdapter = moshi.adapter(RecentPage.class);
   }
 
   void toJson(BufferedSink sink, BookmarkData bookmarks) throws IOException {
@@ -30,4 +71,92 @@ class BookmarkJsonModel {
   BookmarkData fromJson(BufferedSource jsonSource) throws IOException {
     return jsonAdapter.fromJson(jsonSource);
   }
+
+  /**
+   * Writes the same json as {@link #toJson(BufferedSink, BookmarkData)}, but only holds a
+   * single batch of tags or bookmarks in memory at a time.
+   */
+  void toJson(BufferedSink sink, BookmarkBatchSource source) throws IOException {
+    JsonWriter writer = JsonWriter.of(sink);
+    writer.beginObject();
+
+    writer.name(TAGS).beginArray();
+    List<Tag> tags = source.getTags(0);
+    while (!tags.isEmpty()) {
+      for (int i = 0, size = tags.size(); i < size; i++) {
+        tagAdapter.toJson(writer, tags.get(i));
+      }
+      tags = source.getTags(tags.get(tags.size() - 1).getId());
+    }
+    writer.endArray();
+
+    writer.name(BOOKMARKS).beginArray();
+    List<Bookmark> bookmarks = source.getBookmarks(0);
+    while (!bookmarks.isEmpty()) {
+      for (int i = 0, size = bookmarks.size(); i < size; i++) {
+        bookmarkAdapter.toJson(writer, bookmarks.get(i));
+      }
+      bookmarks = source.getBookmarks(bookmarks.get(bookmarks.size() - 1).getId());
+    }
+    writer.endArray();
+
+    writer.name(RECENT_PAGES).beginArray();
+    for (RecentPage recentPage : source.getRecentPages()) {
+      recentPageAdapter.toJson(writer, recentPage);
+    }
+    writer.endArray();
+
+    writer.endObject();
+    writer.flush();
+  }
+
+  /**
+   * Reads the tags and bookmarks from json written by {@link #toJson}, passing them to
+   * {@code listener} in batches of up to {@code batchSize} items as they are read, so that the
+   * whole file is never held in memory. Recent pages are skipped.
+   */
+  void readJson(BufferedSource jsonSource, int batchSize, BookmarkBatchListener listener)
+      throws IOException {
+    JsonReader reader = JsonReader.of(jsonSource);
+    reader.beginObject();
+    while (reader.hasNext()) {
+      String name = reader.nextName();
+      if (TAGS.equals(name)) {
+        readArray(reader, tagAdapter, batchSize, listener::onTags);
+      } else if (BOOKMARKS.equals(name)) {
+        readArray(reader, bookmarkAdapter, batchSize, listener::onBookmarks);
+      } else {
+        reader.skipValue();
+      }
+    }
+    reader.endObject();
+  }
+
+  private <T> void readArray(JsonReader reader, JsonAdapter<T> adapter,
+                             int batchSize, BatchHandler<T> handler) throws IOException {
+    if (reader.peek() == JsonReader.Token.NULL) {
+      reader.nextNull();
+      return;
+    }
+
+    List<T> batch = new ArrayList<>(batchSize);
+    reader.beginArray();
+    while (reader.hasNext()) {
+      T item = adapter.fromJson(reader);
+      if (item == null) {
+        throw new IOException("Unexpected null at " + reader.getPath());
+      }
+
+      batch.add(item);
+      if (batch.size() == batchSize) {
+        handler.onBatch(batch);
+        batch = new ArrayList<>(batchSize);
+      }
+    }
+    reader.endArray();
+
+    if (!batch.isEmpty()) {
+      handler.onBatch(batch);
+    }
+  }
 }
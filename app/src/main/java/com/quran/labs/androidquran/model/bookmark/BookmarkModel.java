@@ -1,18 +1,25 @@
 package com.quran.labs.androidquran.model.bookmark;
 
+import com.quran.labs.androidquran.dao.RecentPage;
 import com.quran.labs.androidquran.dao.Tag;
 import com.quran.labs.androidquran.dao.bookmark.Bookmark;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange;
 import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
 import com.quran.labs.androidquran.database.BookmarksDBAdapter;
 import com.quran.labs.androidquran.ui.helpers.QuranRow;
 
+import java.io.IOException;
 import java.util.ArrayList;
+import java.util.Collections;
+import java.util.LinkedHashSet;
 import java.util.List;
 import java.util.Set;
 
 import javax.inject.Inject;
 import javax.inject.Singleton;
 
+import androidx.annotation.NonNull;
+import androidx.annotation.Nullable;
 import androidx.core.util.Pair;
 import io.reactivex.Completable;
 import io.reactivex.Maybe;
@@ -28,7 +35,9 @@ public class BookmarkModel {
   private final RecentPageModel recentPageModel;
   private final BookmarksDBAdapter bookmarksDBAdapter;
   private final Subject<Tag> tagPublishSubject;
-  private final Subject<Boolean> bookmarksPublishSubject;
+  private final Subject<List<BookmarkChange>> bookmarksPublishSubject;
+  private final BookmarkIndex bookmarkIndex;
+  private boolean isIndexLoaded;
 
   @Inject
   public BookmarkModel(BookmarksDBAdapter bookmarksAdapter, RecentPageModel recentPageModel) {
@@ -36,7 +45,8 @@ public class BookmarkModel {
     this.bookmarksDBAdapter = bookmarksAdapter;
 
     tagPublishSubject = PublishSubject.<Tag>create().toSerialized();
-    bookmarksPublishSubject = PublishSubject.<Boolean>create().toSerialized();
+    bookmarksPublishSubject = PublishSubject.<List<BookmarkChange>>create().toSerialized();
+    bookmarkIndex = new BookmarkIndex();
   }
 
   public Observable<Tag> tagsObservable() {
@@ -47,7 +57,10 @@ public class BookmarkModel {
     return recentPageModel.getRecentPagesUpdatedObservable();
   }
 
-  public Observable<Boolean> bookmarksObservable() {
+  /**
+   * Emits the changes made by each bookmark operation.
+   */
+  public Observable<List<BookmarkChange>> bookmarksObservable() {
     return bookmarksPublishSubject.hide();
   }
 
@@ -78,7 +91,24 @@ public class BookmarkModel {
         }
       }
       bookmarksDBAdapter.bulkDelete(tagsToDelete, bookmarksToDelete, untag);
-      bookmarksPublishSubject.onNext(true);
+
+      final BookmarkIndex index = getBookmarkIndex();
+      final List<BookmarkChange> changes = new ArrayList<>();
+      for (Long tagId : tagsToDelete) {
+        changes.addAll(index.removeTag(tagId));
+      }
+      for (Long bookmarkId : bookmarksToDelete) {
+        addChange(changes, index.remove(bookmarkId));
+      }
+      for (Pair<Long, Long> item : untag) {
+        final Bookmark bookmark = index.getBookmark(item.first);
+        if (bookmark != null) {
+          final List<Long> tags = new ArrayList<>(bookmark.getTags());
+          tags.remove(item.second);
+          addChange(changes, index.setTags(item.first, tags));
+        }
+      }
+      publishChanges(changes);
       return null;
     }).subscribeOn(Schedulers.io());
   }
@@ -107,7 +137,19 @@ public class BookmarkModel {
     return Observable.fromCallable(() -> {
       boolean result = bookmarksDBAdapter.tagBookmarks(bookmarkIds, tagIds, deleteNonTagged);
       if (result) {
-        bookmarksPublishSubject.onNext(true);
+        final BookmarkIndex index = getBookmarkIndex();
+        final List<BookmarkChange> changes = new ArrayList<>();
+        for (long bookmarkId : bookmarkIds) {
+          final Bookmark bookmark = index.getBookmark(bookmarkId);
+          if (bookmark != null) {
+            final Set<Long> tags = new LinkedHashSet<>(tagIds);
+            if (!deleteNonTagged) {
+              tags.addAll(bookmark.getTags());
+            }
+            addChange(changes, index.setTags(bookmarkId, tags));
+          }
+        }
+        publishChanges(changes);
       }
       return result;
     }).subscribeOn(Schedulers.io());
@@ -116,7 +158,10 @@ public class BookmarkModel {
   public Observable<Long> safeAddBookmark(final Integer sura, final Integer ayah, final int page) {
     return Observable.fromCallable(() -> {
       long result = bookmarksDBAdapter.addBookmarkIfNotExists(sura, ayah, page);
-      bookmarksPublishSubject.onNext(true);
+      final BookmarkIndex index = getBookmarkIndex();
+      if (result > 0 && index.getBookmark(result) == null) {
+        publishChanges(Collections.singletonList(index.add(newBookmark(result, sura, ayah, page))));
+      }
       return result;
     }).subscribeOn(Schedulers.io());
   }
@@ -125,8 +170,8 @@ public class BookmarkModel {
     return Single.fromCallable(bookmarksDBAdapter::getTags).subscribeOn(Schedulers.io());
   }
 
-  private Single<List<Bookmark>> getBookmarksObservable(final int sortOrder) {
-    return Single.fromCallable(() -> bookmarksDBAdapter.getBookmarks(sortOrder));
+  public Single<List<Bookmark>> getBookmarksObservable(final int sortOrder) {
+    return Single.fromCallable(() -> getBookmarkIndex().getBookmarks(sortOrder));
   }
 
   public Maybe<List<Long>> getBookmarkTagIds(Single<Long> bookmarkIdSingle) {
@@ -136,20 +181,20 @@ public class BookmarkModel {
   }
 
   public Single<Long> getBookmarkId(final Integer sura, final Integer ayah, final int page) {
-    return Single.fromCallable(() -> bookmarksDBAdapter.getBookmarkId(sura, ayah, page))
+    return Single.fromCallable(() -> getBookmarkIndex().getBookmarkId(sura, ayah, page))
         .subscribeOn(Schedulers.io());
   }
 
   public Observable<List<Bookmark>> getBookmarkedAyahsOnPageObservable(Integer... pages) {
     return Observable.fromArray(pages)
-        .map(bookmarksDBAdapter::getBookmarkedAyahsOnPage)
+        .map(page -> getBookmarkIndex().getBookmarkedAyahsOnPage(page))
         .filter(bookmarks -> !bookmarks.isEmpty())
         .subscribeOn(Schedulers.io());
   }
 
   public Observable<Pair<Integer, Boolean>> getIsBookmarkedObservable(Integer... pages) {
     return Observable.fromArray(pages)
-        .map(page -> new Pair<>(page, bookmarksDBAdapter.getBookmarkId(null, null, page) > 0))
+        .map(page -> new Pair<>(page, getBookmarkIndex().isPageBookmarked(page)))
         .subscribeOn(Schedulers.io());
   }
 
@@ -165,25 +210,116 @@ public class BookmarkModel {
     return getBookmarkId(sura, ayah, page)
         .map(bookmarkId -> {
           boolean result;
+          final BookmarkChange change;
           if (bookmarkId > 0) {
             bookmarksDBAdapter.removeBookmark(bookmarkId);
+            change = getBookmarkIndex().remove(bookmarkId);
             result = false;
           } else {
-            bookmarksDBAdapter.addBookmark(sura, ayah, page);
+            long id = bookmarksDBAdapter.addBookmark(sura, ayah, page);
+            change = id > 0 ? getBookmarkIndex().add(newBookmark(id, sura, ayah, page)) : null;
             result = true;
           }
-          bookmarksPublishSubject.onNext(true);
+          publishChanges(change == null ?
+              Collections.<BookmarkChange>emptyList() : Collections.singletonList(change));
           return result;
         }).subscribeOn(Schedulers.io());
   }
 
-  public Observable<Boolean> importBookmarksObservable(final BookmarkData data) {
-    return Observable.fromCallable(() -> {
-      boolean result = bookmarksDBAdapter.importBookmarks(data);
-      if (result) {
-        bookmarksPublishSubject.onNext(true);
+  /**
+   * Reads the tags and bookmarks being imported, passing them along a batch at a time.
+   */
+  interface BatchReader {
+    void read(BookmarkJsonModel.BookmarkBatchListener listener) throws IOException;
+  }
+
+  /**
+   * Replaces all the tags and bookmarks with the ones read by {@code reader}. Only one batch is
+   * held in memory at a time, but they are all imported in one transaction, so the existing
+   * bookmarks are kept if the import fails part of the way through.
+   * @return an observable of the number of tags and bookmarks imported so far
+   */
+  Observable<Integer> importBookmarksObservable(final BatchReader reader) {
+    return Observable.<Integer>create(emitter -> {
+      final int[] imported = new int[1];
+      try {
+        bookmarksDBAdapter.replaceAllBookmarks(() ->
+            reader.read(new BookmarkJsonModel.BookmarkBatchListener() {
+              @Override
+              public void onTags(@NonNull List<Tag> tags) {
+                bookmarksDBAdapter.importTags(tags);
+                imported[0] += tags.size();
+                emitter.onNext(imported[0]);
+              }
+
+              @Override
+              public void onBookmarks(@NonNull List<Bookmark> bookmarks) {
+                bookmarksDBAdapter.importBookmarks(bookmarks);
+                imported[0] += bookmarks.size();
+                emitter.onNext(imported[0]);
+              }
+            }));
+      } finally {
+        synchronized (this) {
+          isIndexLoaded = false;
+        }
+        publishChanges(Collections.singletonList(BookmarkChange.RESET));
       }
-      return result;
-    }).subscribeOn(Schedulers.io()).cache();
+      emitter.onComplete();
+    }).subscribeOn(Schedulers.io());
+  }
+
+  /**
+   * Returns the tags and bookmarks in batches of {@code batchSize}, so they can be exported
+   * without reading all of them at once.
+   */
+  BookmarkJsonModel.BookmarkBatchSource getBookmarkBatchSource(final int batchSize) {
+    return new BookmarkJsonModel.BookmarkBatchSource() {
+      @NonNull
+      @Override
+      public List<Tag> getTags(long afterId) {
+        return bookmarksDBAdapter.getTagsAfter(afterId, batchSize);
+      }
+
+      @NonNull
+      @Override
+      public List<Bookmark> getBookmarks(long afterId) {
+        return bookmarksDBAdapter.getBookmarksAfter(afterId, batchSize);
+      }
+
+      @NonNull
+      @Override
+      public List<RecentPage> getRecentPages() {
+        return bookmarksDBAdapter.getRecentPages();
+      }
+    };
+  }
+
+  /**
+   * Returns the index of the bookmarks, loading it from the database the first time.
+   */
+  private synchronized BookmarkIndex getBookmarkIndex() {
+    if (!isIndexLoaded) {
+      bookmarkIndex.reset(bookmarksDBAdapter.getBookmarks(BookmarksDBAdapter.SORT_LOCATION));
+      isIndexLoaded = true;
+    }
+    return bookmarkIndex;
+  }
+
+  private Bookmark newBookmark(long id, Integer sura, Integer ayah, int page) {
+    // added dates are stored in seconds
+    return new Bookmark(id, sura, ayah, page, System.currentTimeMillis() / 1000);
+  }
+
+  private void addChange(List<BookmarkChange> changes, @Nullable BookmarkChange change) {
+    if (change != null) {
+      changes.add(change);
+    }
+  }
+
+  private void publishChanges(List<BookmarkChange> changes) {
+    if (!changes.isEmpty()) {
+      bookmarksPublishSubject.onNext(changes);
+    }
   }
 }
@@ -2,16 +2,22 @@ package com.quran.labs.androidquran.model.quran;
 
 import android.graphics.RectF;
 
+import com.quran.data.core.QuranInfo;
 import com.quran.labs.androidquran.data.AyahInfoDatabaseHandler;
 import com.quran.labs.androidquran.data.AyahInfoDatabaseProvider;
+import com.quran.labs.androidquran.data.PageCoordinatesCache;
 import com.quran.labs.androidquran.di.ActivityScope;
 import com.quran.page.common.data.AyahBounds;
+import com.quran.page.common.data.AyahBoundsTable;
 import com.quran.page.common.data.AyahCoordinates;
 import com.quran.page.common.data.PageCoordinates;
 
+import java.io.File;
+import java.io.IOException;
 import java.util.ArrayList;
 import java.util.Collections;
 import java.util.HashMap;
+import java.util.HashSet;
 import java.util.List;
 import java.util.Map;
 import java.util.NoSuchElementException;
@@ -19,18 +25,28 @@ import java.util.Set;
 
 import javax.inject.Inject;
 
+import androidx.annotation.Nullable;
+import io.reactivex.Completable;
 import io.reactivex.Observable;
 import io.reactivex.schedulers.Schedulers;
+import timber.log.Timber;
 
 @ActivityScope
 public class CoordinatesModel {
   private static final float THRESHOLD_PERCENTAGE = 0.015f;
+  private static final String COORDINATES_CACHE_EXTENSION = ".coords";
+  private static final int CACHE_BUILD_BATCH_SIZE = 20;
+  private static final Set<String> CACHES_BEING_BUILT =
+      Collections.synchronizedSet(new HashSet<>());
 
   private final AyahInfoDatabaseProvider ayahInfoDatabaseProvider;
+  private final QuranInfo quranInfo;
+  @Nullable private PageCoordinatesCache coordinatesCache;
 
   @Inject
-  CoordinatesModel(AyahInfoDatabaseProvider ayahInfoDatabaseProvider) {
+  CoordinatesModel(AyahInfoDatabaseProvider ayahInfoDatabaseProvider, QuranInfo quranInfo) {
     this.ayahInfoDatabaseProvider = ayahInfoDatabaseProvider;
+    this.quranInfo = quranInfo;
   }
 
   public Observable<PageCoordinates> getPageCoordinates(boolean wantPageBounds, Integer... pages) {
@@ -39,8 +55,14 @@ public class CoordinatesModel {
       return Observable.error(new NoSuchElementException("No AyahInfoDatabaseHandler found!"));
     }
 
-    return Observable.fromArray(pages)
-        .map(page -> database.getPageInfo(page, wantPageBounds))
+    return Observable.fromCallable(() -> {
+      final int[] pageNumbers = toIntArray(pages);
+      final PageCoordinatesCache cache = getCoordinatesCache(database);
+      final List<PageCoordinates> cached =
+          cache == null ? null : cache.getPageCoordinates(wantPageBounds, pageNumbers);
+      return cached != null ? cached : database.getPageInfo(wantPageBounds, pageNumbers);
+    })
+        .flatMapIterable(pageCoordinates -> pageCoordinates)
         .subscribeOn(Schedulers.computation());
   }
 
@@ -50,12 +72,98 @@ public class CoordinatesModel {
       return Observable.error(new NoSuchElementException("No AyahInfoDatabaseHandler found!"));
     }
 
-    return Observable.fromArray(pages)
-        .map(database::getVersesBoundsForPage)
-        .map(this::normalizePageAyahs)
+    return Observable.fromCallable(() -> {
+      final PageCoordinatesCache cache = getCoordinatesCache(database);
+      final List<AyahCoordinates> result = new ArrayList<>(pages.length);
+      for (int page : pages) {
+        final AyahCoordinates cached = cache == null ? null : cache.getAyahCoordinates(page);
+        if (cached == null) {
+          return getAyahCoordinatesFromDatabase(database, toIntArray(pages));
+        }
+        result.add(cached);
+      }
+      return result;
+    })
+        .flatMapIterable(ayahCoordinates -> ayahCoordinates)
         .subscribeOn(Schedulers.computation());
   }
 
+  private List<AyahCoordinates> getAyahCoordinatesFromDatabase(AyahInfoDatabaseHandler database,
+                                                               int... pages) {
+    final AyahBoundsTable table = database.getVersesBoundsForPages(quranInfo, pages);
+    final List<AyahCoordinates> result = new ArrayList<>(pages.length);
+    for (int page : pages) {
+      result.add(normalizePageAyahs(table.toAyahCoordinates(page)));
+    }
+    return result;
+  }
+
+  /**
+   * Returns the coordinates cache for the current width. When it is missing or was built
+   * from a different database, this returns null and builds it in the background.
+   */
+  @Nullable
+  private synchronized PageCoordinatesCache getCoordinatesCache(
+      AyahInfoDatabaseHandler database) {
+    if (coordinatesCache != null) {
+      return coordinatesCache;
+    }
+
+    final File databaseFile = ayahInfoDatabaseProvider.getAyahInfoDatabaseFile();
+    if (databaseFile == null) {
+      return null;
+    }
+
+    final File cacheFile = new File(databaseFile.getPath() + COORDINATES_CACHE_EXTENSION);
+    final long sourceVersion = databaseFile.lastModified();
+    coordinatesCache = PageCoordinatesCache.open(cacheFile, sourceVersion);
+    if (coordinatesCache == null && CACHES_BEING_BUILT.add(cacheFile.getPath())) {
+      Completable.fromAction(() -> buildCoordinatesCache(database, cacheFile, sourceVersion))
+          .doFinally(() -> CACHES_BEING_BUILT.remove(cacheFile.getPath()))
+          .subscribeOn(Schedulers.io())
+          .subscribe(() -> { }, e -> Timber.e(e, "unable to build the coordinates cache"));
+    }
+    return coordinatesCache;
+  }
+
+  private void buildCoordinatesCache(AyahInfoDatabaseHandler database,
+                                     File cacheFile,
+                                     long sourceVersion) throws IOException {
+    final long start = System.currentTimeMillis();
+    final int numberOfPages = quranInfo.getNumberOfPages();
+    final PageCoordinatesCache.Writer writer =
+        new PageCoordinatesCache.Writer(cacheFile, sourceVersion, numberOfPages);
+    try {
+      for (int first = 1; first <= numberOfPages; first += CACHE_BUILD_BATCH_SIZE) {
+        final int last = Math.min(first + CACHE_BUILD_BATCH_SIZE - 1, numberOfPages);
+        final int[] pages = new int[last - first + 1];
+        for (int i = 0; i < pages.length; i++) {
+          pages[i] = first + i;
+        }
+
+        final List<PageCoordinates> pageCoordinates = database.getPageInfo(true, pages);
+        final List<AyahCoordinates> ayahCoordinates =
+            getAyahCoordinatesFromDatabase(database, pages);
+        for (int i = 0; i < pages.length; i++) {
+          writer.addPage(pageCoordinates.get(i), ayahCoordinates.get(i));
+        }
+      }
+      writer.finish();
+      Timber.d("built coordinates cache in %d ms", System.currentTimeMillis() - start);
+    } catch (IOException | RuntimeException e) {
+      writer.abort();
+      throw e;
+    }
+  }
+
+  private static int[] toIntArray(Integer... pages) {
+    final int[] result = new int[pages.length];
+    for (int i = 0; i < pages.length; i++) {
+      result[i] = pages[i];
+    }
+    return result;
+  }
+
   private AyahCoordinates normalizePageAyahs(AyahCoordinates ayahCoordinates) {
     final Map<String, List<AyahBounds>> original = ayahCoordinates.getAyahCoordinates();
     Map<String, List<AyahBounds>> normalizedMap = new HashMap<>();
@@ -67,7 +67,7 @@ public class ArabicDatabaseUtils {
       try {
         DatabaseHandler arabicDatabaseHandler = getArabicDatabaseHandler();
         cursor = arabicDatabaseHandler.getVerses(start.sura, start.ayah,
-            end.sura, end.ayah, QuranFileConstants.ARABIC_SHARE_TABLE);
+            end.sura, end.ayah, QuranFileConstants.ARABIC_SHARE_TABLE, quranInfo);
         while (cursor.moveToNext()) {
           final int sura = cursor.getInt(1);
           final int ayah = cursor.getInt(2);
@@ -2,6 +2,7 @@ package com.quran.labs.androidquran.model.translation;
 
 import android.content.Context;
 
+import com.quran.data.core.QuranInfo;
 import com.quran.labs.androidquran.common.QuranText;
 import com.quran.labs.androidquran.data.QuranDataProvider;
 import com.quran.data.model.VerseRange;
@@ -19,11 +20,13 @@ import io.reactivex.Single;
 public class TranslationModel {
   private final Context appContext;
   private final QuranFileUtils quranFileUtils;
+  private final QuranInfo quranInfo;
 
   @Inject
-  TranslationModel(Context appContext, QuranFileUtils quranFileUtils) {
+  TranslationModel(Context appContext, QuranFileUtils quranFileUtils, QuranInfo quranInfo) {
     this.appContext = appContext;
     this.quranFileUtils = quranFileUtils;
+    this.quranInfo = quranInfo;
   }
 
   public Single<List<QuranText>> getArabicFromDatabase(VerseRange verses) {
@@ -41,7 +44,7 @@ public class TranslationModel {
     return Single.fromCallable(() -> {
       DatabaseHandler databaseHandler =
           DatabaseHandler.getDatabaseHandler(appContext, database, quranFileUtils);
-      return databaseHandler.getVerses(verses, type);
+      return databaseHandler.getVerses(verses, type, quranInfo);
     });
   }
 }
@@ -11,9 +11,8 @@ import androidx.annotation.VisibleForTesting;
 import androidx.core.app.ActivityCompat;
 
 import com.quran.labs.androidquran.QuranImportActivity;
-import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkCounts;
 import com.quran.labs.androidquran.model.bookmark.BookmarkImportExportModel;
-import com.quran.labs.androidquran.model.bookmark.BookmarkModel;
 import com.quran.labs.androidquran.service.util.PermissionUtil;
 import com.quran.labs.androidquran.util.QuranSettings;
 
@@ -29,6 +28,7 @@ import io.reactivex.Observable;
 import io.reactivex.android.schedulers.AndroidSchedulers;
 import io.reactivex.disposables.CompositeDisposable;
 import io.reactivex.observers.DisposableMaybeObserver;
+import io.reactivex.observers.DisposableObserver;
 import io.reactivex.schedulers.Schedulers;
 import okio.BufferedSource;
 import okio.Okio;
@@ -39,20 +39,19 @@ public class QuranImportPresenter implements Presenter<QuranImportActivity> {
   private static final int REQUEST_WRITE_TO_SDCARD_PERMISSIONS = 1;
 
   private final Context mAppContext;
-  private final BookmarkModel mBookmarkModel;
   private final BookmarkImportExportModel mBookmarkImportExportModel;
   private final CompositeDisposable compositeDisposable = new CompositeDisposable();
 
   private boolean mRequestingPermissions;
-  private Observable<Boolean> mImportObservable;
+  private Maybe<BufferedSource> mImportSource;
+  private BookmarkCounts mImportCounts;
+  private Observable<Integer> mImportObservable;
   private QuranImportActivity mCurrentActivity;
 
   @Inject
   QuranImportPresenter(Context appContext,
-                       BookmarkImportExportModel model,
-                       BookmarkModel bookmarkModel) {
+                       BookmarkImportExportModel model) {
     mAppContext = appContext;
-    mBookmarkModel = bookmarkModel;
     mBookmarkImportExportModel = model;
   }
 
@@ -74,8 +73,9 @@ public class QuranImportPresenter implements Presenter<QuranImportActivity> {
     }
   }
 
-  public void importData(final BookmarkData data) {
-    mImportObservable = mBookmarkModel.importBookmarksObservable(data);
+  public void importData() {
+    // the backup was only counted, so it is read again (a batch at a time) to import it
+    mImportObservable = mBookmarkImportExportModel.importBookmarksObservable(mImportSource);
     subscribeToImportData();
   }
 
@@ -96,23 +96,40 @@ public class QuranImportPresenter implements Presenter<QuranImportActivity> {
     compositeDisposable.add(
         mImportObservable
             .observeOn(AndroidSchedulers.mainThread())
-            .subscribe(ignored -> {
-              if (mCurrentActivity != null) {
-                mCurrentActivity.showImportComplete();
-                mImportObservable = null;
+            .subscribeWith(new DisposableObserver<Integer>() {
+              @Override
+              public void onNext(Integer imported) {
+                if (mCurrentActivity != null) {
+                  mCurrentActivity.showImportProgress(imported, mImportCounts.getTotal());
+                }
+              }
+
+              @Override
+              public void onError(Throwable e) {
+                if (mCurrentActivity != null) {
+                  mCurrentActivity.showError();
+                  mImportObservable = null;
+                }
+              }
+
+              @Override
+              public void onComplete() {
+                if (mCurrentActivity != null) {
+                  mCurrentActivity.showImportComplete();
+                  mImportObservable = null;
+                }
               }
             }));
   }
 
   private void parseIntentUri(final Uri uri) {
-    getBookmarkDataObservable(parseUri(uri))
+    final Maybe<BufferedSource> source = parseUri(uri);
+    getBookmarkCountsObservable(source)
         .observeOn(AndroidSchedulers.mainThread())
-        .subscribe(new DisposableMaybeObserver<BookmarkData>() {
+        .subscribe(new DisposableMaybeObserver<BookmarkCounts>() {
           @Override
-          public void onSuccess(BookmarkData bookmarkData) {
-            if (mCurrentActivity != null) {
-              mCurrentActivity.showImportConfirmationDialog(bookmarkData);
-            }
+          public void onSuccess(BookmarkCounts bookmarkCounts) {
+            onBookmarksCounted(source, bookmarkCounts);
           }
 
           @Override
@@ -148,14 +165,13 @@ public class QuranImportPresenter implements Presenter<QuranImportActivity> {
   }
 
   private void handleExternalStorageFileInternal(Uri uri) {
-    getBookmarkDataObservable(parseExternalFile(uri))
+    final Maybe<BufferedSource> source = parseExternalFile(uri);
+    getBookmarkCountsObservable(source)
         .observeOn(AndroidSchedulers.mainThread())
-        .subscribe(new DisposableMaybeObserver<BookmarkData>() {
+        .subscribe(new DisposableMaybeObserver<BookmarkCounts>() {
           @Override
-          public void onSuccess(BookmarkData bookmarkData) {
-            if (mCurrentActivity != null) {
-              mCurrentActivity.showImportConfirmationDialog(bookmarkData);
-            }
+          public void onSuccess(BookmarkCounts bookmarkCounts) {
+            onBookmarksCounted(source, bookmarkCounts);
           }
 
           @Override
@@ -174,7 +190,15 @@ public class QuranImportPresenter implements Presenter<QuranImportActivity> {
         });
   }
 
-  private Maybe<BookmarkData> getBookmarkDataObservable(Maybe<BufferedSource> source) {
+  private void onBookmarksCounted(Maybe<BufferedSource> source, BookmarkCounts bookmarkCounts) {
+    if (mCurrentActivity != null) {
+      mImportSource = source;
+      mImportCounts = bookmarkCounts;
+      mCurrentActivity.showImportConfirmationDialog(bookmarkCounts);
+    }
+  }
+
+  private Maybe<BookmarkCounts> getBookmarkCountsObservable(Maybe<BufferedSource> source) {
     return source
         .flatMap(
             bufferedSource -> mBookmarkImportExportModel.readBookmarks(bufferedSource).toMaybe())
@@ -28,6 +28,7 @@ import java.util.HashSet;
 import java.util.List;
 import java.util.Map;
 import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
 import java.util.concurrent.TimeUnit;
 
 import javax.inject.Inject;
@@ -57,6 +58,7 @@ public class BookmarkPresenter implements Presenter<BookmarksFragment> {
   private BookmarkResult cachedData;
   private BookmarksFragment fragment;
   private ArabicDatabaseUtils arabicDatabaseUtils;
+  private final Map<String, String> ayahTextCache = new ConcurrentHashMap<>();
 
   private boolean isRtl;
   private DisposableSingleObserver<BookmarkResult> pendingRemoval;
@@ -263,7 +265,7 @@ public class BookmarkPresenter implements Presenter<BookmarksFragment> {
         .map(bookmarkData -> {
           try {
             return new BookmarkData(bookmarkData.getTags(),
-                arabicDatabaseUtils.hydrateAyahText(bookmarkData.getBookmarks()),
+                hydrateAyahText(bookmarkData.getBookmarks()),
                 bookmarkData.getRecentPages());
           } catch (Exception e) {
             return bookmarkData;
@@ -271,6 +273,43 @@ public class BookmarkPresenter implements Presenter<BookmarksFragment> {
         });
   }
 
+  /**
+   * Adds the ayah text to ayah bookmarks, only reading the text of ayat that weren't read before,
+   * so a change to a few bookmarks doesn't read the text of all of them again.
+   */
+  private List<Bookmark> hydrateAyahText(List<Bookmark> bookmarks) {
+    List<Bookmark> missing = new ArrayList<>();
+    for (int i = 0, size = bookmarks.size(); i < size; i++) {
+      Bookmark bookmark = bookmarks.get(i);
+      if (!bookmark.isPageBookmark() && !ayahTextCache.containsKey(getAyahKey(bookmark))) {
+        missing.add(bookmark);
+      }
+    }
+
+    if (!missing.isEmpty()) {
+      List<Bookmark> hydrated = arabicDatabaseUtils.hydrateAyahText(missing);
+      for (int i = 0, size = hydrated.size(); i < size; i++) {
+        Bookmark bookmark = hydrated.get(i);
+        String ayahText = bookmark.getAyahText();
+        if (ayahText != null) {
+          ayahTextCache.put(getAyahKey(bookmark), ayahText);
+        }
+      }
+    }
+
+    List<Bookmark> result = new ArrayList<>(bookmarks.size());
+    for (int i = 0, size = bookmarks.size(); i < size; i++) {
+      Bookmark bookmark = bookmarks.get(i);
+      String ayahText = bookmark.isPageBookmark() ? null : ayahTextCache.get(getAyahKey(bookmark));
+      result.add(ayahText == null ? bookmark : bookmark.withAyahText(ayahText));
+    }
+    return result;
+  }
+
+  private String getAyahKey(Bookmark bookmark) {
+    return bookmark.getSura() + ":" + bookmark.getAyah();
+  }
+
   @VisibleForTesting(otherwise = VisibleForTesting.PRIVATE)
   Single<BookmarkResult> getBookmarksListObservable(
       int sortOrder, final boolean groupByTags) {
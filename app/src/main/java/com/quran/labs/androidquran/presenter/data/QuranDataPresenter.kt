@@ -23,6 +23,7 @@ import com.quran.labs.androidquran.util.CopyDatabaseUtil
 import com.quran.labs.androidquran.util.QuranFileUtils
 import com.quran.labs.androidquran.util.QuranScreenInfo
 import com.quran.labs.androidquran.util.QuranSettings
+import com.quran.labs.androidquran.util.StorageUsageTracker
 import com.quran.labs.androidquran.worker.AudioUpdateWorker
 import com.quran.labs.androidquran.worker.MissingPageDownloadWorker
 import com.quran.labs.androidquran.worker.PartialPageCheckingWorker
@@ -44,7 +45,8 @@ class QuranDataPresenter @Inject internal constructor(
     val quranScreenInfo: QuranScreenInfo,
     private val quranPageProvider: PageProvider,
     private val copyDatabaseUtil: CopyDatabaseUtil,
-    val quranFileUtils: QuranFileUtils) : Presenter<QuranDataActivity> {
+    val quranFileUtils: QuranFileUtils,
+    private val storageUsageTracker: StorageUsageTracker) : Presenter<QuranDataActivity> {
 
   private var activity: QuranDataActivity? = null
   private var checkPagesDisposable: Disposable? = null
@@ -105,6 +107,13 @@ class QuranDataPresenter @Inject internal constructor(
           quranFileUtils.removeFilesForWidth(appContext, widthToDelete)
         }
         quranFileUtils.copyQuranDataFromAssets(appContext, status.portraitWidth)
+        val changedWidths =
+          QuranFileConstants.FORCE_DELETE_PAGES.map { "_$it" } + status.portraitWidth
+        val changedDirectories =
+          changedWidths.map { quranFileUtils.getQuranImagesDirectory(appContext, it) } +
+              quranFileUtils.getQuranAyahDatabaseDirectory(appContext)
+        changedDirectories.filterNotNull()
+            .forEach { storageUsageTracker.onDirectoryChanged(File(it)) }
         status.copy(havePortrait = true, haveLandscape = true)
       } else {
         status
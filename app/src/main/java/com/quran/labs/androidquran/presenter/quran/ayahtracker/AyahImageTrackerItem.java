@@ -9,6 +9,7 @@ import com.quran.labs.androidquran.data.QuranDisplayData;
 import com.quran.data.model.SuraAyah;
 import com.quran.labs.androidquran.ui.helpers.HighlightType;
 import com.quran.labs.androidquran.ui.helpers.QuranDisplayHelper;
+import com.quran.labs.androidquran.ui.util.AyahSpatialIndex;
 import com.quran.labs.androidquran.ui.util.ImageAyahUtils;
 import com.quran.labs.androidquran.util.QuranUtils;
 import com.quran.labs.androidquran.view.AyahToolBar;
@@ -32,6 +33,7 @@ public class AyahImageTrackerItem extends AyahTrackerItem {
   private final int screenHeight;
   private final Set<ImageDrawHelper> imageDrawHelpers;
   @Nullable Map<String, List<AyahBounds>> coordinates;
+  @Nullable AyahSpatialIndex spatialIndex;
   @NonNull final HighlightingImageView ayahView;
 
 
@@ -79,9 +81,10 @@ public class AyahImageTrackerItem extends AyahTrackerItem {
   }
 
   @Override
-  void onSetAyahCoordinates(AyahCoordinates ayahCoordinates) {
+  void onSetAyahCoordinates(AyahCoordinates ayahCoordinates, AyahSpatialIndex spatialIndex) {
     if (this.page == ayahCoordinates.getPage()) {
       this.coordinates = ayahCoordinates.getAyahCoordinates();
+      this.spatialIndex = spatialIndex;
       if (!coordinates.isEmpty()) {
         ayahView.setAyahData(ayahCoordinates);
         ayahView.invalidate();
@@ -91,25 +94,18 @@ public class AyahImageTrackerItem extends AyahTrackerItem {
 
   @Override
   void onSetAyahBookmarks(@NonNull List<Bookmark> bookmarks) {
-    int highlighted = 0;
     for (int i = 0, size = bookmarks.size(); i < size; i++) {
       Bookmark bookmark = bookmarks.get(i);
       if (bookmark.getPage() == page) {
-        highlighted++;
         ayahView.highlightAyah(bookmark.getSura(), bookmark.getAyah(), HighlightType.BOOKMARK);
       }
     }
-
-    if (highlighted > 0) {
-      ayahView.invalidate();
-    }
   }
 
   @Override
   boolean onHighlightAyah(int page, int sura, int ayah, HighlightType type, boolean scrollToAyah) {
     if (this.page == page && coordinates != null) {
       ayahView.highlightAyah(sura, ayah, type);
-      ayahView.invalidate();
       return true;
     } else if (coordinates != null) {
       ayahView.unHighlight(type);
@@ -121,7 +117,6 @@ public class AyahImageTrackerItem extends AyahTrackerItem {
   void onHighlightAyat(int page, Set<String> ayahKeys, HighlightType type) {
     if (this.page == page) {
       ayahView.highlightAyat(ayahKeys, type);
-      ayahView.invalidate();
     }
   }
 
@@ -162,6 +157,6 @@ public class AyahImageTrackerItem extends AyahTrackerItem {
   @Override
   SuraAyah getAyahForPosition(int page, float x, float y) {
     return this.page == page ?
-        ImageAyahUtils.getAyahFromCoordinates(coordinates, ayahView, x, y) : null;
+        ImageAyahUtils.getAyahFromCoordinates(spatialIndex, ayahView, x, y) : null;
   }
 }
@@ -3,6 +3,7 @@ package com.quran.labs.androidquran.presenter.quran.ayahtracker
 import com.quran.data.model.SuraAyah
 import com.quran.labs.androidquran.dao.bookmark.Bookmark
 import com.quran.labs.androidquran.ui.helpers.HighlightType
+import com.quran.labs.androidquran.ui.util.AyahSpatialIndex
 import com.quran.labs.androidquran.view.AyahToolBar.AyahToolBarPosition
 import com.quran.page.common.data.AyahCoordinates
 import com.quran.page.common.data.PageCoordinates
@@ -18,9 +19,12 @@ class AyahSplitConsolidationTrackerItem(
     translationTrackerItem.onSetPageBounds(pageCoordinates)
   }
 
-  override fun onSetAyahCoordinates(ayahCoordinates: AyahCoordinates?) {
-    imageTrackerItem.onSetAyahCoordinates(ayahCoordinates)
-    translationTrackerItem.onSetAyahCoordinates(ayahCoordinates)
+  override fun onSetAyahCoordinates(
+    ayahCoordinates: AyahCoordinates?,
+    spatialIndex: AyahSpatialIndex?
+  ) {
+    imageTrackerItem.onSetAyahCoordinates(ayahCoordinates, spatialIndex)
+    translationTrackerItem.onSetAyahCoordinates(ayahCoordinates, spatialIndex)
   }
 
   override fun onSetAyahBookmarks(bookmarks: MutableList<Bookmark>) {
@@ -6,6 +6,7 @@ import androidx.annotation.Nullable;
 import com.quran.labs.androidquran.dao.bookmark.Bookmark;
 import com.quran.data.model.SuraAyah;
 import com.quran.labs.androidquran.ui.helpers.HighlightType;
+import com.quran.labs.androidquran.ui.util.AyahSpatialIndex;
 import com.quran.labs.androidquran.view.AyahToolBar;
 import com.quran.page.common.data.AyahCoordinates;
 import com.quran.page.common.data.PageCoordinates;
@@ -23,7 +24,7 @@ public class AyahTrackerItem {
   void onSetPageBounds(PageCoordinates pageCoordinates) {
   }
 
-  void onSetAyahCoordinates(AyahCoordinates ayahCoordinates) {
+  void onSetAyahCoordinates(AyahCoordinates ayahCoordinates, AyahSpatialIndex spatialIndex) {
   }
 
   void onSetAyahBookmarks(@NonNull List<Bookmark> bookmarks) {
@@ -14,6 +14,7 @@ import com.quran.labs.androidquran.ui.PagerActivity;
 import com.quran.labs.androidquran.ui.helpers.AyahSelectedListener;
 import com.quran.labs.androidquran.ui.helpers.AyahTracker;
 import com.quran.labs.androidquran.ui.helpers.HighlightType;
+import com.quran.labs.androidquran.ui.util.AyahSpatialIndex;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.view.AyahToolBar;
 import com.quran.page.common.data.AyahCoordinates;
@@ -46,8 +47,11 @@ public class AyahTrackerPresenter implements AyahTracker,
   }
 
   public void setAyahCoordinates(AyahCoordinates ayahCoordinates) {
+    // built once per page, since every tap on the page is looked up in it
+    final AyahSpatialIndex spatialIndex =
+        AyahSpatialIndex.fromAyahCoordinates(ayahCoordinates.getAyahCoordinates());
     for (AyahTrackerItem item : items) {
-      item.onSetAyahCoordinates(ayahCoordinates);
+      item.onSetAyahCoordinates(ayahCoordinates, spatialIndex);
     }
 
     if (pendingHighlightInfo != null && !ayahCoordinates.getAyahCoordinates().isEmpty()) {
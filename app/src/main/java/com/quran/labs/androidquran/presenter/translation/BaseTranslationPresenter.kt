@@ -26,7 +26,8 @@ internal open class BaseTranslationPresenter<T> internal constructor(
     private val translationModel: TranslationModel,
     private val translationsAdapter: TranslationsDBAdapter,
     private val translationUtil: TranslationUtil,
-    private val quranInfo: QuranInfo
+    private val quranInfo: QuranInfo,
+    private val translationResultCache: TranslationResultCache
 ) : Presenter<T> {
   private var lastCacheTime: Long = 0
   private val translationMap: MutableMap<String, LocalTranslation> = HashMap()
@@ -37,6 +38,17 @@ internal open class BaseTranslationPresenter<T> internal constructor(
   fun getVerses(getArabic: Boolean,
                 translations: List<String>,
                 verseRange: VerseRange
+  ): Single<ResultHolder> {
+    val key = TranslationResultCache.Key(
+        verseRange, getArabic, translations.toList(), translationsAdapter.lastWriteTime)
+    return translationResultCache.get(key) {
+      getVersesFromDatabase(getArabic, translations, verseRange)
+    }
+  }
+
+  private fun getVersesFromDatabase(getArabic: Boolean,
+                                    translations: List<String>,
+                                    verseRange: VerseRange
   ): Single<ResultHolder> {
     // get all the translations for these verses, using a source of the list of active translations
     val source = Observable.fromIterable(translations)
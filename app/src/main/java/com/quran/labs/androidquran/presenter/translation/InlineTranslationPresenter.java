@@ -26,8 +26,9 @@ public class InlineTranslationPresenter extends
                              TranslationsDBAdapter dbAdapter,
                              TranslationUtil translationUtil,
                              QuranSettings quranSettings,
-                             QuranInfo quranInfo) {
-    super(translationModel, dbAdapter, translationUtil, quranInfo);
+                             QuranInfo quranInfo,
+                             TranslationResultCache translationResultCache) {
+    super(translationModel, dbAdapter, translationUtil, quranInfo, translationResultCache);
     this.quranSettings = quranSettings;
   }
 
@@ -4,6 +4,7 @@ import android.content.Context;
 import android.util.Pair;
 import android.util.SparseArray;
 
+import com.quran.common.networking.ManifestFetcher;
 import com.quran.labs.androidquran.common.LocalTranslation;
 import com.quran.labs.androidquran.dao.translation.Translation;
 import com.quran.labs.androidquran.dao.translation.TranslationItem;
@@ -15,6 +16,7 @@ import com.quran.labs.androidquran.presenter.Presenter;
 import com.quran.labs.androidquran.ui.TranslationManagerActivity;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.util.QuranSettings;
+import com.quran.labs.androidquran.util.TranslationUtil;
 import com.squareup.moshi.JsonAdapter;
 import com.squareup.moshi.Moshi;
 
@@ -33,10 +35,6 @@ import io.reactivex.Observable;
 import io.reactivex.android.schedulers.AndroidSchedulers;
 import io.reactivex.observers.DisposableObserver;
 import io.reactivex.schedulers.Schedulers;
-import okhttp3.OkHttpClient;
-import okhttp3.Request;
-import okhttp3.Response;
-import okhttp3.ResponseBody;
 import okio.BufferedSink;
 import okio.Okio;
 import timber.log.Timber;
@@ -47,7 +45,7 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
   private static final String CACHED_RESPONSE_FILE_NAME = "translations.v5.cache";
 
   private final Context appContext;
-  private final OkHttpClient okHttpClient;
+  private final ManifestFetcher manifestFetcher;
   private final QuranSettings quranSettings;
   private final QuranFileUtils quranFileUtils;
   private final TranslationsDBAdapter translationsDBAdapter;
@@ -57,13 +55,13 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
 
   @Inject
   TranslationManagerPresenter(Context appContext,
-                              OkHttpClient okHttpClient,
+                              ManifestFetcher manifestFetcher,
                               QuranSettings quranSettings,
                               TranslationsDBAdapter dbAdapter,
                               QuranFileUtils quranFileUtils) {
     this.host = Constants.HOST;
     this.appContext = appContext;
-    this.okHttpClient = okHttpClient;
+    this.manifestFetcher = manifestFetcher;
     this.quranSettings = quranSettings;
     this.quranFileUtils = quranFileUtils;
     this.translationsDBAdapter = dbAdapter;
@@ -77,13 +75,14 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
     final boolean isCacheStale = System.currentTimeMillis() -
         quranSettings.getLastUpdatedTranslationDate() > Constants.MIN_TRANSLATION_REFRESH_TIME;
     final Observable<TranslationList> source =
-        Observable.concat(getCachedTranslationListObservable(), getRemoteTranslationListObservable());
+        Observable.concat(getCachedTranslationListObservable(),
+            getRemoteTranslationListObservable(false));
     final Observable<TranslationList> observableSource;
     if (forceDownload) {
       // we only force if we pulled to refresh or are refreshing in the background,
       // implying that we have data on the screen already (or don't need data in the
       // background case), so just get remote data.
-      observableSource = getRemoteTranslationListObservable();
+      observableSource = getRemoteTranslationListObservable(true);
     } else if (isCacheStale) {
       observableSource = source;
     } else {
@@ -126,6 +125,10 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
 
           @Override
           public void onComplete() {
+            // nothing is emitted if the list is empty, or if the cached list can't be read
+            if (currentActivity != null) {
+              currentActivity.onTranslationsRefreshed();
+            }
           }
         });
   }
@@ -140,6 +143,12 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
           if (translation.getMinimumVersion() >= 5) {
             translationsDBAdapter.deleteTranslationByFile(translation.getFileName());
           }
+
+          // process the text of newly installed translations before they're shown
+          if (item.exists() &&
+              translation.getMinimumVersion() >= TranslationUtil.MINIMUM_PROCESSING_VERSION) {
+            processTranslationText(translation.getFileName());
+          }
           return translationsDBAdapter.writeTranslationUpdates(Collections.singletonList(item));
         }
     ).subscribeOn(Schedulers.io())
@@ -178,29 +187,36 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
     });
   }
 
-  Observable<TranslationList> getRemoteTranslationListObservable() {
-    return Observable.fromCallable(() -> {
-      Request request = new Request.Builder()
-          .url(host + WEB_SERVICE_ENDPOINT)
-          .build();
-      Response response = okHttpClient.newCall(request).execute();
-
-      Moshi moshi = new Moshi.Builder().build();
-      JsonAdapter<TranslationList> jsonAdapter = moshi.adapter(TranslationList.class);
-
-      ResponseBody responseBody = response.body();
-      TranslationList result = jsonAdapter.fromJson(responseBody.source());
-      responseBody.close();
-      return result;
-    }).doOnNext(translationList -> {
-      translationList.getTranslations();
-      if (!translationList.getTranslations().isEmpty()) {
-        writeTranslationList(translationList);
+  /**
+   * Fetches the list of translations, emitting the cached list if it hasn't changed since it was
+   * last cached (in which case it isn't downloaded or parsed again). When forceDownload is set,
+   * the server is asked even if the cached list is still fresh.
+   */
+  Observable<TranslationList> getRemoteTranslationListObservable(boolean forceDownload) {
+    return Observable.defer(() -> {
+      String url = host + WEB_SERVICE_ENDPOINT;
+      try (ManifestFetcher.Manifest manifest = manifestFetcher.fetch(url, forceDownload)) {
+        if (!manifest.isChanged() && getCachedFile().exists()) {
+          quranSettings.setLastUpdatedTranslationDate(System.currentTimeMillis());
+          return getCachedTranslationListObservable();
+        }
+
+        Moshi moshi = new Moshi.Builder().build();
+        JsonAdapter<TranslationList> jsonAdapter = moshi.adapter(TranslationList.class);
+        TranslationList result = jsonAdapter.fromJson(manifest.source());
+        if (result == null) {
+          throw new IOException("Invalid translation list");
+        }
+
+        if (!result.getTranslations().isEmpty() && writeTranslationList(result)) {
+          manifest.markProcessed();
+        }
+        return Observable.just(result);
       }
     });
   }
 
-  void writeTranslationList(TranslationList list) {
+  boolean writeTranslationList(TranslationList list) {
     File cacheFile = getCachedFile();
     try {
       File directory = cacheFile.getParentFile();
@@ -215,11 +231,13 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
         jsonAdapter.toJson(sink, list);
         sink.close();
         quranSettings.setLastUpdatedTranslationDate(System.currentTimeMillis());
+        return true;
       }
     } catch (Exception e) {
       cacheFile.delete();
       Timber.e(e);
     }
+    return false;
   }
 
   private File getCachedFile() {
@@ -285,6 +303,16 @@ public class TranslationManagerPresenter implements Presenter<TranslationManager
     return results;
   }
 
+  private void processTranslationText(String filename) {
+    try {
+      DatabaseHandler handler =
+          DatabaseHandler.getDatabaseHandler(appContext, filename, quranFileUtils);
+      handler.processTranslationText();
+    } catch (Exception e) {
+      Timber.d(e, "exception processing database: %s", filename);
+    }
+  }
+
   private Pair<Integer, Integer> getVersionFromDatabase(String filename) {
     try {
       DatabaseHandler handler =
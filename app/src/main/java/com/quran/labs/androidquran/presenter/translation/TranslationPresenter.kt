@@ -19,9 +19,10 @@ internal class TranslationPresenter @Inject internal constructor(translationMode
                      translationsAdapter: TranslationsDBAdapter,
                      translationUtil: TranslationUtil,
                      private val quranInfo: QuranInfo,
+                     translationResultCache: TranslationResultCache,
                      private val pages: Array<Int?>) :
     BaseTranslationPresenter<TranslationPresenter.TranslationScreen>(
-        translationModel, translationsAdapter, translationUtil, quranInfo) {
+        translationModel, translationsAdapter, translationUtil, quranInfo, translationResultCache) {
 
   fun refresh() {
     disposable?.dispose()
@@ -0,0 +1,81 @@
+package com.quran.labs.androidquran.presenter.translation
+
+import androidx.collection.LruCache
+import com.quran.data.model.VerseRange
+import com.quran.labs.androidquran.presenter.translation.BaseTranslationPresenter.ResultHolder
+import io.reactivex.Single
+import javax.inject.Inject
+import javax.inject.Singleton
+
+/**
+ * In memory cache of assembled translation results, shared by all translation presenters.
+ *
+ * Swiping back to a page or rotating the device would otherwise read the arabic and every
+ * translation database and parse all the translation text again. Results are keyed by the
+ * verse range, whether arabic was requested, the ordered translations, and the last write
+ * time of the translations database, so updating translations invalidates old entries. The
+ * cache is bounded by the approximate size of the text it holds. Identical requests that are
+ * made while a result is being loaded share the same load.
+ */
+@Singleton
+internal class TranslationResultCache internal constructor(maxSizeBytes: Int) {
+
+  @Inject
+  constructor() : this(defaultMaxSize())
+
+  internal data class Key(
+    val verseRange: VerseRange,
+    val withArabic: Boolean,
+    val translations: List<String>,
+    val lastWriteTime: Long
+  )
+
+  private val cache = object : LruCache<Key, ResultHolder>(maxSizeBytes) {
+    override fun sizeOf(key: Key, value: ResultHolder): Int = estimateSize(value)
+  }
+  private val pending = mutableMapOf<Key, Single<ResultHolder>>()
+
+  /**
+   * Returns the cached result for [key], or the result of [load], which is cached unless it
+   * is empty. Concurrent requests for the same key only call [load] once.
+   */
+  fun get(key: Key, load: () -> Single<ResultHolder>): Single<ResultHolder> {
+    return Single.defer {
+      val cached = cache.get(key)
+      if (cached != null) {
+        Single.just(cached)
+      } else {
+        synchronized(pending) {
+          pending.getOrPut(key) {
+            load()
+                .doOnSuccess { if (it.ayahInformation.isNotEmpty()) cache.put(key, it) }
+                .doFinally { synchronized(pending) { pending.remove(key) } }
+                .cache()
+          }
+        }
+      }
+    }
+  }
+
+  fun hitCount(): Int = cache.hitCount()
+
+  fun missCount(): Int = cache.missCount()
+
+  fun clear() {
+    cache.evictAll()
+  }
+
+  companion object {
+    private fun defaultMaxSize(): Int {
+      // use a sixty fourth of the available heap for translations
+      return (Runtime.getRuntime().maxMemory() / 64).toInt()
+    }
+
+    private fun estimateSize(result: ResultHolder): Int {
+      // two bytes per character of text, which dominates the size of a result
+      return 2 * result.ayahInformation.sumBy { info ->
+        (info.arabicText?.length ?: 0) + info.texts.sumBy { it.text.length }
+      } + 1
+    }
+  }
+}
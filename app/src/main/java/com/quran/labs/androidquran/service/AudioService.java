@@ -30,8 +30,6 @@ import android.content.Intent;
 import android.content.IntentFilter;
 import android.content.res.AssetFileDescriptor;
 import android.content.res.Resources;
-import android.database.Cursor;
-import android.database.SQLException;
 import android.graphics.Bitmap;
 import android.graphics.BitmapFactory;
 import android.graphics.Canvas;
@@ -54,7 +52,6 @@ import android.os.PowerManager;
 import android.support.v4.media.MediaMetadataCompat;
 import android.support.v4.media.session.MediaSessionCompat;
 import android.support.v4.media.session.PlaybackStateCompat;
-import android.util.SparseIntArray;
 import androidx.core.app.NotificationCompat;
 import androidx.core.content.ContextCompat;
 import androidx.localbroadcastmanager.content.LocalBroadcastManager;
@@ -65,11 +62,11 @@ import com.quran.labs.androidquran.QuranApplication;
 import com.quran.labs.androidquran.R;
 import com.quran.labs.androidquran.dao.audio.AudioPlaybackInfo;
 import com.quran.labs.androidquran.dao.audio.AudioRequest;
+import com.quran.labs.androidquran.dao.audio.SuraTimings;
 import com.quran.labs.androidquran.data.Constants;
 import com.quran.labs.androidquran.data.QuranDisplayData;
 import com.quran.data.model.SuraAyah;
-import com.quran.labs.androidquran.database.DatabaseUtils;
-import com.quran.labs.androidquran.database.SuraTimingDatabaseHandler;
+import com.quran.labs.androidquran.database.AyahTimingIndex;
 import com.quran.labs.androidquran.extension.SuraAyahExtensionKt;
 import com.quran.labs.androidquran.presenter.audio.service.AudioQueue;
 import com.quran.labs.androidquran.service.util.AudioFocusHelper;
@@ -206,8 +203,9 @@ public class AudioService extends Service implements OnCompletionListener,
   // read by service thread, written on the I/O thread once
   private volatile Bitmap notificationIcon;
   private Bitmap displayIcon;
-  private SparseIntArray gaplessSuraData = null;
-  private AsyncTask<Integer, Void, SparseIntArray> timingTask = null;
+  private SuraTimings gaplessSuraData = null;
+  private AyahTimingIndex timingIndex = null;
+  private AsyncTask<Integer, SuraTimings, Void> timingTask = null;
   private final CompositeDisposable compositeDisposable = new CompositeDisposable();
 
   @Inject QuranInfo quranInfo;
@@ -443,54 +441,64 @@ public class AudioService extends Service implements OnCompletionListener,
     }
   }
 
-  private class ReadGaplessDataTask extends AsyncTask<Integer, Void, SparseIntArray> {
+  private class ReadGaplessDataTask extends AsyncTask<Integer, SuraTimings, Void> {
 
     private int mSura = 0;
-    private String mDatabasePath = null;
+    private final AyahTimingIndex mTimingIndex;
 
-    public ReadGaplessDataTask(String database) {
-      mDatabasePath = database;
+    public ReadGaplessDataTask(AyahTimingIndex timingIndex) {
+      mTimingIndex = timingIndex;
     }
 
     @Override
-    protected SparseIntArray doInBackground(Integer... params) {
+    protected Void doInBackground(Integer... params) {
       int sura = params[0];
       mSura = sura;
 
-      SuraTimingDatabaseHandler db = SuraTimingDatabaseHandler.getDatabaseHandler(mDatabasePath);
-      SparseIntArray map = null;
-
-      Cursor cursor = null;
-      try {
-        cursor = db.getAyahTimings(sura);
-        Timber.d("got cursor of data");
-
-        if (cursor != null && cursor.moveToFirst()) {
-          map = new SparseIntArray();
-          do {
-            int ayah = cursor.getInt(1);
-            int time = cursor.getInt(2);
-            map.put(ayah, time);
-          }
-          while (cursor.moveToNext());
-        }
-      } catch (SQLException se) {
-        // don't crash the app if the database is corrupt
-        Timber.e(se);
-      } finally {
-        DatabaseUtils.closeCursor(cursor);
+      // publish this sura's timings before reading the next sura's
+      publishProgress(mTimingIndex.getTimings(sura));
+      if (sura < Constants.SURAS_COUNT && !isCancelled()) {
+        // warm up the next sura so that crossing into it doesn't hit the database
+        mTimingIndex.getTimings(sura + 1);
       }
-      return map;
+      return null;
     }
 
     @Override
-    protected void onPostExecute(SparseIntArray map) {
+    protected void onProgressUpdate(SuraTimings... timings) {
+      if (isCancelled()) {
+        // a newer task is loading timings, possibly for another sura
+        return;
+      }
       gaplessSura = mSura;
-      gaplessSuraData = map;
+      gaplessSuraData = timings[0];
+    }
+
+    @Override
+    protected void onPostExecute(Void result) {
       timingTask = null;
     }
   }
 
+  private void loadGaplessTimings(int sura) {
+    if (timingTask != null) {
+      timingTask.cancel(true);
+    }
+
+    String dbPath = audioRequest.getAudioPathInfo().getGaplessDatabase();
+    if (timingIndex == null || !timingIndex.getDatabasePath().equals(dbPath)) {
+      timingIndex = new AyahTimingIndex(dbPath);
+    }
+
+    SuraTimings cached = timingIndex.getCachedTimings(sura);
+    if (cached != null) {
+      gaplessSura = sura;
+      gaplessSuraData = cached;
+    }
+    timingTask = new ReadGaplessDataTask(timingIndex);
+    timingTask.execute(sura);
+  }
+
   private int getSeekPosition(boolean isRepeating) {
     if (audioRequest == null) {
       return -1;
@@ -499,11 +507,10 @@ public class AudioService extends Service implements OnCompletionListener,
     if (gaplessSura == audioQueue.getCurrentSura()) {
       if (gaplessSuraData != null) {
         int ayah = audioQueue.getCurrentAyah();
-        Integer time = gaplessSuraData.get(ayah);
         if (ayah == 1 && !isRepeating) {
-          return gaplessSuraData.get(0);
+          return gaplessSuraData.getTime(0);
         }
-        return time;
+        return gaplessSuraData.getTime(ayah);
       }
     }
     return -1;
@@ -519,7 +526,6 @@ public class AudioService extends Service implements OnCompletionListener,
       int sura = audioQueue.getCurrentSura();
       int ayah = audioQueue.getCurrentAyah();
 
-      int updatedAyah = ayah;
       int maxAyahs = quranInfo.getNumberOfAyahs(sura);
 
       if (sura != gaplessSura) {
@@ -527,39 +533,17 @@ public class AudioService extends Service implements OnCompletionListener,
       }
       setState(PlaybackStateCompat.STATE_PLAYING);
       int pos = player.getCurrentPosition();
-      Integer ayahTime = gaplessSuraData.get(ayah);
+      int ayahTime = gaplessSuraData.getTime(ayah);
       Timber.d("updateAudioPlayPosition: %d:%d, currently at %d vs expected at %d",
           sura, ayah, pos, ayahTime);
 
-      if (ayahTime > pos) {
-        int iterAyah = ayah;
-        while (--iterAyah > 0) {
-          ayahTime = gaplessSuraData.get(iterAyah);
-          if (ayahTime <= pos) {
-            updatedAyah = iterAyah;
-            break;
-          } else {
-            updatedAyah--;
-          }
-        }
-      } else {
-        int iterAyah = ayah;
-        while (++iterAyah <= maxAyahs) {
-          ayahTime = gaplessSuraData.get(iterAyah);
-          if (ayahTime > pos) {
-            updatedAyah = iterAyah - 1;
-            break;
-          } else {
-            updatedAyah++;
-          }
-        }
-      }
+      int updatedAyah = Math.min(gaplessSuraData.getAyahForPosition(pos), maxAyahs);
 
       Timber.d("updateAudioPlayPosition: %d:%d, decided ayah should be: %d",
           sura, ayah, updatedAyah);
 
       if (updatedAyah != ayah) {
-        ayahTime = gaplessSuraData.get(ayah);
+        ayahTime = gaplessSuraData.getTime(ayah);
         if (Math.abs(pos - ayahTime) < 150) {
           // shouldn't change ayahs if the delta is just 150ms...
           serviceHandler.sendEmptyMessageDelayed(MSG_UPDATE_AUDIO_POS, 150);
@@ -598,7 +582,7 @@ public class AudioService extends Service implements OnCompletionListener,
       } else {
         // if we have end of sura info and we bypassed end of sura
         // line, switch the sura.
-        ayahTime = gaplessSuraData.get(999);
+        ayahTime = gaplessSuraData.getTime(SuraTimings.END_OF_SURA);
         if (ayahTime > 0 && pos >= ayahTime) {
           boolean success = audioQueue.playAt(sura + 1, 1, true);
           if (success && audioQueue.getCurrentSura() == sura) {
@@ -618,7 +602,7 @@ public class AudioService extends Service implements OnCompletionListener,
       notifyAyahChanged();
 
       if (maxAyahs >= (updatedAyah + 1)) {
-        int t = gaplessSuraData.get(updatedAyah + 1) - player.getCurrentPosition();
+        int t = gaplessSuraData.getTime(updatedAyah + 1) - player.getCurrentPosition();
         Timber.d("updateAudioPlayPosition postingDelayed after: %d", t);
 
         if (t < 100) {
@@ -655,12 +639,7 @@ public class AudioService extends Service implements OnCompletionListener,
 
     if (State.Stopped == state) {
       if (audioRequest.isGapless()) {
-        if (timingTask != null) {
-          timingTask.cancel(true);
-        }
-        String dbPath = audioRequest.getAudioPathInfo().getGaplessDatabase();
-        timingTask = new ReadGaplessDataTask(dbPath);
-        timingTask.execute(audioQueue.getCurrentSura());
+        loadGaplessTimings(audioQueue.getCurrentSura());
       }
 
       // If we're stopped, just go ahead to the next file and start playing
@@ -1117,13 +1096,7 @@ public class AudioService extends Service implements OnCompletionListener,
     // if gapless and sura changed, get the new data
     if (audioRequest.isGapless()) {
       if (gaplessSura != audioQueue.getCurrentSura()) {
-        if (timingTask != null) {
-          timingTask.cancel(true);
-        }
-
-        String dbPath = audioRequest.getAudioPathInfo().getGaplessDatabase();
-        timingTask = new ReadGaplessDataTask(dbPath);
-        timingTask.execute(audioQueue.getCurrentSura());
+        loadGaplessTimings(audioQueue.getCurrentSura());
       }
     }
 
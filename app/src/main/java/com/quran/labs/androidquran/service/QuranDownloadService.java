@@ -17,22 +17,32 @@ import com.quran.data.core.QuranInfo;
 import com.quran.labs.androidquran.QuranApplication;
 import com.quran.data.model.SuraAyah;
 import com.quran.labs.androidquran.extension.CloseableExtensionKt;
+import com.quran.labs.androidquran.service.util.ParallelDownloader;
 import com.quran.labs.androidquran.service.util.QuranDownloadNotifier;
 import com.quran.labs.androidquran.service.util.QuranDownloadNotifier.NotificationDetails;
 import com.quran.labs.androidquran.service.util.QuranDownloadNotifier.ProgressIntent;
+import com.quran.labs.androidquran.util.PageImageManifest;
 import com.quran.labs.androidquran.util.QuranSettings;
 import com.quran.labs.androidquran.util.QuranUtils;
-import com.quran.labs.androidquran.util.ZipUtils;
+import com.quran.labs.androidquran.util.StorageUsageTracker;
+import com.quran.labs.androidquran.util.ZipStreamExtractor;
 
 import java.io.File;
+import java.io.FilterInputStream;
 import java.io.IOException;
+import java.io.InputStream;
+import java.io.InterruptedIOException;
+import java.util.ArrayList;
 import java.util.HashMap;
+import java.util.List;
 import java.util.Locale;
 import java.util.Map;
 import java.util.concurrent.atomic.AtomicInteger;
+import java.util.zip.ZipException;
 
 import javax.inject.Inject;
 
+import androidx.annotation.NonNull;
 import androidx.localbroadcastmanager.content.LocalBroadcastManager;
 import okhttp3.Call;
 import okhttp3.OkHttpClient;
@@ -44,8 +54,7 @@ import okio.BufferedSource;
 import okio.Okio;
 import timber.log.Timber;
 
-public class QuranDownloadService extends Service implements
-    ZipUtils.ZipListener<NotificationDetails> {
+public class QuranDownloadService extends Service {
 
   public static final String TAG = "QuranDownloadService";
   public static final String DEFAULT_TAG = "QuranDownload";
@@ -90,6 +99,8 @@ public class QuranDownloadService extends Service implements
   private static final int WAIT_TIME = 15 * 1000;
   private static final int RETRY_COUNT = 3;
   private static final String PARTIAL_EXT = ".part";
+  private static final String UNZIP_CHECKPOINT_EXT = ".unzip";
+  private static final int MAX_CONCURRENT_RANGE_DOWNLOADS = 4;
 
   // download method return values
   private static final int DOWNLOAD_SUCCESS = 0;
@@ -104,7 +115,8 @@ public class QuranDownloadService extends Service implements
   private QuranSettings quranSettings;
   private WifiLock wifiLock;
 
-  private Intent lastSentIntent = null;
+  // written from download threads
+  private volatile Intent lastSentIntent = null;
   private Map<String, Boolean> successfulZippedDownloads = null;
   private Map<String, Intent> recentlyFailedDownloads = null;
 
@@ -113,6 +125,7 @@ public class QuranDownloadService extends Service implements
 
   @Inject QuranInfo quranInfo;
   @Inject OkHttpClient okHttpClient;
+  @Inject StorageUsageTracker storageUsageTracker;
 
   private final class ServiceHandler extends Handler {
 
@@ -307,6 +320,19 @@ public class QuranDownloadService extends Service implements
       } else {
         result = download(url, destination, outputFile, details);
       }
+      if (result) {
+        if (type == DOWNLOAD_TYPE_PAGES) {
+          // the images directory can be the base directory, so each width is counted on its own
+          final File[] pageDirectories = getPageDirectories(destination);
+          updatePageManifests(pageDirectories);
+          for (File directory : pageDirectories) {
+            storageUsageTracker.onDirectoryChanged(directory);
+          }
+        } else {
+          storageUsageTracker.onDirectoryChanged(new File(destination));
+        }
+      }
+
       if (result && isZipFile) {
         successfulZippedDownloads.put(url, true);
       } else if (!result) {
@@ -316,6 +342,20 @@ public class QuranDownloadService extends Service implements
     }
   }
 
+  private File[] getPageDirectories(String destination) {
+    // page zips extract into one width directory per image set
+    final File[] directories = new File(destination).listFiles(
+        file -> file.isDirectory() && file.getName().startsWith("width"));
+    return directories == null ? new File[0] : directories;
+  }
+
+  private void updatePageManifests(File[] directories) {
+    final int numberOfPages = quranInfo.getNumberOfPages();
+    for (File directory : directories) {
+      PageImageManifest.rebuildIfStale(directory, numberOfPages);
+    }
+  }
+
   private boolean download(String urlString, String destination,
       String outputFile,
       NotificationDetails details) {
@@ -383,7 +423,9 @@ public class QuranDownloadService extends Service implements
     final int extLocation = singleFileName.lastIndexOf(".");
     final String extension = singleFileName.substring(extLocation);
 
-    boolean result;
+    // collect the files that still need to be downloaded
+    final List<RangeDownload> downloads = new ArrayList<>();
+    int existingFiles = 0;
     for (int i = startSura; i <= endSura; i++) {
       int lastAyah = quranInfo.getNumberOfAyahs(i);
       if (i == endSura) {
@@ -394,7 +436,6 @@ public class QuranDownloadService extends Service implements
         firstAyah = startAyah;
       }
 
-      details.sura = i;
       if (isGapless) {
         if (i == endSura && endAyah == 0) {
           continue;
@@ -404,12 +445,10 @@ public class QuranDownloadService extends Service implements
         Timber.d("gapless asking to download %s to %s", url, destDir);
         final String filename = QuranDownloadService.getFilenameFromUrl(url);
         if (!new File(destDir, filename).exists()) {
-          result = downloadFileWrapper(url, destDir, filename, details);
-          if (!result) {
-            return false;
-          }
+          downloads.add(new RangeDownload(url, destDir, filename, i, 0));
+        } else {
+          existingFiles++;
         }
-        details.currentFile++;
         continue;
       }
 
@@ -418,19 +457,37 @@ public class QuranDownloadService extends Service implements
       new File(destDir).mkdirs();
 
       for (int j = firstAyah; j <= lastAyah; j++) {
-        details.ayah = j;
         String url = String.format(Locale.US, urlString, i, j);
         String destFile = j + extension;
         if (!new File(destDir, destFile).exists()) {
-          result = downloadFileWrapper(url, destDir, destFile, details);
-          if (!result) {
-            return false;
-          }
+          downloads.add(new RangeDownload(url, destDir, destFile, i, j));
+        } else {
+          existingFiles++;
         }
+      }
+    }
 
-        details.currentFile++;
+    final AtomicInteger completedFiles = new AtomicInteger(existingFiles);
+    final ParallelDownloader downloader = new ParallelDownloader(MAX_CONCURRENT_RANGE_DOWNLOADS);
+    boolean result = downloader.downloadAll(downloads, download -> {
+      // each download gets its own details so that concurrent downloads don't
+      // overwrite each other's sura and ayah.
+      final NotificationDetails fileDetails = details.copy();
+      fileDetails.sura = download.sura;
+      fileDetails.ayah = download.ayah;
+      fileDetails.currentFile = completedFiles.get() + 1;
+      final boolean success = downloadFileWrapper(
+          download.url, download.destination, download.filename, fileDetails);
+      if (success) {
+        completedFiles.incrementAndGet();
       }
+      return success;
+    });
+
+    if (!result) {
+      return false;
     }
+    details.currentFile = completedFiles.get() + 1;
 
     if (!isGapless) {
       // attempt to download basmallah if it doesn't exist
@@ -441,6 +498,8 @@ public class QuranDownloadService extends Service implements
         Timber.d("basmallah doesn't exist, downloading...");
         String url = String.format(Locale.US, urlString, 1, 1);
         String destFile = 1 + extension;
+        details.sura = 1;
+        details.ayah = 1;
         result = downloadFileWrapper(url, destDir, destFile, details);
         if (!result) {
           return false;
@@ -521,21 +580,84 @@ public class QuranDownloadService extends Service implements
           false, notificationInfo);
       return QuranDownloadNotifier.ERROR_NETWORK;
     }
-    final int result = downloadUrl(url, path, filename, notificationInfo);
-    if (result == DOWNLOAD_SUCCESS) {
-      if (filename.endsWith("zip")) {
-        final File actualFile = new File(path, filename);
-        if (!ZipUtils.unzipFile(actualFile.getAbsolutePath(),
-            path, notificationInfo, this)) {
-          return !actualFile.delete() ?
-              QuranDownloadNotifier.ERROR_PERMISSIONS :
-              QuranDownloadNotifier.ERROR_INVALID_DOWNLOAD;
-        } else {
-          actualFile.delete();
+    if (filename.endsWith("zip")) {
+      return downloadAndUnzip(url, path, filename, notificationInfo, true);
+    }
+    return downloadUrl(url, path, filename, notificationInfo);
+  }
+
+  /**
+   * Downloads a zip file and extracts it as it arrives, without writing the zip file itself.
+   * An interrupted download resumes after the last entry that was completely extracted. If the
+   * server rejects the resume offset, the download is restarted once when canRestart is set.
+   */
+  private int downloadAndUnzip(String url, String path, String filename,
+      NotificationDetails notificationInfo, boolean canRestart) {
+    Timber.d("downloading and unzipping %s", url);
+    final File partialFile = new File(path, filename + PARTIAL_EXT);
+    if (partialFile.exists() && !partialFile.delete()) {
+      // partial zips from older versions can't be resumed while unzipping
+      return QuranDownloadNotifier.ERROR_PERMISSIONS;
+    }
+
+    final ZipStreamExtractor extractor =
+        new ZipStreamExtractor(path, new File(path, filename + UNZIP_CHECKPOINT_EXT));
+    final long resumeOffset = extractor.getResumeOffset();
+    final Request.Builder builder = new Request.Builder()
+        .url(url).tag(DEFAULT_TAG);
+    if (resumeOffset > 0) {
+      Timber.d("downloadAndUnzip: resuming from %d", resumeOffset);
+      builder.addHeader("Range", "bytes=" + resumeOffset + "-");
+    }
+
+    Call call = null;
+    Response response = null;
+    try {
+      call = okHttpClient.newCall(builder.build());
+      response = call.execute();
+      if (response.code() == 416 && canRestart) {
+        extractor.reset();
+        CloseableExtensionKt.closeQuietly(response);
+        return downloadAndUnzip(url, path, filename, notificationInfo, false);
+      } else if (response.isSuccessful()) {
+        if (resumeOffset > 0 && response.code() != 206) {
+          // the server sent the whole file, so start over
+          extractor.reset();
         }
+
+        final ResponseBody body = response.body();
+        final long start = extractor.getResumeOffset();
+        final long size = body.contentLength() < 0 ? -1 : body.contentLength() + start;
+        // the zip itself isn't written, so only the remaining entries need space (the images
+        // in the zips are already compressed, so they take about as much space unzipped)
+        if (!isSpaceAvailable(body.contentLength())) {
+          return QuranDownloadNotifier.ERROR_DISK_SPACE;
+        }
+
+        final DownloadInputStream input =
+            new DownloadInputStream(body.byteStream(), start, notificationInfo, size);
+        extractor.extract(input, notificationInfo, (details, processed, total) ->
+            lastSentIntent = notifier.notifyProgress(details, input.position, size));
+        return DOWNLOAD_SUCCESS;
+      } else {
+        Timber.e(new Exception("Unable to download file - code: " + response.code()));
       }
+    } catch (ZipException | IllegalStateException exception) {
+      Timber.e(exception, "Invalid zip file while unzipping");
+      extractor.reset();
+      return QuranDownloadNotifier.ERROR_INVALID_DOWNLOAD;
+    } catch (IOException exception) {
+      Timber.d(exception, "Failed to download file");
+    } catch (SecurityException se) {
+      Timber.e(se, "Security exception while downloading file");
+    } finally {
+      CloseableExtensionKt.closeQuietly(response);
     }
-    return result;
+
+    return isDownloadCanceled || (call != null && call.isCanceled()) ?
+        QuranDownloadNotifier.ERROR_CANCELLED :
+        notifyError(QuranDownloadNotifier.ERROR_NETWORK,
+            false, notificationInfo);
   }
 
   private int downloadUrl(String url, String path, String filename,
@@ -554,8 +676,6 @@ public class QuranDownloadService extends Service implements
       Timber.d("downloadUrl: partialFile exists, length: %d", downloadedAmount);
       builder.addHeader("Range", "bytes=" + downloadedAmount + "-");
     }
-    final boolean isZip = filename.endsWith(".zip");
-
     Call call = null;
     BufferedSource source = null;
     try {
@@ -569,7 +689,7 @@ public class QuranDownloadService extends Service implements
         source = body.source();
         final long size = body.contentLength() + downloadedAmount;
 
-        if (!isSpaceAvailable(size + (isZip ? downloadedAmount + size : 0))) {
+        if (!isSpaceAvailable(size)) {
           return QuranDownloadNotifier.ERROR_DISK_SPACE;
         } else if (actualFile.exists()) {
           if (actualFile.length() == (size + downloadedAmount)) {
@@ -622,14 +742,6 @@ public class QuranDownloadService extends Service implements
             false, notificationInfo);
   }
 
-  @Override
-  public void onProcessingProgress(NotificationDetails details, int processed, int total) {
-    if (details.totalFiles == 1) {
-      lastSentIntent = notifier.notifyDownloadProcessing(
-          details, processed, total);
-    }
-  }
-
   private int notifyError(int errorCode, boolean isFatal, NotificationDetails details) {
     lastSentIntent = notifier.notifyError(errorCode, isFatal, details);
 
@@ -657,6 +769,63 @@ public class QuranDownloadService extends Service implements
     }
   }
 
+  /**
+   * The body of a download, reporting progress as it is read and stopping once the download
+   * is canceled.
+   */
+  private class DownloadInputStream extends FilterInputStream {
+    private final NotificationDetails details;
+    private final long size;
+    private long position;
+    private int reads;
+
+    DownloadInputStream(InputStream input, long position,
+        NotificationDetails details, long size) {
+      super(input);
+      this.position = position;
+      this.details = details;
+      this.size = size;
+    }
+
+    @Override
+    public int read() throws IOException {
+      final byte[] buffer = new byte[1];
+      return read(buffer, 0, 1) == 1 ? buffer[0] & 0xff : -1;
+    }
+
+    @Override
+    public int read(@NonNull byte[] buffer, int offset, int length) throws IOException {
+      if (isDownloadCanceled) {
+        throw new InterruptedIOException("download canceled");
+      }
+
+      final int read = super.read(buffer, offset, length);
+      if (read > 0) {
+        position += read;
+        if (reads++ % 5 == 0) {
+          lastSentIntent = notifier.notifyProgress(details, position, size);
+        }
+      }
+      return read;
+    }
+  }
+
+  private static class RangeDownload {
+    final String url;
+    final String destination;
+    final String filename;
+    final int sura;
+    final int ayah;
+
+    RangeDownload(String url, String destination, String filename, int sura, int ayah) {
+      this.url = url;
+      this.destination = destination;
+      this.filename = filename;
+      this.sura = sura;
+      this.ayah = ayah;
+    }
+  }
+
   private static String getFilenameFromUrl(String url) {
     int slashIndex = url.lastIndexOf("/");
     if (slashIndex != -1) {
@@ -0,0 +1,168 @@
+package com.quran.labs.androidquran.service.util
+
+import com.quran.labs.androidquran.util.PageImageManifest
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.async
+import kotlinx.coroutines.awaitAll
+import kotlinx.coroutines.coroutineScope
+import kotlinx.coroutines.delay
+import kotlinx.coroutines.sync.Semaphore
+import kotlinx.coroutines.sync.withPermit
+import kotlinx.coroutines.withContext
+import okhttp3.OkHttpClient
+import okhttp3.Request
+import okio.buffer
+import okio.sink
+import timber.log.Timber
+import java.io.File
+import java.io.IOException
+import java.io.RandomAccessFile
+import java.util.concurrent.TimeUnit
+
+/**
+ * Downloads page images, keeping at most [maxConcurrentDownloads] of them in flight.
+ *
+ * Unlike [ParallelDownloader], every page is downloaded independently of the others, and a page
+ * that fails with a network or server error is retried up to [maxAttempts] times, waiting
+ * [initialBackoffMs] before the first retry and twice as long before each one after that. Pages
+ * are written as they are downloaded (without decoding them), first to a temporary file next to
+ * the images directory, which is then moved into place if it is a complete png image.
+ */
+class PageDownloader(
+  private val okHttpClient: OkHttpClient,
+  private val maxConcurrentDownloads: Int,
+  private val maxAttempts: Int = 3,
+  private val initialBackoffMs: Long = 1000
+) {
+
+  data class PageDownload(val url: String, val directory: File, val fileName: String)
+
+  class PageResult(
+    val download: PageDownload,
+    val isSuccessful: Boolean,
+    val attempts: Int,
+    val latencyMs: Long,
+    val bytes: Long
+  )
+
+  class Summary(val results: List<PageResult>, val elapsedMs: Long) {
+    val successes: Int
+      get() = results.count { it.isSuccessful }
+
+    val failures: Int
+      get() = results.size - successes
+
+    val totalBytes: Long
+      get() = results.sumOf { it.bytes }
+
+    fun latencyPercentile(percentile: Int): Long {
+      if (results.isEmpty()) {
+        return 0
+      }
+      val latencies = results.map { it.latencyMs }.sorted()
+      return latencies[((latencies.size - 1) * percentile) / 100]
+    }
+
+    override fun toString(): String {
+      return "$successes of ${results.size} pages (${totalBytes / 1024} kb) in $elapsedMs ms, " +
+          "latency p50: ${latencyPercentile(50)} ms, p90: ${latencyPercentile(90)} ms, " +
+          "max: ${latencyPercentile(100)} ms, " +
+          "retries: ${results.sumBy { it.attempts - 1 }}"
+    }
+  }
+
+  suspend fun downloadAll(pages: List<PageDownload>): Summary = coroutineScope {
+    val start = System.nanoTime()
+    val semaphore = Semaphore(maxOf(1, maxConcurrentDownloads))
+    val results = pages.map { page ->
+      async { download(page, semaphore) }
+    }.awaitAll()
+    Summary(results, TimeUnit.NANOSECONDS.toMillis(System.nanoTime() - start))
+  }
+
+  private suspend fun download(page: PageDownload, semaphore: Semaphore): PageResult {
+    val start = System.nanoTime()
+    var backoff = initialBackoffMs
+    var attempts = 0
+    while (true) {
+      attempts++
+      // the permit isn't held while waiting to retry, so other pages can use it
+      val result = semaphore.withPermit { withContext(Dispatchers.IO) { downloadPage(page) } }
+      if (result.bytes >= 0 || !result.shouldRetry || attempts >= maxAttempts) {
+        val latency = TimeUnit.NANOSECONDS.toMillis(System.nanoTime() - start)
+        return PageResult(page, result.bytes >= 0, attempts, latency, maxOf(result.bytes, 0))
+      }
+      delay(backoff)
+      backoff *= 2
+    }
+  }
+
+  private class AttemptResult(val bytes: Long, val shouldRetry: Boolean)
+
+  private fun downloadPage(page: PageDownload): AttemptResult {
+    Timber.d("downloading %s - thread: %s", page.url, Thread.currentThread().name)
+    val directory = page.directory
+    val temporaryFile =
+        File(directory.parentFile ?: directory, ".${directory.name}_${page.fileName}.part")
+    try {
+      val request = Request.Builder()
+          .url(page.url)
+          .build()
+      okHttpClient.newCall(request).execute().use { response ->
+        val body = response.body()
+        if (!response.isSuccessful || body == null) {
+          // client errors won't get any better by trying again
+          return AttemptResult(-1, response.code() >= 500)
+        }
+
+        val bytes = temporaryFile.sink().buffer().use { it.writeAll(body.source()) }
+        if (!isCompletePng(temporaryFile)) {
+          // ex an error page served with a 200, which won't be any different next time
+          Timber.e("invalid image downloaded from %s", page.url)
+          return AttemptResult(-1, false)
+        }
+
+        val saved = PageImageManifest.savePage(directory, page.fileName) {
+          temporaryFile.renameTo(it)
+        }
+        return AttemptResult(if (saved) bytes else -1, false)
+      }
+    } catch (ioException: IOException) {
+      // including timeouts, which are worth retrying
+      Timber.e(ioException, "exception downloading %s", page.url)
+      return AttemptResult(-1, true)
+    } finally {
+      temporaryFile.delete()
+    }
+  }
+
+  /**
+   * Whether [file] starts with the png signature and ends with the png end chunk, so that other
+   * responses and truncated images aren't saved as pages.
+   */
+  private fun isCompletePng(file: File): Boolean {
+    val length = file.length()
+    if (length < PNG_SIGNATURE.size + PNG_END.size) {
+      return false
+    }
+
+    RandomAccessFile(file, "r").use { input ->
+      val signature = ByteArray(PNG_SIGNATURE.size)
+      input.readFully(signature)
+      val end = ByteArray(PNG_END.size)
+      input.seek(length - end.size)
+      input.readFully(end)
+      return signature.contentEquals(PNG_SIGNATURE) && end.contentEquals(PNG_END)
+    }
+  }
+
+  companion object {
+    private val PNG_SIGNATURE =
+      byteArrayOf(0x89.toByte(), 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a)
+
+    // an empty IEND chunk, along with its crc
+    private val PNG_END = byteArrayOf(
+        0, 0, 0, 0, 0x49, 0x45, 0x4e, 0x44, 0xae.toByte(), 0x42, 0x60, 0x82.toByte()
+    )
+  }
+}
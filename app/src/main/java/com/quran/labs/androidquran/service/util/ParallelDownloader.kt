@@ -0,0 +1,60 @@
+package com.quran.labs.androidquran.service.util
+
+import timber.log.Timber
+import java.util.concurrent.Callable
+import java.util.concurrent.ExecutionException
+import java.util.concurrent.Executors
+import java.util.concurrent.Future
+import java.util.concurrent.atomic.AtomicBoolean
+
+/**
+ * Runs a set of downloads, keeping at most [maxConcurrentDownloads] of them in flight.
+ *
+ * Downloads share the same [okhttp3.OkHttpClient] (and thus its connection pool), so each
+ * download only needs to run a blocking call. Once any download fails, downloads that have
+ * not yet started are skipped.
+ */
+class ParallelDownloader(private val maxConcurrentDownloads: Int) {
+
+  fun interface DownloadAction<T> {
+    /**
+     * Download a single item, returning true if the download succeeded.
+     */
+    fun download(item: T): Boolean
+  }
+
+  fun <T> downloadAll(items: List<T>, action: DownloadAction<T>): Boolean {
+    if (items.isEmpty()) {
+      return true
+    } else if (maxConcurrentDownloads <= 1 || items.size == 1) {
+      return items.all { action.download(it) }
+    }
+
+    val failed = AtomicBoolean(false)
+    val executor = Executors.newFixedThreadPool(minOf(maxConcurrentDownloads, items.size))
+    try {
+      val futures: List<Future<*>> = items.map { item ->
+        executor.submit(Callable {
+          if (!failed.get() && !action.download(item)) {
+            failed.set(true)
+          }
+        })
+      }
+
+      for (future in futures) {
+        try {
+          future.get()
+        } catch (exception: ExecutionException) {
+          Timber.e(exception.cause, "error while downloading")
+          failed.set(true)
+        }
+      }
+    } catch (exception: InterruptedException) {
+      Thread.currentThread().interrupt()
+      failed.set(true)
+    } finally {
+      executor.shutdownNow()
+    }
+    return !failed.get()
+  }
+}
@@ -82,6 +82,16 @@ public class QuranDownloadNotifier {
     public void setIsGapless(boolean isGapless) {
       this.isGapless = isGapless;
     }
+
+    public NotificationDetails copy() {
+      NotificationDetails result = new NotificationDetails(title, key, type);
+      result.setFileStatus(currentFile, totalFiles);
+      result.sura = sura;
+      result.ayah = ayah;
+      result.sendIndeterminate = sendIndeterminate;
+      result.isGapless = isGapless;
+      return result;
+    }
   }
 
   private final Context appContext;
@@ -108,7 +118,7 @@ public class QuranDownloadNotifier {
         notificationManager, NOTIFICATION_CHANNEL_ID, channelName);
   }
 
-  public void resetNotifications() {
+  public synchronized void resetNotifications() {
     // hide any previous errors, canceled, etc
     lastMaximum = -1;
     lastProgress = -1;
@@ -116,7 +126,7 @@ public class QuranDownloadNotifier {
     notificationManager.cancel(DOWNLOADING_COMPLETE_NOTIFICATION);
   }
 
-  public Intent notifyProgress(NotificationDetails details,
+  public synchronized Intent notifyProgress(NotificationDetails details,
       long downloadedSize, long totalSize){
 
     int max = 100;
@@ -173,33 +183,7 @@ public class QuranDownloadNotifier {
     return progressIntent;
   }
 
-  public Intent notifyDownloadProcessing(
-      NotificationDetails details, int done, int total){
-    String processingString =
-        appContext.getString(R.string.download_processing);
-    showNotification(details.title, processingString,
-        DOWNLOADING_NOTIFICATION, true, !isForeground);
-
-    // send broadcast
-    Intent progressIntent = new Intent(ProgressIntent.INTENT_NAME);
-    progressIntent.putExtra(ProgressIntent.NAME, details.title);
-    progressIntent.putExtra(ProgressIntent.DOWNLOAD_KEY, details.key);
-    progressIntent.putExtra(ProgressIntent.DOWNLOAD_TYPE, details.type);
-    progressIntent.putExtra(ProgressIntent.STATE,
-        ProgressIntent.STATE_PROCESSING);
-
-    if (total > 0){
-      int progress = (int)((100.0 * done) / (1.0 * total));
-      progressIntent.putExtra(ProgressIntent.PROGRESS, progress);
-      progressIntent.putExtra(ProgressIntent.PROCESSED_FILES, done);
-      progressIntent.putExtra(ProgressIntent.TOTAL_FILES, total);
-    }
-
-    broadcastManager.sendBroadcast(progressIntent);
-    return progressIntent;
-  }
-
-  public Intent notifyDownloadSuccessful(NotificationDetails details){
+  public synchronized Intent notifyDownloadSuccessful(NotificationDetails details){
     String successString = appContext.getString(R.string.download_successful);
     notificationManager.cancel(DOWNLOADING_ERROR_NOTIFICATION);
 
@@ -222,7 +206,7 @@ public class QuranDownloadNotifier {
     return progressIntent;
   }
 
-  public Intent notifyError(int errorCode, boolean isFatal, NotificationDetails details){
+  public synchronized Intent notifyError(int errorCode, boolean isFatal, NotificationDetails details){
     int errorId;
     switch (errorCode){
       case ERROR_DISK_SPACE:
@@ -272,7 +256,7 @@ public class QuranDownloadNotifier {
     return progressIntent;
   }
 
-  public void notifyDownloadStarting(){
+  public synchronized void notifyDownloadStarting(){
     String title = appContext.getString(R.string.downloading_title);
     notificationManager.cancel(DOWNLOADING_ERROR_NOTIFICATION);
 
@@ -282,7 +266,7 @@ public class QuranDownloadNotifier {
         DOWNLOADING_NOTIFICATION, true, true);
   }
 
-  public void stopForeground() {
+  public synchronized void stopForeground() {
     if (isForeground) {
       service.stopForeground(true);
       isForeground = false;
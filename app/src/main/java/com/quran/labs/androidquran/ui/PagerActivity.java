@@ -41,6 +41,8 @@ import com.quran.labs.androidquran.common.LocalTranslationDisplaySort;
 import com.quran.labs.androidquran.common.LocalTranslation;
 import com.quran.labs.androidquran.common.audio.QariItem;
 import com.quran.labs.androidquran.dao.audio.AudioRequest;
+import com.quran.labs.androidquran.dao.bookmark.Bookmark;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange;
 import com.quran.labs.androidquran.data.Constants;
 import com.quran.labs.androidquran.data.QuranDataProvider;
 import com.quran.labs.androidquran.data.QuranDisplayData;
@@ -70,6 +72,7 @@ import com.quran.labs.androidquran.ui.helpers.JumpDestination;
 import com.quran.labs.androidquran.ui.helpers.QuranDisplayHelper;
 import com.quran.labs.androidquran.ui.helpers.QuranPage;
 import com.quran.labs.androidquran.ui.helpers.QuranPageAdapter;
+import com.quran.labs.androidquran.ui.helpers.QuranPagePrefetcher;
 import com.quran.labs.androidquran.ui.helpers.SlidingPagerAdapter;
 import com.quran.labs.androidquran.ui.util.ToastCompat;
 import com.quran.labs.androidquran.ui.util.TranslationsSpinnerAdapter;
@@ -209,6 +212,7 @@ public class PagerActivity extends QuranActionBarActivity implements
 
   @Inject BookmarkModel bookmarkModel;
   @Inject RecentPagePresenter recentPagePresenter;
+  @Inject QuranPagePrefetcher quranPagePrefetcher;
   @Inject QuranSettings quranSettings;
   @Inject QuranScreenInfo quranScreenInfo;
   @Inject ArabicDatabaseUtils arabicDatabaseUtils;
@@ -307,7 +311,7 @@ public class PagerActivity extends QuranActionBarActivity implements
     compositeDisposable.add(
         bookmarkModel.bookmarksObservable()
             .observeOn(AndroidSchedulers.mainThread())
-            .subscribe(ignore -> onBookmarksChanged()));
+            .subscribe(this::onBookmarksChanged));
 
     final Resources resources = getResources();
     ayahToolBarTotalHeight = resources
@@ -688,6 +692,8 @@ public class PagerActivity extends QuranActionBarActivity implements
 
     audioPresenter.bind(this);
     recentPagePresenter.bind(this);
+    quranPagePrefetcher.setEnabled(!showingTranslation);
+    quranPagePrefetcher.start();
     isInMultiWindowMode = Build.VERSION.SDK_INT >= Build.VERSION_CODES.N && isInMultiWindowMode();
 
     // read the list of translations
@@ -882,6 +888,7 @@ public class PagerActivity extends QuranActionBarActivity implements
     }
     audioPresenter.unbind(this);
     recentPagePresenter.unbind(this);
+    quranPagePrefetcher.stop();
     quranSettings.setWasShowingTranslation(pagerAdapter.getIsShowingTranslation());
     super.onPause();
   }
@@ -1049,6 +1056,7 @@ public class PagerActivity extends QuranActionBarActivity implements
     final int page = getCurrentPage();
     pagerAdapter.setQuranMode();
     showingTranslation = false;
+    quranPagePrefetcher.setEnabled(true);
     if (shouldUpdatePageNumber()) {
       final int position = quranInfo.getPositionFromPage(page, true);
       viewPager.setCurrentItem(position);
@@ -1073,6 +1081,7 @@ public class PagerActivity extends QuranActionBarActivity implements
       int page = getCurrentPage();
       pagerAdapter.setTranslationMode();
       showingTranslation = true;
+      quranPagePrefetcher.setEnabled(false);
       if (shouldUpdatePageNumber()) {
         if (page % 2 == 0) {
           page--;
@@ -1134,8 +1143,39 @@ public class PagerActivity extends QuranActionBarActivity implements
     dialog.show(fm, AddTagDialog.TAG);
   }
 
-  private void onBookmarksChanged() {
-    if (isInAyahMode) {
+  private void onBookmarksChanged(List<BookmarkChange> changes) {
+    boolean shouldRefreshAyahMode = false;
+    for (int i = 0, size = changes.size(); i < size; i++) {
+      final BookmarkChange change = changes.get(i);
+      final Bookmark bookmark = change.getBookmark();
+      if (change.getType() == BookmarkChange.Type.RESET || bookmark == null) {
+        // anything could have changed, so check the current page(s) again
+        bookmarksCache.clear();
+        final int page = getCurrentPage();
+        if (isDualPageVisible()) {
+          checkIfPageIsBookmarked(page - 1, page);
+        } else {
+          checkIfPageIsBookmarked(page);
+        }
+        shouldRefreshAyahMode = true;
+      } else if (change.getType() != BookmarkChange.Type.RETAGGED) {
+        final boolean isBookmarked = change.getType() == BookmarkChange.Type.ADDED;
+        final int page = bookmark.getPage();
+        if (bookmark.isPageBookmark()) {
+          bookmarksCache.put(page, isBookmarked);
+          supportInvalidateOptionsMenu();
+        } else {
+          // only highlight bookmarks on the visible page(s), since highlighting moves to the ayah
+          final int currentPage = getCurrentPage();
+          final boolean isVisible =
+              page == currentPage || (isDualPageVisible() && page == currentPage - 1);
+          updateAyahBookmark(
+              new SuraAyah(bookmark.getSura(), bookmark.getAyah()), isBookmarked, isVisible);
+        }
+      }
+    }
+
+    if (shouldRefreshAyahMode && isInAyahMode) {
       final int startPage = quranInfo.getPageFromSuraAyah(start.sura, start.ayah);
       compositeDisposable.add(
           bookmarkModel.getIsBookmarkedObservable(start.sura, start.ayah, startPage)
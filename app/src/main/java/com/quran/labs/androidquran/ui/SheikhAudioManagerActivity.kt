@@ -40,6 +40,7 @@ import com.quran.labs.androidquran.util.AudioManagerUtils
 import com.quran.labs.androidquran.util.AudioUtils
 import com.quran.labs.androidquran.util.QariDownloadInfo
 import com.quran.labs.androidquran.util.QuranFileUtils
+import com.quran.labs.androidquran.util.StorageUsageTracker
 import io.reactivex.android.schedulers.AndroidSchedulers
 import io.reactivex.disposables.CompositeDisposable
 import java.io.File
@@ -62,6 +63,9 @@ class SheikhAudioManagerActivity : QuranActionBarActivity(), SimpleDownloadListe
   @Inject
   lateinit var audioUtils: AudioUtils
 
+  @Inject
+  lateinit var storageUsageTracker: StorageUsageTracker
+
   private lateinit var progressBar: ProgressBar
   private lateinit var recyclerView: RecyclerView
   private lateinit var surahAdapter: SurahAdapter
@@ -269,20 +273,30 @@ class SheikhAudioManagerActivity : QuranActionBarActivity(), SimpleDownloadListe
   private fun deleteSurah(surah: Int): Boolean {
     val fileUri = audioUtils.getLocalQariUri(this, qari) ?: return false
     var deletionSuccessful = true
+    val removedFiles = mutableMapOf<File, Long>()
     if (qari.isGapless) {
       val fileName = String.format(Locale.US, fileUri, surah)
       val audioFile = File(fileName)
+      val size = audioFile.length()
       deletionSuccessful = audioFile.delete()
+      if (deletionSuccessful) {
+        removedFiles[audioFile] = size
+      }
     } else {
       val numAyahs = quranInfo.getNumberOfAyahs(surah)
       for (i in 1..numAyahs) {
         val fileName = String.format(Locale.US, fileUri, surah, i)
         val ayahAudioFile = File(fileName)
         if (ayahAudioFile.exists()) {
+          val size = ayahAudioFile.length()
           deletionSuccessful = deletionSuccessful && ayahAudioFile.delete()
+          if (deletionSuccessful) {
+            removedFiles[ayahAudioFile] = size
+          }
         }
       }
     }
+    storageUsageTracker.onFilesRemoved(removedFiles)
     return deletionSuccessful
   }
 
@@ -28,6 +28,7 @@ import com.quran.labs.androidquran.ui.adapter.DownloadedMenuActionListener;
 import com.quran.labs.androidquran.ui.adapter.TranslationsAdapter;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.util.QuranSettings;
+import com.quran.labs.androidquran.util.StorageUsageTracker;
 
 import java.io.File;
 import java.util.ArrayList;
@@ -76,6 +77,7 @@ public class TranslationManagerActivity extends QuranActionBarActivity
 
   @Inject TranslationManagerPresenter presenter;
   @Inject QuranFileUtils quranFileUtils;
+  @Inject StorageUsageTracker storageUsageTracker;
 
   SwipeRefreshLayout translationSwipeRefresh;
   RecyclerView translationRecycler;
@@ -234,6 +236,10 @@ public class TranslationManagerActivity extends QuranActionBarActivity
         .show();
   }
 
+  public void onTranslationsRefreshed() {
+    translationSwipeRefresh.setRefreshing(false);
+  }
+
   public void onTranslationsUpdated(List<TranslationItem> items) {
     translationSwipeRefresh.setRefreshing(false);
     SparseIntArray itemsSparseArray = new SparseIntArray(items.size());
@@ -449,7 +455,11 @@ public class TranslationManagerActivity extends QuranActionBarActivity
     if (path != null) {
       path += File.separator + fileName;
       File f = new File(path);
-      return f.delete();
+      final long size = f.length();
+      if (f.delete()) {
+        storageUsageTracker.onFileRemoved(f, size);
+        return true;
+      }
     }
     return false;
   }
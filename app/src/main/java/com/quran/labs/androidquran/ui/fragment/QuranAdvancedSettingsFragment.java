@@ -29,6 +29,7 @@ import com.quran.labs.androidquran.util.QuranScreenInfo;
 import com.quran.labs.androidquran.util.QuranSettings;
 import com.quran.labs.androidquran.util.QuranUtils;
 import com.quran.labs.androidquran.util.RecordingLogTree;
+import com.quran.labs.androidquran.util.StorageUsageTracker;
 import com.quran.labs.androidquran.util.StorageUtils;
 
 import java.io.File;
@@ -68,6 +69,7 @@ public class QuranAdvancedSettingsFragment extends PreferenceFragmentCompat {
   @Inject BookmarkImportExportModel bookmarkImportExportModel;
   @Inject QuranFileUtils quranFileUtils;
   @Inject QuranScreenInfo quranScreenInfo;
+  @Inject StorageUsageTracker storageUsageTracker;
 
   @Override
   public void onCreatePreferences(Bundle savedInstanceState, String rootKey) {
@@ -189,7 +191,7 @@ public class QuranAdvancedSettingsFragment extends PreferenceFragmentCompat {
       Timber.d("removing advanced settings from preferences");
       hideStorageListPref();
     } else {
-      loadStorageOptionsTask = new LoadStorageOptionsTask(context, quranFileUtils);
+      loadStorageOptionsTask = new LoadStorageOptionsTask(context, storageUsageTracker);
       loadStorageOptionsTask.execute();
     }
   }
@@ -401,11 +403,11 @@ public class QuranAdvancedSettingsFragment extends PreferenceFragmentCompat {
   private class LoadStorageOptionsTask extends AsyncTask<Void, Void, Void> {
 
     private final Context appContext;
-    private final QuranFileUtils quranFileUtils;
+    private final StorageUsageTracker storageUsageTracker;
 
-    LoadStorageOptionsTask(Context context, QuranFileUtils quranFileUtils) {
+    LoadStorageOptionsTask(Context context, StorageUsageTracker storageUsageTracker) {
       this.appContext = context.getApplicationContext();
-      this.quranFileUtils = quranFileUtils;
+      this.storageUsageTracker = storageUsageTracker;
     }
 
     @Override
@@ -415,7 +417,7 @@ public class QuranAdvancedSettingsFragment extends PreferenceFragmentCompat {
 
     @Override
     protected Void doInBackground(Void... voids) {
-      appSize = quranFileUtils.getAppUsedSpace(appContext);
+      appSize = storageUsageTracker.getAppUsedSpace();
       return null;
     }
 
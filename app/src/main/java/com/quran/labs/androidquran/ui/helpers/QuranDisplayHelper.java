@@ -19,6 +19,9 @@ import com.quran.labs.androidquran.common.Response;
 import com.quran.labs.androidquran.ui.util.ToastCompat;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.util.QuranUtils;
+import com.quran.labs.androidquran.util.StorageUsageTracker;
+
+import java.io.File;
 
 import okhttp3.OkHttpClient;
 import timber.log.Timber;
@@ -30,7 +33,8 @@ public class QuranDisplayHelper {
                                Context context,
                                String widthParam,
                                int page,
-                               QuranFileUtils quranFileUtils) {
+                               QuranFileUtils quranFileUtils,
+                               StorageUsageTracker storageUsageTracker) {
     Response response;
     String filename = QuranFileUtils.getPageFileName(page);
     response = quranFileUtils.getImageFromSD(context, widthParam, filename);
@@ -46,6 +50,10 @@ public class QuranDisplayHelper {
           response = noNetworkResponse;
         } else {
           response = quranFileUtils.getImageFromWeb(okHttpClient, context, widthParam, filename);
+          String directory = quranFileUtils.getQuranImagesDirectory(context, widthParam);
+          if (response.isSuccessful() && directory != null) {
+            storageUsageTracker.onDirectoryChanged(new File(directory));
+          }
         }
       }
     }
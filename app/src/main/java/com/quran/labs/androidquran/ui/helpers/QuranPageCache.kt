@@ -0,0 +1,65 @@
+package com.quran.labs.androidquran.ui.helpers
+
+import android.content.ComponentCallbacks2
+import android.graphics.Bitmap
+import androidx.collection.LruCache
+import timber.log.Timber
+import javax.inject.Inject
+import javax.inject.Singleton
+
+/**
+ * In memory cache of decoded page bitmaps, keyed by width parameter and page.
+ *
+ * The page images on disk act as the second level of this cache - a miss here
+ * falls back to decoding the png from the images directory (or downloading it
+ * when it's missing). The cache is bounded by the total byte count of the
+ * bitmaps it holds rather than by the number of pages.
+ */
+@Singleton
+class QuranPageCache internal constructor(maxSizeBytes: Int) {
+
+  @Inject
+  constructor() : this(defaultMaxSize())
+
+  private val cache = object : LruCache<String, Bitmap>(maxSizeBytes) {
+    override fun sizeOf(key: String, value: Bitmap): Int = value.byteCount
+  }
+
+  fun get(widthParam: String, page: Int): Bitmap? = cache.get(key(widthParam, page))
+
+  fun put(widthParam: String, page: Int, bitmap: Bitmap) {
+    cache.put(key(widthParam, page), bitmap)
+  }
+
+  fun hitCount(): Int = cache.hitCount()
+
+  fun missCount(): Int = cache.missCount()
+
+  fun size(): Int = cache.size()
+
+  fun maxSize(): Int = cache.maxSize()
+
+  /**
+   * Trim the cache in response to [ComponentCallbacks2.onTrimMemory].
+   */
+  fun trimMemory(level: Int) {
+    Timber.d("trimMemory: $level, hits: ${hitCount()}, misses: ${missCount()}")
+    when {
+      level >= ComponentCallbacks2.TRIM_MEMORY_MODERATE -> cache.evictAll()
+      level >= ComponentCallbacks2.TRIM_MEMORY_RUNNING_LOW -> cache.trimToSize(cache.maxSize() / 2)
+    }
+  }
+
+  fun clear() {
+    cache.evictAll()
+  }
+
+  private fun key(widthParam: String, page: Int) = "$widthParam:$page"
+
+  companion object {
+    private fun defaultMaxSize(): Int {
+      // use an eighth of the available heap for page images
+      return (Runtime.getRuntime().maxMemory() / 8).toInt()
+    }
+  }
+}
@@ -5,6 +5,8 @@ import com.quran.labs.androidquran.common.Response
 import com.quran.labs.androidquran.di.ActivityScope
 import com.quran.labs.androidquran.util.QuranFileUtils
 import com.quran.labs.androidquran.util.QuranScreenInfo
+import com.quran.labs.androidquran.util.StorageUsageTracker
+import io.reactivex.Completable
 import io.reactivex.Observable
 import io.reactivex.schedulers.Schedulers
 import okhttp3.OkHttpClient
@@ -17,18 +19,32 @@ class QuranPageLoader @Inject internal constructor(
   private val okHttpClient: OkHttpClient,
   private val imageWidth: String,
   private val quranScreenInfo: QuranScreenInfo,
-  private val quranFileUtils: QuranFileUtils
+  private val quranFileUtils: QuranFileUtils,
+  private val quranPageCache: QuranPageCache,
+  private val storageUsageTracker: StorageUsageTracker
 ) {
 
+  private fun getQuranPage(widthParam: String, pageNumber: Int): Response {
+    val cached = quranPageCache.get(widthParam, pageNumber)
+    if (cached != null) {
+      return Response(cached)
+    }
+
+    val response = QuranDisplayHelper.getQuranPage(
+        okHttpClient, appContext, widthParam, pageNumber, quranFileUtils, storageUsageTracker
+    )
+    response.bitmap?.let { quranPageCache.put(widthParam, pageNumber, it) }
+    return response
+  }
+
   private fun loadImage(pageNumber: Int): Response? {
     var response: Response? = null
     var oom: OutOfMemoryError? = null
     try {
-      response = QuranDisplayHelper.getQuranPage(
-          okHttpClient, appContext, imageWidth, pageNumber, quranFileUtils
-      )
+      response = getQuranPage(imageWidth, pageNumber)
     } catch (me: OutOfMemoryError) {
       Timber.w("out of memory exception loading page $pageNumber, $imageWidth")
+      quranPageCache.clear()
       oom = me
     }
 
@@ -47,9 +63,7 @@ class QuranPageLoader @Inject internal constructor(
           }
         }
 
-        response = QuranDisplayHelper.getQuranPage(
-            okHttpClient, appContext, param, pageNumber, quranFileUtils
-        )
+        response = getQuranPage(param, pageNumber)
 
         if (response.bitmap == null) {
           Timber.w("bitmap still null, giving up... [%d]", response.errorCode)
@@ -65,6 +79,24 @@ class QuranPageLoader @Inject internal constructor(
     return response
   }
 
+  /**
+   * Decode a page from disk into the [QuranPageCache] without downloading it.
+   */
+  fun preloadPage(pageNumber: Int): Completable {
+    return Completable.fromAction {
+      if (quranPageCache.get(imageWidth, pageNumber) == null) {
+        try {
+          val filename = QuranFileUtils.getPageFileName(pageNumber)
+          val response = quranFileUtils.getImageFromSD(appContext, imageWidth, filename)
+          response.bitmap?.let { quranPageCache.put(imageWidth, pageNumber, it) }
+        } catch (me: OutOfMemoryError) {
+          Timber.w("out of memory exception preloading page $pageNumber, $imageWidth")
+          quranPageCache.clear()
+        }
+      }
+    }.onErrorComplete()
+  }
+
   fun loadPages(vararg pages: Int?): Observable<Response?> {
     return Observable.fromArray<Int>(*pages)
         .flatMap { page: Int ->
@@ -0,0 +1,154 @@
+package com.quran.labs.androidquran.ui.helpers
+
+import android.os.SystemClock
+import androidx.annotation.UiThread
+import com.quran.data.core.QuranInfo
+import com.quran.labs.androidquran.data.Constants
+import com.quran.labs.androidquran.di.ActivityScope
+import com.quran.labs.androidquran.model.bookmark.RecentPageModel
+import io.reactivex.Scheduler
+import io.reactivex.android.schedulers.AndroidSchedulers
+import io.reactivex.disposables.Disposable
+import io.reactivex.schedulers.Schedulers
+import timber.log.Timber
+import java.util.concurrent.ExecutorService
+import java.util.concurrent.Executors
+import javax.inject.Inject
+
+/**
+ * Decodes the pages the user is likely to read next before their fragments are created.
+ *
+ * The pages to prefetch are based on the direction of the last page change and on how quickly
+ * pages are being turned. Prefetched bitmaps are stored in the [QuranPageCache], so the page
+ * fragment gets the same bitmap instance from [QuranPageLoader] once it asks for it. Pending
+ * prefetches for pages that fall out of the window are cancelled.
+ */
+@ActivityScope
+class QuranPagePrefetcher @Inject constructor(
+  private val quranPageLoader: QuranPageLoader,
+  private val recentPageModel: RecentPageModel,
+  quranInfo: QuranInfo
+) {
+  private val numberOfPages = quranInfo.numberOfPages
+  private val pending = mutableMapOf<Int, Disposable>()
+
+  private var executor: ExecutorService? = null
+  private var scheduler: Scheduler? = null
+  private var pageDisposable: Disposable? = null
+
+  private var lastPage = Constants.NO_PAGE
+  private var lastPageChangeTime = 0L
+
+  /**
+   * Whether or not pages should be prefetched (ex false when showing translations).
+   */
+  var isEnabled = true
+    @UiThread
+    set(value) {
+      field = value
+      if (!value) {
+        cancelAll()
+      }
+    }
+
+  @UiThread
+  fun start() {
+    if (pageDisposable != null) {
+      return
+    }
+
+    val executorService = Executors.newFixedThreadPool(MAX_CONCURRENT_DECODES)
+    executor = executorService
+    scheduler = Schedulers.from(executorService)
+    pageDisposable = recentPageModel.getLatestPageObservable()
+        .observeOn(AndroidSchedulers.mainThread())
+        .subscribe { onPageChanged(it) }
+  }
+
+  @UiThread
+  fun stop() {
+    pageDisposable?.dispose()
+    pageDisposable = null
+    cancelAll()
+    executor?.shutdownNow()
+    executor = null
+    scheduler = null
+    lastPage = Constants.NO_PAGE
+  }
+
+  private fun onPageChanged(page: Int) {
+    if (page == Constants.NO_PAGE) {
+      return
+    }
+
+    val now = SystemClock.elapsedRealtime()
+    val direction = when {
+      lastPage == Constants.NO_PAGE -> 0
+      page > lastPage -> 1
+      page < lastPage -> -1
+      else -> return
+    }
+    val isFast = lastPage != Constants.NO_PAGE && now - lastPageChangeTime < FAST_PAGE_TURN_MS
+    lastPage = page
+    lastPageChangeTime = now
+
+    if (isEnabled) {
+      prefetch(pagesToPrefetch(page, direction, isFast, numberOfPages))
+    }
+  }
+
+  private fun prefetch(pages: List<Int>) {
+    val currentScheduler = scheduler ?: return
+
+    // cancel anything that is no longer likely to be needed
+    val iterator = pending.entries.iterator()
+    while (iterator.hasNext()) {
+      val (page, disposable) = iterator.next()
+      if (page !in pages) {
+        Timber.d("cancelling prefetch of page %d", page)
+        disposable.dispose()
+        iterator.remove()
+      }
+    }
+
+    pages.filter { it !in pending }
+        .forEach { page ->
+          pending[page] = quranPageLoader.preloadPage(page)
+              .subscribeOn(currentScheduler)
+              .observeOn(AndroidSchedulers.mainThread())
+              .subscribe({ pending.remove(page) }, { pending.remove(page) })
+        }
+  }
+
+  private fun cancelAll() {
+    pending.values.forEach { it.dispose() }
+    pending.clear()
+  }
+
+  companion object {
+    private const val MAX_CONCURRENT_DECODES = 2
+    private const val FAST_PAGE_TURN_MS = 1500L
+    private const val PAGES_AHEAD = 2
+    private const val PAGES_AHEAD_FAST = 4
+
+    /**
+     * Returns the pages to prefetch, ordered by how likely they are to be needed.
+     *
+     * @param page the current page
+     * @param direction 1 when moving forward, -1 when moving backwards, 0 when unknown
+     * @param isFast whether the user is turning pages quickly
+     * @param numberOfPages the total number of pages
+     */
+    @JvmStatic
+    fun pagesToPrefetch(page: Int, direction: Int, isFast: Boolean, numberOfPages: Int): List<Int> {
+      val ahead = if (isFast) PAGES_AHEAD_FAST else PAGES_AHEAD
+      val result = if (direction == 0) {
+        // no history yet, so look one page around in both directions
+        listOf(page + 1, page - 1, page + 2, page - 2)
+      } else {
+        (1..ahead).map { page + direction * it } + (page - direction)
+      }
+      return result.filter { it in 1..numberOfPages }
+    }
+  }
+}
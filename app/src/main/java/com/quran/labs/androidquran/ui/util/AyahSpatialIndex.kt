@@ -0,0 +1,181 @@
+package com.quran.labs.androidquran.ui.util
+
+import com.quran.page.common.data.AyahBounds
+
+/**
+ * Index of the ayah bounds on a page, used to find the ayah at a given point.
+ *
+ * Bounds are bucketed by line, and each line knows its vertical extent, so a point query only
+ * checks the bounds of the lines that contain the point. When no bounds contain the point, the
+ * closest line is picked, and then the closest ayah on that line. Ties go to the bounds that
+ * were added first, like the scan over the ayah coordinates that this replaces. Queries don't
+ * allocate.
+ */
+class AyahSpatialIndex private constructor(
+  private val lineStarts: IntArray,
+  private val lineTops: FloatArray,
+  private val lineBottoms: FloatArray,
+  private val suras: IntArray,
+  private val ayahs: IntArray,
+  private val orders: IntArray,
+  private val lefts: FloatArray,
+  private val tops: FloatArray,
+  private val rights: FloatArray,
+  private val bottoms: FloatArray
+) {
+
+  val isEmpty: Boolean
+    get() = suras.isEmpty()
+
+  fun getSura(index: Int) = suras[index]
+
+  fun getAyah(index: Int) = ayahs[index]
+
+  /**
+   * Returns the index of the bounds at or closest to ([x], [y]), or -1 if the index is empty.
+   * Use [getSura] and [getAyah] to get the ayah for the returned index.
+   */
+  fun findAyah(x: Float, y: Float): Int {
+    var found = -1
+    val lineCount = lineStarts.size - 1
+    for (line in 0 until lineCount) {
+      if (y >= lineTops[line] && y < lineBottoms[line]) {
+        for (i in lineStarts[line] until lineStarts[line + 1]) {
+          if (contains(i, x, y) && isBefore(i, found)) {
+            found = i
+          }
+        }
+      }
+    }
+    return if (found == -1) findClosestAyah(x, y) else found
+  }
+
+  private fun isBefore(i: Int, other: Int) = other == -1 || orders[i] < orders[other]
+
+  private fun contains(i: Int, x: Float, y: Float): Boolean {
+    return lefts[i] < rights[i] && tops[i] < bottoms[i] &&
+        x >= lefts[i] && x < rights[i] && y >= tops[i] && y < bottoms[i]
+  }
+
+  private fun findClosestAyah(x: Float, y: Float): Int {
+    var closestLine = -1
+    var closestLineBounds = -1
+    var closestDelta = -1
+    val lineCount = lineStarts.size - 1
+    for (line in 0 until lineCount) {
+      for (i in lineStarts[line] until lineStarts[line + 1]) {
+        val delta = minOf(abs(bottoms[i] - y), abs(tops[i] - y))
+        if (closestDelta == -1 || delta < closestDelta ||
+            (delta == closestDelta && isBefore(i, closestLineBounds))) {
+          closestLine = line
+          closestLineBounds = i
+          closestDelta = delta
+        }
+      }
+    }
+
+    if (closestLine == -1) {
+      return -1
+    }
+
+    var within = -1
+    var closest = -1
+    var closestDeltaX = -1
+    for (i in lineStarts[closestLine] until lineStarts[closestLine + 1]) {
+      // if x is within the x of this ayah, that's our answer
+      if (x >= lefts[i] && x <= rights[i]) {
+        if (isBefore(i, within)) {
+          within = i
+        }
+        continue
+      }
+
+      val delta = minOf(abs(rights[i] - x), abs(lefts[i] - x))
+      if (closestDeltaX == -1 || delta < closestDeltaX ||
+          (delta == closestDeltaX && isBefore(i, closest))) {
+        closest = i
+        closestDeltaX = delta
+      }
+    }
+    return if (within == -1) closest else within
+  }
+
+  /**
+   * Builds an index from bounds added in any order. The order is only used to break ties.
+   */
+  class Builder {
+    private val entries = mutableListOf<Entry>()
+
+    private class Entry(
+      val order: Int,
+      val sura: Int,
+      val ayah: Int,
+      val line: Int,
+      val left: Float,
+      val top: Float,
+      val right: Float,
+      val bottom: Float
+    )
+
+    fun add(sura: Int, ayah: Int, line: Int,
+            left: Float, top: Float, right: Float, bottom: Float): Builder {
+      entries.add(Entry(entries.size, sura, ayah, line, left, top, right, bottom))
+      return this
+    }
+
+    fun build(): AyahSpatialIndex {
+      val sorted = entries.sortedWith(compareBy({ it.line }, { it.left }))
+      val lineCount = sorted.indices.count { it == 0 || sorted[it].line != sorted[it - 1].line }
+
+      val lineStarts = IntArray(lineCount + 1)
+      val lineTops = FloatArray(lineCount)
+      val lineBottoms = FloatArray(lineCount)
+      var line = -1
+      sorted.forEachIndexed { i, entry ->
+        if (i == 0 || entry.line != sorted[i - 1].line) {
+          line++
+          lineStarts[line] = i
+          lineTops[line] = entry.top
+          lineBottoms[line] = entry.bottom
+        } else {
+          lineTops[line] = minOf(lineTops[line], entry.top)
+          lineBottoms[line] = maxOf(lineBottoms[line], entry.bottom)
+        }
+      }
+      lineStarts[lineCount] = sorted.size
+
+      return AyahSpatialIndex(
+          lineStarts, lineTops, lineBottoms,
+          IntArray(sorted.size) { sorted[it].sura },
+          IntArray(sorted.size) { sorted[it].ayah },
+          IntArray(sorted.size) { sorted[it].order },
+          FloatArray(sorted.size) { sorted[it].left },
+          FloatArray(sorted.size) { sorted[it].top },
+          FloatArray(sorted.size) { sorted[it].right },
+          FloatArray(sorted.size) { sorted[it].bottom }
+      )
+    }
+  }
+
+  companion object {
+    private fun abs(value: Float) = Math.abs(value).toInt()
+
+    /**
+     * Builds an index from the bounds of [AyahCoordinates.ayahCoordinates], keyed by "sura:ayah".
+     */
+    @JvmStatic
+    fun fromAyahCoordinates(coordinates: Map<String, List<AyahBounds>>): AyahSpatialIndex {
+      val builder = Builder()
+      coordinates.forEach { (key, bounds) ->
+        val separator = key.indexOf(':')
+        val sura = key.substring(0, separator).toInt()
+        val ayah = key.substring(separator + 1).toInt()
+        bounds.forEach {
+          val rect = it.bounds
+          builder.add(sura, ayah, it.line, rect.left, rect.top, rect.right, rect.bottom)
+        }
+      }
+      return builder.build()
+    }
+  }
+}
@@ -3,7 +3,6 @@ package com.quran.labs.androidquran.ui.util;
 import android.graphics.Matrix;
 import android.graphics.RectF;
 import androidx.annotation.NonNull;
-import android.util.SparseArray;
 import android.widget.ImageView;
 
 import com.quran.page.common.data.AyahBounds;
@@ -11,114 +10,22 @@ import com.quran.data.model.SuraAyah;
 import com.quran.labs.androidquran.view.AyahToolBar;
 import com.quran.labs.androidquran.view.HighlightingImageView;
 
-import java.util.ArrayList;
 import java.util.List;
 import java.util.Map;
-import java.util.Set;
-
-import timber.log.Timber;
 
 public class ImageAyahUtils {
 
-   private static SuraAyah getAyahFromKey(String key){
-      String[] parts = key.split(":", -1);
-     SuraAyah result = null;
-      if (parts.length == 2){
-         try {
-            int sura = Integer.parseInt(parts[0]);
-            int ayah = Integer.parseInt(parts[1]);
-            result = new SuraAyah(sura, ayah);
-         }
-         catch (Exception e){
-           // no op
-         }
-      }
-      return result;
-   }
-
    public static SuraAyah getAyahFromCoordinates(
-           Map<String, List<AyahBounds>> coords,
+           AyahSpatialIndex spatialIndex,
            HighlightingImageView imageView, float xc, float yc) {
-      if (coords == null || imageView == null){ return null; }
+      if (spatialIndex == null || imageView == null){ return null; }
 
       float[] pageXY = getPageXY(xc, yc, imageView);
       if (pageXY == null){ return null; }
-      float x = pageXY[0];
-      float y = pageXY[1];
-
-      int closestLine = -1;
-      int closestDelta = -1;
-
-      final SparseArray<List<String>> lineAyahs = new SparseArray<>();
-      final Set<String> keys = coords.keySet();
-      for (String key : keys){
-         List<AyahBounds> bounds = coords.get(key);
-         if (bounds == null){ continue; }
-
-         for (AyahBounds b : bounds){
-            // only one AyahBound will exist for an ayah on a particular line
-            int line = b.getLine();
-            List<String> items = lineAyahs.get(line);
-            if (items == null){
-               items = new ArrayList<>();
-            }
-            items.add(key);
-            lineAyahs.put(line, items);
-
-            final RectF boundsRect = b.getBounds();
-            if (boundsRect.contains(x, y)) {
-               return getAyahFromKey(key);
-            }
-
-            int delta = Math.min((int) Math.abs(boundsRect.bottom - y),
-                    (int) Math.abs(boundsRect.top - y));
-            if (closestDelta == -1 || delta < closestDelta){
-               closestLine = b.getLine();
-               closestDelta = delta;
-            }
-         }
-      }
 
-      if (closestLine > -1){
-         int leastDeltaX = -1;
-         String closestAyah = null;
-         List<String> ayat = lineAyahs.get(closestLine);
-         if (ayat != null){
-            Timber.d("no exact match, %d candidates.", ayat.size());
-            for (String ayah : ayat){
-               List<AyahBounds> bounds = coords.get(ayah);
-               if (bounds == null){ continue; }
-               for (AyahBounds b : bounds){
-                  if (b.getLine() > closestLine){
-                     // this is the last ayah in ayat list
-                     break;
-                  }
-
-                  final RectF boundsRect = b.getBounds();
-                  if (b.getLine() == closestLine){
-                     // if x is within the x of this ayah, that's our answer
-                     if (boundsRect.right >= x && boundsRect.left <= x){
-                        return getAyahFromKey(ayah);
-                     }
-
-                     // otherwise, keep track of the least delta and return it
-                     int delta = Math.min((int) Math.abs(boundsRect.right - x),
-                             (int) Math.abs(boundsRect.left - x));
-                     if (leastDeltaX == -1 || delta < leastDeltaX){
-                        closestAyah = ayah;
-                        leastDeltaX = delta;
-                     }
-                  }
-               }
-            }
-         }
-
-         if (closestAyah != null){
-            Timber.d("fell back to closest ayah of %s", closestAyah);
-            return getAyahFromKey(closestAyah);
-         }
-      }
-      return null;
+      int index = spatialIndex.findAyah(pageXY[0], pageXY[1]);
+      if (index == -1){ return null; }
+      return new SuraAyah(spatialIndex.getSura(index), spatialIndex.getAyah(index));
    }
 
   public static AyahToolBar.AyahToolBarPosition getToolBarPosition(
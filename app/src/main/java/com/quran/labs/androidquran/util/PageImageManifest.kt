@@ -0,0 +1,276 @@
+package com.quran.labs.androidquran.util
+
+import androidx.annotation.WorkerThread
+import timber.log.Timber
+import java.io.DataInputStream
+import java.io.DataOutputStream
+import java.io.File
+import java.io.IOException
+
+/**
+ * The size of every page image in an images directory, and whether it was verified to be a
+ * complete image, as of when they were written.
+ *
+ * Checking whether all the pages are present, or which pages are missing, is then one read of
+ * a small file instead of listing the directory or checking every page. The manifest is kept
+ * next to the images directory and records the last modified time of the directory, so adding
+ * or removing files without updating the manifest makes it stale, and [read] returns null.
+ *
+ * Only pages that were just written and checked (ex decoded, or unzipped from the bundled
+ * pages) are marked as verified - pages that were already in the directory when the manifest
+ * was built aren't, so the partial page checker still checks them.
+ */
+class PageImageManifest private constructor(
+  private val sizes: LongArray,
+  private val verified: BooleanArray
+) {
+
+  val numberOfPages: Int
+    get() = sizes.size
+
+  fun hasPage(page: Int) = page in 1..sizes.size && sizes[page - 1] >= 0
+
+  fun getSize(page: Int) = if (hasPage(page)) sizes[page - 1] else -1L
+
+  /**
+   * Whether [page] is present and is known to be a complete image.
+   */
+  fun isVerified(page: Int) = hasPage(page) && verified[page - 1]
+
+  fun getMissingPages(): List<Int> = (1..sizes.size).filter { !hasPage(it) }
+
+  fun hasAllPages() = sizes.all { it >= 0 }
+
+  private fun withPage(page: Int, file: File?): PageImageManifest {
+    val sizes = sizes.copyOf()
+    val verified = verified.copyOf()
+    if (file != null && file.exists()) {
+      sizes[page - 1] = file.length()
+      verified[page - 1] = true
+    } else {
+      sizes[page - 1] = -1
+      verified[page - 1] = false
+    }
+    return PageImageManifest(sizes, verified)
+  }
+
+  @Throws(IOException::class)
+  private fun write(directory: File) {
+    val file = getManifestFile(directory)
+    val temporaryFile = File(file.path + ".tmp")
+    try {
+      DataOutputStream(temporaryFile.outputStream().buffered()).use { output ->
+        output.writeInt(MAGIC)
+        output.writeInt(VERSION)
+        output.writeLong(directory.lastModified())
+        output.writeInt(sizes.size)
+        for (i in sizes.indices) {
+          output.writeLong(sizes[i])
+          output.writeBoolean(verified[i])
+        }
+      }
+    } catch (ioException: IOException) {
+      temporaryFile.delete()
+      throw ioException
+    }
+
+    if (!temporaryFile.renameTo(file)) {
+      temporaryFile.delete()
+      throw IOException("unable to write page manifest to ${file.path}")
+    }
+  }
+
+  companion object {
+    private const val MAGIC = 0x5150494d // QPIM
+    private const val VERSION = 2
+
+    private val pageFileName = Regex("page(\\d+)\\.png")
+    private val lock = Any()
+
+    // directories with pages being saved, and how many, guarded by lock. only saves that started
+    // with a valid manifest are counted, and while they run, they explain why it looks stale.
+    private val savingDirectories = mutableMapOf<File, Int>()
+
+    /**
+     * Reads the manifest of [directory], returning null if it is missing, invalid, or stale.
+     */
+    @JvmStatic
+    fun read(directory: File): PageImageManifest? = read(directory, false)
+
+    private fun read(directory: File, allowStale: Boolean): PageImageManifest? {
+      val file = getManifestFile(directory)
+      if (!file.exists() || !directory.isDirectory) {
+        return null
+      }
+
+      return try {
+        DataInputStream(file.inputStream().buffered()).use { input ->
+          if (input.readInt() != MAGIC ||
+              input.readInt() != VERSION ||
+              (input.readLong() != directory.lastModified() && !allowStale)) {
+            null
+          } else {
+            val numberOfPages = input.readInt()
+            val sizes = LongArray(numberOfPages)
+            val verified = BooleanArray(numberOfPages)
+            for (i in 0 until numberOfPages) {
+              sizes[i] = input.readLong()
+              verified[i] = input.readBoolean()
+            }
+            PageImageManifest(sizes, verified)
+          }
+        }
+      } catch (ioException: IOException) {
+        Timber.d(ioException, "ignoring invalid page manifest for %s", directory)
+        null
+      }
+    }
+
+    /**
+     * Builds and writes the manifest of [directory] from the pages in it. Pages are only marked
+     * as verified if [areVerified] is set (ex for the bundled pages), or if they were verified
+     * in the previous manifest and their size hasn't changed since.
+     */
+    @JvmStatic
+    @JvmOverloads
+    @WorkerThread
+    fun rebuild(
+      directory: File,
+      numberOfPages: Int,
+      areVerified: Boolean = false
+    ): PageImageManifest? {
+      return synchronized(lock) {
+        if (!directory.isDirectory) {
+          null
+        } else {
+          try {
+            build(directory, numberOfPages, areVerified).also { it.write(directory) }
+          } catch (ioException: IOException) {
+            Timber.e(ioException, "unable to build page manifest for %s", directory)
+            null
+          }
+        }
+      }
+    }
+
+    /**
+     * Rebuilds the manifest of [directory] unless it already has a valid one.
+     */
+    @JvmStatic
+    @WorkerThread
+    fun rebuildIfStale(directory: File, numberOfPages: Int) {
+      if (read(directory)?.numberOfPages != numberOfPages) {
+        rebuild(directory, numberOfPages)
+      }
+    }
+
+    /**
+     * Marks [pages] of [directory] as verified (ex once they were checked by decoding them),
+     * rebuilding the manifest first if it is stale.
+     */
+    @JvmStatic
+    @WorkerThread
+    fun markVerified(directory: File, numberOfPages: Int, pages: Collection<Int>) {
+      synchronized(lock) {
+        if (!directory.isDirectory) {
+          return
+        }
+
+        try {
+          val manifest = read(directory)?.takeIf { it.numberOfPages == numberOfPages }
+              ?: build(directory, numberOfPages, false)
+          pages.filter { manifest.hasPage(it) }
+              .forEach { manifest.verified[it - 1] = true }
+          manifest.write(directory)
+        } catch (ioException: IOException) {
+          Timber.e(ioException, "unable to update page manifest for %s", directory)
+          getManifestFile(directory).delete()
+        }
+      }
+    }
+
+    /**
+     * Writes a single page named [fileName] into [directory] using [save], keeping a valid
+     * manifest of the directory up to date with the result. [save] should only return true once
+     * the page is completely written and known to be a valid image, since it is then marked as
+     * verified. [save] isn't called while holding the manifest lock, so pages can be saved in
+     * parallel.
+     */
+    @JvmStatic
+    fun savePage(directory: File, fileName: String, save: (File) -> Boolean): Boolean {
+      val file = File(directory, fileName)
+      val page = pageFileName.matchEntire(fileName)?.groupValues?.get(1)?.toInt() ?: -1
+      val isTracked = synchronized(lock) {
+        val manifest = read(directory, directory in savingDirectories)
+        val isTracked = manifest != null && page in 1..manifest.numberOfPages
+        if (isTracked) {
+          savingDirectories[directory] = (savingDirectories[directory] ?: 0) + 1
+        }
+        isTracked
+      }
+
+      var saved = false
+      try {
+        saved = save(file)
+      } finally {
+        if (isTracked) {
+          synchronized(lock) {
+            val saving = savingDirectories.getValue(directory) - 1
+            if (saving == 0) {
+              savingDirectories.remove(directory)
+            } else {
+              savingDirectories[directory] = saving
+            }
+            // a failed save may leave a partial file behind, so the page is dropped
+            updatePage(directory, page, if (saved) file else null)
+          }
+        }
+      }
+      return saved
+    }
+
+    private fun updatePage(directory: File, page: Int, file: File?) {
+      // stale, since saving the page changed the directory
+      val manifest = read(directory, true)?.takeIf { page in 1..it.numberOfPages } ?: return
+      try {
+        manifest.withPage(page, file).write(directory)
+      } catch (ioException: IOException) {
+        Timber.e(ioException, "unable to update page manifest for %s", directory)
+        getManifestFile(directory).delete()
+      }
+    }
+
+    /**
+     * Removes the manifest of [directory], forcing the next check to scan the directory.
+     */
+    @JvmStatic
+    fun delete(directory: File) {
+      getManifestFile(directory).delete()
+    }
+
+    private fun build(
+      directory: File,
+      numberOfPages: Int,
+      areVerified: Boolean
+    ): PageImageManifest {
+      // a page stays verified as long as its size is the same as when it was verified
+      val previous = read(directory, true)?.takeIf { it.numberOfPages == numberOfPages }
+      val manifest = PageImageManifest(LongArray(numberOfPages) { -1 }, BooleanArray(numberOfPages))
+      for (page in 1..numberOfPages) {
+        val file = File(directory, QuranFileUtils.getPageFileName(page))
+        if (file.exists()) {
+          val size = file.length()
+          manifest.sizes[page - 1] = size
+          manifest.verified[page - 1] =
+            areVerified || (previous?.isVerified(page) == true && previous.getSize(page) == size)
+        }
+      }
+      return manifest
+    }
+
+    private fun getManifestFile(directory: File): File {
+      // kept outside of the images directory, so writing it doesn't change the directory
+      return File(directory.parentFile ?: directory, ".${directory.name}.manifest")
+    }
+  }
+}
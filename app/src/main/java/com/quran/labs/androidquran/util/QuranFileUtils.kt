@@ -29,8 +29,6 @@ import java.io.IOException
 import java.io.InputStream
 import java.io.InterruptedIOException
 import java.text.NumberFormat
-import java.util.ArrayList
-import java.util.Collections
 import java.util.Locale
 import javax.inject.Inject
 
@@ -100,6 +98,7 @@ class QuranFileUtils @Inject constructor(
     val file = File(quranDirectory)
     if (file.exists()) {
       deleteFileOrDirectory(file)
+      PageImageManifest.delete(file)
       val ayahinfoFile = File(getQuranAyahDatabaseDirectory(context), "ayahinfo_$width.db")
       if (ayahinfoFile.exists()) {
         ayahinfoFile.delete()
@@ -127,6 +126,8 @@ class QuranFileUtils @Inject constructor(
     val filename = "ayahinfo$widthParam.zip"
     copyFromAssets("databases${File.separator}$filename", filename, databaseDestination)
     writeNoMediaFile(quranDirectory)
+    // the bundled pages are known to be complete, so they don't need to be checked
+    PageImageManifest.rebuild(File(quranDirectory), 604, true)
   }
 
   fun haveAllImages(context: Context,
@@ -144,6 +145,12 @@ class QuranFileUtils @Inject constructor(
       val dir = File(quranDirectory + File.separator)
       if (dir.isDirectory) {
         Timber.d("haveAllImages: media state is mounted and directory exists")
+        val manifest = PageImageManifest.read(dir)
+        if (manifest != null && manifest.numberOfPages == totalPages) {
+          Timber.d("haveAllImages: checking against the page manifest")
+          return manifest.hasAllPages()
+        }
+
         val fileList = dir.list()
         if (fileList == null) {
           Timber.d("haveAllImages: null fileList, checking page by page...")
@@ -267,7 +274,7 @@ class QuranFileUtils @Inject constructor(
     filename: String,
     isRetry: Boolean
   ): Response {
-    val urlString = (imageBaseUrl + "width" + widthParam + File.separator + filename)
+    val urlString = getPageUrl(widthParam, filename)
     Timber.d("want to download: %s", urlString)
     val request = Builder()
         .url(urlString)
@@ -290,14 +297,13 @@ class QuranFileUtils @Inject constructor(
           // throw if an error occurred while decoding the stream
           exceptionCatchingSource.throwIfCaught()
           if (bitmap != null) {
-            var path = getQuranImagesDirectory(context, widthParam)
+            val path = getQuranImagesDirectory(context, widthParam)
             var warning = Response.WARN_SD_CARD_NOT_FOUND
             if (path != null && makeQuranDirectory(context, widthParam)) {
-              path += File.separator + filename
-              warning = if (tryToSaveBitmap(
-                      bitmap, path
-                  )
-              ) 0 else Response.WARN_COULD_NOT_SAVE_FILE
+              val saved = PageImageManifest.savePage(File(path), filename) {
+                tryToSaveBitmap(bitmap, it.path)
+              }
+              warning = if (saved) 0 else Response.WARN_COULD_NOT_SAVE_FILE
             }
             return Response(bitmap, warning)
           }
@@ -315,6 +321,10 @@ class QuranFileUtils @Inject constructor(
     ) else getImageFromWeb(okHttpClient, context, filename, widthParam, true)
   }
 
+  fun getPageUrl(widthParam: String, filename: String): String {
+    return imageBaseUrl + "width" + widthParam + File.separator + filename
+  }
+
   private fun decodeBitmapStream(`is`: InputStream): Bitmap? {
     val options = Options()
     options.inPreferredConfig = ALPHA_8
@@ -365,29 +375,6 @@ class QuranFileUtils @Inject constructor(
     return null
   }
 
-  /**
-   * Returns the app used space in megabytes
-   */
-  fun getAppUsedSpace(context: Context): Int {
-    val baseDirectory = getQuranBaseDirectory(context) ?: return -1
-    val base = File(baseDirectory)
-    val files = ArrayList<File>()
-    files.add(base)
-    var size: Long = 0
-    while (files.isNotEmpty()) {
-      val f = files.removeAt(0)
-      if (f.isDirectory) {
-        val subFiles = f.listFiles()
-        if (subFiles != null) {
-          Collections.addAll(files, *subFiles)
-        }
-      } else {
-        size += f.length()
-      }
-    }
-    return (size / (1024 * 1024).toLong()).toInt()
-  }
-
   fun getQuranDatabaseDirectory(context: Context): String? {
     val base = getQuranBaseDirectory(context)
     return if (base == null) null else base + databaseDirectory
@@ -1,16 +1,31 @@
 package com.quran.labs.androidquran.util
 
+import android.graphics.Bitmap
 import android.graphics.BitmapFactory
+import android.graphics.BitmapRegionDecoder
+import android.graphics.Rect
+import androidx.annotation.VisibleForTesting
+import kotlinx.coroutines.CancellationException
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.async
+import kotlinx.coroutines.awaitAll
+import kotlinx.coroutines.coroutineScope
+import kotlinx.coroutines.withContext
 import timber.log.Timber
 import java.io.File
+import java.io.IOException
 import javax.inject.Inject
 
 class QuranPartialPageChecker @Inject constructor() {
 
   /**
    * Checks all the pages to find partially downloaded images.
+   *
+   * Pages are checked in parallel on [Dispatchers.Default], in batches. Progress is saved
+   * after every batch, so a check that is cancelled resumes where it stopped
+   * the next time it runs. Call [clearCheckpoint] once the partial pages have been handled.
    */
-  fun checkPages(directory: String, numberOfPages: Int, width: String): List<Int> {
+  suspend fun checkPages(directory: String, numberOfPages: Int, width: String): List<Int> {
     // past versions of the partial page checker didn't run the checker
     // whenever any .vX file exists. this was noted as a "works sometimes"
     // solution because not all zip files contain .vX files (ex naskh and
@@ -21,85 +36,195 @@ class QuranPartialPageChecker @Inject constructor() {
     try {
       // check the partial images for the width
       return checkPartialImages(directory, width, numberOfPages)
+    } catch (cancellationException: CancellationException) {
+      throw cancellationException
     } catch (throwable: Throwable) {
       Timber.e(throwable, "Error while checking partial pages: $width")
     }
     return emptyList()
   }
 
+  /**
+   * Removes the saved progress of checking the pages of [width] in [directory].
+   */
+  fun clearCheckpoint(directory: String, width: String) {
+    getCheckpointFile(File(directory), width).delete()
+  }
+
+  @VisibleForTesting
+  internal fun getCheckpointFile(directory: File, width: String): File {
+    // kept outside of the images directory, since its files are counted as pages
+    return File(directory.parentFile ?: directory, CHECKPOINT_PREFIX + width)
+  }
+
   /**
    * Check for partial images and return them.
-   * This opens every downloaded image and looks at the last set of pixels.
+   * Pages verified by the [PageImageManifest] of the directory are skipped. This decodes the
+   * bottom of every other downloaded image and looks at the last set of pixels.
    * If the last few rows are blank, the image is assumed to be partial and
-   * the image is returned.
+   * the image is returned. The other pages are marked as verified in the manifest as they are
+   * decoded.
    */
-  private fun checkPartialImages(directoryName: String,
-                                 width: String,
-                                 numberOfPages: Int): List<Int> {
-    val result = mutableListOf<Int>()
+  private suspend fun checkPartialImages(directoryName: String,
+                                         width: String,
+                                         numberOfPages: Int): List<Int> {
+    val directory = File(directoryName)
+    val checkpointFile = getCheckpointFile(directory, width)
+    val checkpoint = readCheckpoint(checkpointFile)
+    val result = checkpoint?.partialPages?.toMutableList() ?: mutableListOf()
 
-    // scale images down to 1/16th of size
-    val options = BitmapFactory.Options()
-        .apply {
-          inSampleSize = 16
-        }
+    // verified pages were completely written, so there's no need to decode them
+    val manifest = PageImageManifest.read(directory)
 
-    val directory = File(directoryName)
-    // optimization to avoid re-generating the pixel array every time
-    var pixelArray: IntArray? = null
+    // this is an optimization to avoid decoding more than needed.
+    val rowsToCheck =
+      // madani, 9 for 1920, 7 for 1280, 5 for 1260 and 1024, and
+      //   less for smaller images.
+      // for naskh, 1 for everything
+      // for qaloon, 2 for largest size, 1 for smallest
+      // for warsh, 2 for everything
+      when (width) {
+        "_1024", "_1260" -> 5
+        "_1280" -> 7
+        "_1920" -> 9
+        else -> 4
+      }
 
     // skip pages 1 and 2 since they're "special" (not full pages)
-    for (page in 3..numberOfPages) {
-      val filename = QuranFileUtils.getPageFileName(page)
-      if (File(directory, filename).exists()) {
-        val bitmap = BitmapFactory.decodeFile(
-            directoryName + File.separator + filename, options
-        )
-
-        // this is an optimization to avoid allocating 8 * width of memory
-        // for everything.
-        val rowsToCheck =
-          // madani, 9 for 1920, 7 for 1280, 5 for 1260 and 1024, and
-          //   less for smaller images.
-          // for naskh, 1 for everything
-          // for qaloon, 2 for largest size, 1 for smallest
-          // for warsh, 2 for everything
-          when (width) {
-            "_1024", "_1260" -> 5
-            "_1280" -> 7
-            "_1920" -> 9
-            else -> 4
-          }
-
-        val bitmapWidth = bitmap.width
-        // these should all be the same size, so we can just allocate once
-        val pixels = if (pixelArray?.size == (bitmapWidth * rowsToCheck)) {
-          pixelArray
-        } else {
-          pixelArray = IntArray(bitmapWidth * rowsToCheck)
-          pixelArray
-        }
+    val firstPage = checkpoint?.nextPage ?: 3
+    val start = System.currentTimeMillis()
+    var checkedPages = 0
+    var checkedBytes = 0L
+    withContext(Dispatchers.Default) {
+      (firstPage..numberOfPages).chunked(CHECKPOINT_INTERVAL).forEach { batch ->
+        val checked = coroutineScope {
+          batch.map { page ->
+            async {
+              val file = File(directory, QuranFileUtils.getPageFileName(page))
+              if (manifest?.isVerified(page) != true && file.exists()) {
+                CheckedPage(page, file, file.length(), isPartialImage(file.path, rowsToCheck))
+              } else {
+                null
+              }
+            }
+          }.awaitAll()
+        }.filterNotNull()
 
-        // get the set of pixels
-        bitmap.getPixels(
-            pixels,
-            0,
-            bitmapWidth,
-            0,
-            bitmap.height - rowsToCheck,
-            bitmapWidth,
-            rowsToCheck
-        )
-
-        // see if there's any non-0 pixel
-        val foundPixel = pixels.any { it != 0 }
-
-        // if all are non-zero, assume the image is partially blank
-        if (!foundPixel) {
-          result.add(page)
+        checkedPages += checked.size
+        checkedBytes += checked.sumOf { it.bytes }
+        result.addAll(checked.filter { it.isPartial }.map { it.page })
+        // only pages decoded by this batch that haven't been written again since then. pages
+        // that were missing may have been downloaded during the check, and pages before the
+        // checkpoint were marked by the run that decoded them.
+        val verifiedPages = checked
+            .filter { !it.isPartial && it.file.length() == it.bytes }
+            .map { it.page }
+        if (verifiedPages.isNotEmpty()) {
+          PageImageManifest.markVerified(directory, numberOfPages, verifiedPages)
         }
+        writeCheckpoint(checkpointFile, Checkpoint(batch.last() + 1, result))
       }
     }
+
+    val elapsed = (System.currentTimeMillis() - start).coerceAtLeast(1)
+    Timber.d("checked %d pages (%d kb) for %s in %d ms, %.1f pages/s",
+        checkedPages, checkedBytes / 1024, width, elapsed, checkedPages * 1000f / elapsed)
     return result
   }
+
+  private fun isPartialImage(path: String, rowsToCheck: Int): Boolean {
+    // an image that can't be decoded at all is as broken as a partial one
+    val bitmap = decodeBottomRows(path, rowsToCheck) ?: return true
+    val rows = minOf(rowsToCheck, bitmap.height)
+    val bitmapWidth = bitmap.width
+    val pixels = IntArray(bitmapWidth * rows)
+
+    // get the set of pixels
+    bitmap.getPixels(pixels, 0, bitmapWidth, 0, bitmap.height - rows, bitmapWidth, rows)
+    bitmap.recycle()
+
+    // if there's no non-0 pixel, assume the image is partially blank
+    return pixels.none { it != 0 }
+  }
+
+  /**
+   * Decodes the bottom of the image at [path], scaled down to 1/16th of its size, such that
+   * it has at least [rowsToCheck] rows. Falls back to decoding the whole image if the region
+   * can't be decoded.
+   */
+  private fun decodeBottomRows(path: String, rowsToCheck: Int): Bitmap? {
+    val options = BitmapFactory.Options().apply { inSampleSize = SAMPLE_SIZE }
+
+    val decoder = try {
+      BitmapRegionDecoder.newInstance(path, false)
+    } catch (ioException: IOException) {
+      null
+    }
+
+    if (decoder != null) {
+      try {
+        val height = decoder.height
+        val top = maxOf(0, height - rowsToCheck * SAMPLE_SIZE)
+        val bitmap = decoder.decodeRegion(Rect(0, top, decoder.width, height), options)
+        if (bitmap != null) {
+          return bitmap
+        }
+      } catch (exception: IllegalArgumentException) {
+        Timber.d(exception, "unable to decode the bottom of %s", path)
+      } finally {
+        decoder.recycle()
+      }
+    }
+    return BitmapFactory.decodeFile(path, options)
+  }
+
+  private class CheckedPage(
+    val page: Int,
+    val file: File,
+    val bytes: Long,
+    val isPartial: Boolean
+  )
+
+  private class Checkpoint(val nextPage: Int, val partialPages: List<Int>)
+
+  private fun readCheckpoint(file: File): Checkpoint? {
+    if (!file.exists()) {
+      return null
+    }
+
+    return try {
+      val lines = file.readLines()
+      val nextPage = lines[0].toInt()
+      val partialPages = lines.getOrNull(1)
+          ?.split(',')
+          ?.filter { it.isNotEmpty() }
+          ?.map { it.toInt() } ?: emptyList()
+      Checkpoint(nextPage, partialPages)
+    } catch (exception: Exception) {
+      Timber.d(exception, "ignoring invalid partial page checkpoint")
+      null
+    }
+  }
+
+  private fun writeCheckpoint(file: File, checkpoint: Checkpoint) {
+    try {
+      val temporaryFile = File(file.path + ".tmp")
+      temporaryFile.writeText(
+          "${checkpoint.nextPage}\n${checkpoint.partialPages.joinToString(",")}\n")
+      if (!temporaryFile.renameTo(file)) {
+        temporaryFile.delete()
+      }
+    } catch (ioException: IOException) {
+      Timber.d(ioException, "unable to write partial page checkpoint")
+    }
+  }
+
+  companion object {
+    // scale images down to 1/16th of size
+    private const val SAMPLE_SIZE = 16
+
+    // number of pages checked between saving progress
+    private const val CHECKPOINT_INTERVAL = 32
+    private const val CHECKPOINT_PREFIX = ".partial_check"
+  }
 }
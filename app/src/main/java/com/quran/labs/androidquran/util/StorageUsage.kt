@@ -0,0 +1,357 @@
+package com.quran.labs.androidquran.util
+
+import timber.log.Timber
+import java.io.DataInputStream
+import java.io.DataOutputStream
+import java.io.File
+import java.io.IOException
+import java.util.ArrayDeque
+import java.util.concurrent.Callable
+import java.util.concurrent.Executors
+
+/**
+ * Keeps track of the space used by each category of files under [baseDirectory].
+ *
+ * Files are counted per unit (a width of page images, the audio of a qari, the database
+ * directories, and everything else), so a change to one unit only means counting that unit
+ * again instead of walking the whole tree. The totals are saved to [stateFile] so they are
+ * available right away the next time, and [rescan] counts everything again to correct them.
+ */
+class StorageUsage(
+  val baseDirectory: File,
+  imagesDirectory: String,
+  private val audioDirectory: String,
+  databaseDirectory: String,
+  ayahInfoDirectory: String,
+  private val arabicDatabase: String,
+  private val stateFile: File
+) {
+  private val basePath = baseDirectory.absolutePath
+  private val imagesPath = splitPath(imagesDirectory)
+  private val databasePaths = listOf(splitPath(databaseDirectory), splitPath(ayahInfoDirectory))
+      .filter { it.isNotEmpty() }
+      .distinct()
+
+  private val lock = Any()
+
+  // unit -> category -> bytes, or null if nothing has been counted yet
+  private var units: MutableMap<String, MutableMap<String, Long>>? = null
+  private var isRescanning = false
+  private val changedDuringRescan = mutableSetOf<String>()
+
+  /**
+   * Where the files of a directory are counted - [category] is null for the database
+   * directories, where the category depends on the name of each file.
+   */
+  private class Location(val unit: String, val category: String?)
+
+  init {
+    read()
+  }
+
+  /**
+   * The total number of bytes used, or null if they haven't been counted yet.
+   */
+  val totalBytes: Long?
+    get() = synchronized(lock) { units?.values?.sumOf { it.values.sum() } }
+
+  /**
+   * The number of bytes used per category, or null if they haven't been counted yet.
+   */
+  fun getCategories(): Map<String, Long>? {
+    return synchronized(lock) {
+      units?.let { current ->
+        val categories = sortedMapOf<String, Long>()
+        current.values.forEach { totals ->
+          totals.forEach { (category, bytes) ->
+            categories[category] = (categories[category] ?: 0L) + bytes
+          }
+        }
+        categories
+      }
+    }
+  }
+
+  /**
+   * Updates the totals after files were deleted.
+   * @param files the deleted files, along with their sizes from before they were deleted
+   */
+  fun onFilesRemoved(files: Map<File, Long>) {
+    synchronized(lock) {
+      val current = units ?: return
+      files.forEach { (file, size) ->
+        val path = file.parentFile?.let { relativePath(it) } ?: return@forEach
+        val location = locate(path)
+        val totals = current[location.unit] ?: return@forEach
+        val category = location.category ?: getDatabaseCategory(file.name)
+        val remaining = (totals[category] ?: 0L) - size
+        if (remaining > 0) {
+          totals[category] = remaining
+        } else {
+          totals.remove(category)
+        }
+
+        if (isRescanning) {
+          changedDuringRescan.add(location.unit)
+        }
+      }
+      write()
+    }
+  }
+
+  /**
+   * Counts the unit containing [directory] again after files were added or removed there. If
+   * [directory] isn't within a single unit (ex it is the base directory), everything is counted
+   * again instead. Nothing is done if nothing has been counted yet.
+   */
+  fun onDirectoryChanged(directory: File) {
+    val path = relativePath(directory) ?: return
+    val unit = locate(path).unit
+    synchronized(lock) {
+      if (units == null) {
+        return
+      } else if (isRescanning) {
+        changedDuringRescan.add(unit)
+        return
+      }
+    }
+
+    if (unit == OTHER_UNIT) {
+      rescan(1)
+    } else {
+      rescanUnit(unit)
+    }
+  }
+
+  /**
+   * Counts all the files again, walking the directories in parallel.
+   * @param threads the number of threads to walk the directories with
+   * @return the total number of bytes used
+   */
+  fun rescan(threads: Int): Long {
+    synchronized(lock) {
+      isRescanning = true
+      changedDuringRescan.clear()
+    }
+
+    val start = System.currentTimeMillis()
+    val counted = try {
+      countAll(threads)
+    } finally {
+      synchronized(lock) { isRescanning = false }
+    }
+
+    val changed = synchronized(lock) {
+      val previous = totalBytes
+      units = counted
+      write()
+      Timber.d("counted %d bytes in %d ms, previously %d bytes",
+          totalBytes, System.currentTimeMillis() - start, previous)
+      changedDuringRescan.toList()
+    }
+
+    // units that changed while counting may have been counted before the change
+    changed.filter { it != OTHER_UNIT }.forEach { rescanUnit(it) }
+    return totalBytes ?: 0L
+  }
+
+  private fun rescanUnit(unit: String) {
+    val totals = HashMap<String, MutableMap<String, Long>>()
+    walk(File(baseDirectory, unit), totals, unit)
+    synchronized(lock) {
+      val current = units ?: return
+      val unitTotals = totals[unit]
+      if (unitTotals == null) {
+        current.remove(unit)
+      } else {
+        current[unit] = unitTotals
+      }
+      write()
+    }
+  }
+
+  private fun countAll(threads: Int): MutableMap<String, MutableMap<String, Long>> {
+    val totals = HashMap<String, MutableMap<String, Long>>()
+
+    // the first two levels (ex the audio directory and the qaris in it) are listed here, so
+    // each directory below them can be walked on its own thread
+    val directories = countFiles(baseDirectory, totals, null)
+        .flatMap { countFiles(it, totals, null) }
+    if (directories.isEmpty()) {
+      return totals
+    }
+
+    val executor = Executors.newFixedThreadPool(threads)
+    try {
+      directories
+          .map { directory ->
+            executor.submit(Callable {
+              HashMap<String, MutableMap<String, Long>>().also { walk(directory, it, null) }
+            })
+          }
+          .forEach { future ->
+            future.get().forEach { (unit, unitTotals) ->
+              val merged = totals.getOrPut(unit) { HashMap() }
+              unitTotals.forEach { (category, bytes) ->
+                merged[category] = (merged[category] ?: 0L) + bytes
+              }
+            }
+          }
+    } finally {
+      executor.shutdown()
+    }
+    return totals
+  }
+
+  private fun walk(
+    root: File,
+    totals: MutableMap<String, MutableMap<String, Long>>,
+    unit: String?
+  ) {
+    val directories = ArrayDeque<File>()
+    directories.add(root)
+    while (directories.isNotEmpty()) {
+      directories.addAll(countFiles(directories.removeFirst(), totals, unit))
+    }
+  }
+
+  /**
+   * Adds the sizes of the files directly within [directory] to [totals] (if [unit] is null or
+   * the files are in [unit]), and returns the directories within it.
+   */
+  private fun countFiles(
+    directory: File,
+    totals: MutableMap<String, MutableMap<String, Long>>,
+    unit: String?
+  ): List<File> {
+    val path = relativePath(directory) ?: return emptyList()
+    val location = locate(path)
+    val files = directory.listFiles() ?: return emptyList()
+
+    val directories = ArrayList<File>()
+    val shouldCount = unit == null || unit == location.unit
+    files.forEach { file ->
+      if (file.isDirectory) {
+        directories.add(file)
+      } else if (shouldCount) {
+        val unitTotals = totals.getOrPut(location.unit) { HashMap() }
+        val category = location.category ?: getDatabaseCategory(file.name)
+        unitTotals[category] = (unitTotals[category] ?: 0L) + file.length()
+      }
+    }
+    return directories
+  }
+
+  private fun locate(path: List<String>): Location {
+    val images = imagesPath.size
+    return when {
+      path.size > images && path.subList(0, images) == imagesPath &&
+          path[images].startsWith(WIDTH_PREFIX) ->
+        Location(path.subList(0, images + 1).joinToString("/"), CATEGORY_PAGES + path[images])
+      audioDirectory.isNotEmpty() && path.firstOrNull() == audioDirectory ->
+        if (path.size > 1) {
+          Location(audioDirectory + "/" + path[1], CATEGORY_AUDIO + "/" + path[1])
+        } else {
+          Location(OTHER_UNIT, CATEGORY_AUDIO)
+        }
+      else -> {
+        val databasePath = databasePaths.firstOrNull {
+          path.size >= it.size && path.subList(0, it.size) == it
+        }
+        if (databasePath != null) {
+          Location(databasePath.joinToString("/"), null)
+        } else {
+          Location(OTHER_UNIT, CATEGORY_OTHER)
+        }
+      }
+    }
+  }
+
+  private fun getDatabaseCategory(fileName: String): String {
+    return if (fileName.startsWith(AYAH_INFO_PREFIX) || fileName.startsWith(arabicDatabase)) {
+      CATEGORY_DATABASES
+    } else {
+      CATEGORY_TRANSLATIONS
+    }
+  }
+
+  private fun relativePath(file: File): List<String>? {
+    val path = file.absolutePath
+    return when {
+      path == basePath -> emptyList()
+      path.startsWith(basePath + File.separator) ->
+        splitPath(path.substring(basePath.length + 1))
+      else -> null
+    }
+  }
+
+  private fun read() {
+    if (!stateFile.exists()) {
+      return
+    }
+
+    try {
+      DataInputStream(stateFile.inputStream().buffered()).use { input ->
+        if (input.readInt() == VERSION && input.readUTF() == basePath) {
+          val saved = HashMap<String, MutableMap<String, Long>>()
+          repeat(input.readInt()) {
+            val unitTotals = HashMap<String, Long>()
+            saved[input.readUTF()] = unitTotals
+            repeat(input.readInt()) {
+              unitTotals[input.readUTF()] = input.readLong()
+            }
+          }
+          units = saved
+        }
+      }
+    } catch (ioException: IOException) {
+      // everything will be counted again
+      Timber.d(ioException, "ignoring invalid storage usage")
+    }
+  }
+
+  private fun write() {
+    val current = units ?: return
+    val temporaryFile = File(stateFile.path + ".tmp")
+    try {
+      DataOutputStream(temporaryFile.outputStream().buffered()).use { output ->
+        output.writeInt(VERSION)
+        output.writeUTF(basePath)
+        output.writeInt(current.size)
+        current.forEach { (unit, unitTotals) ->
+          output.writeUTF(unit)
+          output.writeInt(unitTotals.size)
+          unitTotals.forEach { (category, bytes) ->
+            output.writeUTF(category)
+            output.writeLong(bytes)
+          }
+        }
+      }
+
+      if (!temporaryFile.renameTo(stateFile)) {
+        temporaryFile.delete()
+      }
+    } catch (ioException: IOException) {
+      // the saved totals are only a head start, so they can be counted again next time
+      Timber.d(ioException, "unable to save storage usage")
+      temporaryFile.delete()
+    }
+  }
+
+  companion object {
+    const val CATEGORY_PAGES = "pages/"
+    const val CATEGORY_AUDIO = "audio"
+    const val CATEGORY_TRANSLATIONS = "translations"
+    const val CATEGORY_DATABASES = "databases"
+    const val CATEGORY_OTHER = "other"
+
+    private const val OTHER_UNIT = ""
+    private const val WIDTH_PREFIX = "width"
+    private const val AYAH_INFO_PREFIX = "ayahinfo"
+    private const val VERSION = 1
+
+    private fun splitPath(path: String): List<String> {
+      return path.split('/', File.separatorChar).filter { it.isNotEmpty() }
+    }
+  }
+}
@@ -0,0 +1,113 @@
+package com.quran.labs.androidquran.util
+
+import android.content.Context
+import androidx.annotation.WorkerThread
+import com.quran.data.source.PageProvider
+import com.quran.labs.androidquran.data.QuranDataProvider
+import io.reactivex.Completable
+import io.reactivex.schedulers.Schedulers
+import timber.log.Timber
+import java.io.File
+import java.util.concurrent.atomic.AtomicBoolean
+import javax.inject.Inject
+import javax.inject.Singleton
+
+/**
+ * Keeps track of the space used by the app, so the settings don't have to walk the whole
+ * Quran directory every time they show it.
+ *
+ * Downloads and deletions report their changes here, and the totals are counted again in the
+ * background once per run to catch anything that wasn't reported.
+ */
+@Singleton
+class StorageUsageTracker @Inject constructor(
+  context: Context,
+  private val quranFileUtils: QuranFileUtils,
+  private val pageProvider: PageProvider
+) {
+  private val appContext = context.applicationContext
+  private val isVerified = AtomicBoolean(false)
+  private var storageUsage: StorageUsage? = null
+
+  /**
+   * Returns the app used space in megabytes, or -1 if the Quran directory isn't available.
+   */
+  @WorkerThread
+  fun getAppUsedSpace(): Int {
+    val usage = getStorageUsage() ?: return -1
+    val cached = usage.totalBytes
+    val total = if (cached == null) {
+      isVerified.set(true)
+      usage.rescan(RESCAN_THREADS)
+    } else {
+      verifyInBackground(usage)
+      cached
+    }
+    return (total / (1024 * 1024)).toInt()
+  }
+
+  /**
+   * Returns the bytes used per category (ex pages/width_1024, audio/minshawi_murattal, or
+   * translations), or null if they haven't been counted yet.
+   */
+  fun getCategories(): Map<String, Long>? = getStorageUsage()?.getCategories()
+
+  /**
+   * Call after files were added to or removed from [directory] (ex after a download).
+   */
+  @WorkerThread
+  fun onDirectoryChanged(directory: File) {
+    getStorageUsage()?.onDirectoryChanged(directory)
+  }
+
+  /**
+   * Call after deleting [file], with its size from before it was deleted.
+   */
+  fun onFileRemoved(file: File, size: Long) {
+    onFilesRemoved(mapOf(file to size))
+  }
+
+  /**
+   * Call after deleting files, with their sizes from before they were deleted.
+   */
+  fun onFilesRemoved(files: Map<File, Long>) {
+    if (files.isNotEmpty()) {
+      getStorageUsage()?.onFilesRemoved(files)
+    }
+  }
+
+  @Synchronized
+  private fun getStorageUsage(): StorageUsage? {
+    val base = quranFileUtils.getQuranBaseDirectory(appContext) ?: return null
+    val baseDirectory = File(base)
+    val current = storageUsage
+    return if (current != null && current.baseDirectory == baseDirectory) {
+      current
+    } else {
+      // the totals are saved with their base directory, so moving the app's files
+      // to another location means they will be counted again
+      StorageUsage(
+          baseDirectory,
+          pageProvider.getImagesDirectoryName(),
+          pageProvider.getAudioDirectoryName(),
+          pageProvider.getDatabaseDirectoryName(),
+          pageProvider.getAyahInfoDirectoryName(),
+          QuranDataProvider.QURAN_ARABIC_DATABASE,
+          File(appContext.filesDir, STATE_FILE)
+      ).also { storageUsage = it }
+    }
+  }
+
+  private fun verifyInBackground(usage: StorageUsage) {
+    if (isVerified.compareAndSet(false, true)) {
+      Completable.fromAction { usage.rescan(RESCAN_THREADS) }
+          .subscribeOn(Schedulers.io())
+          .subscribe({ }, { Timber.e(it, "Error verifying storage usage") })
+    }
+  }
+
+  companion object {
+    private const val STATE_FILE = "storage_usage"
+    private const val RESCAN_THREADS = 4
+  }
+}
@@ -8,6 +8,8 @@ import com.quran.data.core.QuranInfo
 import com.quran.labs.androidquran.common.QuranText
 import com.quran.labs.androidquran.common.TranslationMetadata
 import dagger.Reusable
+import java.util.concurrent.Callable
+import java.util.concurrent.Executors
 
 @Reusable
 open class TranslationUtil(@ColorInt private val color: Int,
@@ -30,23 +32,77 @@ open class TranslationUtil(@ColorInt private val color: Int,
       text
     }
 
-    val withoutFooters = footerRegex.replace(textToParse, "")
-    val spannable = SpannableString(withoutFooters)
+    // translations processed at install time already have their footers removed
+    val ayahSpans = if (textToParse === quranText.extraData || quranText.extraData == null) {
+      quranText.ayahSpans
+    } else {
+      null
+    }
+    val processed = if (ayahSpans != null) {
+      ProcessedText(textToParse, ayahSpans)
+    } else {
+      processTranslationText(textToParse)
+    }
 
-    ayahRegex.findAll(withoutFooters)
-        .forEach {
-          val span = ForegroundColorSpan(color)
-          val range = it.range
-          spannable.setSpan(span, range.start, range.last + 1, Spanned.SPAN_EXCLUSIVE_EXCLUSIVE)
-        }
+    val spannable = SpannableString(processed.text)
+    val spans = processed.ayahSpans
+    for (i in spans.indices step 2) {
+      val span = ForegroundColorSpan(color)
+      spannable.setSpan(span, spans[i], spans[i + 1], Spanned.SPAN_EXCLUSIVE_EXCLUSIVE)
+    }
     return TranslationMetadata(quranText.sura, quranText.ayah, spannable, translationId, suraAyah)
   }
 
+  /**
+   * Translation text without footers, along with the start and end offsets of each quoted ayah.
+   */
+  class ProcessedText(val text: String, val ayahSpans: IntArray)
+
   companion object {
     private val ayahRegex = """([«{﴿][\s\S]*?[﴾}»])""".toRegex()
     private val footerRegex = """\[\[[\s\S]*?]]""".toRegex()
     const val MINIMUM_PROCESSING_VERSION = 5
 
+    /**
+     * Removes the footers from [text] and finds the quoted ayahs in what remains.
+     */
+    @JvmStatic
+    fun processTranslationText(text: String): ProcessedText {
+      val withoutFooters = footerRegex.replace(text, "")
+      val matches = ayahRegex.findAll(withoutFooters).toList()
+      val ayahSpans = IntArray(matches.size * 2)
+      matches.forEachIndexed { index, match ->
+        ayahSpans[index * 2] = match.range.first
+        ayahSpans[index * 2 + 1] = match.range.last + 1
+      }
+      return ProcessedText(withoutFooters, ayahSpans)
+    }
+
+    /**
+     * Processes each of [texts] as [processTranslationText] does, spreading the work across
+     * the available processors.
+     */
+    @JvmStatic
+    fun processTranslationTexts(texts: List<String>): List<ProcessedText> {
+      val threads = Runtime.getRuntime().availableProcessors().coerceIn(1, MAX_PROCESSING_THREADS)
+      if (threads == 1 || texts.size < PROCESSING_CHUNK_SIZE) {
+        return texts.map { processTranslationText(it) }
+      }
+
+      val executor = Executors.newFixedThreadPool(threads)
+      try {
+        val futures = texts.chunked(PROCESSING_CHUNK_SIZE).map { chunk ->
+          executor.submit(Callable { chunk.map { processTranslationText(it) } })
+        }
+        return futures.flatMap { it.get() }
+      } finally {
+        executor.shutdownNow()
+      }
+    }
+
+    private const val MAX_PROCESSING_THREADS = 4
+    private const val PROCESSING_CHUNK_SIZE = 256
+
     @JvmStatic
     fun getHyperlinkAyahId(quranText: QuranText): Int? {
       val text = quranText.text
@@ -0,0 +1,365 @@
+package com.quran.labs.androidquran.util;
+
+import androidx.annotation.NonNull;
+import androidx.annotation.Nullable;
+
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.EOFException;
+import java.io.File;
+import java.io.FileInputStream;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.nio.charset.Charset;
+import java.util.zip.CRC32;
+import java.util.zip.DataFormatException;
+import java.util.zip.Inflater;
+import java.util.zip.ZipException;
+
+import timber.log.Timber;
+
+/**
+ * Extracts a zip file while it is being read from a stream (ex while it is being downloaded), so
+ * the archive itself never needs to be written to disk.
+ *
+ * Entries are read from their local headers, so this makes the same checks as
+ * {@link ZipUtils#unzipFile} (no entries outside of the destination, at most
+ * {@link ZipUtils#MAX_FILES} files and {@link ZipUtils#MAX_UNZIPPED_SIZE} bytes). After each
+ * entry, the offset of the next entry in the archive is saved in a checkpoint file, so an
+ * interrupted extraction can continue reading from {@link #getResumeOffset()} (ex using an http
+ * range request) without extracting the earlier entries again.
+ */
+public class ZipStreamExtractor {
+  private static final int LOCAL_HEADER_SIGNATURE = 0x04034b50;
+  private static final int DATA_DESCRIPTOR_SIGNATURE = 0x08074b50;
+  private static final int CENTRAL_DIRECTORY_SIGNATURE = 0x02014b50;
+  private static final int END_OF_CENTRAL_DIRECTORY_SIGNATURE = 0x06054b50;
+
+  private static final int FLAG_ENCRYPTED = 1;
+  private static final int FLAG_DATA_DESCRIPTOR = 1 << 3;
+  private static final int FLAG_UTF8 = 1 << 11;
+  private static final int METHOD_STORED = 0;
+  private static final int METHOD_DEFLATED = 8;
+  private static final long ZIP64_SIZE = 0xffffffffL;
+
+  private static final int BUFFER_SIZE = 8192;
+  private static final int CHECKPOINT_VERSION = 1;
+
+  private final File destination;
+  private final File checkpointFile;
+
+  private long offset;
+  private int processedFiles;
+  private long totalUnzipped;
+
+  public ZipStreamExtractor(@NonNull String destDirectory, @NonNull File checkpointFile) {
+    this.destination = new File(destDirectory);
+    this.checkpointFile = checkpointFile;
+    readCheckpoint();
+  }
+
+  /**
+   * The offset in the archive to continue reading from, or 0 to start from the beginning.
+   */
+  public long getResumeOffset() {
+    return offset;
+  }
+
+  /**
+   * Discards any saved progress, so the next extraction starts from the beginning.
+   */
+  public void reset() {
+    offset = 0;
+    processedFiles = 0;
+    totalUnzipped = 0;
+    checkpointFile.delete();
+  }
+
+  /**
+   * Extract the entries of an archive.
+   * @param input the archive, starting at {@link #getResumeOffset()}
+   * @param item any data object passed back to the listener
+   * @param listener a listener called after each entry, with the total number of files as 0
+   *                 since it isn't known until the end of the archive
+   * @param <T> the type of the item passed in
+   * @throws IOException if reading fails, in which case the extraction can be resumed, or if the
+   *                     archive is invalid ({@link ZipException}), in which case it can't be
+   * @throws IllegalStateException if the archive fails the zip file checks
+   */
+  public <T> void extract(@NonNull InputStream input,
+      T item, @Nullable ZipUtils.ZipListener<T> listener) throws IOException {
+    if (!destination.exists()) {
+      destination.mkdirs();
+    }
+
+    final String canonicalPath = destination.getCanonicalPath();
+    final Source source = new Source(input, offset);
+    while (extractEntry(source, canonicalPath)) {
+      processedFiles++;
+      if (processedFiles >= ZipUtils.MAX_FILES || totalUnzipped >= ZipUtils.MAX_UNZIPPED_SIZE) {
+        throw new IllegalStateException("Invalid zip file.");
+      }
+
+      offset = source.position;
+      writeCheckpoint();
+      if (listener != null) {
+        listener.onProcessingProgress(item, processedFiles, 0);
+      }
+    }
+
+    Timber.d("extracted %d files, %d bytes", processedFiles, totalUnzipped);
+    reset();
+  }
+
+  private boolean extractEntry(Source source, String canonicalPath) throws IOException {
+    final int signature = source.readInt();
+    if (signature == CENTRAL_DIRECTORY_SIGNATURE ||
+        signature == END_OF_CENTRAL_DIRECTORY_SIGNATURE) {
+      // the central directory only repeats what the local headers said
+      return false;
+    } else if (signature != LOCAL_HEADER_SIGNATURE) {
+      throw new ZipException("Invalid local header at " + (source.position - 4));
+    }
+
+    source.skip(2); // version needed to extract
+    final int flags = source.readShort();
+    final int method = source.readShort();
+    source.skip(4); // modification time and date
+    long crc = source.readUnsignedInt();
+    final long compressedSize = source.readUnsignedInt();
+    final long size = source.readUnsignedInt();
+    final int nameLength = source.readShort();
+    final int extraLength = source.readShort();
+    final String name = new String(source.readBytes(nameLength),
+        Charset.forName((flags & FLAG_UTF8) != 0 ? "UTF-8" : "ISO-8859-1"));
+    source.skip(extraLength);
+
+    final boolean hasDataDescriptor = (flags & FLAG_DATA_DESCRIPTOR) != 0;
+    if ((flags & FLAG_ENCRYPTED) != 0 || compressedSize == ZIP64_SIZE || size == ZIP64_SIZE ||
+        (method == METHOD_STORED && hasDataDescriptor) ||
+        (method != METHOD_STORED && method != METHOD_DEFLATED)) {
+      throw new ZipException("Unsupported zip entry: " + name);
+    }
+
+    final File currentEntryFile = new File(destination, name);
+    if (!currentEntryFile.getCanonicalPath().startsWith(canonicalPath)) {
+      throw new IllegalStateException("Invalid zip file.");
+    }
+
+    final boolean isDirectory = name.endsWith("/");
+    if (isDirectory) {
+      if (!currentEntryFile.exists()) {
+        currentEntryFile.mkdirs();
+      }
+    } else if (currentEntryFile.exists()) {
+      // delete files that already exist
+      currentEntryFile.delete();
+    }
+
+    final CRC32 actualCrc = new CRC32();
+    try (OutputStream output = isDirectory ? null : new FileOutputStream(currentEntryFile)) {
+      if (method == METHOD_STORED) {
+        copy(source, compressedSize, output, actualCrc);
+      } else {
+        inflate(source, output, actualCrc);
+      }
+    } catch (IOException | RuntimeException exception) {
+      if (!isDirectory) {
+        currentEntryFile.delete();
+      }
+      throw exception;
+    }
+
+    if (hasDataDescriptor) {
+      // the signature of the data descriptor is optional
+      final long first = source.readUnsignedInt();
+      crc = first == DATA_DESCRIPTOR_SIGNATURE ? source.readUnsignedInt() : first;
+      source.skip(8); // compressed and uncompressed sizes
+    }
+
+    if (!isDirectory && crc != actualCrc.getValue()) {
+      currentEntryFile.delete();
+      throw new ZipException("Invalid crc for " + name);
+    }
+    return true;
+  }
+
+  private void copy(Source source, long length, OutputStream output, CRC32 crc)
+      throws IOException {
+    long remaining = length;
+    while (remaining > 0) {
+      source.require();
+      final int count = (int) Math.min(remaining, source.available());
+      write(output, crc, source.buffer, source.bufferPosition, count);
+      source.consume(count);
+      remaining -= count;
+    }
+  }
+
+  private void inflate(Source source, OutputStream output, CRC32 crc) throws IOException {
+    final Inflater inflater = new Inflater(true);
+    try {
+      final byte[] buffer = new byte[BUFFER_SIZE];
+      while (!inflater.finished()) {
+        if (inflater.needsInput()) {
+          source.require();
+          final int available = source.available();
+          inflater.setInput(source.buffer, source.bufferPosition, available);
+          source.consume(available);
+        }
+
+        final int inflated = inflater.inflate(buffer);
+        if (inflated > 0) {
+          write(output, crc, buffer, 0, inflated);
+        } else if (inflater.needsDictionary()) {
+          throw new ZipException("Invalid deflated data");
+        }
+      }
+
+      // give back the bytes that belong to whatever follows the entry
+      source.unread(inflater.getRemaining());
+    } catch (DataFormatException dataFormatException) {
+      throw new ZipException(dataFormatException.getMessage());
+    } finally {
+      inflater.end();
+    }
+  }
+
+  private void write(@Nullable OutputStream output, CRC32 crc,
+      byte[] buffer, int start, int count) throws IOException {
+    totalUnzipped += count;
+    if (totalUnzipped > ZipUtils.MAX_UNZIPPED_SIZE) {
+      throw new IllegalStateException("Invalid zip file.");
+    }
+
+    crc.update(buffer, start, count);
+    if (output != null) {
+      output.write(buffer, start, count);
+    }
+  }
+
+  private void readCheckpoint() {
+    if (!checkpointFile.exists()) {
+      return;
+    }
+
+    try (DataInputStream input = new DataInputStream(new FileInputStream(checkpointFile))) {
+      if (input.readInt() == CHECKPOINT_VERSION) {
+        offset = input.readLong();
+        processedFiles = input.readInt();
+        totalUnzipped = input.readLong();
+      }
+    } catch (IOException ioException) {
+      Timber.d(ioException, "ignoring invalid unzip checkpoint");
+      reset();
+    }
+  }
+
+  private void writeCheckpoint() {
+    final File temporaryFile = new File(checkpointFile.getPath() + ".tmp");
+    try (DataOutputStream output = new DataOutputStream(new FileOutputStream(temporaryFile))) {
+      output.writeInt(CHECKPOINT_VERSION);
+      output.writeLong(offset);
+      output.writeInt(processedFiles);
+      output.writeLong(totalUnzipped);
+    } catch (IOException ioException) {
+      // without a checkpoint, an interrupted extraction starts over
+      Timber.d(ioException, "unable to write unzip checkpoint");
+      temporaryFile.delete();
+      return;
+    }
+
+    if (!temporaryFile.renameTo(checkpointFile)) {
+      temporaryFile.delete();
+    }
+  }
+
+  /**
+   * A buffered stream that knows its exact position in the archive, including bytes that were
+   * given back after inflating an entry.
+   */
+  private static class Source {
+    private final InputStream input;
+    private final byte[] buffer = new byte[BUFFER_SIZE];
+    private int bufferPosition;
+    private int bufferLimit;
+    private long position;
+
+    Source(InputStream input, long position) {
+      this.input = input;
+      this.position = position;
+    }
+
+    int available() {
+      return bufferLimit - bufferPosition;
+    }
+
+    /**
+     * Makes sure that at least one byte is buffered.
+     */
+    void require() throws IOException {
+      if (bufferPosition == bufferLimit) {
+        final int read = input.read(buffer, 0, buffer.length);
+        if (read <= 0) {
+          throw new EOFException("Unexpected end of zip file at " + position);
+        }
+        bufferPosition = 0;
+        bufferLimit = read;
+      }
+    }
+
+    void consume(int count) {
+      bufferPosition += count;
+      position += count;
+    }
+
+    void unread(int count) {
+      bufferPosition -= count;
+      position -= count;
+    }
+
+    int readByte() throws IOException {
+      require();
+      final int value = buffer[bufferPosition] & 0xff;
+      consume(1);
+      return value;
+    }
+
+    int readShort() throws IOException {
+      return readByte() | (readByte() << 8);
+    }
+
+    int readInt() throws IOException {
+      return readShort() | (readShort() << 16);
+    }
+
+    long readUnsignedInt() throws IOException {
+      return readInt() & 0xffffffffL;
+    }
+
+    byte[] readBytes(int count) throws IOException {
+      final byte[] result = new byte[count];
+      int read = 0;
+      while (read < count) {
+        require();
+        final int length = Math.min(count - read, available());
+        System.arraycopy(buffer, bufferPosition, result, read, length);
+        consume(length);
+        read += length;
+      }
+      return result;
+    }
+
+    void skip(long count) throws IOException {
+      long remaining = count;
+      while (remaining > 0) {
+        require();
+        final int length = (int) Math.min(remaining, available());
+        consume(length);
+        remaining -= length;
+      }
+    }
+  }
+}
@@ -11,6 +11,8 @@ import android.graphics.Matrix;
 import android.graphics.Paint;
 import android.graphics.Paint.Align;
 import android.graphics.Paint.FontMetrics;
+import android.graphics.Path;
+import android.graphics.Rect;
 import android.graphics.RectF;
 import android.graphics.drawable.Drawable;
 import android.util.AttributeSet;
@@ -38,6 +40,7 @@ import java.util.SortedMap;
 import java.util.TreeMap;
 
 import androidx.annotation.NonNull;
+import androidx.annotation.Nullable;
 import androidx.appcompat.widget.AppCompatImageView;
 import androidx.core.content.ContextCompat;
 import androidx.core.view.DisplayCutoutCompat;
@@ -60,8 +63,20 @@ public class HighlightingImageView extends AppCompatImageView {
   private boolean isColorFilterOn;
   private int nightModeTextBrightness = Constants.DEFAULT_NIGHT_MODE_TEXT_BRIGHTNESS;
 
-  // cached objects for onDraw
+  // highlights are drawn from paths in view coordinates, one per type in order of priority,
+  // which are only rebuilt when the highlights or the image matrix change
+  private final List<HighlightPath> highlightPaths = new ArrayList<>();
+  private final Set<HighlightType> dirtyHighlightTypes = new HashSet<>();
+  private boolean areAllHighlightsDirty = true;
+  private final Matrix highlightMatrix = new Matrix();
+  private int highlightOffsetX;
+  private int highlightOffsetY;
+
+  // cached objects for building the highlight paths
   private final RectF scaledRect = new RectF();
+  private final RectF pathBounds = new RectF();
+  private final RectF dirtyBounds = new RectF();
+  private final Rect dirtyRect = new Rect();
   private final Set<AyahHighlight> alreadyHighlighted = new HashSet<>();
 
   // Params for drawing text
@@ -124,7 +139,7 @@ public class HighlightingImageView extends AppCompatImageView {
   public void unHighlight(int surah, int ayah, HighlightType type) {
     Set<AyahHighlight> highlights = currentHighlights.get(type);
     if (highlights != null && highlights.remove(new SingleAyahHighlight(surah, ayah))) {
-      invalidate();
+      invalidateHighlights(null);
     }
   }
 
@@ -135,6 +150,7 @@ public class HighlightingImageView extends AppCompatImageView {
       currentHighlights.put(type, highlights);
     }
     highlights.addAll(SingleAyahHighlight.createSet(ayahKeys));
+    invalidateHighlights(null);
   }
 
   public void unHighlight(HighlightType type) {
@@ -149,7 +165,7 @@ public class HighlightingImageView extends AppCompatImageView {
           animator.cancel();
         }
       }
-      invalidate();
+      invalidateHighlights(null);
     }
   }
 
@@ -163,6 +179,7 @@ public class HighlightingImageView extends AppCompatImageView {
     for(Map.Entry<String, List<AyahBounds>> entry: ayahCoordinates.getAyahCoordinates().entrySet()) {
       highlightCoordinates.put(new SingleAyahHighlight(entry.getKey()), entry.getValue());
     }
+    areAllHighlightsDirty = true;
   }
 
   public void setNightMode(boolean isNightMode, int textBrightness) {
@@ -185,17 +202,22 @@ public class HighlightingImageView extends AppCompatImageView {
      */
     Set<AyahHighlight> highlights;
     TransitionAyahHighlight transitionHighlight;
+    HighlightType type;
 
-    public AnimationUpdateListener(Set<AyahHighlight> highlights, TransitionAyahHighlight transitionHighlight) {
+    public AnimationUpdateListener(Set<AyahHighlight> highlights,
+                                   TransitionAyahHighlight transitionHighlight,
+                                   HighlightType type) {
       this.highlights = highlights;
       this.transitionHighlight = transitionHighlight;
+      this.type = type;
     }
 
     @Override
     public void onAnimationUpdate(ValueAnimator animation) {
       List<AyahBounds> value = (List<AyahBounds>) animation.getAnimatedValue();
       highlightCoordinates.put(transitionHighlight, value);
-      invalidate();
+      // only the bounds of the transition changed, so the other types don't need rebuilding
+      invalidateHighlights(type);
     }
 
     @Override
@@ -208,12 +230,14 @@ public class HighlightingImageView extends AppCompatImageView {
       highlightCoordinates.remove(transitionHighlight);
       highlights.remove(transitionHighlight);
       highlights.add(transitionHighlight.getDestination());
+      invalidateHighlights(null);
     }
 
     @Override
     public void onAnimationCancel(Animator animation) {
       highlightCoordinates.remove(transitionHighlight);
       highlights.remove(transitionHighlight);
+      invalidateHighlights(null);
     }
 
     @Override
@@ -222,7 +246,8 @@ public class HighlightingImageView extends AppCompatImageView {
     }
   }
 
-  private void highlightFloatableAyah(Set<AyahHighlight> highlights, AyahHighlight destinationHighlight, HighlightAnimationConfig config) {
+  private void highlightFloatableAyah(Set<AyahHighlight> highlights, AyahHighlight destinationHighlight, HighlightType type) {
+    final HighlightAnimationConfig config = type.getAnimationConfig();
     AyahHighlight previousHighlight = highlights.iterator().next();
     AyahHighlight sourceHighlight;
 
@@ -250,7 +275,7 @@ public class HighlightingImageView extends AppCompatImageView {
 
     animator.setDuration(config.getDuration());
 
-    AnimationUpdateListener listener = new AnimationUpdateListener(highlights, transitionHighlight);
+    AnimationUpdateListener listener = new AnimationUpdateListener(highlights, transitionHighlight, type);
     animator.addUpdateListener(listener);
     animator.addListener(listener);
     animator.setInterpolator(config.getInterpolator());
@@ -294,7 +319,7 @@ public class HighlightingImageView extends AppCompatImageView {
       // clear all others of this type first
       // only if highlight type is floatable
       if (shouldFloatHighlight(highlights, type, surah, ayah)) {
-        highlightFloatableAyah(highlights, singleAyahHighlight, type.getAnimationConfig());
+        highlightFloatableAyah(highlights, singleAyahHighlight, type);
       } else {
         highlights.clear();
         highlights.add(singleAyahHighlight);
@@ -303,6 +328,7 @@ public class HighlightingImageView extends AppCompatImageView {
       highlights.add(singleAyahHighlight);
       currentHighlights.put(type, highlights);
     }
+    invalidateHighlights(null);
   }
 
   @Override
@@ -476,6 +502,119 @@ public class HighlightingImageView extends AppCompatImageView {
     return false;
   }
 
+  private static class HighlightPath {
+    final HighlightType type;
+    final Paint paint;
+    final Path path = new Path();
+
+    HighlightPath(HighlightType type, Paint paint) {
+      this.type = type;
+      this.paint = paint;
+    }
+  }
+
+  /**
+   * Marks the highlights of a type (or of all types if type is null) as changed, and
+   * invalidates the part of the view covered by their old and new bounds.
+   */
+  private void invalidateHighlights(@Nullable HighlightType type) {
+    if (type == null) {
+      areAllHighlightsDirty = true;
+    } else {
+      dirtyHighlightTypes.add(type);
+    }
+
+    if (getDrawable() != null && highlightCoordinates != null) {
+      if (updateHighlightPaths()) {
+        dirtyBounds.roundOut(dirtyRect);
+        invalidate(dirtyRect);
+      }
+    } else {
+      invalidate();
+    }
+  }
+
+  /**
+   * Rebuilds the paths of the highlight types that changed, or of all of them if the image
+   * matrix changed. Returns true if any paths were rebuilt, in which case dirtyBounds holds
+   * the area covered by their old and new bounds.
+   */
+  private boolean updateHighlightPaths() {
+    final Matrix matrix = getImageMatrix();
+    final int offsetX = getPaddingLeft();
+    final int offsetY = getPaddingTop();
+    if (!highlightMatrix.equals(matrix) ||
+        highlightOffsetX != offsetX || highlightOffsetY != offsetY) {
+      highlightMatrix.set(matrix);
+      highlightOffsetX = offsetX;
+      highlightOffsetY = offsetY;
+      areAllHighlightsDirty = true;
+    }
+
+    if (!areAllHighlightsDirty && dirtyHighlightTypes.isEmpty()) {
+      return false;
+    }
+
+    dirtyBounds.setEmpty();
+    // drop the paths of types that are no longer highlighted
+    for (int i = highlightPaths.size() - 1; i >= 0; i--) {
+      final HighlightPath highlightPath = highlightPaths.get(i);
+      if (!currentHighlights.containsKey(highlightPath.type)) {
+        highlightPath.path.computeBounds(pathBounds, true);
+        dirtyBounds.union(pathBounds);
+        highlightPaths.remove(i);
+      }
+    }
+
+    // both are sorted by priority, and every remaining path has a type in currentHighlights
+    int position = 0;
+    alreadyHighlighted.clear();
+    for (Map.Entry<HighlightType, Set<AyahHighlight>> entry : currentHighlights.entrySet()) {
+      final HighlightType type = entry.getKey();
+      HighlightPath highlightPath =
+          position < highlightPaths.size() ? highlightPaths.get(position) : null;
+      boolean isDirty = areAllHighlightsDirty || dirtyHighlightTypes.contains(type);
+      if (highlightPath == null || !highlightPath.type.equals(type)) {
+        highlightPath = new HighlightPath(type, getPaintForHighlightType(type));
+        highlightPaths.add(position, highlightPath);
+        isDirty = true;
+      }
+      position++;
+
+      final Path path = highlightPath.path;
+      if (isDirty) {
+        path.computeBounds(pathBounds, true);
+        dirtyBounds.union(pathBounds);
+        path.rewind();
+      }
+
+      for (AyahHighlight ayahHighlight : entry.getValue()) {
+        if (alreadyHighlightedContains(ayahHighlight)) continue;
+        List<AyahBounds> rangesToDraw = highlightCoordinates == null ?
+            null : highlightCoordinates.get(ayahHighlight);
+        if (rangesToDraw != null && !rangesToDraw.isEmpty()) {
+          if (isDirty) {
+            for (int i = 0, size = rangesToDraw.size(); i < size; i++) {
+              matrix.mapRect(scaledRect, rangesToDraw.get(i).getBounds());
+              scaledRect.offset(offsetX, offsetY);
+              path.addRect(scaledRect, Path.Direction.CW);
+            }
+          }
+          alreadyHighlighted.add(ayahHighlight);
+        }
+      }
+
+      if (isDirty) {
+        path.computeBounds(pathBounds, true);
+        dirtyBounds.union(pathBounds);
+      }
+    }
+
+    areAllHighlightsDirty = false;
+    dirtyHighlightTypes.clear();
+    return true;
+  }
+
   @Override
   protected void onDraw(@NonNull Canvas canvas) {
     super.onDraw(canvas);
@@ -495,22 +634,11 @@ public class HighlightingImageView extends AppCompatImageView {
     }
 
     // Draw each ayah highlight
-    if (highlightCoordinates != null && !currentHighlights.isEmpty()) {
-      alreadyHighlighted.clear();
-      for (Map.Entry<HighlightType, Set<AyahHighlight>> entry : currentHighlights.entrySet()) {
-        Paint paint = getPaintForHighlightType(entry.getKey());
-        for (AyahHighlight ayahHighlight : entry.getValue()) {
-           if (alreadyHighlightedContains(ayahHighlight)) continue;
-           List<AyahBounds> rangesToDraw = highlightCoordinates.get(ayahHighlight);
-           if (rangesToDraw != null && !rangesToDraw.isEmpty()) {
-             for (AyahBounds b : rangesToDraw) {
-               matrix.mapRect(scaledRect, b.getBounds());
-               scaledRect.offset(getPaddingLeft(), getPaddingTop());
-               canvas.drawRect(scaledRect, paint);
-             }
-             alreadyHighlighted.add(ayahHighlight);
-           }
-        }
+    if (highlightCoordinates != null) {
+      updateHighlightPaths();
+      for (int i = 0, size = highlightPaths.size(); i < size; i++) {
+        final HighlightPath highlightPath = highlightPaths.get(i);
+        canvas.drawPath(highlightPath.path, highlightPath.paint);
       }
     }
 
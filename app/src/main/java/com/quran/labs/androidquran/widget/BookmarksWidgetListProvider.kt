@@ -6,10 +6,10 @@ import android.graphics.Color
 import android.os.Bundle
 import android.widget.RemoteViews
 import android.widget.RemoteViewsService.RemoteViewsFactory
-import com.quran.data.core.QuranInfo
 import com.quran.labs.androidquran.QuranApplication
 import com.quran.labs.androidquran.R
 import com.quran.labs.androidquran.database.BookmarksDBAdapter
+import com.quran.labs.androidquran.model.bookmark.BookmarkModel
 import com.quran.labs.androidquran.ui.PagerActivity
 import com.quran.labs.androidquran.ui.helpers.QuranRow
 import com.quran.labs.androidquran.ui.helpers.QuranRowFactory
@@ -24,10 +24,10 @@ class BookmarksWidgetListProvider(private val context: Context) : RemoteViewsFac
   private var quranRowList: List<QuranRow> = listOf()
 
   @Inject
-  lateinit var quranInfo: QuranInfo
+  lateinit var quranRowFactory: QuranRowFactory
 
   @Inject
-  lateinit var quranRowFactory: QuranRowFactory
+  lateinit var bookmarkModel: BookmarkModel
 
   init {
     (context.applicationContext as QuranApplication).applicationComponent.inject(this)
@@ -36,8 +36,8 @@ class BookmarksWidgetListProvider(private val context: Context) : RemoteViewsFac
 
   private fun populateListItem() {
     val appContext = context.applicationContext
-    val mBookmarksDBAdapter = BookmarksDBAdapter(appContext, quranInfo.numberOfPages)
-    val bookmarksList = mBookmarksDBAdapter.getBookmarks(BookmarksDBAdapter.SORT_LOCATION)
+    val bookmarksList = bookmarkModel.getBookmarksObservable(BookmarksDBAdapter.SORT_LOCATION)
+        .blockingGet()
     quranRowList = bookmarksList.map { quranRowFactory.fromBookmark(appContext, it) }
   }
 
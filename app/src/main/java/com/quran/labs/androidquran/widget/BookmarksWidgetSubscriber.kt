@@ -1,5 +1,6 @@
 package com.quran.labs.androidquran.widget
 
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange
 import com.quran.labs.androidquran.model.bookmark.BookmarkModel
 import io.reactivex.android.schedulers.AndroidSchedulers
 import io.reactivex.disposables.Disposable
@@ -26,6 +27,8 @@ class BookmarksWidgetSubscriber @Inject constructor(
 
   private fun subscribeBookmarksWidget() {
     bookmarksWidgetDisposable = bookmarkModel.bookmarksObservable()
+        // the widget doesn't show tags, so it only changes when bookmarks are added or removed
+        .filter { changes -> changes.any { it.type != BookmarkChange.Type.RETAGGED } }
         .observeOn(AndroidSchedulers.mainThread())
         .subscribe { bookmarksWidgetUpdater.updateBookmarksWidget() }
   }
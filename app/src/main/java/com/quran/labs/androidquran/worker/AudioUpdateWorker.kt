@@ -15,11 +15,13 @@ import com.quran.labs.androidquran.database.SuraTimingDatabaseHandler
 import com.quran.labs.androidquran.feature.audio.AudioUpdater
 import com.quran.labs.androidquran.feature.audio.api.AudioUpdateService
 import com.quran.labs.androidquran.feature.audio.util.AudioFileCheckerImpl
+import com.quran.labs.androidquran.feature.audio.util.CachingHashCalculator
 import com.quran.labs.androidquran.feature.audio.util.MD5Calculator
 import com.quran.labs.androidquran.util.AudioUtils
 import com.quran.labs.androidquran.util.NotificationChannelUtil
 import com.quran.labs.androidquran.util.QuranFileUtils
 import com.quran.labs.androidquran.util.QuranSettings
+import com.quran.labs.androidquran.util.StorageUsageTracker
 import kotlinx.coroutines.coroutineScope
 import timber.log.Timber
 import java.io.File
@@ -31,58 +33,69 @@ class AudioUpdateWorker(
   private val audioUpdateService: AudioUpdateService,
   private val audioUtils: AudioUtils,
   private val quranFileUtils: QuranFileUtils,
-  private val quranSettings: QuranSettings
+  private val quranSettings: QuranSettings,
+  private val storageUsageTracker: StorageUsageTracker
 ) : CoroutineWorker(context, params) {
 
   override suspend fun doWork(): Result = coroutineScope {
     val audioPathRoot = quranFileUtils.getQuranAudioDirectory(context)
     if (audioPathRoot != null) {
       val currentVersion = quranSettings.currentAudioRevision
-      val updates = audioUpdateService.getUpdates(currentVersion)
+      // unchanged updates (ex a 304 from the server) were already handled, so they are skipped
+      audioUpdateService.withUpdates(currentVersion) { updates ->
+        Timber.d("local version: %d - server version: %d",
+            currentVersion, updates.currentRevision)
+        if (currentVersion != updates.currentRevision) {
+          // hashes are cached next to the audio directory, so unchanged files aren't read again
+          val hashCacheFile = File(File(audioPathRoot).parentFile, AUDIO_HASH_CACHE)
+          val hashCalculator = CachingHashCalculator(MD5Calculator, hashCacheFile)
+          try {
+            val localFilesToDelete = AudioUpdater.computeUpdates(
+                updates.updates, audioUtils.getQariList(context),
+                AudioFileCheckerImpl(hashCalculator, audioPathRoot, MAX_CONCURRENT_HASHES),
+                AudioDatabaseVersionChecker()
+            )
 
-      Timber.d("local version: %d - server version: %d",
-          currentVersion, updates.currentRevision)
-      if (currentVersion != updates.currentRevision) {
-        val localFilesToDelete = AudioUpdater.computeUpdates(
-            updates.updates, audioUtils.getQariList(context),
-            AudioFileCheckerImpl(MD5Calculator, audioPathRoot),
-            AudioDatabaseVersionChecker()
-        )
+            Timber.d("update count: %d", localFilesToDelete.size)
+            if (localFilesToDelete.isNotEmpty()) {
+              localFilesToDelete.forEach { localUpdate ->
+                if (localUpdate.needsDatabaseUpgrade) {
+                  // delete the database
+                  val dbPath = audioUtils.getQariDatabasePathIfGapless(context, localUpdate.qari)
+                  SuraTimingDatabaseHandler.clearDatabaseHandlerIfExists(dbPath)
+                  Timber.d("would remove %s", dbPath)
+                  File(dbPath).delete()
+                }
 
-        Timber.d("update count: %d", localFilesToDelete.size)
-        if (localFilesToDelete.isNotEmpty()) {
-          localFilesToDelete.forEach { localUpdate ->
-            if (localUpdate.needsDatabaseUpgrade) {
-              // delete the database
-              val dbPath = audioUtils.getQariDatabasePathIfGapless(context, localUpdate.qari)
-              SuraTimingDatabaseHandler.clearDatabaseHandlerIfExists(dbPath)
-              Timber.d("would remove %s", dbPath)
-              File(dbPath).delete()
-            }
-
-            val qari = localUpdate.qari
-            val path = audioUtils.getLocalQariUrl(context, qari)
-            localUpdate.files.forEach {
-              // delete the file
-              val filePath = if (qari.isGapless) {
-                path + File.separator + it
-              } else {
-                // this is a hack to drop the leading 0s in the file name
-                val sura = it.substring(0, 3).toInt().toString()
-                val ayah = it.substring(3, 6).toInt().toString()
-                path + File.separator + sura + File.separator + ayah + ".mp3"
+                val qari = localUpdate.qari
+                val path = audioUtils.getLocalQariUrl(context, qari)
+                localUpdate.files.forEach {
+                  // delete the file
+                  val filePath = if (qari.isGapless) {
+                    path + File.separator + it
+                  } else {
+                    // this is a hack to drop the leading 0s in the file name
+                    val sura = it.substring(0, 3).toInt().toString()
+                    val ayah = it.substring(3, 6).toInt().toString()
+                    path + File.separator + sura + File.separator + ayah + ".mp3"
+                  }
+                  Timber.d("would remove %s", filePath)
+                  File(filePath).delete()
+                }
+                storageUsageTracker.onDirectoryChanged(File(path))
               }
-              Timber.d("would remove %s", filePath)
-              File(filePath).delete()
+
+              // push a notification to inform the person that some files
+              // have been deleted.
+              sendNotification(context)
             }
+          } finally {
+            // keep the hashes computed so far, even if the update fails part of the way
+            hashCalculator.save()
           }
-
-          // push a notification to inform the person that some files
-          // have been deleted.
-          sendNotification(context)
+          Timber.d("updating audio to revision: %d", updates.currentRevision)
+          quranSettings.currentAudioRevision = updates.currentRevision
         }
-        Timber.d("updating audio to revision: %d", updates.currentRevision)
-        quranSettings.currentAudioRevision = updates.currentRevision
       }
     }
     Result.success()
@@ -116,7 +129,8 @@ class AudioUpdateWorker(
     private val audioUpdateService: AudioUpdateService,
     private val audioUtils: AudioUtils,
     private val quranFileUtils: QuranFileUtils,
-    private val quranSettings: QuranSettings
+    private val quranSettings: QuranSettings,
+    private val storageUsageTracker: StorageUsageTracker
   ) : WorkerTaskFactory {
     override fun makeWorker(
       appContext: Context,
@@ -124,8 +138,13 @@ class AudioUpdateWorker(
     ): ListenableWorker {
       return AudioUpdateWorker(
           appContext, workerParameters, audioUpdateService, audioUtils, quranFileUtils,
-          quranSettings
+          quranSettings, storageUsageTracker
       )
     }
   }
+
+  companion object {
+    private const val AUDIO_HASH_CACHE = ".audio_hashes"
+    private const val MAX_CONCURRENT_HASHES = 4
+  }
 }
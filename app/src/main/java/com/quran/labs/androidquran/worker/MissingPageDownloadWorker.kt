@@ -6,15 +6,13 @@ import androidx.work.ListenableWorker
 import androidx.work.WorkerParameters
 import com.quran.data.core.QuranInfo
 import com.quran.labs.androidquran.core.worker.WorkerTaskFactory
+import com.quran.labs.androidquran.service.util.PageDownloader
+import com.quran.labs.androidquran.util.PageImageManifest
 import com.quran.labs.androidquran.util.QuranFileUtils
 import com.quran.labs.androidquran.util.QuranScreenInfo
-import kotlinx.coroutines.Dispatchers
+import com.quran.labs.androidquran.util.StorageUsageTracker
 import kotlinx.coroutines.ExperimentalCoroutinesApi
 import kotlinx.coroutines.coroutineScope
-import kotlinx.coroutines.flow.asFlow
-import kotlinx.coroutines.flow.flowOn
-import kotlinx.coroutines.flow.map
-import kotlinx.coroutines.flow.toList
 import okhttp3.OkHttpClient
 import timber.log.Timber
 import java.io.File
@@ -25,7 +23,8 @@ class MissingPageDownloadWorker(private val context: Context,
                                 private val okHttpClient: OkHttpClient,
                                 private val quranInfo: QuranInfo,
                                 private val quranScreenInfo: QuranScreenInfo,
-                                private val quranFileUtils: QuranFileUtils
+                                private val quranFileUtils: QuranFileUtils,
+                                private val storageUsageTracker: StorageUsageTracker
 ) : CoroutineWorker(context, params) {
 
   @ExperimentalCoroutinesApi
@@ -35,17 +34,24 @@ class MissingPageDownloadWorker(private val context: Context,
     Timber.d("MissingPageDownloadWorker found $pagesToDownload missing pages")
     if (pagesToDownload.size < MISSING_PAGE_LIMIT) {
       // attempt to download missing pages
-      val results = pagesToDownload.asFlow()
-          .map { downloadPage(it) }
-          .flowOn(Dispatchers.IO)
-          .toList()
+      val pageDownloader = PageDownloader(okHttpClient, MAX_CONCURRENT_DOWNLOADS)
+      val downloads = pagesToDownload.mapNotNull { toPageDownload(it) }
+      val summary = pageDownloader.downloadAll(downloads)
 
-      val failures = results.count { !it }
+      // pages that couldn't be downloaded at all (ex without a directory to save them) failed too
+      val failures = summary.failures + (pagesToDownload.size - downloads.size)
       if (failures > 0) {
         Timber.d("MissingPageWorker failed with $failures from ${pagesToDownload.size}")
       } else {
         Timber.d("MissingPageWorker success with ${pagesToDownload.size}")
       }
+      Timber.d("MissingPageWorker downloaded %s", summary)
+
+      summary.results
+          .filter { it.isSuccessful }
+          .map { it.download.directory }
+          .distinct()
+          .forEach { storageUsageTracker.onDirectoryChanged(it) }
     }
     Result.success()
   }
@@ -63,8 +69,13 @@ class MissingPageDownloadWorker(private val context: Context,
   }
 
   private fun findMissingPagesForWidth(width: String): List<PageToDownload> {
-    val result = mutableListOf<PageToDownload>()
     val pagesDirectory = File(quranFileUtils.getQuranImagesDirectory(context, width))
+    val manifest = PageImageManifest.read(pagesDirectory)
+    if (manifest != null && manifest.numberOfPages == quranInfo.numberOfPages) {
+      return manifest.getMissingPages().map { PageToDownload(width, it) }
+    }
+
+    val result = mutableListOf<PageToDownload>()
     for (page in 1..quranInfo.numberOfPages) {
       val pageFile = QuranFileUtils.getPageFileName(page)
       if (!File(pagesDirectory, pageFile).exists()) {
@@ -76,36 +87,39 @@ class MissingPageDownloadWorker(private val context: Context,
 
   data class PageToDownload(val width: String, val page: Int)
 
-  private fun downloadPage(pageToDownload: PageToDownload): Boolean {
-    Timber.d("downloading ${pageToDownload.page} for ${pageToDownload.width} - thread: %s",
-        Thread.currentThread().name)
-    val pageName = QuranFileUtils.getPageFileName(pageToDownload.page)
-
-    return try {
-      quranFileUtils.getImageFromWeb(okHttpClient, context, pageToDownload.width, pageName)
-          .isSuccessful
-    } catch (throwable: Throwable) {
-      false
+  private fun toPageDownload(pageToDownload: PageToDownload): PageDownloader.PageDownload? {
+    val width = pageToDownload.width
+    if (!quranFileUtils.makeQuranDirectory(context, width)) {
+      return null
     }
+
+    val directory = File(quranFileUtils.getQuranImagesDirectory(context, width))
+    val pageName = QuranFileUtils.getPageFileName(pageToDownload.page)
+    return PageDownloader.PageDownload(
+        quranFileUtils.getPageUrl(width, pageName), directory, pageName
+    )
   }
 
   class Factory @Inject constructor(
     private val quranInfo: QuranInfo,
     private val quranFileUtils: QuranFileUtils,
     private val quranScreenInfo: QuranScreenInfo,
-    private val okHttpClient: OkHttpClient
+    private val okHttpClient: OkHttpClient,
+    private val storageUsageTracker: StorageUsageTracker
   ) : WorkerTaskFactory {
     override fun makeWorker(
       appContext: Context,
       workerParameters: WorkerParameters
     ): ListenableWorker {
       return MissingPageDownloadWorker(
-          appContext, workerParameters, okHttpClient, quranInfo, quranScreenInfo, quranFileUtils
+          appContext, workerParameters, okHttpClient, quranInfo, quranScreenInfo, quranFileUtils,
+          storageUsageTracker
       )
     }
   }
 
   companion object {
     private const val MISSING_PAGE_LIMIT = 50
+    private const val MAX_CONCURRENT_DOWNLOADS = 4
   }
 }
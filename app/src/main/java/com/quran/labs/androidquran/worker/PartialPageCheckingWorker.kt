@@ -6,10 +6,12 @@ import androidx.work.ListenableWorker
 import androidx.work.WorkerParameters
 import com.quran.data.core.QuranInfo
 import com.quran.labs.androidquran.core.worker.WorkerTaskFactory
+import com.quran.labs.androidquran.util.PageImageManifest
 import com.quran.labs.androidquran.util.QuranFileUtils
 import com.quran.labs.androidquran.util.QuranPartialPageChecker
 import com.quran.labs.androidquran.util.QuranScreenInfo
 import com.quran.labs.androidquran.util.QuranSettings
+import com.quran.labs.androidquran.util.StorageUsageTracker
 import kotlinx.coroutines.ExperimentalCoroutinesApi
 import kotlinx.coroutines.coroutineScope
 import timber.log.Timber
@@ -23,7 +25,8 @@ class PartialPageCheckingWorker(private val context: Context,
                                 private val quranFileUtils: QuranFileUtils,
                                 private val quranScreenInfo: QuranScreenInfo,
                                 private val quranSettings: QuranSettings,
-                                private val quranPartialPageChecker: QuranPartialPageChecker
+                                private val quranPartialPageChecker: QuranPartialPageChecker,
+                                private val storageUsageTracker: StorageUsageTracker
 ) : CoroutineWorker(context, params) {
 
   @ExperimentalCoroutinesApi
@@ -80,6 +83,18 @@ class PartialPageCheckingWorker(private val context: Context,
         Result.retry()
       } else {
         Timber.d("PartialPageCheckingWorker - partial success!")
+        if (partialPages.isNotEmpty()) {
+          storageUsageTracker.onDirectoryChanged(File(pagesDirectory))
+        }
+        if (tabletPartialPages.isNotEmpty()) {
+          storageUsageTracker.onDirectoryChanged(File(tabletPagesDirectory))
+        }
+        quranPartialPageChecker.clearCheckpoint(pagesDirectory, width)
+        PageImageManifest.rebuildIfStale(File(pagesDirectory), numberOfPages)
+        if (width != tabletWidth) {
+          quranPartialPageChecker.clearCheckpoint(tabletPagesDirectory, tabletWidth)
+          PageImageManifest.rebuildIfStale(File(tabletPagesDirectory), numberOfPages)
+        }
         quranSettings.setCheckedPartialImages(requestedPageType)
         Result.success()
       }
@@ -106,7 +121,8 @@ class PartialPageCheckingWorker(private val context: Context,
     private val quranFileUtils: QuranFileUtils,
     private val quranScreenInfo: QuranScreenInfo,
     private val quranSettings: QuranSettings,
-    private val quranPartialPageChecker: QuranPartialPageChecker
+    private val quranPartialPageChecker: QuranPartialPageChecker,
+    private val storageUsageTracker: StorageUsageTracker
   ) : WorkerTaskFactory {
     override fun makeWorker(
       appContext: Context,
@@ -114,7 +130,7 @@ class PartialPageCheckingWorker(private val context: Context,
     ): ListenableWorker {
       return PartialPageCheckingWorker(
           appContext, workerParameters, quranInfo, quranFileUtils, quranScreenInfo, quranSettings,
-          quranPartialPageChecker
+          quranPartialPageChecker, storageUsageTracker
       )
     }
   }
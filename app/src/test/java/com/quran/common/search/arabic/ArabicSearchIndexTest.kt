@@ -0,0 +1,148 @@
+package com.quran.common.search.arabic
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.util.Random
+import java.util.regex.Pattern
+
+class ArabicSearchIndexTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  @Test
+  fun testNormalizationMatchesRegex() {
+    val characters = "ءآأؤإئاةت" +
+        "هوىيبل"
+    characters.forEach { given ->
+      val pattern = Pattern.compile(ArabicCharacterHelper.generateRegex(given.toString()))
+      characters.forEach { other ->
+        if (pattern.matcher(other.toString()).matches()) {
+          assertThat(ArabicCharacterHelper.normalize(other))
+              .isEqualTo(ArabicCharacterHelper.normalize(given))
+        }
+      }
+    }
+  }
+
+  @Test
+  fun testCandidatesContainAllMatches() {
+    val verses = generateVerses(500)
+    val index = buildIndex(verses)
+
+    val queries = listOf(
+        "الله", // الله
+        "ألله", // ألله
+        "الرحمة", // الرحمة
+        "كتاب مبين", // كتاب مبين
+        "عليم" // عليم
+    )
+
+    queries.forEach { query ->
+      val candidates = index.candidates(query)!!.toSet()
+      val matches = regexMatches(verses, query)
+      assertThat(matches).isNotEmpty()
+      assertThat(candidates).containsAtLeastElementsIn(matches)
+    }
+  }
+
+  @Test
+  fun testUnindexableQueries() {
+    val index = buildIndex(generateVerses(10))
+    // too short to have a trigram
+    assertThat(index.candidates("من")).isNull()
+    // contains regex syntax
+    assertThat(index.candidates("ال.له")).isNull()
+    // unknown trigram
+    assertThat(index.candidates("ققق")).isEmpty()
+  }
+
+  @Test
+  fun testSourceVersion() {
+    val file = temporaryFolder.newFile()
+    ArabicSearchIndex.Builder().apply { add(1, WORDS[0]) }.write(file, 42L)
+    assertThat(ArabicSearchIndex.open(file)!!.sourceVersion).isEqualTo(42L)
+    assertThat(ArabicSearchIndex.open(temporaryFolder.newFile())).isNull()
+  }
+
+  @Test
+  fun testIndexBuiltInMemory() {
+    val verses = generateVerses(100)
+    val builder = ArabicSearchIndex.Builder()
+    verses.forEachIndexed { index, text -> builder.add(index + 1, text) }
+    val file = temporaryFolder.newFile()
+    builder.write(file, 7L)
+
+    val inMemory = builder.build(7L)
+    val mapped = ArabicSearchIndex.open(file)!!
+    assertThat(inMemory.sourceVersion).isEqualTo(7L)
+    WORDS.filter { it.length >= 3 }.forEach { query ->
+      assertThat(inMemory.candidates(query)).isEqualTo(mapped.candidates(query))
+    }
+  }
+
+  @Test
+  fun testIndexedSearchMatchesFullScan() {
+    // roughly the size of the verses table in quran.ar.db
+    val verses = generateVerses(6236)
+    val index = buildIndex(verses)
+
+    WORDS.filter { it.length >= 3 }.forEach { query ->
+      val pattern = Pattern.compile(ArabicCharacterHelper.generateRegex(query))
+      val indexMatches = index.candidates(query)!!
+          .filter { pattern.matcher(verses[it - 1]).find() }
+          .toSet()
+      assertThat(indexMatches).isEqualTo(regexMatches(verses, query))
+    }
+  }
+
+  private fun buildIndex(verses: List<String>): ArabicSearchIndex {
+    val builder = ArabicSearchIndex.Builder()
+    verses.forEachIndexed { index, text -> builder.add(index + 1, text) }
+    val file = temporaryFolder.newFile()
+    builder.write(file, 1L)
+    return ArabicSearchIndex.open(file)!!
+  }
+
+  private fun regexMatches(verses: List<String>, query: String): Set<Int> {
+    val pattern = Pattern.compile(ArabicCharacterHelper.generateRegex(query))
+    return verses.indices
+        .filter { pattern.matcher(verses[it]).find() }
+        .map { it + 1 }
+        .toSet()
+  }
+
+  private fun generateVerses(count: Int): List<String> {
+    val random = Random(114)
+    return (0 until count).map {
+      (0 until 5 + random.nextInt(25)).joinToString(" ") { WORDS[random.nextInt(WORDS.size)] }
+    }
+  }
+
+  companion object {
+    private val WORDS = listOf(
+        "إن", // إن
+        "الله", // الله
+        "ألله", // ألله
+        "الرحمن", // الرحمن
+        "الرحيم", // الرحيم
+        "الرحمه", // الرحمه
+        "كتاب", // كتاب
+        "مبين", // مبين
+        "عليم", // عليم
+        "حكيم", // حكيم
+        "الذين", // الذين
+        "آمنوا", // آمنوا
+        "الصلاة", // الصلاة
+        "الزكاة", // الزكاة
+        "الأرض", // الأرض
+        "السماء", // السماء
+        "موسى", // موسى
+        "على", // على
+        "في", // في
+        "من" // من
+    )
+  }
+}
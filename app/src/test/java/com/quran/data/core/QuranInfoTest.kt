@@ -2,6 +2,7 @@ package com.quran.data.core
 
 import com.google.common.truth.Truth.assertThat
 import com.quran.data.pageinfo.common.MadaniDataSource
+import com.quran.data.source.QuranDataSource
 import org.junit.Test
 
 class QuranInfoTest {
@@ -59,4 +60,103 @@ class QuranInfoTest {
     assertThat(quranInfo.getJuzForDisplayFromPage(201)).isEqualTo(10)
     assertThat(quranInfo.getJuzFromPage(201)).isEqualTo(11)
   }
+
+  @Test
+  fun testAyahIdMatchesLinearSum() {
+    dataSources().forEach { dataSource ->
+      val quranInfo = QuranInfo(dataSource)
+      val ayahCounts = dataSource.getNumberOfAyahsForSuraArray()
+      var expected = 0
+      for (sura in 1..QuranConstants.NUMBER_OF_SURAS) {
+        for (ayah in 1..ayahCounts[sura - 1]) {
+          expected++
+          assertThat(quranInfo.getAyahId(sura, ayah)).isEqualTo(expected)
+        }
+      }
+      assertThat(expected).isEqualTo(6236)
+    }
+  }
+
+  @Test
+  fun testAyahIdMatchesLinearScan() {
+    dataSources().forEach { dataSource ->
+      val quranInfo = QuranInfo(dataSource)
+      val ayahCounts = dataSource.getNumberOfAyahsForSuraArray()
+      for (sura in 1..QuranConstants.NUMBER_OF_SURAS) {
+        // include ayah 0 and ayahs past the end of the sura
+        for (ayah in 0..ayahCounts[sura - 1] + 2) {
+          assertThat(quranInfo.getAyahId(sura, ayah))
+              .isEqualTo(linearAyahId(ayahCounts, sura, ayah))
+        }
+      }
+    }
+  }
+
+  @Test
+  fun testFirstAyahOfEveryPageIsOnThatPage() {
+    dataSources().forEach { dataSource ->
+      val quranInfo = QuranInfo(dataSource)
+      val pageSuraStart = dataSource.getSuraForPageArray()
+      val pageAyahStart = dataSource.getAyahForPageArray()
+      for (page in 1..dataSource.getNumberOfPages()) {
+        assertThat(quranInfo.getPageFromSuraAyah(pageSuraStart[page - 1], pageAyahStart[page - 1]))
+            .isEqualTo(page)
+      }
+    }
+  }
+
+  @Test
+  fun testPageFromSuraAyahMatchesLinearScan() {
+    dataSources().forEach { dataSource ->
+      val quranInfo = QuranInfo(dataSource)
+      val linearLookup = LinearPageLookup(dataSource)
+      val ayahCounts = dataSource.getNumberOfAyahsForSuraArray()
+      for (sura in 1..QuranConstants.NUMBER_OF_SURAS) {
+        // include ayah 0 and ayahs past the end of the sura
+        for (ayah in 0..ayahCounts[sura - 1] + 2) {
+          assertThat(quranInfo.getPageFromSuraAyah(sura, ayah))
+              .isEqualTo(linearLookup.getPage(sura, ayah))
+        }
+      }
+      assertThat(quranInfo.getPageFromSuraAyah(0, 1)).isEqualTo(-1)
+      assertThat(quranInfo.getPageFromSuraAyah(115, 1)).isEqualTo(-1)
+      assertThat(quranInfo.getPageFromSuraAyah(2, 287)).isEqualTo(-1)
+    }
+  }
+
+  private fun dataSources(): List<QuranDataSource> = listOf(MadaniDataSource())
+
+  /**
+   * The original loop from [QuranInfo.getAyahId], used as a reference.
+   */
+  private fun linearAyahId(ayahCounts: IntArray, sura: Int, ayah: Int): Int {
+    var ayahId = 0
+    for (i in 0 until sura - 1) {
+      ayahId += ayahCounts[i]
+    }
+    return ayahId + ayah
+  }
+
+  /**
+   * The original linear scan from [QuranInfo.getPageFromSuraAyah], used as a reference.
+   */
+  private class LinearPageLookup(dataSource: QuranDataSource) {
+    private val numberOfPages = dataSource.getNumberOfPages()
+    private val suraPageStart = dataSource.getPageForSuraArray()
+    private val pageSuraStart = dataSource.getSuraForPageArray()
+    private val pageAyahStart = dataSource.getAyahForPageArray()
+
+    fun getPage(sura: Int, ayah: Int): Int {
+      val currentAyah = if (ayah == 0) 1 else ayah
+      var index = suraPageStart[sura - 1] - 1
+      while (index < numberOfPages) {
+        val ss = pageSuraStart[index]
+        if (ss > sura || ss == sura && pageAyahStart[index] > currentAyah) {
+          break
+        }
+        index++
+      }
+      return index
+    }
+  }
 }
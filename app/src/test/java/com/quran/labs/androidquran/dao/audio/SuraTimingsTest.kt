@@ -0,0 +1,51 @@
+package com.quran.labs.androidquran.dao.audio
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Test
+
+class SuraTimingsTest {
+  // basmallah at 0, ayahs 1 to 4, and the end of the sura at 9000
+  private val timings = SuraTimings(
+      2,
+      intArrayOf(0, 1, 2, 3, 4, SuraTimings.END_OF_SURA),
+      intArrayOf(0, 1000, 3000, 5000, 7000, 9000)
+  )
+
+  @Test
+  fun testGetTime() {
+    assertThat(timings.getTime(0)).isEqualTo(0)
+    assertThat(timings.getTime(3)).isEqualTo(5000)
+    assertThat(timings.getTime(SuraTimings.END_OF_SURA)).isEqualTo(9000)
+    assertThat(timings.getTime(5)).isEqualTo(0)
+  }
+
+  @Test
+  fun testGetAyahForPosition() {
+    assertThat(timings.getAyahForPosition(0)).isEqualTo(1)
+    assertThat(timings.getAyahForPosition(999)).isEqualTo(1)
+    assertThat(timings.getAyahForPosition(1000)).isEqualTo(1)
+    assertThat(timings.getAyahForPosition(2999)).isEqualTo(1)
+    assertThat(timings.getAyahForPosition(3000)).isEqualTo(2)
+    assertThat(timings.getAyahForPosition(6500)).isEqualTo(3)
+    // past the end marker stays on the last ayah
+    assertThat(timings.getAyahForPosition(10000)).isEqualTo(4)
+  }
+
+  @Test
+  fun testMatchesLinearScan() {
+    val ayahs = IntArray(287) { it }
+    val times = IntArray(287) { it * 1234 }
+    val suraTimings = SuraTimings(2, ayahs, times)
+    for (position in 0..(286 * 1234 + 5000) step 97) {
+      val expected = (1..286).lastOrNull { times[it] <= position } ?: 1
+      assertThat(suraTimings.getAyahForPosition(position)).isEqualTo(expected)
+    }
+  }
+
+  @Test
+  fun testEmptyTimings() {
+    val empty = SuraTimings(1, IntArray(0), IntArray(0))
+    assertThat(empty.getTime(1)).isEqualTo(0)
+    assertThat(empty.getAyahForPosition(1000)).isEqualTo(1)
+  }
+}
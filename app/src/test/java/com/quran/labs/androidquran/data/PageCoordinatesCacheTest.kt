@@ -0,0 +1,63 @@
+package com.quran.labs.androidquran.data
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Assert.fail
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+
+class PageCoordinatesCacheTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  @Test
+  fun testMissingCache() {
+    val file = File(temporaryFolder.root, "ayahinfo_1024.db.coords")
+    assertThat(PageCoordinatesCache.open(file, 1L)).isNull()
+  }
+
+  @Test
+  fun testStaleCacheIsIgnored() {
+    val file = File(temporaryFolder.root, "ayahinfo_1024.db.coords")
+    PageCoordinatesCache.Writer(file, 1L, 0).finish()
+
+    assertThat(PageCoordinatesCache.open(file, 1L)).isNotNull()
+    assertThat(PageCoordinatesCache.open(file, 2L)).isNull()
+  }
+
+  @Test
+  fun testAbortKeepsExistingCache() {
+    val file = File(temporaryFolder.root, "ayahinfo_1024.db.coords")
+    PageCoordinatesCache.Writer(file, 1L, 0).finish()
+    PageCoordinatesCache.Writer(file, 2L, 0).abort()
+
+    assertThat(PageCoordinatesCache.open(file, 1L)).isNotNull()
+    assertThat(File(file.path + ".tmp").exists()).isFalse()
+  }
+
+  @Test
+  fun testPagesOutsideOfTheCache() {
+    val file = File(temporaryFolder.root, "ayahinfo_1024.db.coords")
+    PageCoordinatesCache.Writer(file, 1L, 0).finish()
+
+    val cache = PageCoordinatesCache.open(file, 1L)!!
+    assertThat(cache.getAyahCoordinates(1)).isNull()
+    assertThat(cache.getPageCoordinates(false, 1, 2)).isNull()
+  }
+
+  @Test
+  fun testIncompleteCacheIsNotWritten() {
+    val file = File(temporaryFolder.root, "ayahinfo_1024.db.coords")
+    try {
+      PageCoordinatesCache.Writer(file, 1L, 604).finish()
+      fail("an incomplete cache should not be written")
+    } catch (exception: IllegalStateException) {
+      // expected
+    }
+
+    assertThat(file.exists()).isFalse()
+    assertThat(File(file.path + ".tmp").exists()).isFalse()
+  }
+}
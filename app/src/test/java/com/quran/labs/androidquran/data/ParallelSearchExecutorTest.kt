@@ -0,0 +1,78 @@
+package com.quran.labs.androidquran.data
+
+import com.google.common.truth.Truth.assertThat
+import com.quran.labs.androidquran.data.SearchSession.SearchRow
+import org.junit.Test
+import java.util.concurrent.CountDownLatch
+import java.util.concurrent.Executors
+import java.util.concurrent.TimeUnit
+
+class ParallelSearchExecutorTest {
+
+  @Test
+  fun testResultsAreMergedInDatabaseOrder() {
+    val source = FakeSearchSource(
+        mapOf(
+            "first.db" to listOf("skip", "the first"),
+            "second.db" to listOf("the second", "also the second", "the third")
+        )
+    )
+    val searchExecutor = ParallelSearchExecutor(source, Executors.newFixedThreadPool(2))
+
+    val results = searchExecutor.search("the", listOf("first.db", "second.db"), 10)
+    // ayah 2 is found in both databases, so it's only kept from the first one
+    assertThat(results.rows.map { it.text })
+        .containsExactly("the first", "the second", "the third")
+        .inOrder()
+    assertThat(results.timings.keys).containsExactly("first.db", "second.db")
+  }
+
+  @Test
+  fun testGlobalLimitCancelsRemainingSearches() {
+    val blocked = CountDownLatch(1)
+    val interrupted = CountDownLatch(1)
+    val source = object : FakeSearchSource(
+        mapOf(
+            "first.db" to listOf("the first", "the second"),
+            "second.db" to listOf("", "", "the third")
+        )
+    ) {
+      override fun search(
+        database: String,
+        query: String,
+        withSnippets: Boolean
+      ): List<SearchRow>? {
+        if (database == "second.db") {
+          blocked.countDown()
+          try {
+            Thread.sleep(TimeUnit.MINUTES.toMillis(1))
+          } catch (exception: InterruptedException) {
+            interrupted.countDown()
+            throw exception
+          }
+        }
+        return super.search(database, query, withSnippets)
+      }
+    }
+    val searchExecutor = ParallelSearchExecutor(source, Executors.newFixedThreadPool(2))
+
+    val results = searchExecutor.search("the", listOf("first.db", "second.db"), 2)
+    assertThat(results.rows.map { it.text }).containsExactly("the first", "the second")
+    assertThat(results.timings.keys).containsExactly("first.db")
+    if (blocked.await(5, TimeUnit.SECONDS)) {
+      assertThat(interrupted.await(5, TimeUnit.SECONDS)).isTrue()
+    }
+  }
+
+  @Test
+  fun testSearchesAllDatabases() {
+    val databases = (1..10).map { "translation$it.db" }
+    val source = FakeSearchSource(databases.associateWith { listOf("the text") })
+
+    val results = ParallelSearchExecutor(source, Executors.newFixedThreadPool(4))
+        .search("the", databases, 1000)
+    assertThat(results.timings.keys).containsExactlyElementsIn(databases)
+    // the same ayah is found in every database, so it's only kept once
+    assertThat(results.rows.map { it.text }).containsExactly("the text")
+  }
+}
@@ -0,0 +1,176 @@
+package com.quran.labs.androidquran.data
+
+import com.google.common.truth.Truth.assertThat
+import com.quran.common.search.ResultFilter
+import com.quran.labs.androidquran.data.SearchSession.SearchRow
+import org.junit.Test
+import java.util.Collections
+import java.util.concurrent.CountDownLatch
+import java.util.concurrent.Executors
+import java.util.concurrent.TimeUnit
+
+class SearchSessionTest {
+
+  @Test
+  fun testFirstDatabaseWithResultsIsReturned() {
+    val source = FakeSearchSource(
+        mapOf(
+            "first.db" to listOf("nothing here"),
+            "second.db" to listOf("in the beginning", "the end"),
+            "third.db" to listOf("the other")
+        )
+    )
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+
+    val results = session.search("the", listOf("first.db", "second.db", "third.db"))!!
+    assertThat(results.database).isEqualTo("second.db")
+    assertThat(results.rows.map { it.text }).containsExactly("in the beginning", "the end")
+  }
+
+  @Test
+  fun testExtendedQueryIsNarrowedInMemory() {
+    val source = FakeSearchSource(
+        mapOf(
+            "first.db" to listOf("nothing here"),
+            "second.db" to listOf("in the beginning", "the end")
+        )
+    )
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+    val databases = listOf("first.db", "second.db")
+
+    session.search("the", databases)
+    val results = session.search("the e", databases)!!
+
+    assertThat(results.rows.map { it.text }).containsExactly("the end")
+    // neither database is queried again, since first.db had no results
+    assertThat(source.queries).containsExactly("first.db:the", "second.db:the")
+  }
+
+  @Test
+  fun testIncompleteResultsAreQueriedAgain() {
+    val source = FakeSearchSource(mapOf("first.db" to listOf("the a", "the b", "the c")), maxResults = 2)
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+
+    session.search("the", listOf("first.db"))
+    val results = session.search("the c", listOf("first.db"))!!
+
+    assertThat(results.rows.map { it.text }).containsExactly("the c")
+    assertThat(source.queries).containsExactly("first.db:the", "first.db:the c")
+  }
+
+  @Test
+  fun testUnrelatedQueryIsQueriedAgain() {
+    val source = FakeSearchSource(mapOf("first.db" to listOf("the end", "a beginning")))
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+
+    session.search("the", listOf("first.db"))
+    val results = session.search("beg", listOf("first.db"))!!
+
+    assertThat(results.rows.map { it.text }).containsExactly("a beginning")
+    assertThat(source.queries).containsExactly("first.db:the", "first.db:beg")
+  }
+
+  @Test
+  fun testEmptyResultsWithoutAFilterAreQueriedAgain() {
+    val source = object : FakeSearchSource(mapOf("first.db" to listOf("a cat", "a dog"))) {
+      override fun search(
+        database: String,
+        query: String,
+        withSnippets: Boolean
+      ): List<SearchRow>? {
+        // a tiny stand in for full text search operators
+        queries.add("$database:$query")
+        val words = query.split(" OR ")
+        return listOf("a cat", "a dog")
+            .withIndex()
+            .filter { row -> words.any { row.value.contains(it) } }
+            .map { SearchRow(it.index, 1, it.index + 1, it.value) }
+      }
+
+      override fun getResultFilter(database: String, query: String): ResultFilter? = null
+    }
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+
+    assertThat(session.search("bird", listOf("first.db"))).isNull()
+    val results = session.search("bird OR dog", listOf("first.db"))!!
+
+    assertThat(results.rows.map { it.text }).containsExactly("a dog")
+    assertThat(source.queries).containsExactly("first.db:bird", "first.db:bird OR dog")
+  }
+
+  @Test
+  fun testClearedSessionQueriesAgain() {
+    val source = FakeSearchSource(
+        mapOf(
+            "first.db" to listOf("nothing here"),
+            "second.db" to listOf("in the beginning", "the end")
+        )
+    )
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+    val databases = listOf("first.db", "second.db")
+
+    session.search("the", databases)
+    session.clear()
+    val results = session.search("the e", databases)!!
+
+    assertThat(results.rows.map { it.text }).containsExactly("the end")
+    assertThat(source.queries)
+        .containsExactly("first.db:the", "second.db:the", "first.db:the e", "second.db:the e")
+  }
+
+  @Test
+  fun testStaleSearchIsCancelled() {
+    val started = CountDownLatch(1)
+    val source = object : FakeSearchSource(mapOf("first.db" to listOf("the end"))) {
+      override fun search(
+        database: String,
+        query: String,
+        withSnippets: Boolean
+      ): List<SearchRow>? {
+        if (query == "slow") {
+          started.countDown()
+          // blocks until interrupted by the newer search
+          Thread.sleep(TimeUnit.MINUTES.toMillis(1))
+        }
+        return super.search(database, query, withSnippets)
+      }
+    }
+    val session = SearchSession(source, Executors.newFixedThreadPool(2))
+
+    val executor = Executors.newSingleThreadExecutor()
+    val staleSearch = executor.submit<SearchSession.SearchResults?> {
+      session.search("slow", listOf("first.db"))
+    }
+    assertThat(started.await(5, TimeUnit.SECONDS)).isTrue()
+
+    val results = session.search("the", listOf("first.db"))
+    assertThat(results!!.rows).hasSize(1)
+    assertThat(staleSearch.get(5, TimeUnit.SECONDS)).isNull()
+    executor.shutdown()
+  }
+}
+
+/**
+ * A [SearchSession.Source] over in memory databases, where each string is the text of a row.
+ */
+internal open class FakeSearchSource(
+  private val databases: Map<String, List<String>>,
+  private val maxResults: Int = 10
+) : SearchSession.Source {
+  val queries: MutableList<String> = Collections.synchronizedList(mutableListOf())
+
+  override fun search(database: String, query: String, withSnippets: Boolean): List<SearchRow>? {
+    queries.add("$database:$query")
+    return databases[database]
+        ?.withIndex()
+        ?.filter { it.value.contains(query) }
+        ?.map { SearchRow(it.index, 1, it.index + 1, it.value) }
+        ?.take(maxResults)
+  }
+
+  override fun getMaxResults(database: String): Int = maxResults
+
+  override fun getResultFilter(database: String, query: String): ResultFilter? {
+    return ResultFilter { it.contains(query) }
+  }
+}
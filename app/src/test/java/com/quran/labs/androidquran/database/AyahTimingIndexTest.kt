@@ -0,0 +1,52 @@
+package com.quran.labs.androidquran.database
+
+import com.google.common.truth.Truth.assertThat
+import com.quran.labs.androidquran.dao.audio.SuraTimings
+import org.junit.Test
+
+class AyahTimingIndexTest {
+
+  @Test
+  fun testTimingsAreLoadedOnce() {
+    val loads = mutableListOf<Int>()
+    val index = AyahTimingIndex("test.db", 4) { sura ->
+      loads.add(sura)
+      SuraTimings(sura, intArrayOf(1), intArrayOf(sura))
+    }
+
+    assertThat(index.getCachedTimings(1)).isNull()
+    assertThat(index.getTimings(1)!!.getTime(1)).isEqualTo(1)
+    assertThat(index.getTimings(1)!!.getTime(1)).isEqualTo(1)
+    assertThat(index.getCachedTimings(1)).isNotNull()
+    assertThat(loads).containsExactly(1)
+  }
+
+  @Test
+  fun testLeastRecentlyUsedSuraIsEvicted() {
+    val loads = mutableListOf<Int>()
+    val index = AyahTimingIndex("test.db", 2) { sura ->
+      loads.add(sura)
+      SuraTimings(sura, intArrayOf(1), intArrayOf(sura))
+    }
+
+    index.getTimings(1)
+    index.getTimings(2)
+    // touch sura 1 so that sura 2 is the eldest
+    index.getTimings(1)
+    index.getTimings(3)
+
+    assertThat(index.getCachedTimings(1)).isNotNull()
+    assertThat(index.getCachedTimings(2)).isNull()
+    assertThat(index.getCachedTimings(3)).isNotNull()
+    assertThat(loads).containsExactly(1, 2, 3).inOrder()
+  }
+
+  @Test
+  fun testMissingTimingsAreNotCached() {
+    var loads = 0
+    val index = AyahTimingIndex("test.db", 2) { loads++; null }
+    assertThat(index.getTimings(1)).isNull()
+    assertThat(index.getTimings(1)).isNull()
+    assertThat(loads).isEqualTo(2)
+  }
+}
@@ -2,23 +2,30 @@ package com.quran.labs.androidquran.model.bookmark;
 
 import android.content.Context;
 
-import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkCounts;
 
 import org.junit.Before;
+import org.junit.Rule;
 import org.junit.Test;
+import org.junit.rules.TemporaryFolder;
 import org.mockito.Mock;
 import org.mockito.MockitoAnnotations;
 
+import java.io.File;
 import java.io.IOException;
 
+import io.reactivex.Maybe;
 import io.reactivex.observers.TestObserver;
 import okio.Buffer;
+import okio.Okio;
 
 public class BookmarkImportExportModelTest {
   private static final String TAGS_JSON =
       "{\"bookmarks\":[],\"tags\":[{\"id\":1,\"name\":\"First\"}," +
           "{\"id\":2,\"name\":\"Second\"},{\"id\":3,\"name\":\"Third\"}]}";
 
+  @Rule public TemporaryFolder temporaryFolder = new TemporaryFolder();
+
   @Mock Context context;
   @Mock BookmarkModel bookmarkModel;
   private BookmarkImportExportModel bookmarkImportExportModel;
@@ -33,17 +40,31 @@ public class BookmarkImportExportModelTest {
   @Test
   public void testReadBookmarks() {
     Buffer buffer = new Buffer().writeUtf8(TAGS_JSON);
-    TestObserver<BookmarkData> testObserver = new TestObserver<>();
+    TestObserver<BookmarkCounts> testObserver = new TestObserver<>();
     bookmarkImportExportModel.readBookmarks(buffer)
         .subscribe(testObserver);
     testObserver.awaitTerminalEvent();
     testObserver.assertValueCount(1);
     testObserver.assertNoErrors();
+    testObserver.assertValue(new BookmarkCounts(3, 0));
+  }
+
+  @Test
+  public void testReadLargeBookmarks() throws IOException {
+    File backup = temporaryFolder.newFile("quran_android.backup");
+    SyntheticBookmarkSource.write(backup, 100, 50000);
+
+    TestObserver<BookmarkCounts> testObserver = new TestObserver<>();
+    bookmarkImportExportModel.readBookmarks(Okio.buffer(Okio.source(backup)))
+        .subscribe(testObserver);
+    testObserver.awaitTerminalEvent();
+    testObserver.assertNoErrors();
+    testObserver.assertValue(new BookmarkCounts(100, 50000));
   }
 
   @Test
   public void testReadInvalidBookmarks() {
-    TestObserver<BookmarkData> testObserver = new TestObserver<>();
+    TestObserver<BookmarkCounts> testObserver = new TestObserver<>();
 
     Buffer source = new Buffer();
     source.writeUtf8(")");
@@ -54,4 +75,14 @@ public class BookmarkImportExportModelTest {
     testObserver.assertValueCount(0);
     testObserver.assertError(IOException.class);
   }
+
+  @Test
+  public void testImportFailsWhenBackupCantBeReadAgain() {
+    TestObserver<Integer> testObserver = new TestObserver<>();
+    bookmarkImportExportModel.importBookmarksObservable(Maybe.empty())
+        .subscribe(testObserver);
+    testObserver.awaitTerminalEvent();
+    testObserver.assertNoValues();
+    testObserver.assertError(IOException.class);
+  }
 }
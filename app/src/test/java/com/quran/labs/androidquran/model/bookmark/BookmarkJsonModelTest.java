@@ -1,5 +1,8 @@
 package com.quran.labs.androidquran.model.bookmark;
 
+import androidx.annotation.NonNull;
+
+import com.quran.labs.androidquran.dao.bookmark.Bookmark;
 import com.quran.labs.androidquran.dao.bookmark.BookmarkData;
 import com.quran.labs.androidquran.dao.Tag;
 
@@ -40,4 +43,65 @@ public class BookmarkJsonModelTest {
     assertThat(data.getTags()).hasSize(TAGS.size());
     assertThat(data.getTags()).isEqualTo(TAGS);
   }
+
+  @Test
+  public void testStreamingToJsonMatchesBookmarkData() throws IOException {
+    Buffer output = new Buffer();
+    jsonModel.toJson(output, new SyntheticBookmarkSource(3, 25, 10));
+
+    BookmarkData data = jsonModel.fromJson(output);
+    assertThat(data.getTags()).hasSize(3);
+    assertThat(data.getBookmarks()).hasSize(25);
+    assertThat(data.getBookmarks().get(0))
+        .isEqualTo(new SyntheticBookmarkSource(3, 25, 10).getBookmarks(0).get(0));
+    assertThat(data.getRecentPages()).hasSize(1);
+  }
+
+  @Test
+  public void testReadJsonInBatches() throws IOException {
+    Buffer output = new Buffer();
+    jsonModel.toJson(output, new SyntheticBookmarkSource(3, 25, 7));
+
+    final List<Integer> tagBatches = new ArrayList<>();
+    final List<Integer> bookmarkBatches = new ArrayList<>();
+    final List<Bookmark> lastBatch = new ArrayList<>();
+    jsonModel.readJson(output, 10, new BookmarkJsonModel.BookmarkBatchListener() {
+      @Override
+      public void onTags(@NonNull List<Tag> tags) {
+        tagBatches.add(tags.size());
+      }
+
+      @Override
+      public void onBookmarks(@NonNull List<Bookmark> bookmarks) {
+        bookmarkBatches.add(bookmarks.size());
+        lastBatch.clear();
+        lastBatch.addAll(bookmarks);
+      }
+    });
+
+    assertThat(tagBatches).containsExactly(3);
+    assertThat(bookmarkBatches).containsExactly(10, 10, 5).inOrder();
+    assertThat(lastBatch.get(lastBatch.size() - 1).getId()).isEqualTo(25L);
+  }
+
+  @Test
+  public void testReadJsonSkipsUnknownAndNullValues() throws IOException {
+    Buffer buffer = new Buffer().writeUtf8(
+        "{\"tags\":null,\"version\":{\"a\":[1]},\"bookmarks\":[" +
+            "{\"id\":1,\"page\":2,\"timestamp\":3,\"tags\":[]}]}");
+
+    final List<Bookmark> bookmarks = new ArrayList<>();
+    jsonModel.readJson(buffer, 10, new BookmarkJsonModel.BookmarkBatchListener() {
+      @Override
+      public void onTags(@NonNull List<Tag> tags) {
+        throw new AssertionError("no tags expected");
+      }
+
+      @Override
+      public void onBookmarks(@NonNull List<Bookmark> batch) {
+        bookmarks.addAll(batch);
+      }
+    });
+    assertThat(bookmarks).containsExactly(new Bookmark(1, null, null, 2, 3));
+  }
 }
@@ -2,20 +2,25 @@ package com.quran.labs.androidquran.model.bookmark;
 
 import com.quran.labs.androidquran.dao.Tag;
 import com.quran.labs.androidquran.dao.bookmark.Bookmark;
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange;
 import com.quran.labs.androidquran.database.BookmarksDBAdapter;
+import com.quran.labs.androidquran.ui.helpers.QuranRow;
 
 import org.junit.Before;
 import org.junit.Test;
 import org.mockito.Mock;
 import org.mockito.MockitoAnnotations;
 
+import java.io.IOException;
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Collections;
 import java.util.HashSet;
 import java.util.List;
 
 import androidx.core.util.Pair;
 import io.reactivex.observers.TestObserver;
+import okio.Buffer;
 
 import static com.google.common.truth.Truth.assertThat;
 import static org.mockito.Matchers.any;
@@ -24,6 +29,8 @@ import static org.mockito.Matchers.anyInt;
 import static org.mockito.Matchers.anyLong;
 import static org.mockito.Matchers.anySetOf;
 import static org.mockito.Matchers.anyString;
+import static org.mockito.Mockito.doAnswer;
+import static org.mockito.Mockito.never;
 import static org.mockito.Mockito.times;
 import static org.mockito.Mockito.verify;
 import static org.mockito.Mockito.when;
@@ -74,27 +81,29 @@ public class BookmarkModelTest {
     bookmarks.add(
         new Bookmark(42, 46, 1, 502, System.currentTimeMillis(), Collections.singletonList(2L)));
     bookmarks.add(new Bookmark(2, 2, 4, 2, System.currentTimeMillis() - 60000));
-    when(bookmarksAdapter.getBookmarkedAyahsOnPage(anyInt())).thenReturn(bookmarks);
+    when(bookmarksAdapter.getBookmarks(anyInt())).thenReturn(bookmarks);
 
-    Integer[][] inputs = new Integer[][] { new Integer[] { 42 }, new Integer[] { 42, 43 } };
+    Integer[][] inputs = new Integer[][] { new Integer[] { 502 }, new Integer[] { 502, 2, 3 } };
 
-    int total = 0;
     for (Integer[] input : inputs) {
       TestObserver<List<Bookmark>> testObserver = new TestObserver<>();
       model.getBookmarkedAyahsOnPageObservable(input)
           .subscribe(testObserver);
       testObserver.awaitTerminalEvent();
       testObserver.assertNoErrors();
-      testObserver.assertValueCount(input.length);
-      verify(bookmarksAdapter, times(input.length + total)).getBookmarkedAyahsOnPage(anyInt());
-      total += input.length;
+      // pages without bookmarked ayahs are skipped
+      testObserver.assertValueCount(Math.min(input.length, 2));
     }
+
+    // the bookmarks are read once, and pages are looked up in memory afterwards
+    verify(bookmarksAdapter, times(1)).getBookmarks(anyInt());
+    verify(bookmarksAdapter, never()).getBookmarkedAyahsOnPage(anyInt());
   }
 
   @Test
   public void testIsPageBookmarked() {
-    when(bookmarksAdapter.getBookmarkId(null, null, 42)).thenReturn(1L);
-    when(bookmarksAdapter.getBookmarkId(null, null, 43)).thenReturn(-1L);
+    when(bookmarksAdapter.getBookmarks(anyInt()))
+        .thenReturn(Collections.singletonList(new Bookmark(1, null, null, 42)));
 
     TestObserver<Pair<Integer, Boolean>> testObserver = new TestObserver<>();
     model.getIsBookmarkedObservable(42, 43)
@@ -113,5 +122,96 @@ public class BookmarkModelTest {
         assertThat(result.second).isFalse();
       }
     }
+    verify(bookmarksAdapter, never()).getBookmarkId(any(), any(), anyInt());
+  }
+
+  @Test
+  public void testToggleBookmarkPublishesChanges() {
+    when(bookmarksAdapter.addBookmark(2, 255, 42)).thenReturn(7L);
+
+    TestObserver<List<BookmarkChange>> changes = model.bookmarksObservable().test();
+    assertThat(model.toggleBookmarkObservable(2, 255, 42).blockingGet()).isTrue();
+    assertThat(model.getBookmarkId(2, 255, 42).blockingGet()).isEqualTo(7L);
+
+    assertThat(model.toggleBookmarkObservable(2, 255, 42).blockingGet()).isFalse();
+    verify(bookmarksAdapter).removeBookmark(7L);
+    assertThat(model.getBookmarkId(2, 255, 42).blockingGet()).isEqualTo(-1L);
+
+    changes.assertValueCount(2);
+    BookmarkChange added = changes.values().get(0).get(0);
+    assertThat(added.getType()).isEqualTo(BookmarkChange.Type.ADDED);
+    assertThat(added.getBookmark().getId()).isEqualTo(7L);
+    assertThat(changes.values().get(1).get(0).getType()).isEqualTo(BookmarkChange.Type.REMOVED);
+  }
+
+  @Test
+  public void testRemovingTagsPublishesRetaggedBookmarks() {
+    List<Bookmark> bookmarks = new ArrayList<>(3);
+    bookmarks.add(new Bookmark(1, 2, 255, 42, 0, Arrays.asList(1L, 2L)));
+    bookmarks.add(new Bookmark(2, null, null, 43, 0, Collections.singletonList(2L)));
+    bookmarks.add(new Bookmark(3, 3, 1, 50));
+    when(bookmarksAdapter.getBookmarks(anyInt())).thenReturn(bookmarks);
+
+    QuranRow tagHeader = new QuranRow.Builder()
+        .withType(QuranRow.BOOKMARK_HEADER).withTagId(2).build();
+    QuranRow bookmark = new QuranRow.Builder()
+        .withType(QuranRow.AYAH_BOOKMARK).withBookmark(bookmarks.get(2)).build();
+
+    TestObserver<List<BookmarkChange>> changes = model.bookmarksObservable().test();
+    model.removeItemsObservable(Arrays.asList(tagHeader, bookmark)).blockingAwait();
+
+    changes.assertValueCount(1);
+    List<BookmarkChange> published = changes.values().get(0);
+    assertThat(published).hasSize(3);
+    assertThat(published.get(0).getType()).isEqualTo(BookmarkChange.Type.RETAGGED);
+    assertThat(published.get(1).getType()).isEqualTo(BookmarkChange.Type.RETAGGED);
+    assertThat(published.get(2).getType()).isEqualTo(BookmarkChange.Type.REMOVED);
+    assertThat(model.getBookmarkId(3, 1, 50).blockingGet()).isEqualTo(-1L);
+  }
+
+  @Test
+  public void testImportBookmarksInBatches() throws IOException {
+    final BookmarkJsonModel jsonModel = new BookmarkJsonModel();
+    final Buffer backup = new Buffer();
+    jsonModel.toJson(backup, new SyntheticBookmarkSource(3, 1200, 100));
+
+    runImportsInTransaction();
+    TestObserver<List<BookmarkChange>> changes = model.bookmarksObservable().test();
+    TestObserver<Integer> progress =
+        model.importBookmarksObservable(listener -> jsonModel.readJson(backup, 500, listener))
+            .test();
+    progress.awaitTerminalEvent();
+    progress.assertNoErrors();
+    progress.assertValues(3, 503, 1003, 1203);
+
+    verify(bookmarksAdapter).replaceAllBookmarks(any());
+    verify(bookmarksAdapter, times(1)).importTags(any());
+    verify(bookmarksAdapter, times(3)).importBookmarks(any());
+    changes.assertValue(Collections.singletonList(BookmarkChange.RESET));
+  }
+
+  @Test
+  public void testFailedImportIsReported() throws IOException {
+    runImportsInTransaction();
+    TestObserver<List<BookmarkChange>> changes = model.bookmarksObservable().test();
+    TestObserver<Integer> progress =
+        model.importBookmarksObservable(listener -> {
+          listener.onTags(Collections.singletonList(new Tag(1, "First Tag")));
+          throw new IOException("Unable to read the backup");
+        }).test();
+    progress.awaitTerminalEvent();
+    progress.assertValues(1);
+    progress.assertError(IOException.class);
+
+    verify(bookmarksAdapter).replaceAllBookmarks(any());
+    verify(bookmarksAdapter, never()).importBookmarks(any());
+    changes.assertValue(Collections.singletonList(BookmarkChange.RESET));
+  }
+
+  private void runImportsInTransaction() throws IOException {
+    doAnswer(invocation -> {
+      invocation.<BookmarksDBAdapter.BookmarkImporter>getArgument(0).importBookmarks();
+      return null;
+    }).when(bookmarksAdapter).replaceAllBookmarks(any());
   }
 }
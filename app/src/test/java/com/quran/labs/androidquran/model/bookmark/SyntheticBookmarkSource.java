@@ -0,0 +1,84 @@
+package com.quran.labs.androidquran.model.bookmark;
+
+import androidx.annotation.NonNull;
+
+import com.quran.labs.androidquran.dao.RecentPage;
+import com.quran.labs.androidquran.dao.Tag;
+import com.quran.labs.androidquran.dao.bookmark.Bookmark;
+
+import java.io.File;
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
+
+import okio.BufferedSink;
+import okio.Okio;
+
+/**
+ * Generates large synthetic backups for testing and benchmarking the streaming import and
+ * export. Tags and bookmarks are generated a batch at a time, so writing a backup doesn't hold
+ * all of them in memory.
+ */
+class SyntheticBookmarkSource implements BookmarkJsonModel.BookmarkBatchSource {
+  private static final int PAGES = 604;
+  private static final long FIRST_TIMESTAMP = 1600000000L;
+
+  private final int tagCount;
+  private final int bookmarkCount;
+  private final int batchSize;
+
+  SyntheticBookmarkSource(int tagCount, int bookmarkCount, int batchSize) {
+    this.tagCount = tagCount;
+    this.bookmarkCount = bookmarkCount;
+    this.batchSize = batchSize;
+  }
+
+  /**
+   * Writes a backup with {@code tagCount} tags and {@code bookmarkCount} bookmarks to
+   * {@code file}.
+   */
+  static void write(File file, int tagCount, int bookmarkCount) throws IOException {
+    BufferedSink sink = Okio.buffer(Okio.sink(file));
+    try {
+      new BookmarkJsonModel().toJson(sink,
+          new SyntheticBookmarkSource(tagCount, bookmarkCount,
+              BookmarkImportExportModel.BATCH_SIZE));
+    } finally {
+      sink.close();
+    }
+  }
+
+  @NonNull
+  @Override
+  public List<Tag> getTags(long afterId) {
+    List<Tag> tags = new ArrayList<>(batchSize);
+    for (long id = afterId + 1; id <= tagCount && tags.size() < batchSize; id++) {
+      tags.add(new Tag(id, "Tag " + id));
+    }
+    return tags;
+  }
+
+  @NonNull
+  @Override
+  public List<Bookmark> getBookmarks(long afterId) {
+    List<Bookmark> bookmarks = new ArrayList<>(batchSize);
+    for (long id = afterId + 1; id <= bookmarkCount && bookmarks.size() < batchSize; id++) {
+      int page = (int) (id % PAGES) + 1;
+      // every third bookmark is a page bookmark, and every other one is tagged
+      boolean isPageBookmark = id % 3 == 0;
+      Integer sura = isPageBookmark ? null : (int) (id % 114) + 1;
+      Integer ayah = isPageBookmark ? null : (int) (id % 7) + 1;
+      List<Long> tags = tagCount > 0 && id % 2 == 0 ?
+          Collections.singletonList(id % tagCount + 1) : Collections.<Long>emptyList();
+      bookmarks.add(new Bookmark(id, sura, ayah, page, FIRST_TIMESTAMP + id, tags));
+    }
+    return bookmarks;
+  }
+
+  @NonNull
+  @Override
+  public List<RecentPage> getRecentPages() {
+    return Collections.singletonList(new RecentPage(1, FIRST_TIMESTAMP));
+  }
+}
@@ -6,7 +6,6 @@ import android.net.Uri;
 import android.os.ParcelFileDescriptor;
 
 import com.quran.labs.androidquran.model.bookmark.BookmarkImportExportModel;
-import com.quran.labs.androidquran.model.bookmark.BookmarkModel;
 
 import org.junit.Before;
 import org.junit.Test;
@@ -34,7 +33,7 @@ public class QuranImportPresenterTest {
   public void setup() {
     appContext = mock(Context.class);
     BookmarkImportExportModel model = mock(BookmarkImportExportModel.class);
-    presenter = new QuranImportPresenter(appContext, model, mock(BookmarkModel.class));
+    presenter = new QuranImportPresenter(appContext, model);
   }
 
   @Test
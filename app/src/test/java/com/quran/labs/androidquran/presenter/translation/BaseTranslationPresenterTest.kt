@@ -37,7 +37,8 @@ class BaseTranslationPresenterTest {
             return TranslationMetadata(quranText.sura, quranText.ayah, quranText.text, translationId)
           }
         },
-        QuranInfo(MadaniDataSource())
+        QuranInfo(MadaniDataSource()),
+        TranslationResultCache()
     )
   }
 
@@ -2,13 +2,16 @@ package com.quran.labs.androidquran.presenter.translation;
 
 import android.content.Context;
 
+import com.quran.common.networking.ManifestFetcher;
 import com.quran.labs.androidquran.dao.translation.TranslationList;
 import com.quran.labs.androidquran.util.QuranFileUtils;
 import com.quran.labs.androidquran.util.QuranSettings;
 
 import org.junit.After;
 import org.junit.Before;
+import org.junit.Rule;
 import org.junit.Test;
+import org.junit.rules.TemporaryFolder;
 
 import java.io.File;
 import java.io.IOException;
@@ -22,10 +25,13 @@ import okio.Okio;
 
 import static com.google.common.truth.Truth.assertThat;
 import static org.mockito.Mockito.mock;
+import static org.mockito.Mockito.when;
 
 public class TranslationManagerPresenterTest {
   private static final String CLI_ROOT_DIRECTORY = "src/test/resources";
 
+  @Rule public TemporaryFolder temporaryFolder = new TemporaryFolder();
+
   private MockWebServer mockWebServer;
   private TranslationManagerPresenter translationManager;
 
@@ -34,13 +40,15 @@ public class TranslationManagerPresenterTest {
     Context mockAppContext = mock(Context.class);
     QuranSettings mockSettings = mock(QuranSettings.class);
     OkHttpClient mockOkHttp = new OkHttpClient.Builder().build();
+    ManifestFetcher manifestFetcher = new ManifestFetcher(mockOkHttp, temporaryFolder.getRoot());
     mockWebServer = new MockWebServer();
     translationManager = new TranslationManagerPresenter(
-        mockAppContext, mockOkHttp, mockSettings, null,
+        mockAppContext, manifestFetcher, mockSettings, null,
         mock(QuranFileUtils.class)) {
       @Override
-      void writeTranslationList(TranslationList list) {
+      boolean writeTranslationList(TranslationList list) {
         // no op
+        return false;
       }
     };
     translationManager.host = mockWebServer.url("").toString();
@@ -75,7 +83,7 @@ public class TranslationManagerPresenterTest {
     this.mockWebServer.enqueue(mockResponse);
 
     TestObserver<TranslationList> testObserver = new TestObserver<>();
-    this.translationManager.getRemoteTranslationListObservable()
+    this.translationManager.getRemoteTranslationListObservable(false)
         .subscribe(testObserver);
     testObserver.awaitTerminalEvent();
     testObserver.assertValueCount(1);
@@ -84,6 +92,37 @@ public class TranslationManagerPresenterTest {
     assertThat(list.getTranslations()).hasSize(57);
   }
 
+  @Test
+  public void unchangedRemoteTranslationListEmitsTheCachedList() throws Exception {
+    Context context = mock(Context.class);
+    QuranFileUtils quranFileUtils = mock(QuranFileUtils.class);
+    when(quranFileUtils.getQuranDatabaseDirectory(context))
+        .thenReturn(temporaryFolder.newFolder("databases").getAbsolutePath());
+    ManifestFetcher manifestFetcher = new ManifestFetcher(
+        new OkHttpClient.Builder().build(), temporaryFolder.newFolder("manifests"));
+    TranslationManagerPresenter presenter = new TranslationManagerPresenter(
+        context, manifestFetcher, mock(QuranSettings.class), null, quranFileUtils);
+    presenter.host = mockWebServer.url("").toString();
+
+    MockResponse mockResponse = new MockResponse().setHeader("ETag", "\"v1\"");
+    Buffer buffer = new Buffer();
+    buffer.writeAll(Okio.source(new File(CLI_ROOT_DIRECTORY, "translations.json")));
+    mockResponse.setBody(buffer);
+    mockWebServer.enqueue(mockResponse);
+    mockWebServer.enqueue(new MockResponse().setResponseCode(304).setHeader("ETag", "\"v1\""));
+
+    presenter.getRemoteTranslationListObservable(false).blockingSubscribe();
+
+    TestObserver<TranslationList> testObserver = new TestObserver<>();
+    presenter.getRemoteTranslationListObservable(true)
+        .subscribe(testObserver);
+    testObserver.awaitTerminalEvent();
+    testObserver.assertValueCount(1);
+    testObserver.assertNoErrors();
+    assertThat(testObserver.values().get(0).getTranslations()).hasSize(57);
+    assertThat(mockWebServer.getRequestCount()).isEqualTo(2);
+  }
+
   @Test
   public void getRemoteTranslationListObservableIssue() {
     MockResponse mockResponse = new MockResponse();
@@ -91,7 +130,7 @@ public class TranslationManagerPresenterTest {
     this.mockWebServer.enqueue(mockResponse);
 
     TestObserver<TranslationList> testObserver = new TestObserver<>();
-    this.translationManager.getRemoteTranslationListObservable()
+    this.translationManager.getRemoteTranslationListObservable(false)
         .subscribe(testObserver);
     testObserver.awaitTerminalEvent();
     testObserver.assertNoValues();
@@ -0,0 +1,104 @@
+package com.quran.labs.androidquran.presenter.translation
+
+import com.google.common.truth.Truth.assertThat
+import com.quran.data.model.VerseRange
+import com.quran.labs.androidquran.common.QuranAyahInfo
+import com.quran.labs.androidquran.presenter.translation.BaseTranslationPresenter.ResultHolder
+import io.reactivex.Single
+import io.reactivex.subjects.SingleSubject
+import org.junit.Test
+
+class TranslationResultCacheTest {
+  private val verseRange = VerseRange(1, 1, 1, 7, 7)
+  private val key = TranslationResultCache.Key(verseRange, true, listOf("one.db"), 0)
+
+  @Test
+  fun testResultIsCached() {
+    val cache = TranslationResultCache(1024 * 1024)
+    var loads = 0
+    val load = {
+      loads++
+      Single.just(result("first ayah"))
+    }
+
+    val first = cache.get(key, load).blockingGet()
+    val second = cache.get(key, load).blockingGet()
+
+    assertThat(loads).isEqualTo(1)
+    assertThat(second).isSameInstanceAs(first)
+  }
+
+  @Test
+  fun testUpdatedTranslationsAreLoadedAgain() {
+    val cache = TranslationResultCache(1024 * 1024)
+    var loads = 0
+    val load = {
+      loads++
+      Single.just(result("first ayah"))
+    }
+
+    cache.get(key, load).blockingGet()
+    cache.get(key.copy(lastWriteTime = 1), load).blockingGet()
+    cache.get(key.copy(translations = listOf("two.db", "one.db")), load).blockingGet()
+
+    assertThat(loads).isEqualTo(3)
+  }
+
+  @Test
+  fun testEmptyResultIsNotCached() {
+    val cache = TranslationResultCache(1024 * 1024)
+    var loads = 0
+    val load = {
+      loads++
+      Single.just(ResultHolder(emptyArray(), emptyList()))
+    }
+
+    cache.get(key, load).blockingGet()
+    cache.get(key, load).blockingGet()
+
+    assertThat(loads).isEqualTo(2)
+  }
+
+  @Test
+  fun testConcurrentRequestsAreCoalesced() {
+    val cache = TranslationResultCache(1024 * 1024)
+    val subject = SingleSubject.create<ResultHolder>()
+    var loads = 0
+    val load = {
+      loads++
+      subject
+    }
+
+    val first = cache.get(key, load).test()
+    val second = cache.get(key, load).test()
+    first.assertNoValues()
+
+    val result = result("first ayah")
+    subject.onSuccess(result)
+
+    assertThat(loads).isEqualTo(1)
+    first.assertValue(result)
+    second.assertValue(result)
+  }
+
+  @Test
+  fun testCacheIsBoundedBySize() {
+    // large enough for one result of 10 characters, but not two
+    val cache = TranslationResultCache(30)
+    var loads = 0
+    val load = {
+      loads++
+      Single.just(result("ten chars!"))
+    }
+
+    cache.get(key, load).blockingGet()
+    cache.get(key.copy(withArabic = false), load).blockingGet()
+    cache.get(key, load).blockingGet()
+
+    assertThat(loads).isEqualTo(3)
+  }
+
+  private fun result(arabic: String): ResultHolder {
+    return ResultHolder(emptyArray(), listOf(QuranAyahInfo(1, 1, arabic, emptyList(), 1)))
+  }
+}
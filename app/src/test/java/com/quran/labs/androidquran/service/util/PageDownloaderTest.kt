@@ -0,0 +1,178 @@
+package com.quran.labs.androidquran.service.util
+
+import com.google.common.truth.Truth.assertThat
+import kotlinx.coroutines.runBlocking
+import okhttp3.OkHttpClient
+import okhttp3.mockwebserver.Dispatcher
+import okhttp3.mockwebserver.MockResponse
+import okhttp3.mockwebserver.MockWebServer
+import okhttp3.mockwebserver.RecordedRequest
+import okio.Buffer
+import org.junit.After
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+import java.util.concurrent.ConcurrentHashMap
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicInteger
+
+class PageDownloaderTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private lateinit var mockWebServer: MockWebServer
+  private lateinit var okHttpClient: OkHttpClient
+  private lateinit var directory: File
+  private val inFlight = AtomicInteger(0)
+  private val maxInFlight = AtomicInteger(0)
+  private val requestCounts = ConcurrentHashMap<String, AtomicInteger>()
+
+  @Before
+  fun setup() {
+    okHttpClient = OkHttpClient.Builder().build()
+    directory = temporaryFolder.newFolder("width_1024")
+    mockWebServer = MockWebServer()
+    mockWebServer.setDispatcher(object : Dispatcher() {
+      override fun dispatch(request: RecordedRequest): MockResponse {
+        val path = request.path
+        val count = requestCounts.getOrPut(path) { AtomicInteger(0) }.incrementAndGet()
+        return when {
+          path.contains("missing") -> MockResponse().setResponseCode(404)
+          path.contains("error") -> MockResponse().setBody("<html>Service Unavailable</html>")
+          path.contains("truncated") -> MockResponse().setBody(Buffer().write(PNG_SIGNATURE))
+          path.contains("flaky") && count < 3 -> MockResponse().setResponseCode(503)
+          else -> {
+            val current = inFlight.incrementAndGet()
+            maxInFlight.accumulateAndGet(current) { a, b -> maxOf(a, b) }
+            try {
+              // give other requests a chance to overlap with this one
+              Thread.sleep(25)
+            } finally {
+              inFlight.decrementAndGet()
+            }
+
+            // 8kb served at 2kb every 25ms, so roughly 100ms per page
+            MockResponse()
+                .setBody(Buffer().write(pageImage()))
+                .throttleBody(2048, 25, TimeUnit.MILLISECONDS)
+          }
+        }
+      }
+    })
+    mockWebServer.start()
+  }
+
+  @After
+  fun tearDown() {
+    try {
+      mockWebServer.shutdown()
+    } catch (e: Exception) {
+      // no op
+    }
+  }
+
+  @Test
+  fun testDownloadsAllPages() {
+    val pages = pages((1..12).map { "page%03d.png".format(it) })
+    val summary = runBlocking { PageDownloader(okHttpClient, 4, 3, 10).downloadAll(pages) }
+
+    assertThat(summary.successes).isEqualTo(12)
+    assertThat(summary.failures).isEqualTo(0)
+    assertThat(summary.totalBytes).isEqualTo(12L * PAGE_SIZE)
+    pages.forEach {
+      assertThat(File(directory, it.fileName).length()).isEqualTo(PAGE_SIZE.toLong())
+    }
+    assertThat(maxInFlight.get()).isAtMost(4)
+    assertThat(maxInFlight.get()).isGreaterThan(1)
+
+    // temporary files are written outside of the images directory and cleaned up
+    assertThat(directory.list()).hasLength(12)
+    assertThat(temporaryFolder.root.list()).asList().containsExactly("width_1024")
+  }
+
+  @Test
+  fun testRetriesServerErrors() {
+    val pages = pages(listOf("flaky.png", "page001.png"))
+    val summary = runBlocking { PageDownloader(okHttpClient, 2, 3, 10).downloadAll(pages) }
+
+    assertThat(summary.successes).isEqualTo(2)
+    val flaky = summary.results.first { it.download.fileName == "flaky.png" }
+    assertThat(flaky.attempts).isEqualTo(3)
+    assertThat(flaky.bytes).isEqualTo(PAGE_SIZE.toLong())
+    assertThat(File(directory, "flaky.png").exists()).isTrue()
+  }
+
+  @Test
+  fun testGivesUpAfterMaxAttempts() {
+    val summary = runBlocking {
+      PageDownloader(okHttpClient, 2, 2, 10).downloadAll(pages(listOf("flaky.png")))
+    }
+
+    assertThat(summary.failures).isEqualTo(1)
+    assertThat(summary.results.single().attempts).isEqualTo(2)
+    assertThat(File(directory, "flaky.png").exists()).isFalse()
+  }
+
+  @Test
+  fun testClientErrorsAreNotRetried() {
+    val pages = pages(listOf("missing.png", "page001.png"))
+    val summary = runBlocking { PageDownloader(okHttpClient, 2, 3, 10).downloadAll(pages) }
+
+    assertThat(summary.successes).isEqualTo(1)
+    val missing = summary.results.first { it.download.fileName == "missing.png" }
+    assertThat(missing.isSuccessful).isFalse()
+    assertThat(missing.attempts).isEqualTo(1)
+    assertThat(missing.bytes).isEqualTo(0)
+  }
+
+  @Test
+  fun testSerialDownloadsOnePageAtATime() {
+    val pages = pages((1..6).map { "page%03d.png".format(it) })
+    val summary = runBlocking { PageDownloader(okHttpClient, 1, 3, 10).downloadAll(pages) }
+
+    assertThat(summary.successes).isEqualTo(6)
+    assertThat(maxInFlight.get()).isEqualTo(1)
+  }
+
+  @Test
+  fun testInvalidImagesAreNotSaved() {
+    val pages = pages(listOf("error.png", "truncated.png", "page001.png"))
+    val summary = runBlocking { PageDownloader(okHttpClient, 2, 3, 10).downloadAll(pages) }
+
+    assertThat(summary.successes).isEqualTo(1)
+    summary.results.filter { it.download.fileName != "page001.png" }.forEach {
+      assertThat(it.isSuccessful).isFalse()
+      assertThat(it.attempts).isEqualTo(1)
+    }
+    assertThat(directory.list()).asList().containsExactly("page001.png")
+  }
+
+  private fun pages(names: List<String>): List<PageDownloader.PageDownload> {
+    return names.map {
+      PageDownloader.PageDownload(mockWebServer.url("/width_1024/$it").toString(), directory, it)
+    }
+  }
+
+  /**
+   * A fake png of [PAGE_SIZE] bytes, with the png signature and end chunk around zeros.
+   */
+  private fun pageImage(): ByteArray {
+    val image = ByteArray(PAGE_SIZE)
+    PNG_SIGNATURE.copyInto(image)
+    PNG_END.copyInto(image, PAGE_SIZE - PNG_END.size)
+    return image
+  }
+
+  companion object {
+    private const val PAGE_SIZE = 8192
+
+    private val PNG_SIGNATURE =
+      byteArrayOf(0x89.toByte(), 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a)
+    private val PNG_END = byteArrayOf(
+        0, 0, 0, 0, 0x49, 0x45, 0x4e, 0x44, 0xae.toByte(), 0x42, 0x60, 0x82.toByte()
+    )
+  }
+}
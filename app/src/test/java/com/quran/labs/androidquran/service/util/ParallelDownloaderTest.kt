@@ -0,0 +1,140 @@
+package com.quran.labs.androidquran.service.util
+
+import com.google.common.truth.Truth.assertThat
+import okhttp3.OkHttpClient
+import okhttp3.Request
+import okhttp3.mockwebserver.Dispatcher
+import okhttp3.mockwebserver.MockResponse
+import okhttp3.mockwebserver.MockWebServer
+import okhttp3.mockwebserver.RecordedRequest
+import okio.Buffer
+import okio.buffer
+import okio.sink
+import org.junit.After
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicInteger
+
+class ParallelDownloaderTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private lateinit var mockWebServer: MockWebServer
+  private lateinit var okHttpClient: OkHttpClient
+  private val inFlight = AtomicInteger(0)
+  private val maxInFlight = AtomicInteger(0)
+  private val serverInFlight = AtomicInteger(0)
+  private val maxServerInFlight = AtomicInteger(0)
+
+  @Before
+  fun setup() {
+    okHttpClient = OkHttpClient.Builder().build()
+    mockWebServer = MockWebServer()
+    mockWebServer.setDispatcher(object : Dispatcher() {
+      override fun dispatch(request: RecordedRequest): MockResponse {
+        return if (request.path.contains("missing")) {
+          MockResponse().setResponseCode(404)
+        } else {
+          val current = serverInFlight.incrementAndGet()
+          maxServerInFlight.accumulateAndGet(current) { a, b -> maxOf(a, b) }
+          try {
+            // give other requests a chance to reach the server while this one is handled
+            Thread.sleep(25)
+          } finally {
+            serverInFlight.decrementAndGet()
+          }
+
+          // 4kb served at 1kb every 25ms, so roughly 100ms per file
+          MockResponse()
+              .setBody(Buffer().write(ByteArray(FILE_SIZE)))
+              .throttleBody(1024, 25, TimeUnit.MILLISECONDS)
+        }
+      }
+    })
+    mockWebServer.start()
+  }
+
+  @After
+  fun tearDown() {
+    try {
+      mockWebServer.shutdown()
+    } catch (e: Exception) {
+      // no op
+    }
+  }
+
+  @Test
+  fun testDownloadsAllFiles() {
+    val files = (1..12).map { "$it.mp3" }
+    val downloader = ParallelDownloader(4)
+    val result = downloader.downloadAll(files) { download(it) }
+
+    assertThat(result).isTrue()
+    files.forEach {
+      assertThat(File(temporaryFolder.root, it).length()).isEqualTo(FILE_SIZE.toLong())
+    }
+    assertThat(maxInFlight.get()).isAtMost(4)
+    assertThat(maxInFlight.get()).isGreaterThan(1)
+  }
+
+  @Test
+  fun testFailureStopsPendingDownloads() {
+    val files = listOf("missing.mp3") + (1..20).map { "$it.mp3" }
+    val started = AtomicInteger(0)
+    val downloader = ParallelDownloader(2)
+    val result = downloader.downloadAll(files) {
+      started.incrementAndGet()
+      download(it)
+    }
+
+    assertThat(result).isFalse()
+    assertThat(started.get()).isLessThan(files.size)
+  }
+
+  @Test
+  fun testSerialDownloadDoesNotOverlap() {
+    val files = (1..4).map { "$it.mp3" }
+    val result = ParallelDownloader(1).downloadAll(files) { download(it) }
+    assertThat(result).isTrue()
+    assertThat(maxInFlight.get()).isEqualTo(1)
+  }
+
+  @Test
+  fun testParallelRequestsOverlapOnTheServer() {
+    val files = (1..16).map { "$it.mp3" }
+    assertThat(ParallelDownloader(4).downloadAll(files) { download(it) }).isTrue()
+
+    assertThat(mockWebServer.requestCount).isEqualTo(files.size)
+    assertThat(maxServerInFlight.get()).isAtMost(4)
+    assertThat(maxServerInFlight.get()).isGreaterThan(1)
+  }
+
+  private fun download(filename: String): Boolean {
+    val current = inFlight.incrementAndGet()
+    maxInFlight.accumulateAndGet(current) { a, b -> maxOf(a, b) }
+    try {
+      val request = Request.Builder()
+          .url(mockWebServer.url("/audio/$filename"))
+          .build()
+      okHttpClient.newCall(request).execute().use { response ->
+        val body = response.body()
+        if (!response.isSuccessful || body == null) {
+          return false
+        }
+        File(temporaryFolder.root, filename).sink().buffer().use { it.writeAll(body.source()) }
+        return true
+      }
+    } finally {
+      inFlight.decrementAndGet()
+    }
+  }
+
+  companion object {
+    private const val FILE_SIZE = 4096
+  }
+}
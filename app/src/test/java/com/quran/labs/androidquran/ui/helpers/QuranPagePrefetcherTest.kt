@@ -0,0 +1,31 @@
+package com.quran.labs.androidquran.ui.helpers
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Test
+
+class QuranPagePrefetcherTest {
+
+  @Test
+  fun testPrefetchWithoutDirection() {
+    val pages = QuranPagePrefetcher.pagesToPrefetch(50, 0, false, 604)
+    assertThat(pages).containsExactly(51, 49, 52, 48).inOrder()
+  }
+
+  @Test
+  fun testPrefetchForward() {
+    val pages = QuranPagePrefetcher.pagesToPrefetch(50, 1, false, 604)
+    assertThat(pages).containsExactly(51, 52, 49).inOrder()
+  }
+
+  @Test
+  fun testPrefetchBackwardsWhenFast() {
+    val pages = QuranPagePrefetcher.pagesToPrefetch(50, -1, true, 604)
+    assertThat(pages).containsExactly(49, 48, 47, 46, 51).inOrder()
+  }
+
+  @Test
+  fun testPrefetchStaysWithinBounds() {
+    assertThat(QuranPagePrefetcher.pagesToPrefetch(603, 1, true, 604)).containsExactly(604, 602)
+    assertThat(QuranPagePrefetcher.pagesToPrefetch(1, 0, false, 604)).containsExactly(2, 3)
+  }
+}
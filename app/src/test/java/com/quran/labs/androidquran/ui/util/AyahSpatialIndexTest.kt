@@ -0,0 +1,212 @@
+package com.quran.labs.androidquran.ui.util
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Test
+import java.util.Random
+
+class AyahSpatialIndexTest {
+
+  @Test
+  fun testPointInsideBounds() {
+    val index = AyahSpatialIndex.Builder()
+        .add(1, 1, 1, 500f, 0f, 1000f, 100f)
+        .add(1, 2, 1, 0f, 0f, 500f, 100f)
+        .add(1, 2, 2, 600f, 100f, 1000f, 200f)
+        .add(1, 3, 2, 0f, 100f, 600f, 200f)
+        .build()
+
+    assertThat(index.findAyah(750f, 50f).toAyah(index)).isEqualTo("1:1")
+    assertThat(index.findAyah(250f, 50f).toAyah(index)).isEqualTo("1:2")
+    assertThat(index.findAyah(700f, 150f).toAyah(index)).isEqualTo("1:2")
+    assertThat(index.findAyah(100f, 150f).toAyah(index)).isEqualTo("1:3")
+  }
+
+  @Test
+  fun testPointOutsideBoundsFallsBackToClosest() {
+    val index = AyahSpatialIndex.Builder()
+        .add(1, 1, 1, 500f, 0f, 1000f, 100f)
+        .add(1, 2, 1, 0f, 0f, 400f, 100f)
+        .add(1, 3, 2, 0f, 100f, 1000f, 200f)
+        .build()
+
+    // below the last line
+    assertThat(index.findAyah(100f, 500f).toAyah(index)).isEqualTo("1:3")
+    // in the gap between two ayahs on the first line
+    assertThat(index.findAyah(480f, 50f).toAyah(index)).isEqualTo("1:1")
+    assertThat(index.findAyah(420f, 50f).toAyah(index)).isEqualTo("1:2")
+  }
+
+  @Test
+  fun testEmptyIndex() {
+    val index = AyahSpatialIndex.Builder().build()
+    assertThat(index.isEmpty).isTrue()
+    assertThat(index.findAyah(10f, 10f)).isEqualTo(-1)
+  }
+
+  @Test
+  fun testMatchesLinearScan() {
+    val random = Random(604)
+    val pages = (1..PAGES).map { syntheticPage(random) }
+    pages.forEach { page ->
+      val index = page.toIndex()
+      repeat(100) {
+        val x = random.nextFloat() * (PAGE_WIDTH + 100) - 50
+        val y = random.nextFloat() * (PAGE_HEIGHT + 100) - 50
+        assertThat(index.findAyah(x, y).toAyah(index)).isEqualTo(page.linearScan(x, y))
+      }
+    }
+  }
+
+  @Test
+  fun testMatchesLinearScanAtBoundaries() {
+    val random = Random(114)
+    val pages = (1..PAGES).map { syntheticPage(random) }
+    pages.forEach { page ->
+      val index = page.toIndex()
+      page.boundaryPoints().forEach { (x, y) ->
+        assertThat(index.findAyah(x, y).toAyah(index)).isEqualTo(page.linearScan(x, y))
+      }
+    }
+  }
+
+  @Test
+  fun testTiesGoToTheFirstBoundsAdded() {
+    val index = AyahSpatialIndex.Builder()
+        .add(1, 1, 1, 500f, 0f, 1000f, 100f)
+        .add(1, 2, 1, 0f, 0f, 496f, 100f)
+        .build()
+
+    // the middle of the gap is as close to both ayahs
+    assertThat(index.findAyah(498f, 50f).toAyah(index)).isEqualTo("1:1")
+  }
+
+  private fun Int.toAyah(index: AyahSpatialIndex): String? {
+    return if (this == -1) null else "${index.getSura(this)}:${index.getAyah(this)}"
+  }
+
+  private class Bounds(
+    val ayah: String,
+    val line: Int,
+    val left: Float,
+    val top: Float,
+    val right: Float,
+    val bottom: Float
+  )
+
+  /**
+   * A page laid out like a Madani page: 15 lines, each split between a few ayahs, with
+   * pages read right to left.
+   */
+  private class SyntheticPage(val bounds: List<Bounds>) {
+    // like the ayah coordinates of a page, the bounds of each ayah in ayah order
+    private val coordinates: Map<String, List<Bounds>> = bounds.groupBy { it.ayah }
+
+    fun toIndex(): AyahSpatialIndex {
+      val builder = AyahSpatialIndex.Builder()
+      coordinates.forEach { (key, ayahBounds) ->
+        val (sura, ayah) = key.split(":").map { part -> part.toInt() }
+        ayahBounds.forEach {
+          builder.add(sura, ayah, it.line, it.left, it.top, it.right, it.bottom)
+        }
+      }
+      return builder.build()
+    }
+
+    /**
+     * The lookup done before the index existed (ImageAyahUtils.getAyahFromCoordinates), scanning
+     * every bounds of the page in the order of the ayah coordinates.
+     */
+    fun linearScan(x: Float, y: Float): String? {
+      var closestLine = -1
+      var closestDelta = -1
+      val lineAyahs = mutableMapOf<Int, MutableList<String>>()
+      for ((key, ayahBounds) in coordinates) {
+        for (b in ayahBounds) {
+          lineAyahs.getOrPut(b.line) { mutableListOf() }.add(key)
+          if (b.left < b.right && b.top < b.bottom &&
+              x >= b.left && x < b.right && y >= b.top && y < b.bottom) {
+            return key
+          }
+
+          val delta = minOf(Math.abs(b.bottom - y).toInt(), Math.abs(b.top - y).toInt())
+          if (closestDelta == -1 || delta < closestDelta) {
+            closestLine = b.line
+            closestDelta = delta
+          }
+        }
+      }
+
+      var closestAyah: String? = null
+      var leastDeltaX = -1
+      for (key in lineAyahs[closestLine] ?: emptyList<String>()) {
+        for (b in coordinates.getValue(key)) {
+          if (b.line > closestLine) {
+            break
+          } else if (b.line == closestLine) {
+            if (b.right >= x && b.left <= x) {
+              return key
+            }
+
+            val delta = minOf(Math.abs(b.right - x).toInt(), Math.abs(b.left - x).toInt())
+            if (leastDeltaX == -1 || delta < leastDeltaX) {
+              closestAyah = key
+              leastDeltaX = delta
+            }
+          }
+        }
+      }
+      return closestAyah
+    }
+
+    /**
+     * Points on the edges and corners of every bounds, in the gaps between ayahs, and just
+     * outside of the page.
+     */
+    fun boundaryPoints(): List<Pair<Float, Float>> {
+      return bounds.flatMap { b ->
+        val middleX = (b.left + b.right) / 2
+        val middleY = (b.top + b.bottom) / 2
+        listOf(
+            b.left to b.top, b.right to b.top, b.left to b.bottom, b.right to b.bottom,
+            b.left to middleY, b.right to middleY, middleX to b.top, middleX to b.bottom,
+            // the middle of the gap after this ayah, where both ayahs are equally close
+            b.right + GAP / 2 to middleY,
+            -1f to middleY, PAGE_WIDTH + 1 to middleY, middleX to -1f, middleX to PAGE_HEIGHT + 1
+        )
+      }
+    }
+  }
+
+  private fun syntheticPage(random: Random): SyntheticPage {
+    val bounds = mutableListOf<Bounds>()
+    var ayah = 1
+    val lineHeight = PAGE_HEIGHT / LINES
+    for (line in 1..LINES) {
+      val top = (line - 1) * lineHeight
+      var right = PAGE_WIDTH
+      val ayahsOnLine = 1 + random.nextInt(4)
+      for (i in 0 until ayahsOnLine) {
+        val left = if (i == ayahsOnLine - 1) {
+          0f
+        } else {
+          maxOf(0f, right - 50 - random.nextInt(PAGE_WIDTH.toInt() / ayahsOnLine))
+        }
+        // leave a small gap between ayahs, where the ayah markers are
+        bounds.add(Bounds("1:$ayah", line, left, top, right - GAP, top + lineHeight))
+        right = left
+        if (i < ayahsOnLine - 1) {
+          ayah++
+        }
+      }
+    }
+    return SyntheticPage(bounds)
+  }
+
+  companion object {
+    private const val PAGES = 604
+    private const val LINES = 15
+    private const val PAGE_WIDTH = 1260f
+    private const val PAGE_HEIGHT = 2038f
+    private const val GAP = 4f
+  }
+}
@@ -0,0 +1,184 @@
+package com.quran.labs.androidquran.util
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+import java.util.concurrent.CountDownLatch
+import java.util.concurrent.Executors
+import java.util.concurrent.TimeUnit
+
+class PageImageManifestTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private lateinit var directory: File
+
+  @Before
+  fun setup() {
+    directory = temporaryFolder.newFolder("width_1024")
+  }
+
+  @Test
+  fun testMissingManifest() {
+    assertThat(PageImageManifest.read(directory)).isNull()
+  }
+
+  @Test
+  fun testRebuildRecordsPages() {
+    writePage(1, "first")
+    writePage(3, "third page")
+
+    PageImageManifest.rebuild(directory, 3)
+    val manifest = PageImageManifest.read(directory)!!
+    assertThat(manifest.numberOfPages).isEqualTo(3)
+    assertThat(manifest.hasPage(1)).isTrue()
+    assertThat(manifest.hasPage(2)).isFalse()
+    assertThat(manifest.getSize(3)).isEqualTo("third page".length.toLong())
+    // pages that were already there aren't known to be complete
+    assertThat(manifest.isVerified(1)).isFalse()
+    assertThat(manifest.isVerified(3)).isFalse()
+    assertThat(manifest.getMissingPages()).containsExactly(2)
+    assertThat(manifest.hasAllPages()).isFalse()
+
+    // the manifest isn't written into the images directory
+    assertThat(directory.list()).asList().containsExactly("page001.png", "page003.png")
+  }
+
+  @Test
+  fun testChangedDirectoryMakesManifestStale() {
+    writePage(1, "first")
+    PageImageManifest.rebuild(directory, 1)
+    assertThat(PageImageManifest.read(directory)).isNotNull()
+
+    directory.setLastModified(directory.lastModified() + 10_000)
+    assertThat(PageImageManifest.read(directory)).isNull()
+  }
+
+  @Test
+  fun testSavePageUpdatesManifest() {
+    writePage(1, "first")
+    PageImageManifest.rebuild(directory, 2)
+
+    val saved = PageImageManifest.savePage(directory, "page002.png") {
+      it.writeText("second")
+      // simulate the directory changing when a new file is added
+      directory.setLastModified(directory.lastModified() + 10_000)
+      true
+    }
+
+    assertThat(saved).isTrue()
+    val manifest = PageImageManifest.read(directory)!!
+    assertThat(manifest.hasAllPages()).isTrue()
+    assertThat(manifest.getSize(2)).isEqualTo("second".length.toLong())
+    assertThat(manifest.isVerified(1)).isFalse()
+    assertThat(manifest.isVerified(2)).isTrue()
+  }
+
+  @Test
+  fun testRebuildKeepsVerifiedPagesThatDidNotChange() {
+    writePage(1, "first")
+    writePage(2, "second")
+    PageImageManifest.rebuild(directory, 2)
+    PageImageManifest.markVerified(directory, 2, listOf(1, 2))
+
+    // page 2 is replaced with one of a different size (ex a partial download)
+    writePage(2, "2nd")
+    directory.setLastModified(directory.lastModified() + 10_000)
+    PageImageManifest.rebuildIfStale(directory, 2)
+
+    val manifest = PageImageManifest.read(directory)!!
+    assertThat(manifest.isVerified(1)).isTrue()
+    assertThat(manifest.hasPage(2)).isTrue()
+    assertThat(manifest.isVerified(2)).isFalse()
+  }
+
+  @Test
+  fun testRebuildOfVerifiedPages() {
+    writePage(1, "first")
+    PageImageManifest.rebuild(directory, 2, true)
+
+    val manifest = PageImageManifest.read(directory)!!
+    assertThat(manifest.isVerified(1)).isTrue()
+    assertThat(manifest.isVerified(2)).isFalse()
+  }
+
+  @Test
+  fun testMarkVerifiedSkipsMissingPages() {
+    writePage(1, "first")
+
+    // there is no manifest yet, so it is built first
+    PageImageManifest.markVerified(directory, 2, listOf(1, 2))
+    val manifest = PageImageManifest.read(directory)!!
+    assertThat(manifest.isVerified(1)).isTrue()
+    assertThat(manifest.hasPage(2)).isFalse()
+    assertThat(manifest.isVerified(2)).isFalse()
+  }
+
+  @Test
+  fun testPagesAreSavedInParallel() {
+    PageImageManifest.rebuild(directory, 3)
+    val saving = CountDownLatch(1)
+    val finish = CountDownLatch(1)
+
+    val executor = Executors.newSingleThreadExecutor()
+    val slowSave = executor.submit<Boolean> {
+      PageImageManifest.savePage(directory, "page002.png") {
+        it.writeText("second")
+        saving.countDown()
+        finish.await(5, TimeUnit.SECONDS)
+      }
+    }
+    assertThat(saving.await(5, TimeUnit.SECONDS)).isTrue()
+
+    // saved while page 2 is still being saved
+    val saved = PageImageManifest.savePage(directory, "page003.png") {
+      it.writeText("third")
+      true
+    }
+    finish.countDown()
+
+    assertThat(saved).isTrue()
+    assertThat(slowSave.get(5, TimeUnit.SECONDS)).isTrue()
+    executor.shutdown()
+
+    val manifest = PageImageManifest.read(directory)!!
+    assertThat(manifest.getMissingPages()).containsExactly(1)
+    assertThat(manifest.isVerified(2)).isTrue()
+    assertThat(manifest.isVerified(3)).isTrue()
+  }
+
+  @Test
+  fun testFailedSaveDropsPage() {
+    writePage(1, "first")
+    PageImageManifest.rebuild(directory, 1)
+
+    val saved = PageImageManifest.savePage(directory, "page001.png") { false }
+
+    assertThat(saved).isFalse()
+    assertThat(PageImageManifest.read(directory)!!.hasPage(1)).isFalse()
+  }
+
+  @Test
+  fun testRebuildIfStaleKeepsValidManifest() {
+    writePage(1, "first")
+    PageImageManifest.rebuild(directory, 1)
+    // rewriting an existing file doesn't change the directory
+    writePage(1, "changed")
+
+    // the manifest is still valid, so the changed page isn't read again
+    PageImageManifest.rebuildIfStale(directory, 1)
+    assertThat(PageImageManifest.read(directory)!!.getSize(1)).isEqualTo("first".length.toLong())
+
+    PageImageManifest.delete(directory)
+    PageImageManifest.rebuildIfStale(directory, 1)
+    assertThat(PageImageManifest.read(directory)!!.getSize(1)).isEqualTo("changed".length.toLong())
+  }
+
+  private fun writePage(page: Int, content: String) {
+    File(directory, QuranFileUtils.getPageFileName(page)).writeText(content)
+  }
+}
@@ -0,0 +1,91 @@
+package com.quran.labs.androidquran.util
+
+import com.google.common.truth.Truth.assertThat
+import kotlinx.coroutines.runBlocking
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+
+class QuranPartialPageCheckerTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private val checker = QuranPartialPageChecker()
+  private lateinit var directory: File
+  private lateinit var checkpointFile: File
+
+  @Before
+  fun setup() {
+    directory = temporaryFolder.newFolder("width_1024")
+    checkpointFile = checker.getCheckpointFile(directory, WIDTH)
+  }
+
+  @Test
+  fun testCheckpointIsOutsideOfTheImagesDirectory() {
+    assertThat(checkpointFile.parentFile).isEqualTo(directory.parentFile)
+    assertThat(checkpointFile.name).isEqualTo(".partial_check$WIDTH")
+  }
+
+  @Test
+  fun testFinishedCheckIsResumed() {
+    // none of these are images, so decoding any of them would fail the check
+    (3..NUMBER_OF_PAGES).forEach { writePage(it) }
+    checkpointFile.writeText("${NUMBER_OF_PAGES + 1}\n4,7\n")
+
+    assertThat(checkPages()).containsExactly(4, 7)
+
+    // none of the pages were decoded by this check, so none of them are verified
+    val manifest = PageImageManifest.read(directory)
+    assertThat((3..NUMBER_OF_PAGES).filter { manifest?.isVerified(it) == true }).isEmpty()
+  }
+
+  @Test
+  fun testProgressIsSavedToTheCheckpoint() {
+    checkpointFile.writeText("5\n4\n")
+
+    assertThat(checkPages()).containsExactly(4)
+    assertThat(checkpointFile.readText()).isEqualTo("${NUMBER_OF_PAGES + 1}\n4\n")
+  }
+
+  @Test
+  fun testVerifiedPagesAreNotDecoded() {
+    writePage(6)
+    PageImageManifest.rebuild(directory, NUMBER_OF_PAGES, true)
+
+    assertThat(checkPages()).isEmpty()
+    assertThat(checkpointFile.readText()).isEqualTo("${NUMBER_OF_PAGES + 1}\n\n")
+  }
+
+  @Test
+  fun testInvalidCheckpointIsIgnored() {
+    writePage(4)
+    checkpointFile.writeText("not a page\n4\n")
+    PageImageManifest.rebuild(directory, NUMBER_OF_PAGES, true)
+
+    assertThat(checkPages()).isEmpty()
+    assertThat(checkpointFile.readText()).isEqualTo("${NUMBER_OF_PAGES + 1}\n\n")
+  }
+
+  @Test
+  fun testClearCheckpoint() {
+    checkpointFile.writeText("5\n4\n")
+    checker.clearCheckpoint(directory.path, WIDTH)
+    assertThat(checkpointFile.exists()).isFalse()
+  }
+
+  private fun checkPages(): List<Int> {
+    return runBlocking { checker.checkPages(directory.path, NUMBER_OF_PAGES, WIDTH) }
+  }
+
+  private fun writePage(page: Int) {
+    File(directory, QuranFileUtils.getPageFileName(page)).writeText("page $page")
+  }
+
+  companion object {
+    private const val WIDTH = "_1024"
+    private const val NUMBER_OF_PAGES = 10
+  }
+}
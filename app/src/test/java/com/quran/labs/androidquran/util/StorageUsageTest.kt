@@ -0,0 +1,125 @@
+package com.quran.labs.androidquran.util
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+
+class StorageUsageTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private lateinit var base: File
+  private lateinit var stateFile: File
+
+  @Before
+  fun setup() {
+    base = temporaryFolder.newFolder("quran_android")
+    stateFile = File(temporaryFolder.root, "storage_usage")
+
+    writeFile("width_1024/page001.png", 100)
+    writeFile("width_1024/page002.png", 200)
+    writeFile("width_1260/page001.png", 150)
+    writeFile("audio/minshawi/001.mp3", 1000)
+    writeFile("audio/minshawi/minshawi.db", 50)
+    writeFile("audio/husary/1/1.mp3", 300)
+    writeFile("audio/husary/2/1.mp3", 400)
+    writeFile("audio/.nomedia", 0)
+    writeFile("databases/ayahinfo_1024.db", 80)
+    writeFile("databases/quran.ar.db", 90)
+    writeFile("databases/quran.en.sahih.db", 60)
+    writeFile(".width_1024.manifest", 10)
+  }
+
+  @Test
+  fun testRescanCountsEachCategory() {
+    val usage = makeStorageUsage()
+    assertThat(usage.totalBytes).isNull()
+    assertThat(usage.rescan(2)).isEqualTo(2440L)
+
+    assertThat(usage.getCategories()).containsExactly(
+        "pages/width_1024", 300L,
+        "pages/width_1260", 150L,
+        "audio/minshawi", 1050L,
+        "audio/husary", 700L,
+        "audio", 0L,
+        "databases", 170L,
+        "translations", 60L,
+        "other", 10L
+    )
+  }
+
+  @Test
+  fun testTotalsAreSavedForTheSameBaseDirectory() {
+    makeStorageUsage().rescan(2)
+    assertThat(makeStorageUsage().totalBytes).isEqualTo(2440L)
+
+    val moved = StorageUsage(temporaryFolder.newFolder("elsewhere"),
+        "", "audio", "databases", "databases", "quran.ar.db", stateFile)
+    assertThat(moved.totalBytes).isNull()
+  }
+
+  @Test
+  fun testRemovedFilesAreSubtracted() {
+    val usage = makeStorageUsage()
+    usage.rescan(2)
+
+    val translation = File(base, "databases/quran.en.sahih.db")
+    val audio = File(base, "audio/husary/2/1.mp3")
+    val sizes = mapOf(translation to translation.length(), audio to audio.length())
+    translation.delete()
+    audio.delete()
+    usage.onFilesRemoved(sizes)
+
+    val categories = usage.getCategories()!!
+    assertThat(categories).doesNotContainKey("translations")
+    assertThat(categories["audio/husary"]).isEqualTo(300L)
+    assertThat(usage.totalBytes).isEqualTo(1980L)
+    assertThat(makeStorageUsage().totalBytes).isEqualTo(1980L)
+  }
+
+  @Test
+  fun testChangedDirectoryIsCountedAgain() {
+    val usage = makeStorageUsage()
+    usage.rescan(2)
+
+    // a new qari is downloaded, and pages of another width are deleted
+    writeFile("audio/sudais/001.mp3", 500)
+    usage.onDirectoryChanged(File(base, "audio/sudais"))
+    File(base, "width_1260").deleteRecursively()
+    usage.onDirectoryChanged(File(base, "width_1260"))
+
+    val categories = usage.getCategories()!!
+    assertThat(categories["audio/sudais"]).isEqualTo(500L)
+    assertThat(categories).doesNotContainKey("pages/width_1260")
+    assertThat(usage.totalBytes).isEqualTo(2790L)
+
+    // changes outside of a single unit count everything again
+    writeFile("databases/quran.ar.db", 190)
+    writeFile("new_file", 5)
+    usage.onDirectoryChanged(base)
+    assertThat(usage.totalBytes).isEqualTo(2895L)
+  }
+
+  @Test
+  fun testChangesAreIgnoredUntilCounted() {
+    val usage = makeStorageUsage()
+    usage.onDirectoryChanged(File(base, "width_1024"))
+    usage.onFilesRemoved(mapOf(File(base, "width_1024/page001.png") to 100L))
+    assertThat(usage.totalBytes).isNull()
+    assertThat(stateFile.exists()).isFalse()
+  }
+
+  private fun makeStorageUsage(): StorageUsage {
+    return StorageUsage(base, "", "audio", "databases", "databases", "quran.ar.db", stateFile)
+  }
+
+  private fun writeFile(path: String, size: Int) {
+    val file = File(base, path)
+    file.parentFile?.mkdirs()
+    file.writeBytes(ByteArray(size))
+  }
+}
@@ -0,0 +1,39 @@
+package com.quran.labs.androidquran.util
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Test
+
+class TranslationUtilTest {
+
+  @Test
+  fun testProcessTranslationTextRemovesFooters() {
+    val processed = TranslationUtil.processTranslationText("In the name[[a footer]] of God")
+    assertThat(processed.text).isEqualTo("In the name of God")
+    assertThat(processed.ayahSpans).isEmpty()
+  }
+
+  @Test
+  fun testProcessTranslationTextFindsQuotedAyahs() {
+    val text = "He said «first quote»[[footer]] and then ﴿second quote﴾."
+    val processed = TranslationUtil.processTranslationText(text)
+
+    assertThat(processed.text).isEqualTo("He said «first quote» and then ﴿second quote﴾.")
+    val spans = processed.ayahSpans
+    assertThat(spans).hasLength(4)
+    assertThat(processed.text.substring(spans[0], spans[1])).isEqualTo("«first quote»")
+    assertThat(processed.text.substring(spans[2], spans[3])).isEqualTo("﴿second quote﴾")
+  }
+
+  @Test
+  fun testProcessTranslationTextsMatchesSingleProcessing() {
+    val texts = (1..2000).map { "verse $it «quote $it»[[footer $it]] {another}" }
+    val processed = TranslationUtil.processTranslationTexts(texts)
+
+    assertThat(processed).hasSize(texts.size)
+    processed.forEachIndexed { index, result ->
+      val expected = TranslationUtil.processTranslationText(texts[index])
+      assertThat(result.text).isEqualTo(expected.text)
+      assertThat(result.ayahSpans).isEqualTo(expected.ayahSpans)
+    }
+  }
+}
@@ -0,0 +1,161 @@
+package com.quran.labs.androidquran.util
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.ByteArrayInputStream
+import java.io.ByteArrayOutputStream
+import java.io.EOFException
+import java.io.File
+import java.io.FileInputStream
+import java.util.Random
+import java.util.zip.CRC32
+import java.util.zip.ZipEntry
+import java.util.zip.ZipException
+import java.util.zip.ZipOutputStream
+
+class ZipStreamExtractorTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private lateinit var destination: File
+  private lateinit var checkpoint: File
+
+  @Before
+  fun setup() {
+    destination = temporaryFolder.newFolder("images")
+    checkpoint = File(temporaryFolder.root, "images.zip.unzip")
+  }
+
+  @Test
+  fun testExtractsDeflatedAndStoredEntries() {
+    val zip = makeZip(
+        "width_1024/" to null,
+        "width_1024/page001.png" to content(1, 10_000),
+        "width_1024/page002.png" to content(2, 20_000),
+        stored = setOf("width_1024/page002.png")
+    )
+
+    val progress = mutableListOf<Int>()
+    val extractor = ZipStreamExtractor(destination.path, checkpoint)
+    extractor.extract(ByteArrayInputStream(zip), null,
+        ZipUtils.ZipListener<Any?> { _, processed, _ -> progress.add(processed) })
+
+    assertThat(File(destination, "width_1024/page001.png").readBytes())
+        .isEqualTo(content(1, 10_000))
+    assertThat(File(destination, "width_1024/page002.png").readBytes())
+        .isEqualTo(content(2, 20_000))
+    assertThat(progress).containsExactly(1, 2, 3).inOrder()
+
+    // a completed extraction doesn't leave a checkpoint behind
+    assertThat(checkpoint.exists()).isFalse()
+    assertThat(extractor.resumeOffset).isEqualTo(0)
+  }
+
+  @Test
+  fun testResumesAfterInterruption() {
+    val pages = (1..20).map { "page%03d.png".format(it) to content(it, 5_000) }
+    val zip = makeZip(*pages.toTypedArray())
+
+    // the stream stops halfway through the archive
+    val extractor = ZipStreamExtractor(destination.path, checkpoint)
+    val interrupted = ByteArrayInputStream(zip, 0, zip.size / 2)
+    try {
+      extractor.extract(interrupted, null, null)
+      throw AssertionError("expected the extraction to be interrupted")
+    } catch (eofException: EOFException) {
+      // expected
+    }
+
+    val resumed = ZipStreamExtractor(destination.path, checkpoint)
+    val offset = resumed.resumeOffset
+    assertThat(offset).isGreaterThan(0)
+    assertThat(offset).isLessThan(zip.size / 2L)
+
+    // only the entries after the offset are read again
+    val processed = mutableListOf<Int>()
+    resumed.extract(ByteArrayInputStream(zip, offset.toInt(), zip.size - offset.toInt()), null,
+        ZipUtils.ZipListener<Any?> { _, count, _ -> processed.add(count) })
+    assertThat(processed.first()).isGreaterThan(1)
+    assertThat(processed.last()).isEqualTo(20)
+
+    pages.forEach { (name, data) ->
+      assertThat(File(destination, name).readBytes()).isEqualTo(data)
+    }
+    assertThat(checkpoint.exists()).isFalse()
+  }
+
+  @Test(expected = IllegalStateException::class)
+  fun testZipFileWritesOutside() {
+    // thanks to https://github.com/commonsguy/cwac-security for this zip file
+    FileInputStream("$CLI_ROOT_DIRECTORY/zip_file_writes_outside.zip").use {
+      ZipStreamExtractor(destination.path, checkpoint).extract(it, null, null)
+    }
+  }
+
+  @Test
+  fun testFileWithSmallMaxUnzipSize() {
+    val maxUnzippedSize = ZipUtils.MAX_UNZIPPED_SIZE
+    ZipUtils.MAX_UNZIPPED_SIZE = 16 * 1024
+    try {
+      val zip = makeZip("page001.png" to content(1, 10_000), "page002.png" to content(2, 10_000))
+      ZipStreamExtractor(destination.path, checkpoint).extract(ByteArrayInputStream(zip), null, null)
+      throw AssertionError("expected the zip file to be too large")
+    } catch (illegalStateException: IllegalStateException) {
+      // expected
+    } finally {
+      ZipUtils.MAX_UNZIPPED_SIZE = maxUnzippedSize
+    }
+  }
+
+  @Test(expected = IllegalStateException::class)
+  fun testTooManyFiles() {
+    val entries = (0..ZipUtils.MAX_FILES).map { "file$it" to ByteArray(1) }
+    val zip = makeZip(*entries.toTypedArray())
+    ZipStreamExtractor(destination.path, checkpoint).extract(ByteArrayInputStream(zip), null, null)
+  }
+
+  @Test(expected = ZipException::class)
+  fun testCorruptEntry() {
+    val zip = makeZip("page001.png" to content(1, 10_000), stored = setOf("page001.png"))
+    // flip a byte in the data of the stored entry, so its crc doesn't match
+    zip[100] = (zip[100] + 1).toByte()
+    ZipStreamExtractor(destination.path, checkpoint).extract(ByteArrayInputStream(zip), null, null)
+  }
+
+  private fun content(seed: Int, size: Int): ByteArray {
+    // like png data, this barely compresses, so entries span several reads
+    return ByteArray(size).also { Random(seed.toLong()).nextBytes(it) }
+  }
+
+  private fun makeZip(
+    vararg entries: Pair<String, ByteArray?>,
+    stored: Set<String> = emptySet()
+  ): ByteArray {
+    val output = ByteArrayOutputStream()
+    ZipOutputStream(output).use { zip ->
+      entries.forEach { (name, data) ->
+        val entry = ZipEntry(name)
+        if (name in stored || data == null) {
+          val bytes = data ?: ByteArray(0)
+          val crc = CRC32().apply { update(bytes) }
+          entry.method = ZipEntry.STORED
+          entry.size = bytes.size.toLong()
+          entry.compressedSize = bytes.size.toLong()
+          entry.crc = crc.value
+        }
+        zip.putNextEntry(entry)
+        data?.let { zip.write(it) }
+        zip.closeEntry()
+      }
+    }
+    return output.toByteArray()
+  }
+
+  companion object {
+    private const val CLI_ROOT_DIRECTORY = "src/test/resources"
+  }
+}
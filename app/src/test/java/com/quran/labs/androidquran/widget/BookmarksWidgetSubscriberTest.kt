@@ -1,5 +1,7 @@
 package com.quran.labs.androidquran.widget
 
+import com.quran.labs.androidquran.dao.bookmark.Bookmark
+import com.quran.labs.androidquran.dao.bookmark.BookmarkChange
 import com.quran.labs.androidquran.model.bookmark.BookmarkModel
 import io.reactivex.android.plugins.RxAndroidPlugins
 import io.reactivex.schedulers.TestScheduler
@@ -34,14 +36,14 @@ class BookmarksWidgetSubscriberTest {
   @Test
   fun testSubscribeBookmarksWidgetIfBookmarksWidgetsExist() {
     `when`(bookmarksWidgetUpdater.checkForAnyBookmarksWidgets()).thenReturn(true)
-    val testSubject = PublishSubject.create<Boolean>().toSerialized()
+    val testSubject = PublishSubject.create<List<BookmarkChange>>().toSerialized()
     `when`(bookmarkModel.bookmarksObservable()).thenReturn(testSubject.hide())
 
     bookmarksWidgetSubscriber.subscribeBookmarksWidgetIfNecessary()
     testScheduler.advanceTimeBy(1, TimeUnit.SECONDS)
 
     verify(bookmarksWidgetUpdater, never()).updateBookmarksWidget()
-    testSubject.onNext(true)
+    testSubject.onNext(listOf(added))
     testScheduler.advanceTimeBy(1, TimeUnit.SECONDS)
     verify(bookmarksWidgetUpdater).updateBookmarksWidget()
   }
@@ -58,13 +60,13 @@ class BookmarksWidgetSubscriberTest {
   @Test
   fun testSubscribeBookmarksWidgetIfWidgetGetsAdded() {
     `when`(bookmarksWidgetUpdater.checkForAnyBookmarksWidgets()).thenReturn(false)
-    val testSubject = PublishSubject.create<Boolean>().toSerialized()
+    val testSubject = PublishSubject.create<List<BookmarkChange>>().toSerialized()
     `when`(bookmarkModel.bookmarksObservable()).thenReturn(testSubject.hide())
 
     bookmarksWidgetSubscriber.subscribeBookmarksWidgetIfNecessary()
     bookmarksWidgetSubscriber.onEnabledBookmarksWidget()
 
-    testSubject.onNext(true)
+    testSubject.onNext(listOf(added))
     testScheduler.advanceTimeBy(1, TimeUnit.SECONDS)
     verify(bookmarksWidgetUpdater).updateBookmarksWidget()
   }
@@ -72,18 +74,33 @@ class BookmarksWidgetSubscriberTest {
   @Test
   fun testUnsubscribeBookmarksWidgetIfAllBookmarksWidgetsGetRemoved() {
     `when`(bookmarksWidgetUpdater.checkForAnyBookmarksWidgets()).thenReturn(true)
-    val testSubject = PublishSubject.create<Boolean>().toSerialized()
+    val testSubject = PublishSubject.create<List<BookmarkChange>>().toSerialized()
     `when`(bookmarkModel.bookmarksObservable()).thenReturn(testSubject.hide())
 
     bookmarksWidgetSubscriber.subscribeBookmarksWidgetIfNecessary()
     bookmarksWidgetSubscriber.onDisabledBookmarksWidget()
-    testSubject.onNext(true)
+    testSubject.onNext(listOf(added))
+    testScheduler.advanceTimeBy(1, TimeUnit.SECONDS)
+    verify(bookmarksWidgetUpdater, never()).updateBookmarksWidget()
+  }
+
+  @Test
+  fun testRetaggedBookmarksDontUpdateBookmarksWidget() {
+    `when`(bookmarksWidgetUpdater.checkForAnyBookmarksWidgets()).thenReturn(true)
+    val testSubject = PublishSubject.create<List<BookmarkChange>>().toSerialized()
+    `when`(bookmarkModel.bookmarksObservable()).thenReturn(testSubject.hide())
+
+    bookmarksWidgetSubscriber.subscribeBookmarksWidgetIfNecessary()
+    testSubject.onNext(listOf(BookmarkChange(BookmarkChange.Type.RETAGGED, bookmark)))
     testScheduler.advanceTimeBy(1, TimeUnit.SECONDS)
     verify(bookmarksWidgetUpdater, never()).updateBookmarksWidget()
   }
 
   companion object {
 
+    private val bookmark = Bookmark(1, null, null, 1)
+    private val added = BookmarkChange(BookmarkChange.Type.ADDED, bookmark)
+
     private val testScheduler = TestScheduler()
 
     @BeforeClass
@@ -0,0 +1,67 @@
+package com.quran.page.common.data
+
+import com.google.common.truth.Truth.assertThat
+import org.junit.Test
+
+class AyahBoundsTableTest {
+
+  @Test
+  fun testGlyphsOnTheSameLineAreMerged() {
+    val table = AyahBoundsTable.Builder().apply {
+      add(ayahId = 8, sura = 2, ayah = 1, page = 2, line = 1, position = 1,
+          minX = 100, minY = 10, maxX = 150, maxY = 40)
+      add(ayahId = 8, sura = 2, ayah = 1, page = 2, line = 1, position = 2,
+          minX = 50, minY = 12, maxX = 100, maxY = 44)
+      add(ayahId = 8, sura = 2, ayah = 1, page = 2, line = 2, position = 3,
+          minX = 120, minY = 50, maxX = 150, maxY = 80)
+    }.build()
+
+    assertThat(table.ayahCount).isEqualTo(1)
+    val rows = table.getRows(0).toList()
+    assertThat(rows).hasSize(2)
+
+    val first = rows[0]
+    assertThat(table.getLine(first)).isEqualTo(1)
+    assertThat(table.getLeft(first)).isEqualTo(50f)
+    assertThat(table.getTop(first)).isEqualTo(10f)
+    assertThat(table.getRight(first)).isEqualTo(150f)
+    assertThat(table.getBottom(first)).isEqualTo(44f)
+    assertThat(table.getLine(rows[1])).isEqualTo(2)
+  }
+
+  @Test
+  fun testAyahsAcrossPages() {
+    val table = AyahBoundsTable.Builder().apply {
+      add(7, 1, 7, 1, 8, 1, 0, 0, 10, 10)
+      // same line number, but on a different page
+      add(7, 1, 7, 2, 8, 2, 0, 0, 10, 10)
+      add(8, 2, 1, 2, 9, 3, 0, 0, 10, 10)
+      add(9, 2, 2, 2, 10, 4, 0, 0, 10, 10)
+    }.build()
+
+    assertThat(table.ayahCount).isEqualTo(3)
+    assertThat(table.indexOf(8)).isEqualTo(1)
+    assertThat(table.indexOf(10)).isLessThan(0)
+    assertThat(table.getSura(1)).isEqualTo(2)
+    assertThat(table.getAyah(1)).isEqualTo(1)
+
+    val rows = table.getRows(table.indexOf(7)).toList()
+    assertThat(rows.map { table.getPage(it) }).containsExactly(1, 2).inOrder()
+  }
+
+  @Test
+  fun testLargeTable() {
+    val builder = AyahBoundsTable.Builder()
+    for (ayahId in 1..300) {
+      for (line in 1..3) {
+        builder.add(ayahId, 2, ayahId, 1, line, line, ayahId, line, ayahId + 10, line + 10)
+      }
+    }
+
+    val table = builder.build()
+    assertThat(table.ayahCount).isEqualTo(300)
+    val index = table.indexOf(300)
+    assertThat(table.getRows(index).count()).isEqualTo(3)
+    assertThat(table.getRight(table.getRows(index).last)).isEqualTo(310f)
+  }
+}
@@ -25,6 +25,26 @@ class QuranInfo @Inject constructor(quranDataSource: QuranDataSource) {
   val numberOfPages = quranDataSource.getNumberOfPages()
   val numberOfPagesDual = numberOfPages / 2
 
+  // number of ayahs preceding each sura (with the total number of ayahs at the end)
+  private val suraAyahIdOffsets = IntArray(NUMBER_OF_SURAS + 1).also { offsets ->
+    for (i in 0 until NUMBER_OF_SURAS) {
+      offsets[i + 1] = offsets[i] + suraNumAyahs[i]
+    }
+  }
+
+  // page for each ayah, indexed by ayah id
+  private val ayahIdPages = IntArray(suraAyahIdOffsets[NUMBER_OF_SURAS] + 1).also { pages ->
+    for (page in 1..numberOfPages) {
+      val start = getAyahId(pageSuraStart[page - 1], pageAyahStart[page - 1])
+      val end = if (page == numberOfPages) {
+        pages.size - 1
+      } else {
+        getAyahId(pageSuraStart[page], pageAyahStart[page]) - 1
+      }
+      pages.fill(page, start, end + 1)
+    }
+  }
+
   fun getStartingPageForJuz(juz: Int): Int {
     return juzPageStart[juz - 1]
   }
@@ -127,33 +147,13 @@ class QuranInfo @Inject constructor(quranDataSource: QuranDataSource) {
       return -1
     }
 
-    // what page does the sura start on?
-    var index = suraPageStart[sura - 1] - 1
-    while (index < numberOfPages) {
-      // what's the first sura in that page?
-      val ss = pageSuraStart[index]
-
-      // if we've passed the sura, return the previous page
-      // or, if we're at the same sura and passed the ayah
-      if (ss > sura || ss == sura &&
-          pageAyahStart[index] > currentAyah
-      ) {
-        break
-      }
-
-      // otherwise, look at the next page
-      index++
-    }
-    return index
+    // ayahs past the end of the sura are on the same page as the last ayah of the sura
+    val lastAyah = minOf(currentAyah, suraNumAyahs[sura - 1])
+    return ayahIdPages[getAyahId(sura, lastAyah)]
   }
 
   fun getAyahId(sura: Int, ayah: Int): Int {
-    var ayahId = 0
-    for (i in 0 until sura - 1) {
-      ayahId += suraNumAyahs[i]
-    }
-    ayahId += ayah
-    return ayahId
+    return if (sura < 1) ayah else suraAyahIdOffsets[sura - 1] + ayah
   }
 
   fun getNumberOfAyahs(sura: Int): Int {
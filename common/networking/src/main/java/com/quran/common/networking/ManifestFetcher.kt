@@ -0,0 +1,189 @@
+package com.quran.common.networking
+
+import okhttp3.Cache
+import okhttp3.CacheControl
+import okhttp3.Call
+import okhttp3.Callback
+import okhttp3.OkHttpClient
+import okhttp3.Request
+import okhttp3.Response
+import okio.BufferedSource
+import java.io.Closeable
+import java.io.File
+import java.io.IOException
+import java.util.Properties
+import java.util.concurrent.TimeUnit
+
+/**
+ * Fetches manifests (ex the list of translations or the audio updates), keeping them in an http
+ * cache in [cacheDirectory].
+ *
+ * A cached manifest is returned without a request for [freshSeconds]. For [staleSeconds] after
+ * that, it is still returned right away, but is revalidated in the background for next time.
+ * Older manifests are revalidated before they are returned, using their ETag or Last-Modified
+ * headers, so the server can answer with a 304 instead of sending them again.
+ *
+ * Each [Manifest] says whether it changed since the last one that was marked as processed, so
+ * callers can skip parsing a manifest that they already handled.
+ */
+class ManifestFetcher @JvmOverloads constructor(
+  okHttpClient: OkHttpClient,
+  cacheDirectory: File,
+  private val freshSeconds: Int = DEFAULT_FRESH_SECONDS,
+  private val staleSeconds: Int = DEFAULT_STALE_SECONDS
+) {
+  // the shared client isn't cached, since it also downloads pages and audio
+  private val client = okHttpClient.newBuilder()
+      .cache(Cache(File(cacheDirectory, HTTP_CACHE_DIRECTORY), CACHE_SIZE))
+      .build()
+  private val processedFile = File(cacheDirectory, PROCESSED_FILE)
+  private var processed: Properties? = null
+
+  /**
+   * A fetched manifest, which must be closed once it is read (or skipped).
+   */
+  inner class Manifest internal constructor(
+    private val url: String,
+    private val response: Response
+  ) : Closeable {
+    private val validator = response.header("ETag") ?: response.header("Last-Modified")
+
+    /**
+     * Whether this manifest may differ from the last one marked as processed. Manifests without
+     * an ETag or a Last-Modified header are always considered changed.
+     */
+    val isChanged: Boolean = validator == null || validator != getProcessedValidator(url)
+
+    /**
+     * Whether this manifest was downloaded, rather than returned from the cache (with or
+     * without a 304 from the server).
+     */
+    val isDownloaded: Boolean = response.networkResponse()?.code() == 200
+
+    fun source(): BufferedSource = response.body()!!.source()
+
+    /**
+     * Marks this manifest as processed, so that it isn't reported as changed again. Call this
+     * once the manifest has been fully handled (ex saved), so a failure part of the way through
+     * means it is processed again next time.
+     */
+    fun markProcessed() {
+      if (validator != null) {
+        setProcessedValidator(url, validator)
+      }
+    }
+
+    override fun close() {
+      response.close()
+    }
+  }
+
+  /**
+   * Fetches the manifest at [url], either from the cache or from the server. When
+   * [forceRevalidate] is set (ex when the user asks to refresh), the server is always asked,
+   * even for a fresh manifest, but it can still answer with a 304.
+   * @throws IOException if it can't be fetched, or if the server returns an error
+   */
+  @JvmOverloads
+  fun fetch(url: String, forceRevalidate: Boolean = false): Manifest {
+    val request = Request.Builder()
+        .url(url)
+        .build()
+
+    val response = if (forceRevalidate) {
+      client.newCall(request.newBuilder().cacheControl(REVALIDATE).build()).execute()
+    } else {
+      val cached = getCachedResponse(request, freshSeconds)
+          ?: getCachedResponse(request, freshSeconds + staleSeconds)
+              ?.also { revalidateInBackground(request) }
+      cached ?: client.newCall(request).execute()
+    }
+    if (!response.isSuccessful) {
+      response.close()
+      throw IOException("Unexpected response code ${response.code()} for $url")
+    }
+    return Manifest(url, response)
+  }
+
+  private fun getCachedResponse(request: Request, maxStaleSeconds: Int): Response? {
+    val cacheControl = CacheControl.Builder()
+        .onlyIfCached()
+        .maxStale(maxStaleSeconds, TimeUnit.SECONDS)
+        .build()
+    val response = client.newCall(request.newBuilder().cacheControl(cacheControl).build())
+        .execute()
+    return if (response.isSuccessful) {
+      response
+    } else {
+      // not cached, or cached for longer than maxStaleSeconds
+      response.close()
+      null
+    }
+  }
+
+  private fun revalidateInBackground(request: Request) {
+    client.newCall(request).enqueue(object : Callback {
+      override fun onFailure(call: Call, e: IOException) {
+        // the manifest will be revalidated again the next time it is fetched
+      }
+
+      override fun onResponse(call: Call, response: Response) {
+        // the body has to be read for the new response to be cached
+        response.use { it.body()?.bytes() }
+      }
+    })
+  }
+
+  @Synchronized
+  private fun getProcessedValidator(url: String): String? {
+    return getProcessed().getProperty(url)
+  }
+
+  @Synchronized
+  private fun setProcessedValidator(url: String, validator: String) {
+    val current = getProcessed()
+    if (current.getProperty(url) == validator) {
+      return
+    }
+
+    current.setProperty(url, validator)
+    val temporaryFile = File(processedFile.path + ".tmp")
+    try {
+      processedFile.parentFile?.mkdirs()
+      temporaryFile.outputStream().use { current.store(it, null) }
+      if (!temporaryFile.renameTo(processedFile)) {
+        temporaryFile.delete()
+      }
+    } catch (ioException: IOException) {
+      // the manifest will just be considered changed the next time it is fetched
+      temporaryFile.delete()
+    }
+  }
+
+  private fun getProcessed(): Properties {
+    return processed ?: Properties().also { properties ->
+      if (processedFile.exists()) {
+        try {
+          processedFile.inputStream().use { properties.load(it) }
+        } catch (ioException: IOException) {
+          properties.clear()
+        }
+      }
+      processed = properties
+    }
+  }
+
+  companion object {
+    const val DEFAULT_FRESH_SECONDS = 60 * 60
+    const val DEFAULT_STALE_SECONDS = 24 * 60 * 60
+
+    private const val HTTP_CACHE_DIRECTORY = "http"
+    private const val PROCESSED_FILE = "processed.properties"
+    private const val CACHE_SIZE = 2 * 1024 * 1024L
+
+    // max-age=0 makes any cached copy too old, so it is sent with its ETag or Last-Modified
+    private val REVALIDATE = CacheControl.Builder()
+        .maxAge(0, TimeUnit.SECONDS)
+        .build()
+  }
+}
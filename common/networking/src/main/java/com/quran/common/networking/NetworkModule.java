@@ -2,6 +2,7 @@ package com.quran.common.networking;
 
 import com.quran.common.networking.dns.DnsModule;
 
+import java.io.File;
 import java.util.concurrent.TimeUnit;
 
 import javax.inject.Singleton;
@@ -15,6 +16,7 @@ import okhttp3.OkHttpClient;
 public class NetworkModule {
   private static final int DEFAULT_READ_TIMEOUT_SECONDS = 20;
   private static final int DEFAULT_CONNECT_TIMEOUT_SECONDS = 20;
+  private static final String MANIFEST_CACHE_DIRECTORY = "manifests";
 
   @Provides
   @Singleton
@@ -25,4 +27,10 @@ public class NetworkModule {
         .dns(dns)
         .build();
   }
+
+  @Provides
+  @Singleton
+  static ManifestFetcher provideManifestFetcher(OkHttpClient okHttpClient, File cacheDirectory) {
+    return new ManifestFetcher(okHttpClient, new File(cacheDirectory, MANIFEST_CACHE_DIRECTORY));
+  }
 }
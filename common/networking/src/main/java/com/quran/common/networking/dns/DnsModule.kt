@@ -16,7 +16,9 @@ class DnsModule {
 
   @Provides
   fun providesDns(servers: List<@JvmSuppressWildcards Dns>): Dns {
-    return MultiDns(servers)
+    // query the servers at the same time, so a slow dns over https lookup doesn't delay
+    // falling back to the other servers
+    return MultiDns(servers, MultiDns.Mode.RACE)
   }
 
   @Provides
@@ -3,19 +3,189 @@ package com.quran.common.networking.dns
 import okhttp3.Dns
 import java.net.InetAddress
 import java.net.UnknownHostException
+import java.util.concurrent.Callable
+import java.util.concurrent.ConcurrentHashMap
+import java.util.concurrent.ExecutionException
+import java.util.concurrent.ExecutorCompletionService
+import java.util.concurrent.ExecutorService
+import java.util.concurrent.Executors
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicLong
 
-class MultiDns(private val servers: List<Dns>) : Dns {
+/**
+ * A [Dns] that looks hostnames up using several [servers].
+ *
+ * In [Mode.SEQUENTIAL], each server is tried in order until one of them succeeds. In
+ * [Mode.RACE], all the servers are queried at the same time and the first answer wins, so a
+ * slow or unreachable server doesn't hold up the others.
+ *
+ * Answers are cached for [ttlMillis], and hostnames that none of the servers could resolve are
+ * cached for [negativeTtlMillis], since [Dns] doesn't expose the ttl of the records themselves.
+ */
+class MultiDns(
+  private val servers: List<Dns>,
+  private val mode: Mode = Mode.SEQUENTIAL,
+  private val ttlMillis: Long = DEFAULT_TTL_MILLIS,
+  private val negativeTtlMillis: Long = DEFAULT_NEGATIVE_TTL_MILLIS,
+  private val executor: ExecutorService = defaultExecutor(),
+  private val nanoTime: () -> Long = { System.nanoTime() }
+) : Dns {
 
-  override fun lookup(hostname: String): MutableList<InetAddress> {
-    var lastException: Exception? = null
+  enum class Mode { SEQUENTIAL, RACE }
+
+  /**
+   * How a single server has performed so far. Lookups that lost a race are still counted.
+   */
+  data class ResolverStats(
+    val resolver: String,
+    val successes: Long,
+    val failures: Long,
+    val averageLatencyMillis: Long,
+    val lastLatencyMillis: Long
+  )
+
+  private class CacheEntry(val addresses: List<InetAddress>?, val expiresAt: Long)
+
+  private class Stats {
+    val successes = AtomicLong()
+    val failures = AtomicLong()
+    val totalLatencyNanos = AtomicLong()
+    val lastLatencyNanos = AtomicLong()
+  }
+
+  private val cache = ConcurrentHashMap<String, CacheEntry>()
+  private val stats = servers.map { Stats() }
+
+  override fun lookup(hostname: String): List<InetAddress> {
+    val now = nanoTime()
+    val cached = cache[hostname]
+    if (cached != null && cached.expiresAt - now > 0) {
+      return cached.addresses ?: throw UnknownHostException(hostname)
+    }
+
+    return try {
+      val addresses = if (mode == Mode.RACE) race(hostname) else lookupInOrder(hostname)
+      cache(hostname, addresses, ttlMillis)
+      addresses
+    } catch (unknownHostException: UnknownHostException) {
+      cache(hostname, null, negativeTtlMillis)
+      throw unknownHostException
+    }
+  }
+
+  /**
+   * Returns the latency and success stats of each server, in the same order as [servers].
+   */
+  fun getResolverStats(): List<ResolverStats> {
+    return servers.mapIndexed { index, server ->
+      val serverStats = stats[index]
+      val successes = serverStats.successes.get()
+      val failures = serverStats.failures.get()
+      val lookups = successes + failures
+      ResolverStats(
+          server.javaClass.simpleName,
+          successes,
+          failures,
+          if (lookups > 0) toMillis(serverStats.totalLatencyNanos.get() / lookups) else 0,
+          toMillis(serverStats.lastLatencyNanos.get())
+      )
+    }
+  }
+
+  /**
+   * Clears the cached answers (ex after the network changes).
+   */
+  fun clearCache() {
+    cache.clear()
+  }
+
+  private fun lookupInOrder(hostname: String): List<InetAddress> {
+    var lastException: UnknownHostException? = null
     for (i in servers.indices) {
       try {
-        return servers[i].lookup(hostname)
+        return timedLookup(i, hostname)
       } catch (unknownHostException: UnknownHostException) {
         lastException = unknownHostException
       }
     }
 
-    throw lastException!!
+    throw lastException ?: UnknownHostException(hostname)
+  }
+
+  private fun race(hostname: String): List<InetAddress> {
+    val completionService = ExecutorCompletionService<List<InetAddress>>(executor)
+    servers.indices.forEach { i ->
+      completionService.submit(Callable { timedLookup(i, hostname) })
+    }
+
+    // the slower lookups are left to finish in the background, so their stats are still kept
+    var lastException: UnknownHostException? = null
+    repeat(servers.size) {
+      try {
+        return completionService.take().get()
+      } catch (executionException: ExecutionException) {
+        lastException = executionException.cause as? UnknownHostException
+            ?: UnknownHostException(hostname).apply { initCause(executionException.cause) }
+      } catch (interruptedException: InterruptedException) {
+        Thread.currentThread().interrupt()
+        throw UnknownHostException(hostname).apply { initCause(interruptedException) }
+      }
+    }
+
+    throw lastException ?: UnknownHostException(hostname)
+  }
+
+  private fun timedLookup(index: Int, hostname: String): List<InetAddress> {
+    val serverStats = stats[index]
+    val start = nanoTime()
+    var isSuccessful = false
+    try {
+      val addresses = servers[index].lookup(hostname)
+      if (addresses.isEmpty()) {
+        throw UnknownHostException("No addresses for $hostname")
+      }
+      isSuccessful = true
+      return addresses
+    } finally {
+      val latency = nanoTime() - start
+      serverStats.lastLatencyNanos.set(latency)
+      serverStats.totalLatencyNanos.addAndGet(latency)
+      if (isSuccessful) {
+        serverStats.successes.incrementAndGet()
+      } else {
+        serverStats.failures.incrementAndGet()
+      }
+    }
+  }
+
+  private fun cache(hostname: String, addresses: List<InetAddress>?, ttl: Long) {
+    if (ttl <= 0) {
+      return
+    }
+
+    val now = nanoTime()
+    if (cache.size >= MAX_CACHE_ENTRIES) {
+      cache.entries.removeAll { it.value.expiresAt - now <= 0 }
+      if (cache.size >= MAX_CACHE_ENTRIES) {
+        cache.clear()
+      }
+    }
+    cache[hostname] = CacheEntry(addresses?.toList(), now + TimeUnit.MILLISECONDS.toNanos(ttl))
+  }
+
+  companion object {
+    const val DEFAULT_TTL_MILLIS = 5 * 60 * 1000L
+    // kept short, so that lookups work again soon after being offline
+    const val DEFAULT_NEGATIVE_TTL_MILLIS = 10 * 1000L
+
+    private const val MAX_CACHE_ENTRIES = 64
+
+    private fun toMillis(nanos: Long) = TimeUnit.NANOSECONDS.toMillis(nanos)
+
+    private fun defaultExecutor(): ExecutorService {
+      return Executors.newCachedThreadPool { runnable ->
+        Thread(runnable, "MultiDns").apply { isDaemon = true }
+      }
+    }
   }
 }
@@ -0,0 +1,165 @@
+package com.quran.common.networking
+
+import com.google.common.truth.Truth.assertThat
+import okhttp3.OkHttpClient
+import okhttp3.mockwebserver.MockResponse
+import okhttp3.mockwebserver.MockWebServer
+import org.junit.After
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.IOException
+import java.util.concurrent.TimeUnit
+
+class ManifestFetcherTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private lateinit var server: MockWebServer
+  private lateinit var url: String
+
+  @Before
+  fun setup() {
+    server = MockWebServer()
+    server.start()
+    url = server.url("/data/translations.php").toString()
+  }
+
+  @After
+  fun tearDown() {
+    server.shutdown()
+  }
+
+  @Test
+  fun testFirstFetchIsDownloaded() {
+    server.enqueue(manifestResponse())
+
+    fetcher().fetch(url).use { manifest ->
+      assertThat(manifest.isDownloaded).isTrue()
+      assertThat(manifest.isChanged).isTrue()
+      assertThat(manifest.source().readUtf8()).isEqualTo(BODY)
+    }
+    assertThat(server.requestCount).isEqualTo(1)
+  }
+
+  @Test
+  fun testFreshManifestIsReturnedWithoutARequest() {
+    server.enqueue(manifestResponse())
+    val fetcher = fetcher()
+
+    fetcher.fetch(url).use { manifest ->
+      manifest.source().readUtf8()
+      manifest.markProcessed()
+    }
+
+    fetcher.fetch(url).use { manifest ->
+      assertThat(manifest.isDownloaded).isFalse()
+      assertThat(manifest.isChanged).isFalse()
+      assertThat(manifest.source().readUtf8()).isEqualTo(BODY)
+    }
+    assertThat(server.requestCount).isEqualTo(1)
+  }
+
+  @Test
+  fun testUnchangedManifestIsRevalidatedWithoutItsBody() {
+    server.enqueue(manifestResponse())
+    server.enqueue(MockResponse().setResponseCode(304).setHeader("ETag", ETAG))
+    val fetcher = fetcher(freshSeconds = 0, staleSeconds = 0)
+
+    fetcher.fetch(url).use { manifest ->
+      assertThat(manifest.isDownloaded).isTrue()
+      manifest.source().readUtf8()
+      manifest.markProcessed()
+    }
+    assertThat(server.takeRequest().getHeader("If-None-Match")).isNull()
+
+    fetcher.fetch(url).use { manifest ->
+      assertThat(manifest.isDownloaded).isFalse()
+      assertThat(manifest.isChanged).isFalse()
+      assertThat(manifest.source().readUtf8()).isEqualTo(BODY)
+    }
+    assertThat(server.takeRequest().getHeader("If-None-Match")).isEqualTo(ETAG)
+  }
+
+  @Test
+  fun testForcedFetchRevalidatesAFreshManifest() {
+    server.enqueue(manifestResponse())
+    server.enqueue(MockResponse().setResponseCode(304).setHeader("ETag", ETAG))
+    val fetcher = fetcher()
+
+    fetcher.fetch(url).use { manifest ->
+      manifest.source().readUtf8()
+      manifest.markProcessed()
+    }
+    server.takeRequest()
+
+    fetcher.fetch(url, forceRevalidate = true).use { manifest ->
+      assertThat(manifest.isDownloaded).isFalse()
+      assertThat(manifest.isChanged).isFalse()
+      assertThat(manifest.source().readUtf8()).isEqualTo(BODY)
+    }
+    assertThat(server.requestCount).isEqualTo(2)
+    assertThat(server.takeRequest().getHeader("If-None-Match")).isEqualTo(ETAG)
+  }
+
+  @Test
+  fun testUnprocessedManifestIsStillChanged() {
+    server.enqueue(manifestResponse())
+    server.enqueue(MockResponse().setResponseCode(304).setHeader("ETag", ETAG))
+    val fetcher = fetcher(freshSeconds = 0, staleSeconds = 0)
+
+    fetcher.fetch(url).use { it.source().readUtf8() }
+    fetcher.fetch(url).use { manifest ->
+      assertThat(manifest.isDownloaded).isFalse()
+      assertThat(manifest.isChanged).isTrue()
+    }
+    assertThat(server.requestCount).isEqualTo(2)
+  }
+
+  @Test
+  fun testStaleManifestIsRevalidatedInTheBackground() {
+    server.enqueue(manifestResponse())
+    server.enqueue(MockResponse().setResponseCode(304).setHeader("ETag", ETAG))
+    val fetcher = fetcher(freshSeconds = 0, staleSeconds = 60)
+
+    fetcher.fetch(url).use { it.source().readUtf8() }
+    server.takeRequest()
+
+    fetcher.fetch(url).use { manifest ->
+      assertThat(manifest.isDownloaded).isFalse()
+      assertThat(manifest.source().readUtf8()).isEqualTo(BODY)
+    }
+
+    val revalidation = server.takeRequest(5, TimeUnit.SECONDS)
+    assertThat(revalidation).isNotNull()
+    assertThat(revalidation!!.getHeader("If-None-Match")).isEqualTo(ETAG)
+  }
+
+  @Test(expected = IOException::class)
+  fun testServerErrorThrows() {
+    server.enqueue(MockResponse().setResponseCode(500))
+    fetcher().fetch(url)
+  }
+
+  private fun fetcher(
+    freshSeconds: Int = ManifestFetcher.DEFAULT_FRESH_SECONDS,
+    staleSeconds: Int = ManifestFetcher.DEFAULT_STALE_SECONDS
+  ): ManifestFetcher {
+    return ManifestFetcher(
+        OkHttpClient.Builder().build(), temporaryFolder.root, freshSeconds, staleSeconds
+    )
+  }
+
+  private fun manifestResponse(): MockResponse {
+    return MockResponse()
+        .setHeader("ETag", ETAG)
+        .setBody(BODY)
+  }
+
+  companion object {
+    private const val ETAG = "\"v1\""
+    private const val BODY = "{\"current_version\":1,\"data\":[]}"
+  }
+}
@@ -0,0 +1,130 @@
+package com.quran.common.networking.dns
+
+import com.google.common.truth.Truth.assertThat
+import okhttp3.Dns
+import org.junit.Assert.fail
+import org.junit.Test
+import java.net.InetAddress
+import java.net.UnknownHostException
+import java.util.concurrent.CountDownLatch
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicInteger
+
+class MultiDnsTest {
+
+  private var now = 0L
+  private val nanoTime = { now }
+
+  @Test
+  fun testRaceReturnsTheFirstAnswer() {
+    val gate = CountDownLatch(1)
+    val slow = FakeDns(address(1), gate)
+    val fast = FakeDns(address(2))
+    val dns = MultiDns(listOf(slow, fast), MultiDns.Mode.RACE)
+
+    try {
+      assertThat(dns.lookup(HOSTNAME)).containsExactly(address(2).single())
+    } finally {
+      gate.countDown()
+    }
+  }
+
+  @Test
+  fun testRaceSkipsFailedServers() {
+    val failing = FakeDns(null)
+    val working = FakeDns(address(3))
+    val dns = MultiDns(listOf(failing, working), MultiDns.Mode.RACE)
+
+    assertThat(dns.lookup(HOSTNAME)).containsExactly(address(3).single())
+  }
+
+  @Test
+  fun testFailuresAreCachedBriefly() {
+    val first = FakeDns(null)
+    val second = FakeDns(emptyList())
+    val dns = MultiDns(listOf(first, second), MultiDns.Mode.RACE, nanoTime = nanoTime)
+
+    assertLookupFails(dns)
+    assertLookupFails(dns)
+    assertThat(first.lookups.get()).isEqualTo(1)
+    assertThat(second.lookups.get()).isEqualTo(1)
+
+    now += TimeUnit.MILLISECONDS.toNanos(MultiDns.DEFAULT_NEGATIVE_TTL_MILLIS)
+    assertLookupFails(dns)
+    assertThat(first.lookups.get()).isEqualTo(2)
+    assertThat(second.lookups.get()).isEqualTo(2)
+  }
+
+  @Test
+  fun testAnswersAreCachedUntilTheyExpire() {
+    val server = FakeDns(address(4))
+    val dns = MultiDns(listOf(server), nanoTime = nanoTime)
+
+    assertThat(dns.lookup(HOSTNAME)).containsExactly(address(4).single())
+    now += TimeUnit.MILLISECONDS.toNanos(MultiDns.DEFAULT_TTL_MILLIS - 1)
+    assertThat(dns.lookup(HOSTNAME)).containsExactly(address(4).single())
+    assertThat(server.lookups.get()).isEqualTo(1)
+
+    // other hostnames aren't answered from the cache
+    dns.lookup("android.quran.com")
+    assertThat(server.lookups.get()).isEqualTo(2)
+
+    now += TimeUnit.MILLISECONDS.toNanos(1)
+    dns.lookup(HOSTNAME)
+    assertThat(server.lookups.get()).isEqualTo(3)
+  }
+
+  @Test
+  fun testSequentialTriesServersInOrder() {
+    val failing = FakeDns(null)
+    val working = FakeDns(address(5))
+    val unused = FakeDns(address(6))
+    val dns = MultiDns(listOf(failing, working, unused))
+
+    assertThat(dns.lookup(HOSTNAME)).containsExactly(address(5).single())
+    assertThat(unused.lookups.get()).isEqualTo(0)
+
+    val stats = dns.getResolverStats()
+    assertThat(stats).hasSize(3)
+    assertThat(stats[0].resolver).isEqualTo("FakeDns")
+    assertThat(stats[0].failures).isEqualTo(1L)
+    assertThat(stats[0].successes).isEqualTo(0L)
+    assertThat(stats[1].failures).isEqualTo(0L)
+    assertThat(stats[1].successes).isEqualTo(1L)
+    assertThat(stats[2].successes + stats[2].failures).isEqualTo(0L)
+  }
+
+  private fun assertLookupFails(dns: Dns) {
+    try {
+      dns.lookup(HOSTNAME)
+      fail("expected lookup of $HOSTNAME to fail")
+    } catch (unknownHostException: UnknownHostException) {
+      // expected
+    }
+  }
+
+  private fun address(lastByte: Int): List<InetAddress> {
+    return listOf(InetAddress.getByAddress(HOSTNAME, byteArrayOf(127, 0, 0, lastByte.toByte())))
+  }
+
+  /**
+   * A [Dns] that answers every lookup with [addresses] (or fails if they are null), optionally
+   * waiting for [gate] to open first.
+   */
+  private class FakeDns(
+    private val addresses: List<InetAddress>?,
+    private val gate: CountDownLatch? = null
+  ) : Dns {
+    val lookups = AtomicInteger()
+
+    override fun lookup(hostname: String): List<InetAddress> {
+      lookups.incrementAndGet()
+      gate?.await(5, TimeUnit.SECONDS)
+      return addresses ?: throw UnknownHostException(hostname)
+    }
+  }
+
+  companion object {
+    private const val HOSTNAME = "quran.com"
+  }
+}
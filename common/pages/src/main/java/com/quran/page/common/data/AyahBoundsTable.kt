@@ -0,0 +1,154 @@
+package com.quran.page.common.data
+
+import android.graphics.RectF
+
+/**
+ * Bounds of the ayahs on one or more pages, stored in parallel arrays and keyed by ayah id.
+ *
+ * Ayahs are sorted by ayah id. Each ayah has one or more rows of bounds, sorted by page and
+ * then by position, where every row holds the bounds of all the consecutive glyphs of that
+ * ayah on the same line of the same page.
+ */
+class AyahBoundsTable private constructor(
+  private val ayahIds: IntArray,
+  private val suras: IntArray,
+  private val ayahs: IntArray,
+  private val rowStarts: IntArray,
+  private val pages: IntArray,
+  private val lines: IntArray,
+  private val positions: IntArray,
+  private val bounds: FloatArray
+) {
+
+  val ayahCount: Int
+    get() = ayahIds.size
+
+  fun getAyahId(index: Int) = ayahIds[index]
+
+  fun getSura(index: Int) = suras[index]
+
+  fun getAyah(index: Int) = ayahs[index]
+
+  /**
+   * Returns the index of the ayah with [ayahId], or a negative number if it isn't in the table.
+   */
+  fun indexOf(ayahId: Int) = ayahIds.binarySearch(ayahId)
+
+  /**
+   * Returns the rows of the ayah at [index], to be used with the row accessors below.
+   */
+  fun getRows(index: Int): IntRange = rowStarts[index] until rowStarts[index + 1]
+
+  fun getPage(row: Int) = pages[row]
+
+  fun getLine(row: Int) = lines[row]
+
+  fun getLeft(row: Int) = bounds[row * 4]
+
+  fun getTop(row: Int) = bounds[row * 4 + 1]
+
+  fun getRight(row: Int) = bounds[row * 4 + 2]
+
+  fun getBottom(row: Int) = bounds[row * 4 + 3]
+
+  /**
+   * Returns the bounds of the ayah at [index] that are on [page].
+   */
+  fun getBounds(index: Int, page: Int): List<AyahBounds> {
+    val result = mutableListOf<AyahBounds>()
+    for (row in getRows(index)) {
+      if (pages[row] == page) {
+        val rect = RectF(getLeft(row), getTop(row), getRight(row), getBottom(row))
+        result.add(AyahBounds(lines[row], positions[row], rect))
+      }
+    }
+    return result
+  }
+
+  /**
+   * Returns the bounds on [page] keyed by "sura:ayah", as used by [AyahCoordinates].
+   */
+  fun toAyahCoordinates(page: Int): AyahCoordinates {
+    val result = mutableMapOf<String, List<AyahBounds>>()
+    for (index in ayahIds.indices) {
+      val ayahBounds = getBounds(index, page)
+      if (ayahBounds.isNotEmpty()) {
+        result["${suras[index]}:${ayahs[index]}"] = ayahBounds
+      }
+    }
+    return AyahCoordinates(page, result)
+  }
+
+  /**
+   * Builds a table from glyphs added in order of ayah id, then page, then position.
+   */
+  class Builder {
+    private val ayahIds = IntList()
+    private val suras = IntList()
+    private val ayahs = IntList()
+    private val rowStarts = IntList()
+    private val pages = IntList()
+    private val lines = IntList()
+    private val positions = IntList()
+    private var bounds = FloatArray(64)
+
+    fun add(ayahId: Int, sura: Int, ayah: Int, page: Int, line: Int, position: Int,
+            minX: Int, minY: Int, maxX: Int, maxY: Int) {
+      val isNewAyah = ayahIds.size == 0 || ayahIds.last() != ayahId
+      if (isNewAyah) {
+        ayahIds.add(ayahId)
+        suras.add(sura)
+        ayahs.add(ayah)
+        rowStarts.add(pages.size)
+      }
+
+      val lastRow = pages.size - 1
+      if (!isNewAyah && pages.last() == page && lines.last() == line) {
+        // same line as the previous glyph of this ayah, so grow its bounds
+        val offset = lastRow * 4
+        bounds[offset] = minOf(bounds[offset], minX.toFloat())
+        bounds[offset + 1] = minOf(bounds[offset + 1], minY.toFloat())
+        bounds[offset + 2] = maxOf(bounds[offset + 2], maxX.toFloat())
+        bounds[offset + 3] = maxOf(bounds[offset + 3], maxY.toFloat())
+      } else {
+        val offset = (lastRow + 1) * 4
+        if (offset + 4 > bounds.size) {
+          bounds = bounds.copyOf(bounds.size * 2)
+        }
+        bounds[offset] = minX.toFloat()
+        bounds[offset + 1] = minY.toFloat()
+        bounds[offset + 2] = maxX.toFloat()
+        bounds[offset + 3] = maxY.toFloat()
+        pages.add(page)
+        lines.add(line)
+        positions.add(position)
+      }
+    }
+
+    fun build(): AyahBoundsTable {
+      val rows = pages.size
+      rowStarts.add(rows)
+      return AyahBoundsTable(
+          ayahIds.toArray(), suras.toArray(), ayahs.toArray(), rowStarts.toArray(),
+          pages.toArray(), lines.toArray(), positions.toArray(), bounds.copyOf(rows * 4)
+      )
+    }
+  }
+
+  private class IntList {
+    private var values = IntArray(16)
+    var size = 0
+      private set
+
+    fun add(value: Int) {
+      if (size == values.size) {
+        values = values.copyOf(size * 2)
+      }
+      values[size++] = value
+    }
+
+    fun last() = values[size - 1]
+
+    fun toArray(): IntArray = values.copyOf(size)
+  }
+}
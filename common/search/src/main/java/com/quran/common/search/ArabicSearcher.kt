@@ -5,11 +5,16 @@ import android.database.DatabaseUtils
 import android.database.MatrixCursor
 import android.database.sqlite.SQLiteDatabase
 import com.quran.common.search.arabic.ArabicCharacterHelper
+import com.quran.common.search.arabic.ArabicSearchIndex
+import java.util.regex.Matcher
 import java.util.regex.Pattern
 
-class ArabicSearcher(private val defaultSearcher: Searcher,
-                     private val matchStart: String,
-                     private val matchEnd: String) : Searcher {
+class ArabicSearcher @JvmOverloads constructor(
+  private val defaultSearcher: Searcher,
+  private val matchStart: String,
+  private val matchEnd: String,
+  private val searchIndexProvider: ArabicSearchIndex.Provider? = null
+) : Searcher {
   override fun getQuery(withSnippets: Boolean,
                         hasFTS: Boolean,
                         table: String,
@@ -19,7 +24,17 @@ class ArabicSearcher(private val defaultSearcher: Searcher,
   }
 
   override fun getLimit(withSnippets: Boolean): String {
-    return if (withSnippets) { "" } else { "LIMIT 250" }
+    // the limit is applied to the rows matching the regex in runQuery
+    return ""
+  }
+
+  override fun getMaxResults(withSnippets: Boolean): Int {
+    return if (withSnippets) { Int.MAX_VALUE } else { SUGGESTION_LIMIT }
+  }
+
+  override fun getResultFilter(originalSearchText: String, hasFTS: Boolean): ResultFilter? {
+    val pattern = Pattern.compile(ArabicCharacterHelper.generateRegex(originalSearchText))
+    return ResultFilter { text -> pattern.matcher(text).find() }
   }
 
   override fun processSearchText(searchText: String, hasFTS: Boolean): String {
@@ -34,22 +49,32 @@ class ArabicSearcher(private val defaultSearcher: Searcher,
                         columns: Array<String>): Cursor {
     val matrixCursor = MatrixCursor(columns)
 
+    // narrow down the rows to check using the index when possible
+    val candidates = searchIndexProvider?.getSearchIndex()?.candidates(originalSearchText)
+    if (candidates != null && candidates.isEmpty()) {
+      return matrixCursor
+    }
+    val rowQuery = if (candidates == null) query else restrictToRowIds(query, candidates)
+
     val regexp = ArabicCharacterHelper.generateRegex(originalSearchText)
     val pattern = Pattern.compile(regexp)
+    val replacement =
+        Matcher.quoteReplacement(matchStart) + "$0" + Matcher.quoteReplacement(matchEnd)
+    val maxResults = getMaxResults(withSnippets)
 
     var cursorCopy: Cursor? = null
     try {
-      cursorCopy = database.rawQuery(query, arrayOf(searchText))
+      cursorCopy = database.rawQuery(rowQuery, arrayOf(searchText))
       cursorCopy?.let { cursor ->
             cursorCopy = cursor
 
-            while (cursor.moveToNext()) {
+            while (matrixCursor.count < maxResults && cursor.moveToNext()) {
               val text = cursor.getString(3)
 
               val matcher = pattern.matcher(text)
               if (matcher.find()) {
                 val matchText: String = if (withSnippets) {
-                  text.replace("($regexp)".toRegex(), "$matchStart$1$matchEnd")
+                  matcher.replaceAll(replacement)
                 } else {
                   text
                 }
@@ -76,7 +101,25 @@ class ArabicSearcher(private val defaultSearcher: Searcher,
     return matrixCursor
   }
 
+  /**
+   * Adds a rowid constraint to a query from [getQuery]. The LIKE clause is kept so that
+   * the rows are still filtered by sqlite before they are checked against the regex.
+   */
+  private fun restrictToRowIds(query: String, rowIds: IntArray): String {
+    val where = query.lastIndexOf(WHERE)
+    return if (where == -1) {
+      query
+    } else {
+      val position = where + WHERE.length
+      query.substring(0, position) +
+          "rowid IN (" + rowIds.joinToString(",") + ") AND " +
+          query.substring(position)
+    }
+  }
+
   companion object {
+    private const val WHERE = " WHERE "
+    private const val SUGGESTION_LIMIT = 250
     private val arabicRegex =  "[\u0627\u0623\u0621\u062a\u0629\u0647\u0648\u0649]".toRegex()
   }
 }
@@ -31,7 +31,23 @@ class DefaultSearcher(private val matchStart: String,
   }
 
   override fun getLimit(withSnippets: Boolean): String {
-    return if (withSnippets) { "" } else { "LIMIT 10" }
+    return if (withSnippets) { "" } else { "LIMIT $SUGGESTION_LIMIT" }
+  }
+
+  override fun getMaxResults(withSnippets: Boolean): Int {
+    return if (withSnippets) { Int.MAX_VALUE } else { SUGGESTION_LIMIT }
+  }
+
+  override fun getResultFilter(originalSearchText: String, hasFTS: Boolean): ResultFilter? {
+    // full text MATCH queries depend on the tokenizer, and LIKE wildcards and quotes
+    // (which are stripped when unbalanced) change the meaning of the text.
+    if (hasFTS || originalSearchText.any { it in LIKE_SPECIAL_CHARACTERS }) {
+      return null
+    }
+
+    // LIKE is only case insensitive for ASCII characters
+    val query = lowerCaseAscii(originalSearchText)
+    return ResultFilter { text -> lowerCaseAscii(text).contains(query) }
   }
 
   override fun processSearchText(searchText: String, hasFTS: Boolean): String {
@@ -52,4 +68,19 @@ class DefaultSearcher(private val matchStart: String,
                         columns: Array<String>): Cursor {
     return database.rawQuery(query, arrayOf(searchText))
   }
+
+  companion object {
+    private const val SUGGESTION_LIMIT = 10
+    private const val LIKE_SPECIAL_CHARACTERS = "%_\""
+
+    private fun lowerCaseAscii(text: String): String {
+      val characters = text.toCharArray()
+      for (i in characters.indices) {
+        if (characters[i] in 'A'..'Z') {
+          characters[i] = characters[i] + ('a' - 'A')
+        }
+      }
+      return String(characters)
+    }
+  }
 }
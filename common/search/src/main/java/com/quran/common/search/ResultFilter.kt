@@ -0,0 +1,8 @@
+package com.quran.common.search
+
+/**
+ * Checks whether the text of a row matches a query without going back to the database.
+ */
+fun interface ResultFilter {
+  fun matches(text: String): Boolean
+}
@@ -12,6 +12,17 @@ interface Searcher {
 
   fun getLimit(withSnippets: Boolean): String
 
+  /**
+   * The maximum number of rows returned by [runQuery], or [Int.MAX_VALUE] if unlimited.
+   */
+  fun getMaxResults(withSnippets: Boolean): Int
+
+  /**
+   * Returns a filter that finds the rows matching [originalSearchText] amongst the rows
+   * matching any prefix of it, or null if this can't be done outside of the database.
+   */
+  fun getResultFilter(originalSearchText: String, hasFTS: Boolean): ResultFilter?
+
   fun processSearchText(searchText: String, hasFTS: Boolean): String
 
   fun runQuery(database: SQLiteDatabase,
@@ -35,6 +35,14 @@ object ArabicCharacterHelper {
       "\u0649" to "\u0649\u064a"
   )
 
+  /**
+   * Maps every character in the [lookupTable] to a single representative character, such
+   * that any two characters that can match each other through [generateRegex] normalize to
+   * the same character. Since matching isn't symmetric (ex ا matches ى and ى matches ي),
+   * this is done for the connected groups of the table rather than for individual entries.
+   */
+  private val normalizationTable: Map<Char, Char> = buildNormalizationTable()
+
   fun generateRegex(query: String): String {
     val characters = query.toCharArray()
     val regexBuilder = StringBuilder()
@@ -49,4 +57,35 @@ object ArabicCharacterHelper {
     }
     return regexBuilder.toString()
   }
+
+  /**
+   * Normalize a character so that it is equal to the normalized form of every
+   * character it could match in [generateRegex].
+   */
+  fun normalize(character: Char): Char = normalizationTable[character] ?: character
+
+  fun normalize(text: String): String {
+    val result = CharArray(text.length)
+    for (i in text.indices) {
+      result[i] = normalize(text[i])
+    }
+    return String(result)
+  }
+
+  private fun buildNormalizationTable(): Map<Char, Char> {
+    val groups = mutableListOf<Set<Char>>()
+    lookupTable.forEach { (given, matches) ->
+      val characters = (given + matches).toSet()
+      val overlapping = groups.filter { group -> characters.any { it in group } }
+      groups.removeAll(overlapping)
+      groups.add(overlapping.fold(characters) { merged, group -> merged + group })
+    }
+
+    val result = mutableMapOf<Char, Char>()
+    groups.forEach { group ->
+      val representative = group.minOrNull() ?: return@forEach
+      group.forEach { result[it] = representative }
+    }
+    return result
+  }
 }
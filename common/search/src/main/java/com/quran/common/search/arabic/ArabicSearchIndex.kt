@@ -0,0 +1,253 @@
+package com.quran.common.search.arabic
+
+import java.io.ByteArrayOutputStream
+import java.io.DataOutputStream
+import java.io.File
+import java.io.FileOutputStream
+import java.io.IOException
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+import java.nio.channels.FileChannel
+
+/**
+ * A memory mapped inverted index from normalized Arabic trigrams to the rowids containing them.
+ *
+ * Text is split into runs of letters, normalized with [ArabicCharacterHelper.normalize], and
+ * every three character window of each run is indexed. Since a literal match of a query must
+ * contain every trigram of the query's letter runs, intersecting their rowids gives a superset
+ * of the matching rows, which still need to be verified against the regex from
+ * [ArabicCharacterHelper.generateRegex].
+ *
+ * The file consists of a header, a table of (trigram, offset, count) entries sorted by trigram,
+ * followed by the sorted rowids of each trigram.
+ */
+class ArabicSearchIndex private constructor(private val buffer: ByteBuffer) {
+  private val trigramCount = buffer.getInt(TRIGRAM_COUNT_OFFSET)
+  private val postingsStart = HEADER_SIZE + trigramCount * ENTRY_SIZE
+
+  /**
+   * The source version passed to [Builder.write], used to detect stale indices.
+   */
+  val sourceVersion: Long = buffer.getLong(SOURCE_VERSION_OFFSET)
+
+  fun interface Provider {
+    fun getSearchIndex(): ArabicSearchIndex?
+  }
+
+  /**
+   * Returns the sorted rowids that may match [query], or null if the index can't narrow down
+   * the query (ex when it is too short or contains regex syntax) and every row has to be checked.
+   */
+  fun candidates(query: String): IntArray? {
+    if (query.any { it in REGEX_CHARACTERS }) {
+      return null
+    }
+
+    val trigrams = trigrams(query)
+    if (trigrams.isEmpty()) {
+      return null
+    }
+
+    var result: IntArray? = null
+    for (trigram in trigrams) {
+      val postings = postings(trigram) ?: return EMPTY
+      result = if (result == null) postings else intersect(result, postings)
+      if (result.isEmpty()) {
+        return result
+      }
+    }
+    return result
+  }
+
+  private fun postings(trigram: Long): IntArray? {
+    var low = 0
+    var high = trigramCount - 1
+    while (low <= high) {
+      val mid = (low + high).ushr(1)
+      val entry = HEADER_SIZE + mid * ENTRY_SIZE
+      val value = buffer.getLong(entry)
+      when {
+        value < trigram -> low = mid + 1
+        value > trigram -> high = mid - 1
+        else -> {
+          val offset = buffer.getInt(entry + 8)
+          val count = buffer.getInt(entry + 12)
+          val postings = IntArray(count)
+          val start = postingsStart + offset * 4
+          for (i in 0 until count) {
+            postings[i] = buffer.getInt(start + i * 4)
+          }
+          return postings
+        }
+      }
+    }
+    return null
+  }
+
+  /**
+   * Builds an index from rows added in increasing rowid order.
+   */
+  class Builder {
+    private val postings = HashMap<Long, IntList>()
+
+    fun add(rowId: Int, text: String) {
+      forEachTrigram(text) { trigram ->
+        postings.getOrPut(trigram) { IntList() }.addIfNotLast(rowId)
+      }
+    }
+
+    /**
+     * Writes the index to [file], replacing it atomically.
+     */
+    @Throws(IOException::class)
+    fun write(file: File, sourceVersion: Long) {
+      val temporaryFile = File(file.path + ".tmp")
+      try {
+        DataOutputStream(FileOutputStream(temporaryFile).buffered()).use { output ->
+          writeTo(output, sourceVersion)
+        }
+      } catch (ioException: IOException) {
+        temporaryFile.delete()
+        throw ioException
+      }
+
+      if (!temporaryFile.renameTo(file)) {
+        temporaryFile.delete()
+        throw IOException("unable to write search index to ${file.path}")
+      }
+    }
+
+    /**
+     * Returns the index without writing it to a file (ex when it can't be written).
+     */
+    fun build(sourceVersion: Long): ArabicSearchIndex {
+      val bytes = ByteArrayOutputStream()
+      DataOutputStream(bytes).use { writeTo(it, sourceVersion) }
+      return ArabicSearchIndex(ByteBuffer.wrap(bytes.toByteArray()))
+    }
+
+    private fun writeTo(output: DataOutputStream, sourceVersion: Long) {
+      val trigrams = postings.keys.sorted()
+      output.writeInt(MAGIC)
+      output.writeInt(VERSION)
+      output.writeLong(sourceVersion)
+      output.writeInt(trigrams.size)
+
+      var offset = 0
+      trigrams.forEach { trigram ->
+        val count = postings.getValue(trigram).size
+        output.writeLong(trigram)
+        output.writeInt(offset)
+        output.writeInt(count)
+        offset += count
+      }
+
+      trigrams.forEach { trigram ->
+        val list = postings.getValue(trigram)
+        for (i in 0 until list.size) {
+          output.writeInt(list[i])
+        }
+      }
+    }
+  }
+
+  private class IntList {
+    private var values = IntArray(4)
+    var size = 0
+      private set
+
+    operator fun get(index: Int) = values[index]
+
+    fun addIfNotLast(value: Int) {
+      if (size > 0 && values[size - 1] == value) {
+        return
+      }
+
+      if (size == values.size) {
+        values = values.copyOf(size * 2)
+      }
+      values[size++] = value
+    }
+  }
+
+  companion object {
+    private const val MAGIC = 0x51534958 // QSIX
+    private const val VERSION = 1
+    private const val SOURCE_VERSION_OFFSET = 8
+    private const val TRIGRAM_COUNT_OFFSET = 16
+    private const val HEADER_SIZE = 20
+    private const val ENTRY_SIZE = 16
+    private const val REGEX_CHARACTERS = "\\.[]{}()*+?^$|"
+    private val EMPTY = IntArray(0)
+
+    /**
+     * Maps the index in [file], returning null if it doesn't exist or isn't a valid index.
+     */
+    @JvmStatic
+    fun open(file: File): ArabicSearchIndex? {
+      if (!file.exists()) {
+        return null
+      }
+
+      return try {
+        RandomAccessFile(file, "r").use { randomAccessFile ->
+          val channel = randomAccessFile.channel
+          val buffer = channel.map(FileChannel.MapMode.READ_ONLY, 0, channel.size())
+          if (buffer.limit() < HEADER_SIZE ||
+              buffer.getInt(0) != MAGIC || buffer.getInt(4) != VERSION) {
+            null
+          } else {
+            ArabicSearchIndex(buffer)
+          }
+        }
+      } catch (ioException: IOException) {
+        null
+      }
+    }
+
+    private fun trigrams(text: String): Set<Long> {
+      val result = mutableSetOf<Long>()
+      forEachTrigram(text) { result.add(it) }
+      return result
+    }
+
+    private fun forEachTrigram(text: String, action: (Long) -> Unit) {
+      var runLength = 0
+      var trigram = 0L
+      for (character in text) {
+        if (Character.isLetter(character)) {
+          val normalized = ArabicCharacterHelper.normalize(character).toLong()
+          trigram = ((trigram shl 16) or normalized) and 0xffffffffffffL
+          runLength++
+          if (runLength >= 3) {
+            action(trigram)
+          }
+        } else {
+          runLength = 0
+          trigram = 0L
+        }
+      }
+    }
+
+    private fun intersect(first: IntArray, second: IntArray): IntArray {
+      val result = IntArray(minOf(first.size, second.size))
+      var i = 0
+      var j = 0
+      var size = 0
+      while (i < first.size && j < second.size) {
+        val a = first[i]
+        val b = second[j]
+        when {
+          a < b -> i++
+          a > b -> j++
+          else -> {
+            result[size++] = a
+            i++
+            j++
+          }
+        }
+      }
+      return result.copyOf(size)
+    }
+  }
+}
@@ -32,9 +32,9 @@ object AudioUpdater {
                               qari: QariItem): LocalUpdate {
     val existingFiles =
       audioSetUpdate.files.filter { audioFileChecker.doesFileExistForQari(qari, it.filename) }
-    val filesToUpdate = existingFiles
-          .filter { !audioFileChecker.doesHashMatchForQariFile(qari, it.filename, it.md5sum) }
-          .map { it.filename }
+    val filesToUpdate = audioFileChecker.findMismatchedFilesForQari(
+        qari, existingFiles.associate { it.filename to it.md5sum }
+    )
 
     val needsDatabaseUpgrade = if (audioSetUpdate.databaseVersion == null) {
       false
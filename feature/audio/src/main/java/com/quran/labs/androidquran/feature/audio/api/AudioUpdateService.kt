@@ -1,9 +1,34 @@
 package com.quran.labs.androidquran.feature.audio.api
 
-import retrofit2.http.GET
-import retrofit2.http.Query
+import com.quran.common.networking.ManifestFetcher
+import com.squareup.moshi.Moshi
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.withContext
+import java.io.IOException
 
-interface AudioUpdateService {
-  @GET("/data/audio_updates.php")
-  suspend fun getUpdates(@Query("revision") revision: Int): AudioUpdates
+class AudioUpdateService(private val manifestFetcher: ManifestFetcher) {
+  private val adapter = Moshi.Builder().build().adapter(AudioUpdates::class.java)
+
+  /**
+   * Fetches the audio updates since [revision] and passes them to [handle], unless they are the
+   * same as the ones that were last handled successfully.
+   * @return the result of [handle], or null if the updates didn't change
+   */
+  suspend fun <T> withUpdates(revision: Int, handle: suspend (AudioUpdates) -> T): T? {
+    return withContext(Dispatchers.IO) {
+      manifestFetcher.fetch("$AUDIO_UPDATES_URL?revision=$revision").use { manifest ->
+        if (manifest.isChanged) {
+          val updates = adapter.fromJson(manifest.source())
+              ?: throw IOException("Unable to parse audio updates")
+          handle(updates).also { manifest.markProcessed() }
+        } else {
+          null
+        }
+      }
+    }
+  }
+
+  companion object {
+    private const val AUDIO_UPDATES_URL = "https://android.quran.com/data/audio_updates.php"
+  }
 }
@@ -8,4 +8,13 @@ interface AudioFileChecker {
   fun doesHashMatchForQariFile(qari: QariItem, file: String, hash: String): Boolean
   fun getDatabasePathForQari(qari: QariItem): String?
   fun doesDatabaseExist(path: String): Boolean
+
+  /**
+   * Returns the files in [hashes] (a map of file name to expected hash) whose hash doesn't match.
+   */
+  fun findMismatchedFilesForQari(qari: QariItem, hashes: Map<String, String>): List<String> {
+    return hashes.filter { (file, hash) -> !doesHashMatchForQariFile(qari, file, hash) }
+        .keys
+        .toList()
+  }
 }
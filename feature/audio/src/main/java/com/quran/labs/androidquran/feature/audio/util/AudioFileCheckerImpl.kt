@@ -2,9 +2,12 @@ package com.quran.labs.androidquran.feature.audio.util
 
 import com.quran.labs.androidquran.common.audio.QariItem
 import java.io.File
+import java.util.concurrent.Callable
+import java.util.concurrent.Executors
 
 class AudioFileCheckerImpl(private val calculator: HashCalculator,
-                           private val audioPathRoot: String) : AudioFileChecker {
+                           private val audioPathRoot: String,
+                           private val maxConcurrentHashes: Int = 1) : AudioFileChecker {
   override fun isQariOnFilesystem(qari: QariItem) = directoryForQari(qari).exists()
 
   override fun doesFileExistForQari(qari: QariItem, file: String) =
@@ -14,6 +17,26 @@ class AudioFileCheckerImpl(private val calculator: HashCalculator,
     return calculator.calculateHash(fileUrlForFile(qari, file)) == hash
   }
 
+  override fun findMismatchedFilesForQari(
+    qari: QariItem,
+    hashes: Map<String, String>
+  ): List<String> {
+    if (maxConcurrentHashes <= 1 || hashes.size <= 1) {
+      return super.findMismatchedFilesForQari(qari, hashes)
+    }
+
+    // hashing is mostly waiting on reads, so a few files are hashed at once
+    val executor = Executors.newFixedThreadPool(minOf(maxConcurrentHashes, hashes.size))
+    try {
+      val futures = hashes.map { (file, hash) ->
+        file to executor.submit(Callable { doesHashMatchForQariFile(qari, file, hash) })
+      }
+      return futures.filter { (_, matches) -> !matches.get() }.map { it.first }
+    } finally {
+      executor.shutdownNow()
+    }
+  }
+
   override fun getDatabasePathForQari(qari: QariItem): String? {
     return if (qari.isGapless) {
       audioPathRoot + qari.path + File.separator + qari.databaseName + ".db"
@@ -0,0 +1,110 @@
+package com.quran.labs.androidquran.feature.audio.util
+
+import java.io.DataInputStream
+import java.io.DataOutputStream
+import java.io.File
+import java.io.IOException
+import java.util.concurrent.ConcurrentHashMap
+
+/**
+ * A [HashCalculator] that remembers the hashes it calculates in [cacheFile].
+ *
+ * Hashes are keyed by the path, size, and last modified time of a file, so a file is only read
+ * again once it changes. Call [save] to write the hashes back to [cacheFile].
+ */
+class CachingHashCalculator(
+  private val calculator: HashCalculator,
+  private val cacheFile: File
+) : HashCalculator {
+
+  private class Entry(val size: Long, val lastModified: Long, val hash: String)
+
+  private val entries = ConcurrentHashMap<String, Entry>()
+
+  @Volatile
+  private var isDirty = false
+
+  init {
+    read()
+  }
+
+  override fun calculateHash(file: File): String {
+    val path = file.absolutePath
+    val size = file.length()
+    val lastModified = file.lastModified()
+
+    val cached = entries[path]
+    if (cached != null && cached.size == size && cached.lastModified == lastModified) {
+      return cached.hash
+    }
+
+    val hash = calculator.calculateHash(file)
+    entries[path] = Entry(size, lastModified, hash)
+    isDirty = true
+    return hash
+  }
+
+  /**
+   * Writes the cached hashes to the cache file, dropping those of files that no longer exist.
+   */
+  @Synchronized
+  fun save() {
+    val missing = entries.keys.filter { !File(it).exists() }
+    if (missing.isNotEmpty()) {
+      missing.forEach { entries.remove(it) }
+      isDirty = true
+    }
+
+    if (!isDirty) {
+      return
+    }
+
+    val temporaryFile = File(cacheFile.path + ".tmp")
+    try {
+      DataOutputStream(temporaryFile.outputStream().buffered()).use { output ->
+        val snapshot = entries.toMap()
+        output.writeInt(VERSION)
+        output.writeInt(snapshot.size)
+        snapshot.forEach { (path, entry) ->
+          output.writeUTF(path)
+          output.writeLong(entry.size)
+          output.writeLong(entry.lastModified)
+          output.writeUTF(entry.hash)
+        }
+      }
+
+      if (temporaryFile.renameTo(cacheFile)) {
+        isDirty = false
+      } else {
+        temporaryFile.delete()
+      }
+    } catch (ioException: IOException) {
+      // the hashes will be calculated again next time
+      temporaryFile.delete()
+    }
+  }
+
+  private fun read() {
+    if (!cacheFile.exists()) {
+      return
+    }
+
+    try {
+      DataInputStream(cacheFile.inputStream().buffered()).use { input ->
+        if (input.readInt() == VERSION) {
+          repeat(input.readInt()) {
+            val path = input.readUTF()
+            entries[path] = Entry(input.readLong(), input.readLong(), input.readUTF())
+          }
+        }
+      }
+    } catch (ioException: IOException) {
+      // an unreadable cache is the same as an empty one
+      entries.clear()
+    }
+  }
+
+  companion object {
+    private const val VERSION = 1
+  }
+}
@@ -0,0 +1,146 @@
+package com.quran.labs.androidquran.feature.audio.util
+
+import com.google.common.truth.Truth.assertThat
+import com.quran.labs.androidquran.common.audio.QariItem
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+import java.util.Random
+import java.util.concurrent.atomic.AtomicInteger
+
+class CachingHashCalculatorTest {
+
+  @get:Rule
+  val temporaryFolder = TemporaryFolder()
+
+  private val hashes = AtomicInteger(0)
+  private val countingCalculator = object : HashCalculator {
+    override fun calculateHash(file: File): String {
+      hashes.incrementAndGet()
+      return MD5Calculator.calculateHash(file)
+    }
+  }
+
+  @Test
+  fun testUnchangedFilesAreOnlyHashedOnce() {
+    val file = writeFile("001.mp3", 1024, 1)
+    val cacheFile = File(temporaryFolder.root, ".audio_hashes")
+
+    val calculator = CachingHashCalculator(countingCalculator, cacheFile)
+    val hash = calculator.calculateHash(file)
+    assertThat(calculator.calculateHash(file)).isEqualTo(hash)
+    assertThat(hashes.get()).isEqualTo(1)
+
+    // the cache is read back from disk
+    calculator.save()
+    val warmCalculator = CachingHashCalculator(countingCalculator, cacheFile)
+    assertThat(warmCalculator.calculateHash(file)).isEqualTo(hash)
+    assertThat(hashes.get()).isEqualTo(1)
+  }
+
+  @Test
+  fun testChangedFilesAreHashedAgain() {
+    val file = writeFile("001.mp3", 1024, 1)
+    val calculator =
+      CachingHashCalculator(countingCalculator, File(temporaryFolder.root, ".audio_hashes"))
+    val hash = calculator.calculateHash(file)
+
+    writeFile("001.mp3", 2048, 2)
+    assertThat(calculator.calculateHash(file)).isNotEqualTo(hash)
+    assertThat(hashes.get()).isEqualTo(2)
+
+    file.setLastModified(file.lastModified() + 10_000)
+    calculator.calculateHash(file)
+    assertThat(hashes.get()).isEqualTo(3)
+  }
+
+  @Test
+  fun testSaveDropsMissingFiles() {
+    val first = writeFile("001.mp3", 1024, 1)
+    val second = writeFile("002.mp3", 1024, 2)
+    val cacheFile = File(temporaryFolder.root, ".audio_hashes")
+
+    val calculator = CachingHashCalculator(countingCalculator, cacheFile)
+    calculator.calculateHash(first)
+    calculator.calculateHash(second)
+    second.delete()
+    calculator.save()
+
+    // the dropped file is hashed again once it comes back
+    writeFile("002.mp3", 1024, 2)
+    val warmCalculator = CachingHashCalculator(countingCalculator, cacheFile)
+    warmCalculator.calculateHash(first)
+    warmCalculator.calculateHash(second)
+    assertThat(hashes.get()).isEqualTo(3)
+  }
+
+  @Test
+  fun testInvalidCacheIsIgnored() {
+    val file = writeFile("001.mp3", 1024, 1)
+    val cacheFile = File(temporaryFolder.root, ".audio_hashes")
+    cacheFile.writeText("not a cache")
+
+    val calculator = CachingHashCalculator(countingCalculator, cacheFile)
+    assertThat(calculator.calculateHash(file)).isEqualTo(MD5Calculator.calculateHash(file))
+  }
+
+  @Test
+  fun testParallelHashingFindsMismatches() {
+    val qari = QariItem(1, "Gapless Sheikh", "https://url/", "sheikh", "sheikh")
+    val directory = temporaryFolder.newFolder("audio", "sheikh")
+    val files = (1..8).map { "%03d.mp3".format(it) }
+    files.forEachIndexed { index, name -> writeFile(File(directory, name), 4096, index) }
+
+    val expected = files.associateWith { MD5Calculator.calculateHash(File(directory, it)) }
+        .toMutableMap()
+    expected["003.mp3"] = "outdated"
+    expected["007.mp3"] = "outdated"
+
+    val audioPathRoot = File(temporaryFolder.root, "audio").path + File.separator
+    val serial = AudioFileCheckerImpl(MD5Calculator, audioPathRoot)
+        .findMismatchedFilesForQari(qari, expected)
+    val parallel = AudioFileCheckerImpl(MD5Calculator, audioPathRoot, 4)
+        .findMismatchedFilesForQari(qari, expected)
+    assertThat(serial).containsExactly("003.mp3", "007.mp3").inOrder()
+    assertThat(parallel).isEqualTo(serial)
+  }
+
+  @Test
+  fun testWarmRunDoesNotHashAgain() {
+    val qari = QariItem(1, "Gapless Sheikh", "https://url/", "sheikh", "sheikh")
+    val audioRoot = temporaryFolder.newFolder("warm")
+    val directory = File(audioRoot, "sheikh").apply { mkdirs() }
+    val audioPathRoot = audioRoot.path + File.separator
+    val cacheFile = File(temporaryFolder.root, ".audio_hashes")
+
+    val count = 16
+    (1..count).forEach { writeFile(File(directory, "%03d.mp3".format(it)), FILE_SIZE, it) }
+    val expected = (1..count).associate { "%03d.mp3".format(it) to "" }
+
+    val coldCalculator = CachingHashCalculator(countingCalculator, cacheFile)
+    val cold = AudioFileCheckerImpl(coldCalculator, audioPathRoot, 4)
+        .findMismatchedFilesForQari(qari, expected)
+    coldCalculator.save()
+    assertThat(hashes.get()).isEqualTo(count)
+
+    val warmCalculator = CachingHashCalculator(countingCalculator, cacheFile)
+    val warm = AudioFileCheckerImpl(warmCalculator, audioPathRoot, 4)
+        .findMismatchedFilesForQari(qari, expected)
+    assertThat(hashes.get()).isEqualTo(count)
+    assertThat(warm).isEqualTo(cold)
+  }
+
+  private fun writeFile(name: String, size: Int, seed: Int): File {
+    return writeFile(File(temporaryFolder.root, name), size, seed)
+  }
+
+  private fun writeFile(file: File, size: Int, seed: Int): File {
+    file.writeBytes(ByteArray(size).also { Random(seed.toLong()).nextBytes(it) })
+    return file
+  }
+
+  companion object {
+    private const val FILE_SIZE = 16 * 1024
+  }
+}